@@ -13,6 +13,7 @@ from homeassistant.auth.permissions.const import POLICY_READ
 from homeassistant.bootstrap import DATA_LOGGING
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
+    CONTENT_TYPE_JSON,
     EVENT_HOMEASSISTANT_STOP,
     MATCH_ALL,
     URL_API,
@@ -32,7 +33,7 @@ from homeassistant.helpers import template
 from homeassistant.helpers.json import json_dumps
 from homeassistant.helpers.service import async_get_all_descriptions
 from homeassistant.helpers.typing import ConfigType
-from homeassistant.util.json import json_loads
+from homeassistant.util.json import JSON_ENCODE_EXCEPTIONS, json_loads
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -177,7 +178,12 @@ class APIStatesView(HomeAssistantView):
             for state in request.app["hass"].states.async_all()
             if entity_perm(state.entity_id, "read")
         ]
-        return self.json(states)
+        try:
+            body = b"[" + b",".join(state.as_dict_json() for state in states) + b"]"
+        except JSON_ENCODE_EXCEPTIONS:
+            # Let the generic serializer log the bad data
+            return self.json(states)
+        return _json_response(body)
 
 
 class APIEntityStateView(HomeAssistantView):
@@ -194,7 +200,11 @@ class APIEntityStateView(HomeAssistantView):
             raise Unauthorized(entity_id=entity_id)
 
         if state := request.app["hass"].states.get(entity_id):
-            return self.json(state)
+            try:
+                return _json_response(state.as_dict_json())
+            except JSON_ENCODE_EXCEPTIONS:
+                # Let the generic serializer log the bad data
+                return self.json(state)
         return self.json_message("Entity not found.", HTTPStatus.NOT_FOUND)
 
     async def post(self, request, entity_id):
@@ -403,3 +413,10 @@ def async_events_json(hass):
         {"event": key, "listener_count": value}
         for key, value in hass.bus.async_listeners().items()
     ]
+
+
+def _json_response(body: bytes) -> web.Response:
+    """Return a response for an already serialized JSON body."""
+    response = web.Response(body=body, content_type=CONTENT_TYPE_JSON)
+    response.enable_compression()
+    return response
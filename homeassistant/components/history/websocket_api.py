@@ -4,7 +4,7 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Callable, Iterable, MutableMapping
 from dataclasses import dataclass
-from datetime import datetime as dt
+from datetime import datetime as dt, timedelta
 import logging
 from typing import Any, cast
 
@@ -14,6 +14,11 @@ from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance, history
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
+from homeassistant.components.websocket_api.shared_stream import (
+    SharedStream,
+    SharedStreamSubscriber,
+    async_subscribe_shared_stream,
+)
 from homeassistant.const import (
     COMPRESSED_STATE_ATTRIBUTES,
     COMPRESSED_STATE_LAST_CHANGED,
@@ -35,7 +40,7 @@ from homeassistant.helpers.event import (
 from homeassistant.helpers.json import JSON_DUMP
 import homeassistant.util.dt as dt_util
 
-from .const import EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
+from .const import DOMAIN, EVENT_COALESCE_TIME, MAX_PENDING_HISTORY_STATES
 from .helpers import entities_may_have_state_changes_after
 
 _LOGGER = logging.getLogger(__name__)
@@ -45,10 +50,8 @@ _LOGGER = logging.getLogger(__name__)
 class HistoryLiveStream:
     """Track a history live stream."""
 
-    stream_queue: asyncio.Queue[Event]
-    subscriptions: list[CALLBACK_TYPE]
+    subscriber: SharedStreamSubscriber | None = None
     end_time_unsub: CALLBACK_TYPE | None = None
-    task: asyncio.Task | None = None
     wait_sync_task: asyncio.Task | None = None
 
 
@@ -267,9 +270,52 @@ async def _async_send_historical_states(
     minimal_response: bool,
     no_attributes: bool,
     send_empty: bool,
+    chunk_size: int | None = None,
 ) -> dt | None:
-    """Fetch history significant_states and send them to the client."""
+    """Fetch history significant_states and send them to the client.
+
+    If a chunk_size is given the states are sent oldest first in chunks
+    of about chunk_size state changes, each chunk is sent before the
+    next one is fetched.
+    """
     instance = get_instance(hass)
+    last_time: dt | None = None
+    while chunk_size is not None and entity_ids:
+        if not (
+            chunk_end := await instance.async_add_executor_job(
+                history.get_significant_states_chunk_end,
+                hass,
+                start_time,
+                end_time,
+                entity_ids,
+                chunk_size,
+                significant_changes_only,
+            )
+        ):
+            break
+        # The states changed at the end of the chunk are all sent with it
+        last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
+            _generate_historical_response,
+            hass,
+            msg_id,
+            start_time,
+            chunk_end + timedelta(microseconds=1),
+            entity_ids,
+            include_start_time_state,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+            False,
+        )
+        if payload:
+            connection.send_message(payload)
+            last_time = last_time_dt
+            send_empty = False
+        if msg_id not in connection.subscriptions:
+            return last_time
+        # The start time states were sent with the first chunk
+        include_start_time_state = False
+        start_time = chunk_end
     last_time_ts, last_time_dt, payload = await instance.async_add_executor_job(
         _generate_historical_response,
         hass,
@@ -285,7 +331,7 @@ async def _async_send_historical_states(
     )
     if payload:
         connection.send_message(payload)
-    return last_time_dt if last_time_ts != 0 else None
+    return last_time_dt if last_time_ts != 0 else last_time
 
 
 def _history_compressed_state(state: State, no_attributes: bool) -> dict[str, Any]:
@@ -318,19 +364,13 @@ def _events_to_compressed_states(
 
 
 async def _async_events_consumer(
-    subscriptions_setup_complete_time: dt,
-    connection: ActiveConnection,
-    msg_id: int,
+    stream: SharedStream,
     stream_queue: asyncio.Queue[Event],
     no_attributes: bool,
 ) -> None:
     """Stream events from the queue."""
     while True:
         events: list[Event] = [await stream_queue.get()]
-        # If the event is older than the last db
-        # event we already sent it so we skip it.
-        if events[0].time_fired <= subscriptions_setup_complete_time:
-            continue
         # We sleep for the EVENT_COALESCE_TIME so
         # we can group events together to minimize
         # the number of websocket messages when the
@@ -339,15 +379,60 @@ async def _async_events_consumer(
         while not stream_queue.empty():
             events.append(stream_queue.get_nowait())
 
-        if history_states := _events_to_compressed_states(events, no_attributes):
-            connection.send_message(
-                JSON_DUMP(
-                    messages.event_message(
-                        msg_id,
-                        {"states": history_states},
-                    )
-                )
+        history_states = _events_to_compressed_states(events, no_attributes)
+        stream.async_publish(
+            JSON_DUMP({"states": history_states}) if history_states else None
+        )
+
+
+@callback
+def _async_start_live_stream(
+    hass: HomeAssistant,
+    stream: SharedStream,
+    entity_ids: list[str],
+    significant_changes_only: bool,
+    minimal_response: bool,
+    no_attributes: bool,
+) -> CALLBACK_TYPE:
+    """Start the live stream shared by the identical subscriptions."""
+    subscriptions: list[CALLBACK_TYPE] = []
+    stream_queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_HISTORY_STATES)
+
+    @callback
+    def _queue_or_end(event: Event) -> None:
+        """Queue an event to be processed or end the stream."""
+        try:
+            stream_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            _LOGGER.debug(
+                "Client exceeded max pending messages of %s",
+                MAX_PENDING_HISTORY_STATES,
             )
+            stream.async_end()
+            return
+        stream.async_event_queued(event.time_fired)
+
+    _async_subscribe_events(
+        hass,
+        subscriptions,
+        _queue_or_end,
+        entity_ids,
+        significant_changes_only=significant_changes_only,
+        minimal_response=minimal_response,
+    )
+    task = asyncio.create_task(
+        _async_events_consumer(stream, stream_queue, no_attributes)
+    )
+
+    @callback
+    def _stop() -> None:
+        """Stop the live stream."""
+        for subscription in subscriptions:
+            subscription()
+        subscriptions.clear()
+        task.cancel()
+
+    return _stop
 
 
 @callback
@@ -398,6 +483,7 @@ def _async_subscribe_events(
         vol.Optional("significant_changes_only", default=True): bool,
         vol.Optional("minimal_response", default=False): bool,
         vol.Optional("no_attributes", default=False): bool,
+        vol.Optional("chunk_size"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -432,6 +518,7 @@ async def ws_stream(
     significant_changes_only = msg["significant_changes_only"]
     no_attributes = msg["no_attributes"]
     minimal_response = msg["minimal_response"]
+    chunk_size: int | None = msg.get("chunk_size")
 
     if end_time and end_time <= utc_now:
         if (
@@ -458,23 +545,17 @@ async def ws_stream(
             minimal_response,
             no_attributes,
             True,
+            chunk_size,
         )
         return
 
-    subscriptions: list[CALLBACK_TYPE] = []
-    stream_queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_HISTORY_STATES)
-    live_stream = HistoryLiveStream(
-        subscriptions=subscriptions, stream_queue=stream_queue
-    )
+    live_stream = HistoryLiveStream()
 
     @callback
     def _unsub(*_utc_time: Any) -> None:
         """Unsubscribe from all events."""
-        for subscription in subscriptions:
-            subscription()
-        subscriptions.clear()
-        if live_stream.task:
-            live_stream.task.cancel()
+        if live_stream.subscriber:
+            live_stream.subscriber.async_remove()
         if live_stream.wait_sync_task:
             live_stream.wait_sync_task.cancel()
         if live_stream.end_time_unsub:
@@ -486,27 +567,30 @@ async def ws_stream(
             hass, _unsub, end_time
         )
 
-    @callback
-    def _queue_or_cancel(event: Event) -> None:
-        """Queue an event to be processed or cancel."""
-        try:
-            stream_queue.put_nowait(event)
-        except asyncio.QueueFull:
-            _LOGGER.debug(
-                "Client exceeded max pending messages of %s",
-                MAX_PENDING_HISTORY_STATES,
-            )
-            _unsub()
-
-    _async_subscribe_events(
+    # Identical subscriptions share the live stream
+    live_stream.subscriber = subscriber = async_subscribe_shared_stream(
         hass,
-        subscriptions,
-        _queue_or_cancel,
-        entity_ids,
-        significant_changes_only=significant_changes_only,
-        minimal_response=minimal_response,
+        (
+            DOMAIN,
+            tuple(sorted(set(entity_ids))),
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        ),
+        lambda stream: _async_start_live_stream(
+            hass,
+            stream,
+            entity_ids,
+            significant_changes_only,
+            minimal_response,
+            no_attributes,
+        ),
+        connection,
+        msg_id,
+        MAX_PENDING_HISTORY_STATES,
+        _unsub,
     )
-    subscriptions_setup_complete_time = dt_util.utcnow()
+    subscriptions_setup_complete_time = subscriber.subscribed_time
     connection.subscriptions[msg_id] = _unsub
     connection.send_result(msg_id)
     # Fetch everything from history
@@ -522,21 +606,14 @@ async def ws_stream(
         minimal_response,
         no_attributes,
         True,
+        chunk_size,
     )
 
     if msg_id not in connection.subscriptions:
         # Unsubscribe happened while sending historical states
         return
 
-    live_stream.task = asyncio.create_task(
-        _async_events_consumer(
-            subscriptions_setup_complete_time,
-            connection,
-            msg_id,
-            stream_queue,
-            no_attributes,
-        )
-    )
+    subscriber.async_start()
 
     live_stream.wait_sync_task = asyncio.create_task(
         get_instance(hass).async_block_till_done()
@@ -492,8 +492,11 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
         return True
 
     event_to_json = _generate_event_to_json(conf)
+    entity_keys = convert_include_exclude_filter(conf).included_keys
     max_tries = conf.get(CONF_RETRY_COUNT)
-    instance = hass.data[DOMAIN] = InfluxThread(hass, influx, event_to_json, max_tries)
+    instance = hass.data[DOMAIN] = InfluxThread(
+        hass, influx, event_to_json, max_tries, entity_keys
+    )
     instance.start()
 
     def shutdown(event):
@@ -510,7 +513,7 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
 class InfluxThread(threading.Thread):
     """A threaded event handler class."""
 
-    def __init__(self, hass, influx, event_to_json, max_tries):
+    def __init__(self, hass, influx, event_to_json, max_tries, entity_keys=None):
         """Initialize the listener."""
         threading.Thread.__init__(self, name=DOMAIN)
         self.queue = queue.Queue()
@@ -519,7 +522,13 @@ class InfluxThread(threading.Thread):
         self.max_tries = max_tries
         self.write_errors = 0
         self.shutdown = False
-        hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
+        if entity_keys is not None:
+            # Only the included entities and domains are queued
+            hass.bus.listen_keyed(
+                EVENT_STATE_CHANGED, entity_keys, self._event_listener
+            )
+        else:
+            hass.bus.listen(EVENT_STATE_CHANGED, self._event_listener)
 
     @callback
     def _event_listener(self, event):
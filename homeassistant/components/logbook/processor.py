@@ -1,16 +1,20 @@
 """Event parser and human readable log generator."""
 from __future__ import annotations
 
-from collections.abc import Callable, Generator, Sequence
+from collections.abc import Callable, Collection, Generator, Sequence
 from contextlib import suppress
 from dataclasses import dataclass
 from datetime import datetime as dt
+import math
 from typing import Any
 
 from sqlalchemy.engine import Result
 from sqlalchemy.engine.row import Row
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components.recorder import get_instance
+from homeassistant.components.recorder.const import SQLITE_MAX_BIND_VARS
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import (
     bytes_to_uuid_hex_or_none,
@@ -18,7 +22,11 @@ from homeassistant.components.recorder.models import (
     process_datetime_to_timestamp,
     process_timestamp_to_utc_isoformat,
 )
-from homeassistant.components.recorder.util import session_scope
+from homeassistant.components.recorder.util import (
+    chunked,
+    execute_stmt_lambda_element,
+    session_scope,
+)
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.const import (
     ATTR_DOMAIN,
@@ -59,6 +67,7 @@ from .helpers import is_sensor_continuous
 from .models import EventAsRow, LazyEventPartialState, LogbookConfig, async_event_to_row
 from .queries import statement_for_request
 from .queries.common import PSEUDO_EVENT_STATE_CHANGED
+from .queries.context_origins import context_origins_stmt
 
 
 @dataclass
@@ -151,29 +160,155 @@ class EventProcessor:
             #
             return result.yield_per(1024)
 
+        start_ts = start_day.timestamp()
+        use_context_origins = self._use_context_origins(start_ts)
         with session_scope(hass=self.hass, read_only=True) as session:
-            metadata_ids: list[int] | None = None
-            if self.entity_ids:
-                instance = get_instance(self.hass)
-                metadata_ids = extract_metadata_ids(
-                    instance.states_meta_manager.get_many(
-                        self.entity_ids, session, False
+            stmt = self._statement(
+                session, start_ts, end_day.timestamp(), not use_context_origins
+            )
+            if not use_context_origins:
+                return self.humanify(yield_rows(session.execute(stmt)))
+            return self.humanify(
+                self._stream_with_context_origins(session.execute(stmt).yield_per(1024))
+            )
+
+    def get_events_chunk(
+        self, start_ts: float, end_ts: float, chunk_size: int
+    ) -> tuple[list[dict[str, Any]], float | None]:
+        """Get the oldest events of a period of time in a bounded chunk.
+
+        The chunk holds about chunk_size rows, the rows fired at the
+        same time are never split across chunks. Returns the events
+        and the time to start the next chunk after, or None if the
+        chunk reached the end of the period.
+
+        Only the contexts of the rows of the chunk are kept for the next
+        chunk. A context that has no rows in a whole chunk is looked up
+        again from the context origins when they cover the period, else
+        the later rows of the context are not augmented with it.
+        """
+        # The rows of the chunk are all fetched at once so the
+        # event cache only has to hold the events of one chunk
+        self.logbook_run.event_cache.clear()
+        use_context_origins = self._use_context_origins(start_ts)
+        context_union = bool(self.entity_ids or self.device_ids) and (
+            not use_context_origins
+        )
+        with session_scope(hass=self.hass, read_only=True) as session:
+            # One more row than the chunk holds tells if the rows
+            # fired at the time of its last row continue after it
+            stmt = self._statement(session, start_ts, end_ts, False, chunk_size + 1)
+            rows: Sequence[Row] = session.execute(stmt).all()
+            next_start_ts: float | None = None
+            if len(rows) > chunk_size:
+                next_start_ts = last_ts = rows[chunk_size - 1].time_fired_ts
+                if rows[chunk_size].time_fired_ts > last_ts:
+                    rows = rows[:chunk_size]
+                elif rows[0].time_fired_ts < last_ts:
+                    # The next chunk starts after the last time with
+                    # all of its rows in this chunk
+                    rows = [row for row in rows if row.time_fired_ts < last_ts]
+                    next_start_ts = rows[-1].time_fired_ts
+                else:
+                    # More rows than the chunk holds were fired at the same
+                    # time, select all of them so the next chunk can start
+                    # after that time
+                    stmt = self._statement(
+                        session, start_ts, math.nextafter(last_ts, math.inf), False
                     )
+                    rows = session.execute(stmt).all()
+            if context_union:
+                # The context union selects rows outside of the period,
+                # it is selected again for the period the chunk covers
+                chunk_end_ts = end_ts
+                if next_start_ts is not None:
+                    chunk_end_ts = math.nextafter(next_start_ts, math.inf)
+                stmt = self._statement(session, start_ts, chunk_end_ts, True)
+                rows = session.execute(stmt).all()
+            elif use_context_origins:
+                self._memorize_context_origins(session, rows)
+            events = self.humanify(rows)
+        self.logbook_run.context_lookup.retain({row.context_id_bin for row in rows})
+        return events, next_start_ts
+
+    def _use_context_origins(self, start_ts: float) -> bool:
+        """Return if the context origins take the place of the context union.
+
+        Entities and devices requests look up the rows linked by
+        context from the context origins when they cover the period.
+        """
+        since_ts = get_instance(self.hass).context_origins_manager.since_ts
+        return (
+            bool(self.entity_ids or self.device_ids)
+            and since_ts is not None
+            and start_ts >= since_ts
+        )
+
+    def _statement(
+        self,
+        session: Session,
+        start_ts: float,
+        end_ts: float,
+        context_union: bool,
+        limit: int | None = None,
+    ) -> StatementLambdaElement:
+        """Generate the statement for a period of time."""
+        metadata_ids: list[int] | None = None
+        if self.entity_ids:
+            metadata_ids = extract_metadata_ids(
+                get_instance(self.hass).states_meta_manager.get_many(
+                    self.entity_ids, session, False
                 )
-            stmt = statement_for_request(
-                start_day,
-                end_day,
-                self.event_types,
-                self.entity_ids,
-                metadata_ids,
-                self.device_ids,
-                self.filters,
-                self.context_id,
             )
-            return self.humanify(yield_rows(session.execute(stmt)))
+        return statement_for_request(
+            start_ts,
+            end_ts,
+            self.event_types,
+            self.entity_ids,
+            metadata_ids,
+            self.device_ids,
+            self.filters,
+            self.context_id,
+            context_union,
+            limit,
+        )
+
+    def _stream_with_context_origins(self, rows: Result) -> Generator[Row, None, None]:
+        """Memorize the origins of the contexts of each chunk of rows and yield it.
+
+        The origins are looked up in another session since the
+        rows are still streamed from the database.
+        """
+        with session_scope(hass=self.hass, read_only=True) as session:
+            for rows_chunk in chunked(rows, SQLITE_MAX_BIND_VARS):
+                self._memorize_context_origins(session, rows_chunk)
+                yield from rows_chunk
+
+    def _memorize_context_origins(self, session: Session, rows: Sequence[Row]) -> None:
+        """Memorize the origins of the contexts of the rows.
+
+        The origins take the place of the rows the context union
+        selects, so they are memorized before any of the rows.
+        """
+        context_lookup = self.logbook_run.context_lookup
+        context_id_bins = {
+            context_id_bin
+            for row in rows
+            if (context_id_bin := row.context_id_bin) is not None
+            and context_lookup.get(context_id_bin) is None
+        }
+        for context_id_bins_chunk in chunked(context_id_bins, SQLITE_MAX_BIND_VARS):
+            for origin_row in execute_stmt_lambda_element(
+                session, context_origins_stmt(context_id_bins_chunk)
+            ):
+                context_lookup.memorize(origin_row)
 
     def humanify(
-        self, rows: Generator[EventAsRow, None, None] | Sequence[Row] | Result
+        self,
+        rows: Generator[EventAsRow, None, None]
+        | Generator[Row, None, None]
+        | Sequence[Row]
+        | Result,
     ) -> list[dict[str, str]]:
         """Humanify rows."""
         return list(
@@ -187,7 +322,10 @@ class EventProcessor:
 
 
 def _humanify(
-    rows: Generator[EventAsRow, None, None] | Sequence[Row] | Result,
+    rows: Generator[EventAsRow, None, None]
+    | Generator[Row, None, None]
+    | Sequence[Row]
+    | Result,
     ent_reg: er.EntityRegistry,
     logbook_run: LogbookRun,
     context_augmenter: ContextAugmenter,
@@ -285,6 +423,14 @@ class ContextLookup:
         self._lookup.clear()
         self._memorize_new = False
 
+    def retain(self, context_id_bins: Collection[bytes | None]) -> None:
+        """Forget the context origins of every other context."""
+        self._lookup = {
+            context_id_bin: row
+            for context_id_bin, row in self._lookup.items()
+            if context_id_bin is None or context_id_bin in context_id_bins
+        }
+
     def get(self, context_id_bin: bytes) -> Row | EventAsRow | None:
         """Get the context origin."""
         return self._lookup.get(context_id_bin)
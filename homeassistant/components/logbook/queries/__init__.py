@@ -2,14 +2,12 @@
 from __future__ import annotations
 
 from collections.abc import Collection
-from datetime import datetime as dt
 
 from sqlalchemy.sql.lambdas import StatementLambdaElement
 
 from homeassistant.components.recorder.filters import Filters
 from homeassistant.components.recorder.models import ulid_to_bytes_or_none
 from homeassistant.helpers.json import json_dumps
-from homeassistant.util import dt as dt_util
 
 from .all import all_stmt
 from .devices import devices_stmt
@@ -18,23 +16,32 @@ from .entities_and_devices import entities_devices_stmt
 
 
 def statement_for_request(
-    start_day_dt: dt,
-    end_day_dt: dt,
+    start_day: float,
+    end_day: float,
     event_types: tuple[str, ...],
     entity_ids: list[str] | None = None,
     states_metadata_ids: Collection[int] | None = None,
     device_ids: list[str] | None = None,
     filters: Filters | None = None,
     context_id: str | None = None,
+    context_union: bool = True,
+    limit: int | None = None,
 ) -> StatementLambdaElement:
-    """Generate the logbook statement for a logbook request."""
-    start_day = dt_util.utc_to_timestamp(start_day_dt)
-    end_day = dt_util.utc_to_timestamp(end_day_dt)
+    """Generate the logbook statement for a logbook request.
+
+    Requests for entities or devices select the rows that share a
+    context with the matching rows unless context_union is False.
+    The statement selects at most limit rows, they can only be limited
+    without the context union as it selects rows outside the period.
+    """
+    assert limit is None or not (
+        context_union and (entity_ids or device_ids)
+    ), "can't limit the rows of the context union"
     # No entities: logbook sends everything for the timeframe
     # limited by the context_id and the yaml configured filter
     if not entity_ids and not device_ids:
         context_id_bin = ulid_to_bytes_or_none(context_id)
-        return all_stmt(
+        stmt = all_stmt(
             start_day,
             end_day,
             event_types,
@@ -48,31 +55,39 @@ def statement_for_request(
     # sqlalchemy from quoting them incorrectly
 
     # entities and devices: logbook sends everything for the timeframe for the entities and devices
-    if entity_ids and device_ids:
-        return entities_devices_stmt(
+    elif entity_ids and device_ids:
+        stmt = entities_devices_stmt(
             start_day,
             end_day,
             event_types,
             states_metadata_ids or [],
             [json_dumps(entity_id) for entity_id in entity_ids],
             [json_dumps(device_id) for device_id in device_ids],
+            context_union,
         )
 
     # entities: logbook sends everything for the timeframe for the entities
-    if entity_ids:
-        return entities_stmt(
+    elif entity_ids:
+        stmt = entities_stmt(
             start_day,
             end_day,
             event_types,
             states_metadata_ids or [],
             [json_dumps(entity_id) for entity_id in entity_ids],
+            context_union,
         )
 
     # devices: logbook sends everything for the timeframe for the devices
-    assert device_ids is not None
-    return devices_stmt(
-        start_day,
-        end_day,
-        event_types,
-        [json_dumps(device_id) for device_id in device_ids],
-    )
+    else:
+        assert device_ids is not None
+        stmt = devices_stmt(
+            start_day,
+            end_day,
+            event_types,
+            [json_dumps(device_id) for device_id in device_ids],
+            context_union,
+        )
+
+    if limit is not None:
+        stmt += lambda s: s.limit(limit)
+    return stmt
@@ -0,0 +1,55 @@
+"""Context origins queries for logbook."""
+from __future__ import annotations
+
+from collections.abc import Collection
+
+from sqlalchemy import func, lambda_stmt, select
+from sqlalchemy.sql.lambdas import StatementLambdaElement
+
+from homeassistant.components.recorder.db_schema import (
+    ContextOrigins,
+    EventData,
+    Events,
+    EventTypes,
+    States,
+    StatesMeta,
+)
+
+from .common import CONTEXT_ONLY, STATE_CONTEXT_ONLY_COLUMNS
+
+
+def context_origins_stmt(context_id_bins: Collection[bytes]) -> StatementLambdaElement:
+    """Generate a query for the rows the contexts originate from.
+
+    The rows have the columns of the context only rows of the
+    context unions. A context may have more than one origin,
+    the oldest comes first.
+    """
+    return lambda_stmt(
+        lambda: select(
+            Events.event_id.label("event_id"),
+            EventTypes.event_type.label("event_type"),
+            Events.event_data.label("event_data"),
+            ContextOrigins.time_fired_ts.label("time_fired_ts"),
+            ContextOrigins.context_id_bin.label("context_id_bin"),
+            func.coalesce(Events.context_user_id_bin, States.context_user_id_bin).label(
+                "context_user_id_bin"
+            ),
+            func.coalesce(
+                Events.context_parent_id_bin, States.context_parent_id_bin
+            ).label("context_parent_id_bin"),
+            EventData.shared_data.label("shared_data"),
+            *STATE_CONTEXT_ONLY_COLUMNS,
+            CONTEXT_ONLY,
+        )
+        .select_from(ContextOrigins)
+        .outerjoin(Events, ContextOrigins.event_id == Events.event_id)
+        .outerjoin(EventTypes, (Events.event_type_id == EventTypes.event_type_id))
+        .outerjoin(EventData, (Events.data_id == EventData.data_id))
+        .outerjoin(States, ContextOrigins.state_id == States.state_id)
+        .outerjoin(StatesMeta, (States.metadata_id == StatesMeta.metadata_id))
+        .where(ContextOrigins.context_id_bin.in_(context_id_bins))
+        # Skip the origins of rows that were purged since
+        .where(Events.event_id.is_not(None) | States.state_id.is_not(None))
+        .order_by(ContextOrigins.time_fired_ts)
+    )
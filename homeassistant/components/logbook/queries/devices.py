@@ -79,8 +79,19 @@ def devices_stmt(
     end_day: float,
     event_types: tuple[str, ...],
     json_quotable_device_ids: list[str],
+    context_union: bool = True,
 ) -> StatementLambdaElement:
-    """Generate a logbook query for multiple devices."""
+    """Generate a logbook query for multiple devices.
+
+    Without the context union the rows linked by context are not
+    selected and must be looked up from the context origins instead.
+    """
+    if not context_union:
+        return lambda_stmt(
+            lambda: select_events_without_states(start_day, end_day, event_types)
+            .where(apply_event_device_id_matchers(json_quotable_device_ids))
+            .order_by(Events.time_fired_ts)
+        )
     stmt = lambda_stmt(
         lambda: _apply_devices_context_union(
             select_events_without_states(start_day, end_day, event_types).where(
@@ -98,8 +98,22 @@ def entities_stmt(
     event_types: tuple[str, ...],
     states_metadata_ids: Collection[int],
     json_quoted_entity_ids: list[str],
+    context_union: bool = True,
 ) -> StatementLambdaElement:
-    """Generate a logbook query for multiple entities."""
+    """Generate a logbook query for multiple entities.
+
+    Without the context union the rows linked by context are not
+    selected and must be looked up from the context origins instead.
+    """
+    if not context_union:
+        return lambda_stmt(
+            lambda: select_events_without_states(start_day, end_day, event_types)
+            .where(apply_event_entity_id_matchers(json_quoted_entity_ids))
+            .union_all(
+                states_select_for_entity_ids(start_day, end_day, states_metadata_ids)
+            )
+            .order_by(Events.time_fired_ts)
+        )
     return lambda_stmt(
         lambda: _apply_entities_context_union(
             select_events_without_states(start_day, end_day, event_types).where(
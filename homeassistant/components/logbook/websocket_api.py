@@ -14,6 +14,11 @@ from homeassistant.components import websocket_api
 from homeassistant.components.recorder import get_instance
 from homeassistant.components.websocket_api import messages
 from homeassistant.components.websocket_api.connection import ActiveConnection
+from homeassistant.components.websocket_api.shared_stream import (
+    SharedStream,
+    SharedStreamSubscriber,
+    async_subscribe_shared_stream,
+)
 from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
 from homeassistant.helpers.entityfilter import EntityFilter
 from homeassistant.helpers.event import async_track_point_in_utc_time
@@ -43,10 +48,8 @@ _LOGGER = logging.getLogger(__name__)
 class LogbookLiveStream:
     """Track a logbook live stream."""
 
-    stream_queue: asyncio.Queue[Event]
-    subscriptions: list[CALLBACK_TYPE]
+    subscriber: SharedStreamSubscriber | None = None
     end_time_unsub: CALLBACK_TYPE | None = None
-    task: asyncio.Task | None = None
     wait_sync_task: asyncio.Task | None = None
 
 
@@ -84,6 +87,7 @@ async def _async_send_historical_events(
     event_processor: EventProcessor,
     partial: bool,
     force_send: bool = False,
+    chunk_size: int | None = None,
 ) -> dt | None:
     """Select historical data from the database and deliver it to the websocket.
 
@@ -93,9 +97,26 @@ async def _async_send_historical_events(
     they are not stuck at a loading screen and can start looking at
     the data right away.
 
+    If a chunk_size is given the events are delivered oldest first in
+    chunks of about chunk_size rows instead.
+
     This function returns the time of the most recent event we sent to the
     websocket.
     """
+    if chunk_size is not None:
+        return await _async_send_historical_events_in_chunks(
+            hass,
+            connection,
+            msg_id,
+            start_time,
+            end_time,
+            formatter,
+            event_processor,
+            partial,
+            force_send,
+            chunk_size,
+        )
+
     is_big_query = (
         not event_processor.entity_ids
         and not event_processor.device_ids
@@ -158,6 +179,56 @@ async def _async_send_historical_events(
     return recent_query_last_event_time or older_query_last_event_time
 
 
+async def _async_send_historical_events_in_chunks(
+    hass: HomeAssistant,
+    connection: ActiveConnection,
+    msg_id: int,
+    start_time: dt,
+    end_time: dt,
+    formatter: Callable[[int, Any], dict[str, Any]],
+    event_processor: EventProcessor,
+    partial: bool,
+    force_send: bool,
+    chunk_size: int,
+) -> dt | None:
+    """Deliver historical data to the websocket in bounded chunks.
+
+    Each chunk is selected after the time of the last row of the
+    previous chunk and is sent before the next one is selected, so
+    only one chunk is held in memory at a time.
+    """
+    instance = get_instance(hass)
+    start_ts = dt_util.utc_to_timestamp(start_time)
+    end_ts = dt_util.utc_to_timestamp(end_time)
+    last_event_time: dt | None = None
+    while True:
+        (
+            message,
+            chunk_last_event_time,
+            next_start_ts,
+        ) = await instance.async_add_executor_job(
+            _ws_stream_get_events_chunk,
+            msg_id,
+            start_ts,
+            end_ts,
+            formatter,
+            event_processor,
+            partial,
+            chunk_size,
+        )
+        is_last_chunk = next_start_ts is None
+        # The last message is sent even if it is empty unless
+        # it is partial so consumers of the api know their
+        # request was answered
+        if chunk_last_event_time or (is_last_chunk and not partial) or force_send:
+            connection.send_message(message)
+            force_send = False
+        last_event_time = chunk_last_event_time or last_event_time
+        if next_start_ts is None or msg_id not in connection.subscriptions:
+            return last_event_time
+        start_ts = next_start_ts
+
+
 async def _async_get_ws_stream_events(
     hass: HomeAssistant,
     msg_id: int,
@@ -213,10 +284,35 @@ def _ws_stream_get_events(
     return JSON_DUMP(formatter(msg_id, message)), last_time
 
 
-async def _async_events_consumer(
-    subscriptions_setup_complete_time: dt,
-    connection: ActiveConnection,
+def _ws_stream_get_events_chunk(
     msg_id: int,
+    start_ts: float,
+    end_ts: float,
+    formatter: Callable[[int, Any], dict[str, Any]],
+    event_processor: EventProcessor,
+    partial: bool,
+    chunk_size: int,
+) -> tuple[str, dt | None, float | None]:
+    """Fetch a chunk of events and convert them to json in the executor."""
+    events, next_start_ts = event_processor.get_events_chunk(
+        start_ts, end_ts, chunk_size
+    )
+    last_time = None
+    if events:
+        last_time = dt_util.utc_from_timestamp(events[-1]["when"])
+    message: dict[str, Any] = {
+        "events": events,
+        "start_time": start_ts,
+        "end_time": end_ts if next_start_ts is None else next_start_ts,
+    }
+    if partial or next_start_ts is not None:
+        # More historical data follows this chunk
+        message["partial"] = True
+    return JSON_DUMP(formatter(msg_id, message)), last_time, next_start_ts
+
+
+async def _async_events_consumer(
+    stream: SharedStream,
     stream_queue: asyncio.Queue[Event],
     event_processor: EventProcessor,
 ) -> None:
@@ -225,10 +321,6 @@ async def _async_events_consumer(
 
     while True:
         events: list[Event] = [await stream_queue.get()]
-        # If the event is older than the last db
-        # event we already sent it so we skip it.
-        if events[0].time_fired <= subscriptions_setup_complete_time:
-            continue
         # We sleep for the EVENT_COALESCE_TIME so
         # we can group events together to minimize
         # the number of websocket messages when the
@@ -237,17 +329,74 @@ async def _async_events_consumer(
         while not stream_queue.empty():
             events.append(stream_queue.get_nowait())
 
-        if logbook_events := event_processor.humanify(
-            async_event_to_row(e) for e in events
-        ):
-            connection.send_message(
-                JSON_DUMP(
-                    messages.event_message(
-                        msg_id,
-                        {"events": logbook_events},
-                    )
-                )
+        logbook_events = event_processor.humanify(async_event_to_row(e) for e in events)
+        stream.async_publish(
+            JSON_DUMP({"events": logbook_events}) if logbook_events else None
+        )
+
+
+@callback
+def _async_start_live_stream(
+    hass: HomeAssistant,
+    stream: SharedStream,
+    event_types: tuple[str, ...],
+    entity_ids: list[str] | None,
+    device_ids: list[str] | None,
+) -> CALLBACK_TYPE:
+    """Start the live stream shared by the identical subscriptions."""
+    subscriptions: list[CALLBACK_TYPE] = []
+    stream_queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_LOGBOOK_EVENTS)
+    event_processor = EventProcessor(
+        hass,
+        event_types,
+        entity_ids,
+        device_ids,
+        None,
+        timestamp=True,
+        include_entity_name=False,
+    )
+
+    @callback
+    def _queue_or_end(event: Event) -> None:
+        """Queue an event to be processed or end the stream."""
+        try:
+            stream_queue.put_nowait(event)
+        except asyncio.QueueFull:
+            _LOGGER.debug(
+                "Client exceeded max pending messages of %s",
+                MAX_PENDING_LOGBOOK_EVENTS,
             )
+            stream.async_end()
+            return
+        stream.async_event_queued(event.time_fired)
+
+    entities_filter: EntityFilter | None = None
+    if not event_processor.limited_select:
+        logbook_config: LogbookConfig = hass.data[DOMAIN]
+        entities_filter = logbook_config.entity_filter
+
+    async_subscribe_events(
+        hass,
+        subscriptions,
+        _queue_or_end,
+        event_types,
+        entities_filter,
+        entity_ids,
+        device_ids,
+    )
+    task = asyncio.create_task(
+        _async_events_consumer(stream, stream_queue, event_processor)
+    )
+
+    @callback
+    def _stop() -> None:
+        """Stop the live stream."""
+        for subscription in subscriptions:
+            subscription()
+        subscriptions.clear()
+        task.cancel()
+
+    return _stop
 
 
 @websocket_api.websocket_command(
@@ -257,6 +406,7 @@ async def _async_events_consumer(
         vol.Optional("end_time"): str,
         vol.Optional("entity_ids"): [str],
         vol.Optional("device_ids"): [str],
+        vol.Optional("chunk_size"): vol.All(int, vol.Range(min=1)),
     }
 )
 @websocket_api.async_response
@@ -288,6 +438,7 @@ async def ws_event_stream(
 
     device_ids = msg.get("device_ids")
     entity_ids = msg.get("entity_ids")
+    chunk_size: int | None = msg.get("chunk_size")
     if entity_ids:
         entity_ids = async_filter_entities(hass, entity_ids)
         if not entity_ids and not device_ids:
@@ -319,23 +470,17 @@ async def ws_event_stream(
             messages.event_message,
             event_processor,
             partial=False,
+            chunk_size=chunk_size,
         )
         return
 
-    subscriptions: list[CALLBACK_TYPE] = []
-    stream_queue: asyncio.Queue[Event] = asyncio.Queue(MAX_PENDING_LOGBOOK_EVENTS)
-    live_stream = LogbookLiveStream(
-        subscriptions=subscriptions, stream_queue=stream_queue
-    )
+    live_stream = LogbookLiveStream()
 
     @callback
     def _unsub(*time: Any) -> None:
         """Unsubscribe from all events."""
-        for subscription in subscriptions:
-            subscription()
-        subscriptions.clear()
-        if live_stream.task:
-            live_stream.task.cancel()
+        if live_stream.subscriber:
+            live_stream.subscriber.async_remove()
         if live_stream.wait_sync_task:
             live_stream.wait_sync_task.cancel()
         if live_stream.end_time_unsub:
@@ -347,33 +492,24 @@ async def ws_event_stream(
             hass, _unsub, end_time
         )
 
-    @callback
-    def _queue_or_cancel(event: Event) -> None:
-        """Queue an event to be processed or cancel."""
-        try:
-            stream_queue.put_nowait(event)
-        except asyncio.QueueFull:
-            _LOGGER.debug(
-                "Client exceeded max pending messages of %s",
-                MAX_PENDING_LOGBOOK_EVENTS,
-            )
-            _unsub()
-
-    entities_filter: EntityFilter | None = None
-    if not event_processor.limited_select:
-        logbook_config: LogbookConfig = hass.data[DOMAIN]
-        entities_filter = logbook_config.entity_filter
-
-    async_subscribe_events(
+    # Identical subscriptions share the live stream
+    live_stream.subscriber = subscriber = async_subscribe_shared_stream(
         hass,
-        subscriptions,
-        _queue_or_cancel,
-        event_types,
-        entities_filter,
-        entity_ids,
-        device_ids,
+        (
+            DOMAIN,
+            event_types,
+            tuple(sorted(set(entity_ids or ()))),
+            tuple(sorted(set(device_ids or ()))),
+        ),
+        lambda stream: _async_start_live_stream(
+            hass, stream, event_types, entity_ids, device_ids
+        ),
+        connection,
+        msg_id,
+        MAX_PENDING_LOGBOOK_EVENTS,
+        _unsub,
     )
-    subscriptions_setup_complete_time = dt_util.utcnow()
+    subscriptions_setup_complete_time = subscriber.subscribed_time
     connection.subscriptions[msg_id] = _unsub
     connection.send_result(msg_id)
     # Fetch everything from history
@@ -391,21 +527,14 @@ async def ws_event_stream(
         # we want to make sure the client is not still spinning
         # because it is waiting for the first message
         force_send=True,
+        chunk_size=chunk_size,
     )
 
     if msg_id not in connection.subscriptions:
         # Unsubscribe happened while sending historical events
         return
 
-    live_stream.task = asyncio.create_task(
-        _async_events_consumer(
-            subscriptions_setup_complete_time,
-            connection,
-            msg_id,
-            stream_queue,
-            event_processor,
-        )
-    )
+    subscriber.async_start()
 
     live_stream.wait_sync_task = asyncio.create_task(
         get_instance(hass).async_block_till_done()
@@ -429,6 +558,7 @@ async def ws_event_stream(
         messages.event_message,
         event_processor,
         partial=False,
+        chunk_size=chunk_size,
     )
 
 
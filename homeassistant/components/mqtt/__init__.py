@@ -59,6 +59,7 @@ from .const import (  # noqa: F401
     CONF_COMMAND_TOPIC,
     CONF_DISCOVERY_PREFIX,
     CONF_KEEPALIVE,
+    CONF_MAX_BATCH_LATENCY,
     CONF_QOS,
     CONF_STATE_TOPIC,
     CONF_TLS_INSECURE,
@@ -118,6 +119,7 @@ CONFIG_ENTRY_CONFIG_KEYS = [
     CONF_DISCOVERY,
     CONF_DISCOVERY_PREFIX,
     CONF_KEEPALIVE,
+    CONF_MAX_BATCH_LATENCY,
     CONF_PASSWORD,
     CONF_PORT,
     CONF_PROTOCOL,
@@ -42,6 +42,7 @@ from .mixins import (
     MQTT_ENTITY_COMMON_SCHEMA,
     MqttAvailability,
     MqttEntity,
+    async_batch_add_entities,
     async_setup_entry_helper,
     warn_for_legacy_schema,
 )
@@ -86,7 +87,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT binary sensor through YAML and through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, binary_sensor.DOMAIN, setup, DISCOVERY_SCHEMA)
 
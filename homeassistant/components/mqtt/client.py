@@ -2,13 +2,13 @@
 from __future__ import annotations
 
 import asyncio
-from collections.abc import Callable, Coroutine, Iterable
-from functools import lru_cache
+from collections.abc import Callable, Coroutine, Iterable, Iterator
 import inspect
-from itertools import chain, groupby
+from itertools import groupby
 import logging
 from operator import attrgetter
 import ssl
+import threading
 import time
 from typing import TYPE_CHECKING, Any
 import uuid
@@ -16,6 +16,7 @@ import uuid
 import async_timeout
 import attr
 import certifi
+from lru import LRU  # pylint: disable=no-name-in-module
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -51,6 +52,7 @@ from .const import (
     CONF_CLIENT_CERT,
     CONF_CLIENT_KEY,
     CONF_KEEPALIVE,
+    CONF_MAX_BATCH_LATENCY,
     CONF_TLS_INSECURE,
     CONF_TRANSPORT,
     CONF_WILL_MESSAGE,
@@ -87,6 +89,7 @@ DISCOVERY_COOLDOWN = 2
 INITIAL_SUBSCRIBE_COOLDOWN = 1.0
 SUBSCRIBE_COOLDOWN = 0.1
 TIMEOUT_ACK = 10
+MATCH_CACHE_SIZE = 8192
 
 SubscribePayloadType = str | bytes  # Only bytes if encoding is None
 
@@ -226,7 +229,6 @@ class Subscription:
     """Class to hold data about an active subscription."""
 
     topic: str = attr.ib()
-    matcher: Any = attr.ib()
     job: HassJob[[ReceiveMessage], Coroutine[Any, Any, None] | None] = attr.ib()
     qos: int = attr.ib(default=0)
     encoding: str | None = attr.ib(default="utf-8")
@@ -293,6 +295,122 @@ class MqttClientSetup:
         return self._client
 
 
+class _TopicNode:
+    """A level of the topic filters in a subscription trie."""
+
+    __slots__ = ("children", "subscriptions")
+
+    def __init__(self) -> None:
+        """Initialize the node."""
+        self.children: dict[str, _TopicNode] = {}
+        self.subscriptions: list[Subscription] = []
+
+
+class SubscriptionTrie:
+    """Match topics against the topic filters of subscriptions.
+
+    The topic filters are stored level by level in a trie so matching
+    a topic takes time proportional to its number of levels instead of
+    the number of subscriptions. The matches of recently received
+    topics are kept in an LRU.
+    """
+
+    def __init__(self, cache_size: int = MATCH_CACHE_SIZE) -> None:
+        """Initialize the subscription trie."""
+        self._root = _TopicNode()
+        self._cache: LRU = LRU(cache_size)
+
+    def __iter__(self) -> Iterator[Subscription]:
+        """Iterate over the subscriptions."""
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            yield from node.subscriptions
+            nodes.extend(node.children.values())
+
+    def _invalidate(self, topic: str) -> None:
+        """Invalidate the cached matches of topics matching a topic filter."""
+        if _is_simple_match(topic):
+            self._cache.pop(topic, None)
+        else:
+            self._cache.clear()
+
+    def add(self, subscription: Subscription) -> None:
+        """Add a subscription."""
+        node = self._root
+        for level in subscription.topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                child = node.children[level] = _TopicNode()
+            node = child
+        node.subscriptions.append(subscription)
+        self._invalidate(subscription.topic)
+
+    def remove(self, subscription: Subscription) -> None:
+        """Remove a subscription.
+
+        Raises ValueError if the subscription was not added.
+        """
+        node = self._root
+        path: list[tuple[_TopicNode, str]] = []
+        for level in subscription.topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                raise ValueError(f"{subscription} was not added")
+            path.append((node, level))
+            node = child
+        node.subscriptions.remove(subscription)
+        # Prune the levels no other topic filter uses
+        for parent, level in reversed(path):
+            if node.subscriptions or node.children:
+                break
+            del parent.children[level]
+            node = parent
+        self._invalidate(subscription.topic)
+
+    def has_topic(self, topic: str) -> bool:
+        """Return if a subscription has the topic filter."""
+        node = self._root
+        for level in topic.split("/"):
+            if (child := node.children.get(level)) is None:
+                return False
+            node = child
+        return bool(node.subscriptions)
+
+    def match(self, topic: str) -> list[Subscription]:
+        """Return the subscriptions matching a topic."""
+        if (subscriptions := self._cache.get(topic)) is None:
+            subscriptions = self._cache[topic] = self._match(topic)
+        return subscriptions  # type: ignore[no-any-return]
+
+    def _match(self, topic: str) -> list[Subscription]:
+        """Return the subscriptions matching a topic without the cache."""
+        subscriptions: list[Subscription] = []
+        # Wildcards in the first level do not match topics starting
+        # with $ [MQTT-4.7.2-1]
+        wildcards = not topic.startswith("$")
+        nodes = [self._root]
+        for level in topic.split("/"):
+            next_nodes: list[_TopicNode] = []
+            for node in nodes:
+                children = node.children
+                if (child := children.get(level)) is not None:
+                    next_nodes.append(child)
+                if wildcards:
+                    if (child := children.get("+")) is not None:
+                        next_nodes.append(child)
+                    if (child := children.get("#")) is not None:
+                        subscriptions.extend(child.subscriptions)
+            if not next_nodes:
+                return subscriptions
+            nodes = next_nodes
+            wildcards = True
+        for node in nodes:
+            subscriptions.extend(node.subscriptions)
+            # A multi-level wildcard also matches the parent level
+            if (child := node.children.get("#")) is not None:
+                subscriptions.extend(child.subscriptions)
+        return subscriptions
+
+
 def _is_simple_match(topic: str) -> bool:
     """Return if a topic is a simple match."""
     return not ("+" in topic or "#" in topic)
@@ -388,8 +506,10 @@ class MQTT:
         self.config_entry = config_entry
         self.conf = conf
 
-        self._simple_subscriptions: dict[str, list[Subscription]] = {}
-        self._wildcard_subscriptions: list[Subscription] = []
+        self._subscriptions = SubscriptionTrie()
+        self._received_lock = threading.Lock()
+        self._received_messages: list[mqtt.MQTTMessage] = []
+        self._received_timer: asyncio.TimerHandle | None = None
         self.connected = False
         self._ha_started = asyncio.Event()
         self._cleanup_on_unload: list[Callable[[], None]] = []
@@ -432,10 +552,7 @@ class MQTT:
     @property
     def subscriptions(self) -> list[Subscription]:
         """Return the tracked subscriptions."""
-        return [
-            *chain.from_iterable(self._simple_subscriptions.values()),
-            *self._wildcard_subscriptions,
-        ]
+        return list(self._subscriptions)
 
     def cleanup(self) -> None:
         """Clean up listeners."""
@@ -470,9 +587,7 @@ class MQTT:
 
     def _is_active_subscription(self, topic: str) -> bool:
         """Check if a topic has an active subscription."""
-        return topic in self._simple_subscriptions or any(
-            other.topic == topic for other in self._wildcard_subscriptions
-        )
+        return self._subscriptions.has_topic(topic)
 
     async def async_publish(
         self, topic: str, payload: PublishPayloadType, qos: int, retain: bool
@@ -541,6 +656,11 @@ class MQTT:
         async with self._paho_lock:
             await self.hass.async_add_executor_job(stop)
 
+        # handle the messages received before the loop was stopped
+        if self._received_timer is not None:
+            self._received_timer.cancel()
+        self._async_handle_received_messages()
+
     @callback
     def async_restore_tracked_subscriptions(
         self, subscriptions: list[Subscription]
@@ -548,41 +668,24 @@ class MQTT:
         """Restore tracked subscriptions after reload."""
         for subscription in subscriptions:
             self._async_track_subscription(subscription)
-        self._matching_subscriptions.cache_clear()
 
     @callback
     def _async_track_subscription(self, subscription: Subscription) -> None:
         """Track a subscription.
 
         This method does not send a SUBSCRIBE message to the broker.
-
-        The caller is responsible clearing the cache of _matching_subscriptions.
         """
-        if _is_simple_match(subscription.topic):
-            self._simple_subscriptions.setdefault(subscription.topic, []).append(
-                subscription
-            )
-        else:
-            self._wildcard_subscriptions.append(subscription)
+        self._subscriptions.add(subscription)
 
     @callback
     def _async_untrack_subscription(self, subscription: Subscription) -> None:
         """Untrack a subscription.
 
         This method does not send an UNSUBSCRIBE message to the broker.
-
-        The caller is responsible clearing the cache of _matching_subscriptions.
         """
-        topic = subscription.topic
         try:
-            if _is_simple_match(topic):
-                simple_subscriptions = self._simple_subscriptions
-                simple_subscriptions[topic].remove(subscription)
-                if not simple_subscriptions[topic]:
-                    del simple_subscriptions[topic]
-            else:
-                self._wildcard_subscriptions.remove(subscription)
-        except (KeyError, ValueError) as ex:
+            self._subscriptions.remove(subscription)
+        except ValueError as ex:
             raise HomeAssistantError("Can't remove subscription twice") from ex
 
     @callback
@@ -613,11 +716,8 @@ class MQTT:
         if not isinstance(topic, str):
             raise HomeAssistantError("Topic needs to be a string!")
 
-        subscription = Subscription(
-            topic, _matcher_for_topic(topic), HassJob(msg_callback), qos, encoding
-        )
+        subscription = Subscription(topic, HassJob(msg_callback), qos, encoding)
         self._async_track_subscription(subscription)
-        self._matching_subscriptions.cache_clear()
 
         # Only subscribe if currently connected.
         if self.connected:
@@ -627,7 +727,6 @@ class MQTT:
         def async_remove() -> None:
             """Remove subscription."""
             self._async_untrack_subscription(subscription)
-            self._matching_subscriptions.cache_clear()
             # Only unsubscribe if currently connected
             if self.connected:
                 self.hass.async_create_task(self._async_unsubscribe(topic))
@@ -649,7 +748,7 @@ class MQTT:
         if self._is_active_subscription(topic):
             if self._max_qos[topic] == 0:
                 return
-            subs = self._matching_subscriptions(topic)
+            subs = self._subscriptions.match(topic)
             self._max_qos[topic] = max(sub.qos for sub in subs)
             # Other subscriptions on topic remaining - don't unsubscribe.
             return
@@ -786,18 +885,41 @@ class MQTT:
     def _mqtt_on_message(
         self, _mqttc: mqtt.Client, _userdata: None, msg: mqtt.MQTTMessage
     ) -> None:
-        """Message received callback."""
-        self.hass.add_job(self._mqtt_handle_message, msg)
+        """Message received callback.
 
-    @lru_cache(None)  # pylint: disable=method-cache-max-size-none
-    def _matching_subscriptions(self, topic: str) -> list[Subscription]:
-        subscriptions: list[Subscription] = []
-        if topic in self._simple_subscriptions:
-            subscriptions.extend(self._simple_subscriptions[topic])
-        for subscription in self._wildcard_subscriptions:
-            if subscription.matcher(topic):
-                subscriptions.append(subscription)
-        return subscriptions
+        The messages are buffered and the event loop is only woken up
+        for the first message of a batch. The messages received until
+        the loop handles the batch are handled together.
+        """
+        with self._received_lock:
+            self._received_messages.append(msg)
+            if len(self._received_messages) > 1:
+                return
+        self.hass.loop.call_soon_threadsafe(self._async_schedule_received_messages)
+
+    @callback
+    def _async_schedule_received_messages(self) -> None:
+        """Schedule handling the received messages after the batch latency."""
+        if not (latency := self.conf.get(CONF_MAX_BATCH_LATENCY)):
+            self._async_handle_received_messages()
+            return
+        self._received_timer = self.hass.loop.call_later(
+            latency, self._async_handle_received_messages
+        )
+
+    @callback
+    def _async_handle_received_messages(self) -> None:
+        """Handle the received messages in order."""
+        self._received_timer = None
+        with self._received_lock:
+            messages = self._received_messages
+            self._received_messages = []
+        for msg in messages:
+            try:
+                self._mqtt_handle_message(msg)
+            except Exception:  # pylint: disable=broad-except
+                # Keep handling the rest of the batch
+                _LOGGER.exception("Error handling message on %s", msg.topic)
 
     @callback
     def _mqtt_handle_message(self, msg: mqtt.MQTTMessage) -> None:
@@ -810,7 +932,7 @@ class MQTT:
         )
         timestamp = dt_util.utcnow()
 
-        subscriptions = self._matching_subscriptions(msg.topic)
+        subscriptions = self._subscriptions.match(msg.topic)
 
         for subscription in subscriptions:
             payload: SubscribePayloadType = msg.payload
@@ -942,13 +1064,3 @@ def _raise_on_errors(result_codes: Iterable[int]) -> None:
 def _raise_on_error(result_code: int) -> None:
     """Raise error if error result."""
     _raise_on_errors((result_code,))
-
-
-def _matcher_for_topic(subscription: str) -> Any:
-    # pylint: disable-next=import-outside-toplevel
-    from paho.mqtt.matcher import MQTTMatcher
-
-    matcher = MQTTMatcher()
-    matcher[subscription] = True
-
-    return lambda topic: next(matcher.iter_match(topic), False)
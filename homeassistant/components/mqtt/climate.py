@@ -61,6 +61,7 @@ from .debug_info import log_messages
 from .mixins import (
     MQTT_ENTITY_COMMON_SCHEMA,
     MqttEntity,
+    async_batch_add_entities,
     async_setup_entry_helper,
     warn_for_legacy_schema,
 )
@@ -431,7 +432,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT climate device through YAML and through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, climate.DOMAIN, setup, DISCOVERY_SCHEMA)
 
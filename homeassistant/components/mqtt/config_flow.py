@@ -60,6 +60,7 @@ from .const import (
     CONF_CLIENT_KEY,
     CONF_DISCOVERY_PREFIX,
     CONF_KEEPALIVE,
+    CONF_MAX_BATCH_LATENCY,
     CONF_TLS_INSECURE,
     CONF_TRANSPORT,
     CONF_WILL_MESSAGE,
@@ -69,6 +70,7 @@ from .const import (
     DEFAULT_DISCOVERY,
     DEFAULT_ENCODING,
     DEFAULT_KEEPALIVE,
+    DEFAULT_MAX_BATCH_LATENCY,
     DEFAULT_PORT,
     DEFAULT_PREFIX,
     DEFAULT_PROTOCOL,
@@ -113,6 +115,18 @@ KEEPALIVE_SELECTOR = vol.All(
     ),
     vol.Coerce(int),
 )
+MAX_BATCH_LATENCY_SELECTOR = vol.All(
+    NumberSelector(
+        NumberSelectorConfig(
+            mode=NumberSelectorMode.BOX,
+            min=0,
+            max=10,
+            step="any",
+            unit_of_measurement="sec",
+        )
+    ),
+    vol.Coerce(float),
+)
 PROTOCOL_SELECTOR = SelectSelector(
     SelectSelectorConfig(
         options=SUPPORTED_PROTOCOLS,
@@ -608,6 +622,9 @@ async def async_get_broker_settings(
     current_protocol = current_config.get(CONF_PROTOCOL, DEFAULT_PROTOCOL)
     current_transport = current_config.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
     current_ws_path = current_config.get(CONF_WS_PATH, DEFAULT_WS_PATH)
+    current_max_batch_latency = current_config.get(
+        CONF_MAX_BATCH_LATENCY, DEFAULT_MAX_BATCH_LATENCY
+    )
     current_ws_headers = (
         json_dumps(current_config.get(CONF_WS_HEADERS))
         if CONF_WS_HEADERS in current_config
@@ -624,6 +641,7 @@ async def async_get_broker_settings(
         or current_config.get(SET_CA_CERT, "off") != "off"
         or current_config.get(SET_CLIENT_CERT)
         or current_transport == TRANSPORT_WEBSOCKETS
+        or current_max_batch_latency != DEFAULT_MAX_BATCH_LATENCY
     )
 
     # Build form
@@ -662,6 +680,12 @@ async def async_get_broker_settings(
             description={"suggested_value": current_keepalive},
         )
     ] = KEEPALIVE_SELECTOR
+    fields[
+        vol.Optional(
+            CONF_MAX_BATCH_LATENCY,
+            description={"suggested_value": current_max_batch_latency},
+        )
+    ] = MAX_BATCH_LATENCY_SELECTOR
     fields[
         vol.Optional(
             SET_CLIENT_CERT,
@@ -44,6 +44,7 @@ from .const import (
     CONF_CLIENT_KEY,
     CONF_DISCOVERY_PREFIX,
     CONF_KEEPALIVE,
+    CONF_MAX_BATCH_LATENCY,
     CONF_TLS_INSECURE,
     CONF_TRANSPORT,
     CONF_WILL_MESSAGE,
@@ -52,6 +53,7 @@ from .const import (
     DEFAULT_BIRTH,
     DEFAULT_DISCOVERY,
     DEFAULT_KEEPALIVE,
+    DEFAULT_MAX_BATCH_LATENCY,
     DEFAULT_PORT,
     DEFAULT_PREFIX,
     DEFAULT_PROTOCOL,
@@ -187,6 +189,9 @@ CONFIG_SCHEMA_ENTRY = vol.Schema(
         ),
         vol.Optional(CONF_WS_PATH, default="/"): cv.string,
         vol.Optional(CONF_WS_HEADERS, default={}): {cv.string: cv.string},
+        vol.Optional(
+            CONF_MAX_BATCH_LATENCY, default=DEFAULT_MAX_BATCH_LATENCY
+        ): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
     }
 )
 
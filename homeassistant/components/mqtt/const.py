@@ -17,6 +17,7 @@ CONF_COMMAND_TOPIC = "command_topic"
 CONF_DISCOVERY_PREFIX = "discovery_prefix"
 CONF_ENCODING = "encoding"
 CONF_KEEPALIVE = "keepalive"
+CONF_MAX_BATCH_LATENCY = "max_batch_latency"
 CONF_QOS = ATTR_QOS
 CONF_RETAIN = ATTR_RETAIN
 CONF_SCHEMA = "schema"
@@ -58,6 +59,7 @@ TRANSPORT_WEBSOCKETS = "websockets"
 
 DEFAULT_PORT = 1883
 DEFAULT_KEEPALIVE = 60
+DEFAULT_MAX_BATCH_LATENCY = 0.0
 DEFAULT_PROTOCOL = PROTOCOL_311
 DEFAULT_TRANSPORT = TRANSPORT_TCP
 
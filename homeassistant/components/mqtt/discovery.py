@@ -195,6 +195,9 @@ async def async_start(  # noqa: C901
             setattr(discovery_payload, "discovery_data", discovery_data)
 
             discovery_payload[CONF_PLATFORM] = "mqtt"
+        else:
+            # The item is removed, forget its validated config
+            mqtt_data.discovery_config_cache.pop(discovery_hash, None)
 
         if discovery_hash in mqtt_data.discovery_pending_discovered:
             pending = mqtt_data.discovery_pending_discovered[discovery_hash]["pending"]
@@ -3,7 +3,7 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 import asyncio
-from collections.abc import Callable, Coroutine
+from collections.abc import Callable, Coroutine, Iterable
 from functools import partial
 import logging
 from typing import Any, Protocol, cast, final
@@ -51,6 +51,7 @@ from homeassistant.helpers.entity import (
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.event import async_track_entity_registry_updated_event
 from homeassistant.helpers.issue_registry import IssueSeverity, async_create_issue
+from homeassistant.helpers.json import json_dumps_sorted
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from homeassistant.util.json import json_loads
 
@@ -312,11 +313,23 @@ async def async_setup_entry_helper(
             )
             return
         discovery_data = discovery_payload.discovery_data
+        discovery_hash: tuple[str, str] = discovery_data[ATTR_DISCOVERY_HASH]
         try:
-            config: DiscoveryInfoType = discovery_schema(discovery_payload)
+            # Rediscovered items with an unchanged payload, e.g. after the
+            # entry was reloaded, reuse the config validated before
+            payload_json = json_dumps_sorted(discovery_payload)
+            cached = mqtt_data.discovery_config_cache.get(discovery_hash)
+            if cached is not None and cached[0] == payload_json:
+                config: DiscoveryInfoType = cached[1]
+            else:
+                config = discovery_schema(discovery_payload)
+                mqtt_data.discovery_config_cache[discovery_hash] = (
+                    payload_json,
+                    config,
+                )
             await async_setup(config, discovery_data=discovery_data)
         except Exception:
-            discovery_hash: tuple[str, str] = discovery_data[ATTR_DISCOVERY_HASH]
+            mqtt_data.discovery_config_cache.pop(discovery_hash, None)
             clear_discovery_hash(hass, discovery_hash)
             async_dispatcher_send(
                 hass, MQTT_DISCOVERY_DONE.format(discovery_hash), None
@@ -348,6 +361,40 @@ async def async_setup_entry_helper(
     await _async_setup_entities()
 
 
+@callback
+def async_batch_add_entities(
+    hass: HomeAssistant, async_add_entities: AddEntitiesCallback
+) -> AddEntitiesCallback:
+    """Return a callback adding the entities of one loop iteration together.
+
+    Discovered entities are created one discovery message at a time,
+    adding them together avoids the overhead per call of adding
+    entities to the platform.
+    """
+    pending: list[Entity] = []
+
+    @callback
+    def _async_add_pending() -> None:
+        """Add the pending entities."""
+        entities = pending.copy()
+        pending.clear()
+        async_add_entities(entities)
+
+    @callback
+    def _async_add_entities(
+        new_entities: Iterable[Entity], update_before_add: bool = False
+    ) -> None:
+        """Add the entities with the entities of this loop iteration."""
+        if update_before_add:
+            async_add_entities(new_entities, update_before_add)
+            return
+        if not pending:
+            hass.loop.call_soon(_async_add_pending)
+        pending.extend(new_entities)
+
+    return _async_add_entities
+
+
 def init_entity_id_from_config(
     hass: HomeAssistant, entity: Entity, config: ConfigType, entity_id_format: str
 ) -> None:
@@ -35,7 +35,12 @@ from .const import (
     CONF_STATE_TOPIC,
 )
 from .debug_info import log_messages
-from .mixins import MQTT_ENTITY_COMMON_SCHEMA, MqttEntity, async_setup_entry_helper
+from .mixins import (
+    MQTT_ENTITY_COMMON_SCHEMA,
+    MqttEntity,
+    async_batch_add_entities,
+    async_setup_entry_helper,
+)
 from .models import (
     MessageCallbackType,
     MqttCommandTemplate,
@@ -105,7 +110,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT text through YAML and through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, text.DOMAIN, setup, DISCOVERY_SCHEMA)
 
@@ -33,7 +33,12 @@ from .const import (
     PAYLOAD_EMPTY_JSON,
 )
 from .debug_info import log_messages
-from .mixins import MQTT_ENTITY_COMMON_SCHEMA, MqttEntity, async_setup_entry_helper
+from .mixins import (
+    MQTT_ENTITY_COMMON_SCHEMA,
+    MqttEntity,
+    async_batch_add_entities,
+    async_setup_entry_helper,
+)
 from .models import MessageCallbackType, MqttValueTemplate, ReceiveMessage
 from .util import get_mqtt_data, valid_publish_topic, valid_subscribe_topic
 
@@ -88,7 +93,10 @@ async def async_setup_entry(
 ) -> None:
     """Set up MQTT update through YAML and through MQTT discovery."""
     setup = functools.partial(
-        _async_setup_entity, hass, async_add_entities, config_entry=config_entry
+        _async_setup_entity,
+        hass,
+        async_batch_add_entities(hass, async_add_entities),
+        config_entry=config_entry,
     )
     await async_setup_entry_helper(hass, update.DOMAIN, setup, DISCOVERY_SCHEMA)
 
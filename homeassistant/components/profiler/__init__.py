@@ -14,16 +14,17 @@ from typing import Any, cast
 from lru import LRU  # pylint: disable=no-name-in-module
 import voluptuous as vol
 
-from homeassistant.components import persistent_notification
+from homeassistant.components import persistent_notification, websocket_api
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant, ServiceCall, callback
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE, EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, ServiceCall, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.service import async_register_admin_service
 
 from .const import DOMAIN
+from .stall_detector import StallDetector
 
 SERVICE_START = "start"
 SERVICE_MEMORY = "memory"
@@ -35,6 +36,9 @@ SERVICE_DUMP_LOG_OBJECTS = "dump_log_objects"
 SERVICE_LRU_STATS = "lru_stats"
 SERVICE_LOG_THREAD_FRAMES = "log_thread_frames"
 SERVICE_LOG_EVENT_LOOP_SCHEDULED = "log_event_loop_scheduled"
+SERVICE_START_STALL_DETECTOR = "start_stall_detector"
+SERVICE_STOP_STALL_DETECTOR = "stop_stall_detector"
+SERVICE_LOG_STALLS = "log_stalls"
 
 _LRU_CACHE_WRAPPER_OBJECT = _lru_cache_wrapper.__name__
 _SQLALCHEMY_LRU_OBJECT = "LRUCache"
@@ -58,16 +62,25 @@ SERVICES = (
     SERVICE_LRU_STATS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_START_STALL_DETECTOR,
+    SERVICE_STOP_STALL_DETECTOR,
+    SERVICE_LOG_STALLS,
 )
 
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
 
 DEFAULT_MAX_OBJECTS = 5
 
+DEFAULT_STALL_THRESHOLD = 0.1
+DEFAULT_MAX_STALLS = 50
+
 CONF_SECONDS = "seconds"
 CONF_MAX_OBJECTS = "max_objects"
+CONF_THRESHOLD = "threshold"
+CONF_MAX_STALLS = "max_stalls"
 
 LOG_INTERVAL_SUB = "log_interval_subscription"
+STALL_DETECTOR = "stall_detector"
 
 
 _LOGGER = logging.getLogger(__name__)
@@ -255,6 +268,40 @@ async def async_setup_entry(  # noqa: C901
             arepr.maxstring = original_maxstring
             arepr.maxother = original_maxother
 
+    @callback
+    def _async_start_stall_detector(call: ServiceCall) -> None:
+        if STALL_DETECTOR in domain_data:
+            raise HomeAssistantError("Stall detector already started")
+
+        stall_detector = StallDetector(
+            hass, call.data[CONF_THRESHOLD], call.data[CONF_MAX_STALLS]
+        )
+        stall_detector.async_start()
+        domain_data[STALL_DETECTOR] = stall_detector
+
+    @callback
+    def _async_stop_stall_detector(call: ServiceCall) -> None:
+        if STALL_DETECTOR not in domain_data:
+            raise HomeAssistantError("Stall detector not running")
+
+        domain_data.pop(STALL_DETECTOR).async_stop()
+
+    @callback
+    def _async_log_stalls(call: ServiceCall) -> None:
+        """Log the slowest callbacks seen by the stall detector."""
+        if STALL_DETECTOR not in domain_data:
+            raise HomeAssistantError("Stall detector not running")
+
+        for stall in domain_data[STALL_DETECTOR].async_stalls():
+            _LOGGER.critical(
+                "Event loop stalled for %.3fs at %s by %s (%s) in %s",
+                stall["duration"],
+                stall["time"],
+                stall["callback"],
+                stall["domain"] or "unknown integration",
+                stall["file"] or "unknown file",
+            )
+
     async_register_admin_service(
         hass,
         DOMAIN,
@@ -349,15 +396,87 @@ async def async_setup_entry(  # noqa: C901
         _async_dump_scheduled,
     )
 
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_START_STALL_DETECTOR,
+        _async_start_stall_detector,
+        schema=vol.Schema(
+            {
+                vol.Optional(CONF_THRESHOLD, default=DEFAULT_STALL_THRESHOLD): vol.All(
+                    vol.Coerce(float), vol.Range(min=0.001)
+                ),
+                vol.Optional(CONF_MAX_STALLS, default=DEFAULT_MAX_STALLS): vol.All(
+                    vol.Coerce(int), vol.Range(min=1, max=1000)
+                ),
+            }
+        ),
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_STOP_STALL_DETECTOR,
+        _async_stop_stall_detector,
+    )
+
+    async_register_admin_service(
+        hass,
+        DOMAIN,
+        SERVICE_LOG_STALLS,
+        _async_log_stalls,
+    )
+
+    websocket_api.async_register_command(hass, websocket_stalls)
+
+    @callback
+    def _async_stop_stall_detector_on_close(event: Event) -> None:
+        if STALL_DETECTOR in domain_data:
+            domain_data.pop(STALL_DETECTOR).async_stop()
+
+    entry.async_on_unload(
+        hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, _async_stop_stall_detector_on_close
+        )
+    )
+
     return True
 
 
+@websocket_api.require_admin
+@websocket_api.websocket_command({vol.Required("type"): "profiler/stalls"})
+@callback
+def websocket_stalls(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the slowest callbacks seen by the stall detector."""
+    if (
+        DOMAIN not in hass.data
+        or (stall_detector := hass.data[DOMAIN].get(STALL_DETECTOR)) is None
+    ):
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, "Stall detector not running"
+        )
+        return
+
+    connection.send_result(
+        msg["id"],
+        {
+            "threshold": stall_detector.threshold,
+            "total_stalls": stall_detector.total_stalls,
+            "stalls": stall_detector.async_stalls(),
+        },
+    )
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     for service in SERVICES:
         hass.services.async_remove(domain=DOMAIN, service=service)
     if LOG_INTERVAL_SUB in hass.data[DOMAIN]:
         hass.data[DOMAIN][LOG_INTERVAL_SUB]()
+    if STALL_DETECTOR in hass.data[DOMAIN]:
+        hass.data[DOMAIN].pop(STALL_DETECTOR).async_stop()
     hass.data.pop(DOMAIN)
     return True
 
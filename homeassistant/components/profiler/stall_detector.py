@@ -0,0 +1,136 @@
+"""Detect callbacks that stall the event loop."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from functools import partial
+import heapq
+from itertools import count
+import re
+import time
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util import dt as dt_util
+
+_INTEGRATION_PATH = re.compile(r"(?:homeassistant/components|custom_components)/(\w+)/")
+
+
+class StallDetector:
+    """Time every callback run by the event loop and keep the slowest ones.
+
+    The detector wraps asyncio.Handle._run which runs every callback
+    scheduled on the loop, including task steps, HassJobs and event bus
+    listeners. Callbacks of event loops in other threads are run as is, so
+    the stalls are only recorded from the event loop. Only two perf_counter
+    calls are made per callback; the callback is only described when it ran
+    longer than the threshold.
+    """
+
+    def __init__(self, hass: HomeAssistant, threshold: float, max_stalls: int) -> None:
+        """Initialize the stall detector."""
+        self.hass = hass
+        self.threshold = threshold
+        self.max_stalls = max_stalls
+        # Min-heap of (duration, sequence, stall) holding the slowest stalls
+        self.stalls: list[tuple[float, int, dict[str, Any]]] = []
+        self.total_stalls = 0
+        self._sequence = count()
+        self._original_run: Callable[[asyncio.Handle], None] | None = None
+        self._timed_run: Callable[[asyncio.Handle], None] | None = None
+
+    @property
+    def running(self) -> bool:
+        """Return if the detector is running."""
+        return self._timed_run is not None
+
+    @callback
+    def async_start(self) -> None:
+        """Start timing callbacks."""
+        assert self._timed_run is None
+        # pylint: disable-next=protected-access
+        original_run = self._original_run = asyncio.Handle._run
+        perf_counter = time.perf_counter
+        threshold = self.threshold
+        loop = self.hass.loop
+        record = self._record
+
+        def _timed_run(handle: asyncio.Handle) -> None:
+            if (
+                # pylint: disable-next=protected-access
+                handle._loop is not loop  # type: ignore[attr-defined]
+                or self._timed_run is not _timed_run
+            ):
+                original_run(handle)
+                return
+            start = perf_counter()
+            original_run(handle)
+            if (duration := perf_counter() - start) >= threshold:
+                record(handle, duration)
+
+        self._timed_run = _timed_run
+        # pylint: disable-next=protected-access
+        asyncio.Handle._run = _timed_run  # type: ignore[assignment]
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop timing callbacks.
+
+        If asyncio.Handle._run was wrapped again after the detector started,
+        that wrapper is kept and the detector only stops timing.
+        """
+        assert self._timed_run is not None
+        # pylint: disable-next=protected-access
+        if asyncio.Handle._run is self._timed_run:
+            # pylint: disable-next=protected-access
+            asyncio.Handle._run = self._original_run  # type: ignore[assignment]
+        self._original_run = None
+        self._timed_run = None
+
+    @callback
+    def async_stalls(self) -> list[dict[str, Any]]:
+        """Return the recorded stalls, slowest first."""
+        return [stall for _, _, stall in sorted(self.stalls, reverse=True)]
+
+    def _record(self, handle: asyncio.Handle, duration: float) -> None:
+        """Record a callback that ran longer than the threshold."""
+        self.total_stalls += 1
+        if len(self.stalls) >= self.max_stalls and (
+            not self.stalls or duration <= self.stalls[0][0]
+        ):
+            return
+        try:
+            name, filename = _describe_callback(handle)
+        except Exception:  # pylint: disable=broad-except
+            name, filename = repr(handle), None
+        domain: str | None = None
+        if filename and (match := _INTEGRATION_PATH.search(filename)):
+            domain = match.group(1)
+        stall = {
+            "time": dt_util.utcnow().isoformat(),
+            "duration": round(duration, 6),
+            "callback": name,
+            "file": filename,
+            "domain": domain,
+        }
+        entry = (duration, next(self._sequence), stall)
+        if len(self.stalls) < self.max_stalls:
+            heapq.heappush(self.stalls, entry)
+        else:
+            heapq.heapreplace(self.stalls, entry)
+
+
+def _describe_callback(handle: asyncio.Handle) -> tuple[str, str | None]:
+    """Return a name and the source file of the callback of a handle."""
+    target: Any = getattr(handle, "_callback", None)
+    if isinstance(task := getattr(target, "__self__", None), asyncio.Task):
+        coro: Any = task.get_coro()
+        if (code := getattr(coro, "cr_code", None)) is not None:
+            return f"{task.get_name()} {coro.__qualname__}", code.co_filename
+        return task.get_name(), None
+    while isinstance(target, partial):
+        target = target.func
+    target = getattr(target, "__func__", target)
+    if (code := getattr(target, "__code__", None)) is not None:
+        return target.__qualname__, code.co_filename
+    return repr(target), None
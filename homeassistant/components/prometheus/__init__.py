@@ -114,7 +114,12 @@ def setup(hass: HomeAssistant, config: ConfigType) -> bool:
         default_metric,
     )
 
-    hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_state_changed)
+    if (entity_keys := entity_filter.included_keys) is not None:
+        hass.bus.listen_keyed(
+            EVENT_STATE_CHANGED, entity_keys, metrics.handle_state_changed
+        )
+    else:
+        hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_state_changed)
     hass.bus.listen(
         EVENT_ENTITY_REGISTRY_UPDATED, metrics.handle_entity_registry_updated
     )
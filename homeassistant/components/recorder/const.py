@@ -21,6 +21,24 @@ CONF_DB_INTEGRITY_CHECK = "db_integrity_check"
 
 MAX_QUEUE_BACKLOG = 65000
 
+# Events are spilled to disk once this many tasks are queued in memory
+MAX_QUEUE_IN_MEMORY = 20000
+SPILL_DIR = "recorder_spill"
+# The recorder stops recording once the spilled events take this many bytes
+MAX_SPILL_SIZE = 512 * 1024 * 1024
+# Commit after this many spilled events have been replayed
+SPILL_REPLAY_COMMIT_EVENTS = 1000
+
+# The progress of a purge is persisted so it resumes after a restart
+PURGE_PROGRESS_STORAGE_KEY = f"{DOMAIN}.purge_progress"
+PURGE_PROGRESS_STORAGE_VERSION = 1
+PURGE_PROGRESS_SAVE_DELAY = 30
+
+# Recent states are kept in memory to answer history queries without SQL
+STATES_HISTORY_CACHE_WINDOW = 86400
+STATES_HISTORY_CACHE_MAX_ROWS = 500000
+STATES_HISTORY_CACHE_TRIM_INTERVAL = 300
+
 # The maximum number of rows (events) we purge in one delete statement
 
 # sqlite3 has a limit of 999 until version 3.32.0
@@ -47,6 +65,8 @@ STATISTICS_ROWS_SCHEMA_VERSION = 23
 CONTEXT_ID_AS_BINARY_SCHEMA_VERSION = 36
 EVENT_TYPE_IDS_SCHEMA_VERSION = 37
 STATES_META_SCHEMA_VERSION = 38
+STATISTICS_ROLLUPS_SCHEMA_VERSION = 42
+CONTEXT_ORIGINS_SCHEMA_VERSION = 43
 
 LEGACY_STATES_EVENT_ID_INDEX_SCHEMA_VERSION = 28
 
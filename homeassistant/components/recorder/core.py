@@ -11,10 +11,17 @@ import queue
 import sqlite3
 import threading
 import time
-from typing import Any, TypeVar
+from typing import Any, TypeVar, cast
 
 import async_timeout
-from sqlalchemy import create_engine, event as sqlalchemy_event, exc, select
+from sqlalchemy import (
+    Table,
+    create_engine,
+    event as sqlalchemy_event,
+    exc,
+    insert,
+    select,
+)
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.orm import scoped_session, sessionmaker
@@ -23,6 +30,7 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import persistent_notification
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    EVENT_CORE_CONFIG_UPDATE,
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STOP,
     EVENT_STATE_CHANGED,
@@ -35,6 +43,7 @@ from homeassistant.helpers.event import (
     async_track_utc_time_change,
 )
 from homeassistant.helpers.start import async_at_started
+from homeassistant.helpers.storage import STORAGE_DIR, Store
 from homeassistant.helpers.typing import UNDEFINED, UndefinedType
 import homeassistant.util.dt as dt_util
 from homeassistant.util.enum import try_parse_enum
@@ -42,6 +51,7 @@ from homeassistant.util.enum import try_parse_enum
 from . import migration, statistics
 from .const import (
     CONTEXT_ID_AS_BINARY_SCHEMA_VERSION,
+    CONTEXT_ORIGINS_SCHEMA_VERSION,
     DB_WORKER_PREFIX,
     DOMAIN,
     EVENT_TYPE_IDS_SCHEMA_VERSION,
@@ -50,10 +60,18 @@ from .const import (
     MARIADB_PYMYSQL_URL_PREFIX,
     MARIADB_URL_PREFIX,
     MAX_QUEUE_BACKLOG,
+    MAX_QUEUE_IN_MEMORY,
+    MAX_SPILL_SIZE,
     MYSQLDB_PYMYSQL_URL_PREFIX,
     MYSQLDB_URL_PREFIX,
+    PURGE_PROGRESS_SAVE_DELAY,
+    PURGE_PROGRESS_STORAGE_KEY,
+    PURGE_PROGRESS_STORAGE_VERSION,
+    SPILL_DIR,
+    SPILL_REPLAY_COMMIT_EVENTS,
     SQLITE_URL_PREFIX,
     STATES_META_SCHEMA_VERSION,
+    STATISTICS_ROLLUPS_SCHEMA_VERSION,
     STATISTICS_ROWS_SCHEMA_VERSION,
     SupportedDialect,
 )
@@ -75,17 +93,24 @@ from .db_schema import (
 from .executor import DBInterruptibleThreadPoolExecutor
 from .models import DatabaseEngine, StatisticData, StatisticMetaData, UnsupportedDialect
 from .pool import POOL_SIZE, MutexPool, RecorderPool
+from .purge import PurgeProgress
 from .queries import (
+    find_oldest_context_origin_ts,
+    find_oldest_event_ts,
+    find_oldest_state_ts,
     has_entity_ids_to_migrate,
     has_event_type_to_migrate,
     has_events_context_ids_to_migrate,
     has_states_context_ids_to_migrate,
 )
+from .spill import SpillingQueue, SpillSegment
+from .table_managers.context_origins import ContextOriginsManager
 from .table_managers.event_data import EventDataManager
 from .table_managers.event_types import EventTypeManager
 from .table_managers.recorder_runs import RecorderRunsManager
 from .table_managers.state_attributes import StateAttributesManager
 from .table_managers.states import StatesManager
+from .table_managers.states_history import StatesHistoryManager
 from .table_managers.states_meta import StatesMetaManager
 from .table_managers.statistics_meta import StatisticsMetaManager
 from .tasks import (
@@ -106,7 +131,9 @@ from .tasks import (
     KeepAliveTask,
     PerodicCleanupTask,
     PurgeTask,
+    RebuildStatisticsRollupsTask,
     RecorderTask,
+    ReplaySpilledEventsTask,
     StatesContextIDMigrationTask,
     StatisticsTask,
     StopTask,
@@ -186,7 +213,9 @@ class Recorder(threading.Thread):
         self.keep_days = keep_days
         self._hass_started: asyncio.Future[object] = asyncio.Future()
         self.commit_interval = commit_interval
-        self._queue: queue.SimpleQueue[RecorderTask] = queue.SimpleQueue()
+        self._queue = SpillingQueue(
+            hass.config.path(STORAGE_DIR, SPILL_DIR), MAX_QUEUE_IN_MEMORY
+        )
         self.db_url = uri
         self.db_max_retries = db_max_retries
         self.db_retry_wait = db_retry_wait
@@ -219,8 +248,33 @@ class Recorder(threading.Thread):
             self, exclude_attributes_by_domain
         )
         self.statistics_meta_manager = StatisticsMetaManager(self)
+        self.states_history_manager = StatesHistoryManager()
+        self.context_origins_manager = ContextOriginsManager()
+
+        self.purge_progress: PurgeProgress | None = None
+        self._purge_progress_store: Store[dict[str, Any]] = Store(
+            hass, PURGE_PROGRESS_STORAGE_VERSION, PURGE_PROGRESS_STORAGE_KEY
+        )
+        # The time zone the statistics rollups were built for, None while
+        # they are not usable
+        self.statistics_rollups_time_zone: str | None = None
+        self._statistics_rollups_rebuild_time_zone: str | None = None
 
         self.event_session: Session | None = None
+        # Events and states rows waiting to be bulk inserted on commit
+        # along with the pending rows they link to
+        self._pending_events: list[
+            tuple[dict[str, Any], EventTypes | None, EventData | None]
+        ] = []
+        self._pending_states: list[
+            tuple[
+                str,
+                dict[str, Any],
+                dict[str, Any] | None,
+                StatesMeta | None,
+                StateAttributes | None,
+            ]
+        ] = []
         self._get_session: Callable[[], Session] | None = None
         self._completed_first_database_setup: bool | None = None
         self.async_migration_event = asyncio.Event()
@@ -236,13 +290,24 @@ class Recorder(threading.Thread):
         self._commit_listener: CALLBACK_TYPE | None = None
         self._periodic_listener: CALLBACK_TYPE | None = None
         self._nightly_listener: CALLBACK_TYPE | None = None
+        self._core_config_listener: CALLBACK_TYPE | None = None
         self._dialect_name: SupportedDialect | None = None
         self.enabled = True
 
     @property
     def backlog(self) -> int:
         """Return the number of items in the recorder backlog."""
-        return self._queue.qsize()
+        return self._queue.qsize() + self._queue.spilled_events
+
+    @property
+    def spill_size(self) -> int:
+        """Return the size in bytes of the events spilled to disk."""
+        return self._queue.spill_size
+
+    @property
+    def replay_rate(self) -> float | None:
+        """Return the events/s of the last replay of spilled events."""
+        return self._queue.replay_rate
 
     @property
     def dialect_name(self) -> SupportedDialect | None:
@@ -336,22 +401,37 @@ class Recorder(threading.Thread):
 
     @callback
     def _async_check_queue(self, *_: Any) -> None:
-        """Periodic check of the queue size to ensure we do not exhaust memory.
+        """Periodic check of the backlog to ensure we do not exhaust memory or disk.
 
-        The queue grows during migration or if something really goes wrong.
+        Events are spilled to disk once the queue is full, so the queue
+        only keeps growing if something really goes wrong. The spilled
+        events keep growing while the database cannot keep up.
         """
-        size = self.backlog
-        _LOGGER.debug("Recorder queue size is: %s", size)
-        if size <= MAX_QUEUE_BACKLOG:
+        size = self._queue.qsize()
+        spilled = self._queue.spilled_events
+        spill_size = self._queue.spill_size
+        _LOGGER.debug(
+            "Recorder queue size is: %s, spilled events: %s (%s bytes)",
+            size,
+            spilled,
+            spill_size,
+        )
+        if size <= MAX_QUEUE_BACKLOG and spill_size <= MAX_SPILL_SIZE:
             return
         _LOGGER.error(
             (
-                "The recorder backlog queue reached the maximum size of %s events; "
-                "usually, the system is CPU bound, I/O bound, or the database "
-                "is corrupt due to a disk problem; The recorder will stop "
-                "recording events to avoid running out of memory"
+                "The recorder backlog reached %s events, %s in memory and %s "
+                "spilled to disk, exceeding the maximum of %s events in memory "
+                "or %s MiB on disk; usually, the system is CPU bound, I/O bound, "
+                "or the database is corrupt due to a disk problem; The recorder "
+                "will stop recording events to avoid running out of memory or "
+                "disk space"
             ),
+            size + spilled,
+            size,
+            spilled,
             MAX_QUEUE_BACKLOG,
+            MAX_SPILL_SIZE // (1024 * 1024),
         )
         self._async_stop_queue_watcher_and_event_listener()
 
@@ -381,6 +461,9 @@ class Recorder(threading.Thread):
         if self._periodic_listener:
             self._periodic_listener()
             self._periodic_listener = None
+        if self._core_config_listener:
+            self._core_config_listener()
+            self._core_config_listener = None
 
     @callback
     def _async_event_filter(self, event: Event) -> bool:
@@ -419,6 +502,8 @@ class Recorder(threading.Thread):
                 self._queue.get_nowait()
             except queue.Empty:
                 break
+        # Events spilled to disk are replayed on the next start
+        self._queue.close()
         self.queue_task(StopTask())
 
     async def _async_shutdown(self, event: Event) -> None:
@@ -480,8 +565,89 @@ class Recorder(threading.Thread):
         Called after all migration steps are finished.
         """
         self._async_setup_periodic_tasks()
+        self.hass.async_create_task(self._async_resume_purge())
+        if self.schema_version >= STATISTICS_ROLLUPS_SCHEMA_VERSION:
+            self._core_config_listener = self.hass.bus.async_listen(
+                EVENT_CORE_CONFIG_UPDATE, self._async_core_config_updated
+            )
+            self.hass.async_create_task(self._async_load_statistics_rollups())
         self.async_recorder_ready.set()
 
+    async def _async_resume_purge(self) -> None:
+        """Resume a purge that did not finish before the last shutdown."""
+        if (
+            self.purge_progress is not None
+            or (data := await self._purge_progress_store.async_load()) is None
+            or (progress := PurgeProgress.from_storage(data)) is None
+        ):
+            return
+        _LOGGER.info(
+            "Resuming purge of data before %s",
+            progress.purge_before.isoformat(sep=" ", timespec="seconds"),
+        )
+        self.purge_progress = progress
+        self.queue_task(
+            PurgeTask(progress.purge_before, progress.repack, progress.apply_filter)
+        )
+
+    def save_purge_progress(self) -> None:
+        """Persist the progress of the running purge, or forget it when done."""
+        if (progress := self.purge_progress) is None:
+            self.hass.add_job(self._async_remove_purge_progress)
+            return
+        self.hass.add_job(self._async_save_purge_progress, progress.as_storage())
+
+    @callback
+    def _async_save_purge_progress(self, data: dict[str, Any]) -> None:
+        """Save the progress of the running purge."""
+        self._purge_progress_store.async_delay_save(
+            lambda: data, PURGE_PROGRESS_SAVE_DELAY
+        )
+
+    @callback
+    def _async_remove_purge_progress(self) -> None:
+        """Remove the progress of a purge that is done."""
+        self.hass.async_create_task(self._purge_progress_store.async_remove())
+
+    async def _async_load_statistics_rollups(self) -> None:
+        """Use the statistics rollups if they were built for the time zone."""
+        time_zone = await self.async_add_executor_job(
+            statistics.get_statistics_rollups_run_time_zone, self
+        )
+        if time_zone == statistics.get_statistics_rollups_time_zone():
+            self.statistics_rollups_time_zone = time_zone
+            return
+        self.async_rebuild_statistics_rollups()
+
+    @callback
+    def _async_core_config_updated(self, event: Event) -> None:
+        """Rebuild the statistics rollups when the time zone changes."""
+        if statistics.get_statistics_rollups_time_zone() not in (
+            self.statistics_rollups_time_zone,
+            self._statistics_rollups_rebuild_time_zone,
+        ):
+            self.async_rebuild_statistics_rollups()
+
+    @callback
+    def async_rebuild_statistics_rollups(self) -> None:
+        """Rebuild the statistics rollups for the configured time zone."""
+        self.statistics_rollups_time_zone = None
+        time_zone = statistics.get_statistics_rollups_time_zone()
+        self._statistics_rollups_rebuild_time_zone = time_zone
+        self.queue_task(RebuildStatisticsRollupsTask(time_zone))
+
+    def statistics_rollups_rebuilt(self, time_zone: str) -> None:
+        """Start using the statistics rollups once they are rebuilt."""
+        self.hass.add_job(self._async_statistics_rollups_rebuilt, time_zone)
+
+    @callback
+    def _async_statistics_rollups_rebuilt(self, time_zone: str) -> None:
+        """Start using the statistics rollups once they are rebuilt."""
+        if time_zone != self._statistics_rollups_rebuild_time_zone:
+            return
+        self._statistics_rollups_rebuild_time_zone = None
+        self.statistics_rollups_time_zone = time_zone
+
     @callback
     def async_nightly_tasks(self, now: datetime) -> None:
         """Trigger the purge."""
@@ -708,6 +874,8 @@ class Recorder(threading.Thread):
         if not database_was_ready:
             self._activate_and_set_db_ready()
 
+        self._activate_context_origins()
+
         # Catch up with missed statistics
         self._schedule_compile_missing_statistics()
         _LOGGER.debug("Recorder processing the queue")
@@ -759,6 +927,7 @@ class Recorder(threading.Thread):
             else:
                 _LOGGER.debug("Activating states_meta manager as all data is migrated")
                 self.states_meta_manager.active = True
+                self.states_history_manager.start(time.time())
                 with contextlib.suppress(SQLAlchemyError):
                     # If ix_states_entity_id_last_updated_ts still exists
                     # on the states table it means the entity id migration
@@ -795,6 +964,10 @@ class Recorder(threading.Thread):
         # with a commit every time the event time
         # has changed. This reduces the disk io.
         queue_ = self._queue
+        # Replay the events that were spilled to disk before the last shutdown
+        for segment in queue_.leftover_segments():
+            self._guarded_process_one_task_or_recover(ReplaySpilledEventsTask(segment))
+
         startup_tasks: list[RecorderTask] = []
         while not queue_.empty() and (task := queue_.get_nowait()):
             startup_tasks.append(task)
@@ -840,6 +1013,24 @@ class Recorder(threading.Thread):
         except Exception as err:  # pylint: disable=broad-except
             _LOGGER.exception("Error while processing event %s: %s", task, err)
 
+    def _activate_context_origins(self) -> None:
+        """Start recording the context origins once the table exists."""
+        if self.schema_version < CONTEXT_ORIGINS_SCHEMA_VERSION:
+            return
+        with session_scope(session=self.get_session(), read_only=True) as session:
+            since_ts: float | None = session.execute(
+                find_oldest_context_origin_ts()
+            ).scalar()
+            if since_ts is None:
+                # Without any origins recorded yet only the rows recorded
+                # from now on are covered, unless there are no rows at all
+                has_rows = any(
+                    session.execute(stmt).scalar() is not None
+                    for stmt in (find_oldest_state_ts(), find_oldest_event_ts())
+                )
+                since_ts = time.time() if has_rows else 0.0
+        self.context_origins_manager.start(since_ts)
+
     def _process_one_task_or_recover(self, task: RecorderTask) -> None:
         """Process an event, reconnect, or recover a malformed database."""
         try:
@@ -935,7 +1126,7 @@ class Recorder(threading.Thread):
             # Notify that lock is being held, wait until database can be used again.
             self.hass.add_job(_async_set_database_locked, task)
             while not task.database_unlock.wait(timeout=DB_LOCK_QUEUE_CHECK_TIMEOUT):
-                if self.backlog > MAX_QUEUE_BACKLOG * 0.9:
+                if self._queue.qsize() > MAX_QUEUE_BACKLOG * 0.9:
                     _LOGGER.warning(
                         "Database queue backlog reached more than 90% of maximum queue "
                         "length while waiting for backup to finish; recorder will now "
@@ -960,26 +1151,62 @@ class Recorder(threading.Thread):
         if not self.commit_interval:
             self._commit_event_session_or_retry()
 
+    def _replay_spilled_events(self, segment: SpillSegment) -> None:
+        """Process the events that were spilled to disk when the queue was full.
+
+        The segment is only removed once all its events are committed. If
+        the replay fails, the next start resumes after the events that were
+        committed.
+        """
+        self._queue.close_segment(segment)
+        start = time.monotonic()
+        replayed = 0
+        committed = segment.offset
+        try:
+            for event in segment.read():
+                self._process_one_event(event)
+                replayed += 1
+                if not self.commit_interval:
+                    # Each event was committed when it was processed
+                    committed = segment.read_lines
+                elif not replayed % SPILL_REPLAY_COMMIT_EVENTS:
+                    self._commit_event_session_or_retry()
+                    committed = segment.read_lines
+            self._commit_event_session_or_retry()
+        except Exception:
+            _LOGGER.error(
+                "Replaying spilled events from %s failed, keeping it to resume"
+                " after %s events on the next start",
+                segment.path,
+                committed,
+            )
+            segment.save_offset(committed)
+            raise
+        self._queue.finish_replay(segment, replayed, time.monotonic() - start)
+        _LOGGER.debug("Replayed %s spilled events from %s", replayed, segment.path)
+
     def _process_non_state_changed_event_into_session(self, event: Event) -> None:
         """Process any event into the session except state changed."""
         session = self.event_session
         assert session is not None
-        dbevent = Events.from_event(event)
+        dbevent = Events.row_from_event(event)
+        pending_event_type: EventTypes | None = None
+        pending_event_data: EventData | None = None
 
         # Map the event_type to the EventTypes table
         event_type_manager = self.event_type_manager
         if pending_event_types := event_type_manager.get_pending(event.event_type):
-            dbevent.event_type_rel = pending_event_types
+            pending_event_type = pending_event_types
         elif event_type_id := event_type_manager.get(event.event_type, session):
-            dbevent.event_type_id = event_type_id
+            dbevent["event_type_id"] = event_type_id
         else:
-            event_types = EventTypes(event_type=event.event_type)
-            event_type_manager.add_pending(event_types)
-            session.add(event_types)
-            dbevent.event_type_rel = event_types
+            pending_event_type = EventTypes(event_type=event.event_type)
+            event_type_manager.add_pending(pending_event_type)
+            session.add(pending_event_type)
 
         if not event.data:
-            session.add(dbevent)
+            self.context_origins_manager.add_pending_event(dbevent)
+            self._pending_events.append((dbevent, pending_event_type, None))
             return
 
         event_data_manager = self.event_data_manager
@@ -990,21 +1217,21 @@ class Recorder(threading.Thread):
         shared_data = shared_data_bytes.decode("utf-8")
         # Matching attributes found in the pending commit
         if pending_event_data := event_data_manager.get_pending(shared_data):
-            dbevent.event_data_rel = pending_event_data
+            pass
         # Matching attributes id found in the cache
         elif (data_id := event_data_manager.get_from_cache(shared_data)) or (
             (hash_ := EventData.hash_shared_data_bytes(shared_data_bytes))
             and (data_id := event_data_manager.get(shared_data, hash_, session))
         ):
-            dbevent.data_id = data_id
+            dbevent["data_id"] = data_id
         else:
             # No matching attributes found, save them in the DB
-            dbevent_data = EventData(shared_data=shared_data, hash=hash_)
-            event_data_manager.add_pending(dbevent_data)
-            session.add(dbevent_data)
-            dbevent.event_data_rel = dbevent_data
+            pending_event_data = EventData(shared_data=shared_data, hash=hash_)
+            event_data_manager.add_pending(pending_event_data)
+            session.add(pending_event_data)
 
-        session.add(dbevent)
+        self.context_origins_manager.add_pending_event(dbevent)
+        self._pending_events.append((dbevent, pending_event_type, pending_event_data))
 
     def _process_state_changed_event_into_session(self, event: Event) -> None:
         """Process a state_changed event into the session."""
@@ -1013,20 +1240,16 @@ class Recorder(threading.Thread):
         entity_removed = not event.data.get("new_state")
         entity_id = event.data["entity_id"]
 
-        dbstate = States.from_event(event)
+        dbstate = States.row_from_event(event)
 
         states_manager = self.states_manager
-        if old_state := states_manager.pop_pending(entity_id):
-            dbstate.old_state = old_state
-        elif old_state_id := states_manager.pop_committed(entity_id):
-            dbstate.old_state_id = old_state_id
+        if (old_state := states_manager.pop_pending(entity_id)) is None:
+            dbstate["old_state_id"] = states_manager.pop_committed(entity_id)
         if entity_removed:
-            dbstate.state = None
-        else:
-            states_manager.add_pending(entity_id, dbstate)
+            dbstate["state"] = None
 
         if states_meta_manager.active:
-            dbstate.entity_id = None
+            dbstate["entity_id"] = None
 
         if entity_id is None or not (
             shared_attrs_bytes := state_attributes_manager.serialize_from_event(event)
@@ -1035,11 +1258,13 @@ class Recorder(threading.Thread):
 
         assert self.event_session is not None
         session = self.event_session
+        pending_states_meta: StatesMeta | None = None
+        pending_attributes: StateAttributes | None = None
         # Map the entity_id to the StatesMeta table
         if pending_states_meta := states_meta_manager.get_pending(entity_id):
-            dbstate.states_meta_rel = pending_states_meta
+            pass
         elif metadata_id := states_meta_manager.get(entity_id, session, True):
-            dbstate.metadata_id = metadata_id
+            dbstate["metadata_id"] = metadata_id
         elif states_meta_manager.active and entity_removed:
             # If the entity was removed, we don't need to add it to the
             # StatesMeta table or record it in the pending commit
@@ -1047,17 +1272,15 @@ class Recorder(threading.Thread):
             # it either never existed or was just renamed.
             return
         else:
-            states_meta = StatesMeta(entity_id=entity_id)
-            states_meta_manager.add_pending(states_meta)
-            session.add(states_meta)
-            dbstate.states_meta_rel = states_meta
+            pending_states_meta = StatesMeta(entity_id=entity_id)
+            states_meta_manager.add_pending(pending_states_meta)
+            session.add(pending_states_meta)
 
         # Map the event data to the StateAttributes table
         shared_attrs = shared_attrs_bytes.decode("utf-8")
-        dbstate.attributes = None
         # Matching attributes found in the pending commit
-        if pending_event_data := state_attributes_manager.get_pending(shared_attrs):
-            dbstate.state_attributes = pending_event_data
+        if pending_attributes := state_attributes_manager.get_pending(shared_attrs):
+            pass
         # Matching attributes id found in the cache
         elif (
             attributes_id := state_attributes_manager.get_from_cache(shared_attrs)
@@ -1069,15 +1292,118 @@ class Recorder(threading.Thread):
                 )
             )
         ):
-            dbstate.attributes_id = attributes_id
+            dbstate["attributes_id"] = attributes_id
         else:
             # No matching attributes found, save them in the DB
-            dbstate_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
-            state_attributes_manager.add_pending(dbstate_attributes)
-            session.add(dbstate_attributes)
-            dbstate.state_attributes = dbstate_attributes
+            pending_attributes = StateAttributes(shared_attrs=shared_attrs, hash=hash_)
+            state_attributes_manager.add_pending(pending_attributes)
+            session.add(pending_attributes)
+
+        if not entity_removed:
+            states_manager.add_pending(entity_id, dbstate)
+        self.context_origins_manager.add_pending_state(dbstate)
+        self._pending_states.append(
+            (entity_id, dbstate, old_state, pending_states_meta, pending_attributes)
+        )
+
+    def _bulk_insert_pending_events(self, session: Session) -> None:
+        """Insert the pending events rows with a single executemany."""
+        rows: list[dict[str, Any]] = []
+        for dbevent, pending_event_type, pending_event_data in self._pending_events:
+            if pending_event_type:
+                dbevent["event_type_id"] = pending_event_type.event_type_id
+            if pending_event_data:
+                dbevent["data_id"] = pending_event_data.data_id
+            rows.append(dbevent)
+        table = cast(Table, Events.__table__)
+        context_origins_manager = self.context_origins_manager
+        if (
+            context_origins_manager.has_pending_events
+            and session.get_bind().dialect.insert_executemany_returning
+        ):
+            context_origins_manager.set_event_ids(
+                session.execute(
+                    insert(table).returning(table.c.event_id, table.c.context_id_bin),
+                    rows,
+                )
+            )
+        else:
+            session.execute(insert(table), rows)
+
+    def _bulk_insert_pending_states(self, session: Session) -> None:
+        """Insert the pending states rows with as few statements as possible.
 
-        session.add(dbstate)
+        A row that links to an older row of the same entity in this commit
+        can only be written once the older row has a state_id, so the rows
+        are written in generations holding at most one row per entity.
+        Each generation is a single executemany. Without RETURNING, as on
+        MySQL and MariaDB, the state_ids of a generation are selected after
+        it is inserted.
+        """
+        generations: list[list[tuple[dict[str, Any], dict[str, Any] | None]]] = []
+        entity_generation: dict[str, int] = {}
+        for (
+            entity_id,
+            dbstate,
+            old_state,
+            pending_states_meta,
+            pending_attributes,
+        ) in self._pending_states:
+            if pending_states_meta:
+                dbstate["metadata_id"] = pending_states_meta.metadata_id
+            if pending_attributes:
+                dbstate["attributes_id"] = pending_attributes.attributes_id
+            # A state_id left over from a failed commit must not be reused
+            dbstate.pop("state_id", None)
+            generation = entity_generation.get(entity_id, 0)
+            entity_generation[entity_id] = generation + 1
+            if generation == len(generations):
+                generations.append([])
+            generations[generation].append((dbstate, old_state))
+
+        table = cast(Table, States.__table__)
+        executemany_returning = session.get_bind().dialect.insert_executemany_returning
+        states_history_manager = self.states_history_manager
+        # The rows of a failed attempt are added again when it is retried
+        states_history_manager.discard_pending()
+        for generation_rows in generations:
+            rows: list[dict[str, Any]] = []
+            for dbstate, old_state in generation_rows:
+                if old_state:
+                    dbstate["old_state_id"] = old_state["state_id"]
+                rows.append(dbstate)
+                states_history_manager.add_pending(dbstate)
+            if executemany_returning:
+                by_entity = {
+                    (row["metadata_id"], row["entity_id"]): row for row in rows
+                }
+                for state_id, metadata_id, entity_id in session.execute(
+                    insert(table).returning(
+                        table.c.state_id, table.c.metadata_id, table.c.entity_id
+                    ),
+                    rows,
+                ):
+                    by_entity[(metadata_id, entity_id)]["state_id"] = state_id
+                continue
+            session.execute(insert(table), rows)
+            # An older row can have the same entity and last_updated_ts, the
+            # ids only grow so the row inserted last has the highest one
+            by_key = {
+                (row["metadata_id"], row["entity_id"], row["last_updated_ts"]): row
+                for row in rows
+            }
+            for state_id, metadata_id, entity_id, last_updated_ts in session.execute(
+                select(
+                    table.c.state_id,
+                    table.c.metadata_id,
+                    table.c.entity_id,
+                    table.c.last_updated_ts,
+                )
+                .where(table.c.last_updated_ts.in_([ts for _, _, ts in by_key]))
+                .order_by(table.c.state_id)
+            ):
+                if row := by_key.get((metadata_id, entity_id, last_updated_ts)):
+                    row["state_id"] = state_id
 
     def _handle_database_error(self, err: Exception) -> bool:
         """Handle a database error that may result in moving away the corrupt db."""
@@ -1092,7 +1418,11 @@ class Recorder(threading.Thread):
     def _event_session_has_pending_writes(self) -> bool:
         """Return True if there are pending writes in the event session."""
         session = self.event_session
-        return bool(session and (session.new or session.dirty))
+        return bool(
+            self._pending_events
+            or self._pending_states
+            or (session and (session.new or session.dirty))
+        )
 
     def _commit_event_session_or_retry(self) -> None:
         """Commit the event session if there is work to do."""
@@ -1104,6 +1434,7 @@ class Recorder(threading.Thread):
                 self._commit_event_session()
                 return
             except (exc.InternalError, exc.OperationalError) as err:
+                self.context_origins_manager.rollback_pending()
                 _LOGGER.error(
                     "%s: Error executing query: %s. (retrying in %s seconds)",
                     INVALIDATED_ERR if err.connection_invalidated else CONNECTIVITY_ERR,
@@ -1121,7 +1452,20 @@ class Recorder(threading.Thread):
         session = self.event_session
         self._commits_without_expire += 1
 
+        if self._pending_events or self._pending_states:
+            # Flush the rows the events and states link to first so
+            # their ids are known when the rows are bulk inserted
+            session.flush()
+            if self._pending_events:
+                self._bulk_insert_pending_events(session)
+            if self._pending_states:
+                self._bulk_insert_pending_states(session)
+            self.context_origins_manager.insert_pending(session)
         session.commit()
+        # The pending rows are kept until the commit succeeded so
+        # they are written again when the commit is retried
+        self._pending_events.clear()
+        self._pending_states.clear()
         # We just committed the state attributes to the database
         # and we now know the attributes_ids.  We can save
         # many selects for matching attributes by loading them
@@ -1131,6 +1475,8 @@ class Recorder(threading.Thread):
         self.event_data_manager.post_commit_pending()
         self.event_type_manager.post_commit_pending()
         self.states_meta_manager.post_commit_pending()
+        self.states_history_manager.post_commit_pending()
+        self.context_origins_manager.post_commit_pending()
 
         # Expire is an expensive operation (frequently more expensive
         # than the flush and commit itself) so we only
@@ -1149,6 +1495,8 @@ class Recorder(threading.Thread):
         self.recorder_runs_manager.reset()
         self._setup_recorder()
         self._setup_run()
+        # The statistics rollups were moved away with the broken database
+        self.hass.add_job(self.async_rebuild_statistics_rollups)
 
     def _close_event_session(self) -> None:
         """Close the event session."""
@@ -1158,6 +1506,10 @@ class Recorder(threading.Thread):
         self.event_type_manager.reset()
         self.states_meta_manager.reset()
         self.statistics_meta_manager.reset()
+        self.states_history_manager.reset()
+        self.context_origins_manager.reset()
+        self._pending_events.clear()
+        self._pending_states.clear()
 
         if not self.event_session:
             return
@@ -1390,6 +1742,8 @@ class Recorder(threading.Thread):
         _LOGGER.debug("Shutting down recorder")
         self.hass.add_job(self._async_stop_listeners)
         self._stop_executor()
+        # Events spilled to disk are replayed on the next start
+        self._queue.shutdown()
         try:
             self._end_session()
         finally:
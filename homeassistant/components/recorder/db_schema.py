@@ -54,6 +54,7 @@ from .models import (
     StatisticMetaData,
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
+    context_id_to_bytes_or_none,
     datetime_to_timestamp_or_none,
     process_timestamp,
     ulid_to_bytes_or_none,
@@ -67,7 +68,7 @@ class Base(DeclarativeBase):
     """Base class for tables."""
 
 
-SCHEMA_VERSION = 41
+SCHEMA_VERSION = 43
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -83,6 +84,10 @@ TABLE_STATISTICS = "statistics"
 TABLE_STATISTICS_META = "statistics_meta"
 TABLE_STATISTICS_RUNS = "statistics_runs"
 TABLE_STATISTICS_SHORT_TERM = "statistics_short_term"
+TABLE_STATISTICS_DAY = "statistics_day"
+TABLE_STATISTICS_MONTH = "statistics_month"
+TABLE_STATISTICS_ROLLUPS_RUNS = "statistics_rollups_runs"
+TABLE_CONTEXT_ORIGINS = "context_origins"
 
 STATISTICS_TABLES = ("statistics", "statistics_short_term")
 
@@ -104,6 +109,10 @@ ALL_TABLES = [
     TABLE_STATISTICS_META,
     TABLE_STATISTICS_RUNS,
     TABLE_STATISTICS_SHORT_TERM,
+    TABLE_STATISTICS_DAY,
+    TABLE_STATISTICS_MONTH,
+    TABLE_STATISTICS_ROLLUPS_RUNS,
+    TABLE_CONTEXT_ORIGINS,
 ]
 
 TABLES_TO_CHECK = [
@@ -117,9 +126,11 @@ LAST_UPDATED_INDEX_TS = "ix_states_last_updated_ts"
 METADATA_ID_LAST_UPDATED_INDEX_TS = "ix_states_metadata_id_last_updated_ts"
 EVENTS_CONTEXT_ID_BIN_INDEX = "ix_events_context_id_bin"
 STATES_CONTEXT_ID_BIN_INDEX = "ix_states_context_id_bin"
+CONTEXT_ORIGINS_CONTEXT_ID_BIN_INDEX = "ix_context_origins_context_id_bin"
 LEGACY_STATES_EVENT_ID_INDEX = "ix_states_event_id"
 LEGACY_STATES_ENTITY_ID_LAST_UPDATED_INDEX = "ix_states_entity_id_last_updated_ts"
 CONTEXT_ID_BIN_MAX_LENGTH = 16
+MAX_LENGTH_TIME_ZONE = 64
 
 MYSQL_COLLATE = "utf8mb4_unicode_ci"
 MYSQL_DEFAULT_CHARSET = "utf8mb4"
@@ -266,19 +277,26 @@ class Events(Base):
     @staticmethod
     def from_event(event: Event) -> Events:
         """Create an event database object from a native event."""
-        return Events(
-            event_type=None,
-            event_data=None,
-            origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-            time_fired=None,
-            time_fired_ts=dt_util.utc_to_timestamp(event.time_fired),
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(event.context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(event.context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(event.context.parent_id),
-        )
+        return Events(**Events.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of an events row from a native event."""
+        return {
+            "event_type": None,
+            "event_data": None,
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+            "time_fired": None,
+            "time_fired_ts": dt_util.utc_to_timestamp(event.time_fired),
+            "context_id": None,
+            "context_id_bin": context_id_to_bytes_or_none(event.context),
+            "context_user_id": None,
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(event.context.user_id),
+            "context_parent_id": None,
+            "context_parent_id_bin": ulid_to_bytes_or_none(event.context.parent_id),
+            "data_id": None,
+            "event_type_id": None,
+        }
 
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
@@ -472,36 +490,43 @@ class States(Base):
     @staticmethod
     def from_event(event: Event) -> States:
         """Create object from a state_changed event."""
-        entity_id = event.data["entity_id"]
+        return States(**States.row_from_event(event))
+
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of a states row from a state_changed event."""
         state: State | None = event.data.get("new_state")
-        dbstate = States(
-            entity_id=entity_id,
-            attributes=None,
-            context_id=None,
-            context_id_bin=ulid_to_bytes_or_none(event.context.id),
-            context_user_id=None,
-            context_user_id_bin=uuid_hex_to_bytes_or_none(event.context.user_id),
-            context_parent_id=None,
-            context_parent_id_bin=ulid_to_bytes_or_none(event.context.parent_id),
-            origin_idx=EVENT_ORIGIN_TO_IDX.get(event.origin),
-            last_updated=None,
-            last_changed=None,
-        )
+        row: dict[str, Any] = {
+            "entity_id": event.data["entity_id"],
+            "attributes": None,
+            "context_id": None,
+            "context_id_bin": context_id_to_bytes_or_none(event.context),
+            "context_user_id": None,
+            "context_user_id_bin": uuid_hex_to_bytes_or_none(event.context.user_id),
+            "context_parent_id": None,
+            "context_parent_id_bin": ulid_to_bytes_or_none(event.context.parent_id),
+            "origin_idx": EVENT_ORIGIN_TO_IDX.get(event.origin),
+            "last_updated": None,
+            "last_changed": None,
+            "old_state_id": None,
+            "attributes_id": None,
+            "metadata_id": None,
+        }
         # None state means the state was removed from the state machine
         if state is None:
-            dbstate.state = ""
-            dbstate.last_updated_ts = dt_util.utc_to_timestamp(event.time_fired)
-            dbstate.last_changed_ts = None
-            return dbstate
+            row["state"] = ""
+            row["last_updated_ts"] = dt_util.utc_to_timestamp(event.time_fired)
+            row["last_changed_ts"] = None
+            return row
 
-        dbstate.state = state.state
-        dbstate.last_updated_ts = dt_util.utc_to_timestamp(state.last_updated)
+        row["state"] = state.state
+        row["last_updated_ts"] = dt_util.utc_to_timestamp(state.last_updated)
         if state.last_updated == state.last_changed:
-            dbstate.last_changed_ts = None
+            row["last_changed_ts"] = None
         else:
-            dbstate.last_changed_ts = dt_util.utc_to_timestamp(state.last_changed)
+            row["last_changed_ts"] = dt_util.utc_to_timestamp(state.last_changed)
 
-        return dbstate
+        return row
 
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
@@ -627,6 +652,44 @@ class StatesMeta(Base):
         )
 
 
+class ContextOrigins(Base):
+    """The first events or states row recorded for each context.
+
+    The logbook looks up the origin of a context here instead of
+    searching the events and states tables for the context id.
+    A context may have more than one row if it was seen again after
+    the recorder restarted, the oldest row is the origin.
+    """
+
+    __table_args__ = (
+        Index(
+            CONTEXT_ORIGINS_CONTEXT_ID_BIN_INDEX,
+            "context_id_bin",
+            mysql_length=CONTEXT_ID_BIN_MAX_LENGTH,
+            mariadb_length=CONTEXT_ID_BIN_MAX_LENGTH,
+        ),
+        _DEFAULT_TABLE_ARGS,
+    )
+    __tablename__ = TABLE_CONTEXT_ORIGINS
+    origin_id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    context_id_bin: Mapped[bytes | None] = mapped_column(
+        LargeBinary(CONTEXT_ID_BIN_MAX_LENGTH)
+    )
+    time_fired_ts: Mapped[float | None] = mapped_column(TIMESTAMP_TYPE, index=True)
+    # Only one of event_id and state_id is set. They are not foreign keys
+    # so purging events and states does not have to update this table.
+    event_id: Mapped[int | None] = mapped_column(Integer)
+    state_id: Mapped[int | None] = mapped_column(Integer)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            "<recorder.ContextOrigins("
+            f"id={self.origin_id}, event_id={self.event_id}, "
+            f"state_id={self.state_id}, time_fired_ts={self.time_fired_ts})>"
+        )
+
+
 class StatisticsBase:
     """Statistics base class."""
 
@@ -722,6 +785,50 @@ class StatisticsShortTerm(Base, StatisticsBase):
     __tablename__ = TABLE_STATISTICS_SHORT_TERM
 
 
+class StatisticsRollupBase(StatisticsBase):
+    """Statistics rollup base class."""
+
+    # The number of hourly means the mean is the average of, needed
+    # to fold the next hour into the mean
+    mean_count: Mapped[int | None] = mapped_column(Integer)
+
+
+class StatisticsDay(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per day in the configured time zone."""
+
+    # Days are 23 or 25 hours long when daylight saving time starts or ends
+    duration = timedelta(days=1)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_day_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS_DAY
+
+
+class StatisticsMonth(Base, StatisticsRollupBase):
+    """Long term statistics rolled up per month in the configured time zone."""
+
+    # Months are 28 to 31 days long
+    duration = timedelta(days=31)
+
+    __table_args__ = (
+        # Used for fetching statistics for a certain entity at a specific time
+        Index(
+            "ix_statistics_month_statistic_id_start_ts",
+            "metadata_id",
+            "start_ts",
+            unique=True,
+        ),
+    )
+    __tablename__ = TABLE_STATISTICS_MONTH
+
+
 class StatisticsMeta(Base):
     """Statistics meta data."""
 
@@ -804,6 +911,24 @@ class StatisticsRuns(Base):
         )
 
 
+class StatisticsRollupsRuns(Base):
+    """Representation of a finished rebuild of the statistics rollups."""
+
+    __tablename__ = TABLE_STATISTICS_ROLLUPS_RUNS
+    run_id: Mapped[int] = mapped_column(Integer, Identity(), primary_key=True)
+    # The time zone the days and months of the rollups are in
+    time_zone: Mapped[str] = mapped_column(String(MAX_LENGTH_TIME_ZONE))
+    created: Mapped[datetime] = mapped_column(DATETIME_TYPE, default=dt_util.utcnow)
+
+    def __repr__(self) -> str:
+        """Return string representation of instance for debugging."""
+        return (
+            f"<recorder.StatisticsRollupsRuns(id={self.run_id},"
+            f" time_zone='{self.time_zone}',"
+            f" created='{self.created.isoformat(sep=' ', timespec='seconds')}', )>"
+        )
+
+
 EVENT_DATA_JSON = type_coerce(
     EventData.shared_data.cast(JSONB_VARIANT_CAST), JSONLiteral(none_as_null=True)
 )
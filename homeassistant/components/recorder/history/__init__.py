@@ -16,6 +16,7 @@ from .modern import (
     get_full_significant_states_with_session as _modern_get_full_significant_states_with_session,
     get_last_state_changes as _modern_get_last_state_changes,
     get_significant_states as _modern_get_significant_states,
+    get_significant_states_chunk_end as _modern_get_significant_states_chunk_end,
     get_significant_states_with_session as _modern_get_significant_states_with_session,
     state_changes_during_period as _modern_state_changes_during_period,
 )
@@ -27,6 +28,7 @@ __all__ = [
     "get_full_significant_states_with_session",
     "get_last_state_changes",
     "get_significant_states",
+    "get_significant_states_chunk_end",
     "get_significant_states_with_session",
     "state_changes_during_period",
 ]
@@ -115,6 +117,28 @@ def get_significant_states(
     )
 
 
+def get_significant_states_chunk_end(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    chunk_size: int,
+    significant_changes_only: bool = True,
+) -> datetime | None:
+    """Return the end of the first chunk of significant states changes."""
+    if not recorder.get_instance(hass).states_meta_manager.active:
+        # The legacy schema is not split into chunks
+        return None
+    return _modern_get_significant_states_chunk_end(
+        hass,
+        start_time,
+        end_time,
+        entity_ids,
+        chunk_size,
+        significant_changes_only,
+    )
+
+
 def get_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -198,15 +198,51 @@ def get_significant_states_with_session(
             if metadata_id is not None
             and split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
         ]
-    stmt = _significant_states_stmt(
-        start_time,
-        end_time,
-        metadata_ids,
-        metadata_ids_in_significant_domains,
-        significant_changes_only,
-        no_attributes,
-    )
-    states = execute_stmt_lambda_element(session, stmt, None, end_time)
+    start_time_rows: Iterable[Row] | None = None
+    if no_attributes and (
+        cached := instance.states_history_manager.get_significant_states(
+            metadata_ids,
+            metadata_ids_in_significant_domains,
+            start_time.timestamp(),
+            end_time.timestamp() if end_time else None,
+            significant_changes_only,
+            include_start_time_state,
+        )
+    ):
+        # The recent states are held in memory, only the start time
+        # states missing from memory are looked up in the database.
+        # The cached rows have the same fields as the database rows
+        # selected without attributes.
+        states: Iterable[Row] = cast(list[Row], cached.rows)
+        start_time_rows = _filter_start_time_rows(
+            hass, start_time, entity_ids, cast(list[Row], cached.start_time_rows)
+        )
+        if missing := set(cached.missing_start_time_states):
+            start_time_rows = [
+                *start_time_rows,
+                *_get_rows_with_session(
+                    hass,
+                    session,
+                    start_time,
+                    entity_ids,
+                    {
+                        entity_id: metadata_id
+                        for entity_id, metadata_id in entity_id_to_metadata_id.items()
+                        if metadata_id in missing
+                    },
+                    no_attributes=no_attributes,
+                ),
+            ]
+    else:
+        stmt = _significant_states_stmt(
+            start_time,
+            end_time,
+            metadata_ids,
+            metadata_ids_in_significant_domains,
+            significant_changes_only,
+            no_attributes,
+        )
+        states = execute_stmt_lambda_element(session, stmt, None, end_time)
     return _sorted_states_to_dict(
         hass,
         session,
@@ -218,9 +254,84 @@ def get_significant_states_with_session(
         minimal_response,
         no_attributes,
         compressed_state_format,
+        start_time_rows,
     )
 
 
+def _significant_states_chunk_end_stmt(
+    start_time_ts: float,
+    end_time_ts: float | None,
+    metadata_ids: list[int],
+    metadata_ids_in_significant_domains: list[int],
+    significant_changes_only: bool,
+    chunk_size: int,
+) -> StatementLambdaElement:
+    """Select the time of the last significant state change of a chunk."""
+    stmt = lambda_stmt(
+        lambda: select(States.last_updated_ts).filter(
+            States.metadata_id.in_(metadata_ids)
+            & (States.last_updated_ts > start_time_ts)
+        )
+    )
+    if significant_changes_only:
+        stmt += lambda q: q.filter(
+            States.metadata_id.in_(metadata_ids_in_significant_domains)
+            | (States.last_changed_ts == States.last_updated_ts)
+            | States.last_changed_ts.is_(None)
+        )
+    if end_time_ts:
+        stmt += lambda q: q.filter(States.last_updated_ts < end_time_ts)
+    # The state change after the chunk tells if the chunk is the last one
+    offset = chunk_size - 1
+    stmt += lambda q: q.order_by(States.last_updated_ts).offset(offset).limit(2)
+    return stmt
+
+
+def get_significant_states_chunk_end(
+    hass: HomeAssistant,
+    start_time: datetime,
+    end_time: datetime | None,
+    entity_ids: list[str],
+    chunk_size: int,
+    significant_changes_only: bool = True,
+) -> datetime | None:
+    """Return the end of the first chunk of significant states changes.
+
+    The chunk holds the chunk_size oldest significant state changes
+    after start_time, it ends at the time of its last state change.
+    Returns None if there are no more than chunk_size state changes
+    left before end_time.
+    """
+    with session_scope(hass=hass, read_only=True) as session:
+        entity_id_to_metadata_id = recorder.get_instance(
+            hass
+        ).states_meta_manager.get_many(entity_ids, session, False)
+        if not (metadata_ids := extract_metadata_ids(entity_id_to_metadata_id)):
+            return None
+        metadata_ids_in_significant_domains = [
+            metadata_id
+            for entity_id, metadata_id in entity_id_to_metadata_id.items()
+            if metadata_id is not None
+            and split_entity_id(entity_id)[0] in SIGNIFICANT_DOMAINS
+        ]
+        rows = list(
+            execute_stmt_lambda_element(
+                session,
+                _significant_states_chunk_end_stmt(
+                    start_time.timestamp(),
+                    end_time.timestamp() if end_time else None,
+                    metadata_ids,
+                    metadata_ids_in_significant_domains,
+                    significant_changes_only,
+                    chunk_size,
+                ),
+            )
+        )
+    if len(rows) < 2:
+        return None
+    return dt_util.utc_from_timestamp(rows[0].last_updated_ts)
+
+
 def get_full_significant_states_with_session(
     hass: HomeAssistant,
     session: Session,
@@ -496,6 +607,24 @@ def _get_rows_with_session(
     return execute_stmt_lambda_element(session, stmt)
 
 
+def _filter_start_time_rows(
+    hass: HomeAssistant,
+    utc_point_in_time: datetime,
+    entity_ids: list[str],
+    rows: list[Row],
+) -> list[Row]:
+    """Filter the start time states held in memory like _get_rows_with_session."""
+    if len(entity_ids) == 1 or not rows:
+        return rows
+    run = recorder.get_instance(hass).recorder_runs_manager.get(utc_point_in_time)
+    if run is None or (run_start := process_timestamp(run.start)) > utc_point_in_time:
+        # History did not run before utc_point_in_time
+        return []
+    # Only states since the last recorder run started are start time states
+    run_start_ts = run_start.timestamp()
+    return [row for row in rows if row.last_updated_ts >= run_start_ts]
+
+
 def _get_single_entity_states_stmt(
     utc_point_in_time: datetime,
     metadata_id: int,
@@ -531,6 +660,7 @@ def _sorted_states_to_dict(
     minimal_response: bool = False,
     no_attributes: bool = False,
     compressed_state_format: bool = False,
+    start_time_rows: Iterable[Row] | None = None,
 ) -> MutableMapping[str, list[State | dict[str, Any]]]:
     """Convert SQL results into JSON friendly data structure.
 
@@ -570,9 +700,8 @@ def _sorted_states_to_dict(
     # Get the states at the start time
     initial_states: dict[int, Row] = {}
     if include_start_time_state:
-        initial_states = {
-            row[metadata_id_idx]: row
-            for row in _get_rows_with_session(
+        if start_time_rows is None:
+            start_time_rows = _get_rows_with_session(
                 hass,
                 session,
                 start_time,
@@ -580,7 +709,7 @@ def _sorted_states_to_dict(
                 entity_id_to_metadata_id,
                 no_attributes=no_attributes,
             )
-        }
+        initial_states = {row[metadata_id_idx]: row for row in start_time_rows}
 
     if len(entity_ids) == 1:
         metadata_id = entity_id_to_metadata_id[entity_ids[0]]
@@ -56,13 +56,17 @@ from .db_schema import (
     STATISTICS_TABLES,
     TABLE_STATES,
     Base,
+    ContextOrigins,
     Events,
     EventTypes,
     SchemaChanges,
     States,
     StatesMeta,
     Statistics,
+    StatisticsDay,
     StatisticsMeta,
+    StatisticsMonth,
+    StatisticsRollupsRuns,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -1076,6 +1080,23 @@ def _apply_update(  # noqa: C901
     elif new_version == 41:
         _create_index(session_maker, "event_types", "ix_event_types_event_type")
         _create_index(session_maker, "states_meta", "ix_states_meta_entity_id")
+    elif new_version == 42:
+        # Add the day and month statistics rollups, they are
+        # filled in by a rebuild once the recorder has started
+        Base.metadata.create_all(
+            bind=engine,
+            tables=[
+                cast(Table, StatisticsDay.__table__),
+                cast(Table, StatisticsMonth.__table__),
+                cast(Table, StatisticsRollupsRuns.__table__),
+            ],
+        )
+    elif new_version == 43:
+        # Add the context origins index, it only covers the
+        # rows recorded from now on
+        Base.metadata.create_all(
+            bind=engine, tables=[cast(Table, ContextOrigins.__table__)]
+        )
     else:
         raise ValueError(f"No schema migration defined for version {new_version}")
 
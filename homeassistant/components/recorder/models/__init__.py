@@ -4,6 +4,7 @@ from __future__ import annotations
 from .context import (
     bytes_to_ulid_or_none,
     bytes_to_uuid_hex_or_none,
+    context_id_to_bytes_or_none,
     ulid_to_bytes_or_none,
     uuid_hex_to_bytes_or_none,
 )
@@ -42,6 +43,7 @@ __all__ = [
     "UnsupportedDialect",
     "bytes_to_ulid_or_none",
     "bytes_to_uuid_hex_or_none",
+    "context_id_to_bytes_or_none",
     "datetime_to_timestamp_or_none",
     "extract_metadata_ids",
     "process_datetime_to_timestamp",
@@ -6,6 +6,7 @@ from functools import lru_cache
 import logging
 from uuid import UUID
 
+from homeassistant.core import Context
 from homeassistant.util.ulid import bytes_to_ulid, ulid_to_bytes
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,6 +23,17 @@ def ulid_to_bytes_or_none(ulid: str | None) -> bytes | None:
         return None
 
 
+def context_id_to_bytes_or_none(context: Context) -> bytes | None:
+    """Convert the id of a context to bytes."""
+    try:
+        return context.id_bin
+    except ValueError as ex:
+        _LOGGER.error(
+            "Error converting ulid %s to bytes: %s", context.id, ex, exc_info=True
+        )
+        return None
+
+
 def bytes_to_ulid_or_none(_bytes: bytes | None) -> str | None:
     """Convert bytes to a ulid."""
     if _bytes is None:
@@ -114,6 +114,12 @@ class LazyState(State):
         """Set last updated datetime."""
         self._last_updated_ts = process_timestamp(value).timestamp()
 
+    @property
+    def last_updated_timestamp(self) -> float:
+        """Timestamp of last_updated."""
+        assert self._last_updated_ts is not None
+        return self._last_updated_ts
+
     def as_dict(self) -> dict[str, Any]:  # type: ignore[override]
         """Return a dict representation of the LazyState.
 
@@ -2,11 +2,12 @@
 from __future__ import annotations
 
 from collections.abc import Callable
+from dataclasses import dataclass, field
 from datetime import datetime
 from itertools import zip_longest
 import logging
 import time
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 from sqlalchemy.orm.session import Session
 
@@ -20,6 +21,7 @@ from .queries import (
     attributes_ids_exist_in_states_with_fast_in_distinct,
     data_ids_exist_in_events,
     data_ids_exist_in_events_with_fast_in_distinct,
+    delete_context_origins_rows,
     delete_event_data_rows,
     delete_event_rows,
     delete_event_types_rows,
@@ -30,12 +32,14 @@ from .queries import (
     delete_statistics_runs_rows,
     delete_statistics_short_term_rows,
     disconnect_states_rows,
+    find_context_origins_to_purge,
     find_entity_ids_to_purge,
     find_event_types_to_purge,
     find_events_to_purge,
     find_latest_statistics_runs_run_id,
     find_legacy_event_state_and_attributes_and_data_ids_to_purge,
     find_legacy_row,
+    find_oldest_state_ts,
     find_short_term_statistics_to_purge,
     find_states_to_purge,
     find_statistics_runs_to_purge,
@@ -51,6 +55,125 @@ _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATES_BATCHES_PER_PURGE = 20  # We expect ~95% de-dupe rate
 DEFAULT_EVENTS_BATCHES_PER_PURGE = 15  # We expect ~92% de-dupe rate
+MAX_STATES_BATCHES_PER_PURGE = 200
+MAX_EVENTS_BATCHES_PER_PURGE = 150
+
+# The time in seconds one slice of a purge should hold the recorder thread
+PURGE_TIME_BUDGET = 1.0
+
+
+@dataclass(slots=True)
+class PurgeProgress:
+    """Progress of a purge that runs in time boxed slices.
+
+    Each slice purges a number of batches and then the purge is queued
+    again behind the events that arrived in the meantime. The number of
+    batches is adapted to the measured latency of the database so a slice
+    takes about PURGE_TIME_BUDGET. Rows are purged oldest first, so the
+    oldest remaining state is a watermark of how far the purge got.
+    """
+
+    purge_before: datetime
+    repack: bool
+    apply_filter: bool
+    started: float = field(default_factory=time.time)
+    oldest_ts: float | None = None
+    watermark_ts: float | None = None
+    slices: int = 0
+    states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE
+    events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE
+
+    def restart(
+        self, purge_before: datetime, repack: bool, apply_filter: bool
+    ) -> PurgeProgress:
+        """Return the progress of a new purge with the adapted batch sizes."""
+        return PurgeProgress(
+            purge_before,
+            repack,
+            apply_filter,
+            states_batch_size=self.states_batch_size,
+            events_batch_size=self.events_batch_size,
+        )
+
+    def adapt_batch_sizes(self, elapsed: float) -> None:
+        """Scale the batches of the next slice to fit in the time budget."""
+        self.slices += 1
+        factor = min(max(PURGE_TIME_BUDGET / elapsed, 0.1), 2.0) if elapsed else 2.0
+        self.states_batch_size = min(
+            max(round(self.states_batch_size * factor), 1),
+            MAX_STATES_BATCHES_PER_PURGE,
+        )
+        self.events_batch_size = min(
+            max(round(self.events_batch_size * factor), 1),
+            MAX_EVENTS_BATCHES_PER_PURGE,
+        )
+
+    @property
+    def fraction_done(self) -> float:
+        """Return the fraction of the rows to purge that has been purged."""
+        if self.oldest_ts is None or self.watermark_ts is None:
+            return 0.0
+        total = dt_util.utc_to_timestamp(self.purge_before) - self.oldest_ts
+        if total <= 0:
+            return 1.0
+        return min(max((self.watermark_ts - self.oldest_ts) / total, 0.0), 1.0)
+
+    def estimated_completion(self) -> float | None:
+        """Return the estimated timestamp the purge will finish."""
+        if not (fraction_done := self.fraction_done):
+            return None
+        return self.started + (time.time() - self.started) / fraction_done
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return a dictionary representation of the progress."""
+        estimated_completion = self.estimated_completion()
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "started": dt_util.utc_from_timestamp(self.started).isoformat(),
+            "watermark": dt_util.utc_from_timestamp(self.watermark_ts).isoformat()
+            if self.watermark_ts is not None
+            else None,
+            "progress": round(self.fraction_done, 4),
+            "estimated_completion": dt_util.utc_from_timestamp(
+                estimated_completion
+            ).isoformat()
+            if estimated_completion is not None
+            else None,
+            "slices": self.slices,
+            "states_batch_size": self.states_batch_size,
+            "events_batch_size": self.events_batch_size,
+        }
+
+    def as_storage(self) -> dict[str, Any]:
+        """Return the progress to persist across restarts."""
+        return {
+            "purge_before": self.purge_before.isoformat(),
+            "repack": self.repack,
+            "apply_filter": self.apply_filter,
+            "started": self.started,
+            "oldest_ts": self.oldest_ts,
+            "watermark_ts": self.watermark_ts,
+            "slices": self.slices,
+            "states_batch_size": self.states_batch_size,
+            "events_batch_size": self.events_batch_size,
+        }
+
+    @classmethod
+    def from_storage(cls, data: dict[str, Any]) -> PurgeProgress | None:
+        """Restore the progress of a purge that did not finish."""
+        if (purge_before := dt_util.parse_datetime(data["purge_before"])) is None:
+            return None
+        return cls(
+            purge_before,
+            data["repack"],
+            data["apply_filter"],
+            data["started"],
+            data["oldest_ts"],
+            data["watermark_ts"],
+            data["slices"],
+            data["states_batch_size"],
+            data["events_batch_size"],
+        )
 
 
 @retryable_database_job("purge")
@@ -61,6 +184,7 @@ def purge_old_data(
     apply_filter: bool = False,
     events_batch_size: int = DEFAULT_EVENTS_BATCHES_PER_PURGE,
     states_batch_size: int = DEFAULT_STATES_BATCHES_PER_PURGE,
+    progress: PurgeProgress | None = None,
 ) -> bool:
     """Purge events and states older than purge_before.
 
@@ -71,6 +195,8 @@ def purge_old_data(
         purge_before.isoformat(sep=" ", timespec="seconds"),
     )
     with session_scope(session=instance.get_session()) as session:
+        if progress is not None and progress.oldest_ts is None:
+            progress.oldest_ts = progress.watermark_ts = _find_oldest_state_ts(session)
         # Purge a max of SQLITE_MAX_BIND_VARS, based on the oldest states or events record
         has_more_to_purge = False
         if instance.use_legacy_events_index and _purging_legacy_format(session):
@@ -91,6 +217,11 @@ def purge_old_data(
             has_more_to_purge |= _purge_events_and_data_ids(
                 instance, session, events_batch_size, purge_before
             )
+            if instance.context_origins_manager.active:
+                has_more_to_purge |= _purge_context_origins(
+                    session, events_batch_size, purge_before
+                )
+        instance.states_history_manager.evict_purged_before(purge_before.timestamp())
 
         statistics_runs = _select_statistics_runs_to_purge(session, purge_before)
         short_term_statistics = _select_short_term_statistics_to_purge(
@@ -105,6 +236,8 @@ def purge_old_data(
         if has_more_to_purge or statistics_runs or short_term_statistics:
             # Return false, as we might not be done yet.
             _LOGGER.debug("Purging hasn't fully completed yet")
+            if progress is not None:
+                progress.watermark_ts = _find_oldest_state_ts(session)
             return False
 
         if apply_filter and _purge_filtered_data(instance, session) is False:
@@ -125,6 +258,11 @@ def purge_old_data(
     return True
 
 
+def _find_oldest_state_ts(session: Session) -> float | None:
+    """Find the last_updated_ts of the oldest state."""
+    return session.execute(find_oldest_state_ts()).scalar()
+
+
 def _purging_legacy_format(session: Session) -> bool:
     """Check if there are any legacy event_id linked states rows remaining."""
     return bool(session.execute(find_legacy_row()).scalar())
@@ -217,6 +355,27 @@ def _purge_events_and_data_ids(
     return has_remaining_event_ids_to_purge
 
 
+def _purge_context_origins(
+    session: Session, events_batch_size: int, purge_before: datetime
+) -> bool:
+    """Purge context origins in a batch.
+
+    Returns true if there are more context origins to purge.
+    """
+    for _ in range(events_batch_size):
+        origin_ids = {
+            origin_id
+            for (origin_id,) in session.execute(
+                find_context_origins_to_purge(purge_before.timestamp())
+            )
+        }
+        if not origin_ids:
+            return False
+        deleted_rows = session.execute(delete_context_origins_rows(origin_ids))
+        _LOGGER.debug("Deleted %s context origins", deleted_rows)
+    return True
+
+
 def _select_state_attributes_ids_to_purge(
     session: Session, purge_before: datetime
 ) -> tuple[set[int], set[int]]:
@@ -635,6 +794,9 @@ def _purge_filtered_states(
         "Selected %s state_ids to remove that should be filtered", len(state_ids)
     )
     _purge_state_ids(instance, session, set(state_ids))
+    instance.states_history_manager.evict_purged_metadata_ids(
+        cast(list[int], metadata_ids_to_purge)
+    )
     # These are legacy events that are linked to a state that are no longer
     # created but since we did not remove them when we stopped adding new ones
     # we will need to purge them here.
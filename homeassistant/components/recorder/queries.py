@@ -10,6 +10,7 @@ from sqlalchemy.sql.selectable import Select
 
 from .const import SQLITE_MAX_BIND_VARS
 from .db_schema import (
+    ContextOrigins,
     EventData,
     Events,
     EventTypes,
@@ -621,19 +622,65 @@ def find_events_to_purge(purge_before: float) -> StatementLambdaElement:
     return lambda_stmt(
         lambda: select(Events.event_id, Events.data_id)
         .filter(Events.time_fired_ts < purge_before)
+        .order_by(Events.time_fired_ts)
         .limit(SQLITE_MAX_BIND_VARS)
     )
 
 
+def find_context_origins_to_purge(purge_before: float) -> StatementLambdaElement:
+    """Find context origins to purge."""
+    return lambda_stmt(
+        lambda: select(ContextOrigins.origin_id)
+        .filter(ContextOrigins.time_fired_ts < purge_before)
+        .limit(SQLITE_MAX_BIND_VARS)
+    )
+
+
+def delete_context_origins_rows(origin_ids: Iterable[int]) -> StatementLambdaElement:
+    """Delete context_origins rows."""
+    return lambda_stmt(
+        lambda: delete(ContextOrigins)
+        .where(ContextOrigins.origin_id.in_(origin_ids))
+        .execution_options(synchronize_session=False)
+    )
+
+
+def find_oldest_context_origin_ts() -> StatementLambdaElement:
+    """Find the time_fired_ts of the oldest context origin."""
+    return lambda_stmt(lambda: select(func.min(ContextOrigins.time_fired_ts)))
+
+
+def find_oldest_event_ts() -> StatementLambdaElement:
+    """Find the time_fired_ts of the oldest event."""
+    return lambda_stmt(lambda: select(func.min(Events.time_fired_ts)))
+
+
+def find_first_event_ids_by_context_ids(
+    context_id_bins: Iterable[bytes],
+) -> StatementLambdaElement:
+    """Find the first event_id recorded for each context id."""
+    return lambda_stmt(
+        lambda: select(Events.context_id_bin, func.min(Events.event_id))
+        .where(Events.context_id_bin.in_(context_id_bins))
+        .group_by(Events.context_id_bin)
+    )
+
+
 def find_states_to_purge(purge_before: float) -> StatementLambdaElement:
     """Find states to purge."""
     return lambda_stmt(
         lambda: select(States.state_id, States.attributes_id)
         .filter(States.last_updated_ts < purge_before)
+        .order_by(States.last_updated_ts)
         .limit(SQLITE_MAX_BIND_VARS)
     )
 
 
+def find_oldest_state_ts() -> StatementLambdaElement:
+    """Find the last_updated_ts of the oldest state."""
+    return lambda_stmt(lambda: select(func.min(States.last_updated_ts)))
+
+
 def find_short_term_statistics_to_purge(
     purge_before: datetime,
 ) -> StatementLambdaElement:
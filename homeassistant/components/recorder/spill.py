@@ -0,0 +1,408 @@
+"""Spill recorder events to disk when the queue is full."""
+from __future__ import annotations
+
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from typing import IO, Any, cast
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+from homeassistant.helpers.json import json_bytes
+import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
+
+from .tasks import EventTask, RecorderTask, ReplaySpilledEventsTask
+
+_LOGGER = logging.getLogger(__name__)
+
+SEGMENT_SUFFIX = ".jsonl"
+# The number of lines of a segment that were replayed and committed
+OFFSET_SUFFIX = ".offset"
+
+# event_type, data, origin, time_fired, context_id, user_id, parent_id
+_SpilledEvent = tuple[str, dict[str, Any], str, float, str, str | None, str | None]
+
+
+def _state_to_record(state: State | None) -> list[Any] | None:
+    """Convert a state to a JSON serializable record."""
+    if state is None:
+        return None
+    context = state.context
+    return [
+        state.entity_id,
+        state.state,
+        state.attributes,
+        dt_util.utc_to_timestamp(state.last_changed),
+        dt_util.utc_to_timestamp(state.last_updated),
+        context.id,
+        context.user_id,
+        context.parent_id,
+    ]
+
+
+def _record_to_state(record: list[Any] | None) -> State | None:
+    """Convert a record back to a state."""
+    if record is None:
+        return None
+    (
+        entity_id,
+        state,
+        attributes,
+        last_changed,
+        last_updated,
+        context_id,
+        user_id,
+        parent_id,
+    ) = record
+    return State(
+        entity_id,
+        state,
+        attributes,
+        dt_util.utc_from_timestamp(last_changed),
+        dt_util.utc_from_timestamp(last_updated),
+        Context(user_id, parent_id, context_id),
+    )
+
+
+def event_to_json(event: Event) -> bytes:
+    """Serialize an event to a line of a spill segment."""
+    data: dict[str, Any] = event.data
+    if event.event_type == EVENT_STATE_CHANGED:
+        data = {
+            "entity_id": data["entity_id"],
+            "old_state": _state_to_record(data.get("old_state")),
+            "new_state": _state_to_record(data.get("new_state")),
+        }
+    context = event.context
+    return json_bytes(
+        [
+            event.event_type,
+            data,
+            event.origin.value,
+            dt_util.utc_to_timestamp(event.time_fired),
+            context.id,
+            context.user_id,
+            context.parent_id,
+        ]
+    )
+
+
+def json_to_event(line: bytes) -> Event:
+    """Deserialize an event from a line of a spill segment."""
+    (
+        event_type,
+        data,
+        origin,
+        time_fired,
+        context_id,
+        user_id,
+        parent_id,
+    ) = cast(_SpilledEvent, json_loads(line))
+    if event_type == EVENT_STATE_CHANGED:
+        data = {
+            "entity_id": data["entity_id"],
+            "old_state": _record_to_state(data["old_state"]),
+            "new_state": _record_to_state(data["new_state"]),
+        }
+    return Event(
+        event_type,
+        data,
+        EventOrigin(origin),
+        dt_util.utc_from_timestamp(time_fired),
+        Context(user_id, parent_id, context_id),
+    )
+
+
+class SpillSegment:
+    """An append-only file of events spilled from the recorder queue.
+
+    Events are queued on the segment by the event loop and written by the
+    spill writer thread. Once the segment is sealed and everything queued
+    on it is written, the segment can be read back. A segment that was only
+    replayed in part is read back from the lines that were not committed.
+    """
+
+    def __init__(self, path: str, size: int = 0, written: bool = False) -> None:
+        """Initialize the segment."""
+        self.path = path
+        self.size = size
+        self.events = 0
+        self.sealed = written
+        # The lines to skip when reading, and the lines read from the file
+        self.offset = 0
+        self.read_lines = 0
+        self.pending: list[Event] = []
+        # Events that could not be written are kept in memory, in order
+        self.unwritten: list[Event] = []
+        self._file: IO[bytes] | None = None
+        self._written = threading.Event()
+        if written:
+            self._written.set()
+
+    def write(self, events: list[Event]) -> int:
+        """Write events to the segment and return the number of bytes written.
+
+        Once an event cannot be written, it and all events after it are kept
+        in memory so they are still read back in order.
+        """
+        written = 0
+        for idx, event in enumerate(events):
+            if self.unwritten:
+                self.unwritten.extend(events[idx:])
+                break
+            try:
+                line = event_to_json(event) + b"\n"
+                if self._file is None:
+                    # pylint: disable-next=consider-using-with
+                    self._file = open(self.path, "ab")
+                self._file.write(line)
+            except (OSError, ValueError, TypeError) as err:
+                _LOGGER.error(
+                    "Unable to spill event %s to disk, keeping it in memory: %s",
+                    event,
+                    err,
+                )
+                self.unwritten.extend(events[idx:])
+                break
+            written += len(line)
+        self.size += written
+        return written
+
+    def finish(self) -> None:
+        """Close the file once everything queued on a sealed segment is written."""
+        if self._file is not None:
+            try:
+                self._file.close()
+            except OSError as err:
+                _LOGGER.error("Unable to close spill segment %s: %s", self.path, err)
+            self._file = None
+        self._written.set()
+
+    def wait_written(self) -> None:
+        """Wait until the sealed segment is written."""
+        self._written.wait()
+
+    def read(self) -> Iterator[Event]:
+        """Read the events back in the order they were spilled."""
+        self.read_lines = self.offset
+        with suppress(FileNotFoundError), open(self.path, "rb") as file:
+            for line in itertools.islice(file, self.offset, None):
+                self.read_lines += 1
+                try:
+                    yield json_to_event(line)
+                except (ValueError, TypeError, KeyError):
+                    _LOGGER.warning("Skipping corrupt spilled event in %s", self.path)
+        yield from self.unwritten
+
+    def load_offset(self) -> None:
+        """Load the lines of a segment that were replayed before the restart."""
+        try:
+            with open(self.path + OFFSET_SUFFIX, "rb") as file:
+                self.offset = int(file.read())
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as err:
+            _LOGGER.error(
+                "Unable to load the replayed events of %s, replaying all: %s",
+                self.path,
+                err,
+            )
+
+    def save_offset(self, offset: int) -> None:
+        """Store the lines that were replayed so a restart resumes after them."""
+        self.offset = offset
+        try:
+            with open(self.path + OFFSET_SUFFIX, "wb") as file:
+                file.write(str(offset).encode())
+        except OSError as err:
+            _LOGGER.error(
+                "Unable to store the replayed events of %s: %s", self.path, err
+            )
+
+    def remove(self) -> None:
+        """Remove the segment from disk."""
+        for path in (self.path, self.path + OFFSET_SUFFIX):
+            with suppress(FileNotFoundError):
+                os.unlink(path)
+
+
+class SpillingQueue:
+    """A recorder task queue that spills events to disk when it is full.
+
+    Once more than max_in_memory tasks are queued, events are queued on a
+    segment and a single ReplaySpilledEventsTask takes their place in the
+    queue. The segment stays open for appending until any other task is
+    queued behind it, which keeps the tasks in order.
+
+    put is called from the event loop, so it never does any I/O. The events
+    are serialized and written by a single spill writer thread.
+    """
+
+    def __init__(self, spill_dir: str, max_in_memory: int) -> None:
+        """Initialize the queue."""
+        self._queue: queue.SimpleQueue[RecorderTask] = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._spill_dir = spill_dir
+        self._open_segment: SpillSegment | None = None
+        self._segment_paths: set[str] = set()
+        # Segments with events to write or waiting to be finished, in order
+        self._dirty_segments: dict[str, SpillSegment] = {}
+        self._writer: ThreadPoolExecutor | None = None
+        self._writing = False
+        self._shutdown = False
+        self.max_in_memory = max_in_memory
+        self.spilled_events = 0
+        self.spill_size = 0
+        self.replay_rate: float | None = None
+
+    def qsize(self) -> int:
+        """Return the number of tasks in memory."""
+        return self._queue.qsize()
+
+    def empty(self) -> bool:
+        """Return if there are no tasks in memory."""
+        return self._queue.empty()
+
+    def get(self) -> RecorderTask:
+        """Remove and return a task, waiting for one if needed."""
+        return self._queue.get()
+
+    def get_nowait(self) -> RecorderTask:
+        """Remove and return a task without waiting."""
+        return self._queue.get_nowait()
+
+    def put(self, task: RecorderTask) -> None:
+        """Add a task, spilling events to disk when the queue is full."""
+        with self._lock:
+            if (
+                isinstance(task, EventTask)
+                and not self._shutdown
+                and (
+                    self._open_segment is not None
+                    or self._queue.qsize() >= self.max_in_memory
+                )
+            ):
+                self._spill(task.event)
+                return
+            self._seal_open_segment()
+            self._queue.put(task)
+
+    def _spill(self, event: Event) -> None:
+        """Queue an event on the open segment, opening one if needed."""
+        if (segment := self._open_segment) is None:
+            segment = self._open_segment = SpillSegment(
+                os.path.join(self._spill_dir, f"{time.time_ns():020d}{SEGMENT_SUFFIX}")
+            )
+            self._segment_paths.add(segment.path)
+            self._queue.put(ReplaySpilledEventsTask(segment))
+        segment.pending.append(event)
+        segment.events += 1
+        self.spilled_events += 1
+        self._schedule_write(segment)
+
+    def _seal_open_segment(self) -> None:
+        """Stop appending to the open segment."""
+        if (segment := self._open_segment) is not None:
+            segment.sealed = True
+            self._open_segment = None
+            self._schedule_write(segment)
+
+    def _schedule_write(self, segment: SpillSegment) -> None:
+        """Make sure the spill writer handles the segment."""
+        self._dirty_segments[segment.path] = segment
+        if self._writing:
+            return
+        if self._writer is None:
+            self._writer = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix="Recorder spill"
+            )
+        self._writing = True
+        self._writer.submit(self._write_dirty_segments)
+
+    def _write_dirty_segments(self) -> None:
+        """Write the events queued on segments until there are none left."""
+        with suppress(OSError):
+            os.makedirs(self._spill_dir, exist_ok=True)
+        while True:
+            with self._lock:
+                if not self._dirty_segments:
+                    self._writing = False
+                    return
+                work = [
+                    (segment, segment.pending, segment.sealed)
+                    for segment in self._dirty_segments.values()
+                ]
+                self._dirty_segments.clear()
+                for segment, _, _ in work:
+                    segment.pending = []
+            for segment, events, sealed in work:
+                if events:
+                    written = segment.write(events)
+                    with self._lock:
+                        self.spill_size += written
+                if sealed:
+                    segment.finish()
+
+    def flush(self) -> None:
+        """Wait until the events queued so far are written."""
+        if (writer := self._writer) is not None:
+            writer.submit(lambda: None).result()
+
+    def close_segment(self, segment: SpillSegment) -> None:
+        """Stop appending to a segment and wait until it is written."""
+        with self._lock:
+            if segment is self._open_segment:
+                self._seal_open_segment()
+        segment.wait_written()
+
+    def close(self) -> None:
+        """Stop appending to the open segment so it survives a shutdown."""
+        with self._lock:
+            self._seal_open_segment()
+
+    def shutdown(self) -> None:
+        """Write the spilled events and stop the spill writer."""
+        with self._lock:
+            self._shutdown = True
+            self._seal_open_segment()
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.shutdown(wait=True)
+
+    def finish_replay(
+        self, segment: SpillSegment, replayed: int, elapsed: float
+    ) -> None:
+        """Remove a replayed segment and update the replay stats."""
+        segment.remove()
+        with self._lock:
+            self._segment_paths.discard(segment.path)
+            self.spilled_events = max(self.spilled_events - segment.events, 0)
+            self.spill_size = max(self.spill_size - segment.size, 0)
+            if elapsed > 0:
+                self.replay_rate = replayed / elapsed
+
+    def leftover_segments(self) -> list[SpillSegment]:
+        """Return segments left on disk by a previous run, oldest first."""
+        try:
+            names = sorted(os.listdir(self._spill_dir))
+        except FileNotFoundError:
+            return []
+        segments: list[SpillSegment] = []
+        for name in names:
+            path = os.path.join(self._spill_dir, name)
+            if not name.endswith(SEGMENT_SUFFIX) or path in self._segment_paths:
+                continue
+            segment = SpillSegment(path, os.path.getsize(path), written=True)
+            segment.load_offset()
+            segments.append(segment)
+            with self._lock:
+                self._segment_paths.add(path)
+                self.spill_size += segment.size
+        return segments
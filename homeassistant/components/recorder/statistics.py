@@ -14,7 +14,7 @@ import re
 from statistics import mean
 from typing import TYPE_CHECKING, Any, Literal, TypedDict, cast
 
-from sqlalchemy import Select, and_, bindparam, func, lambda_stmt, select, text
+from sqlalchemy import Select, and_, bindparam, delete, func, lambda_stmt, select, text
 from sqlalchemy.engine.row import Row
 from sqlalchemy.exc import SQLAlchemyError, StatementError
 from sqlalchemy.orm.session import Session
@@ -56,6 +56,10 @@ from .db_schema import (
     STATISTICS_TABLES,
     Statistics,
     StatisticsBase,
+    StatisticsDay,
+    StatisticsMonth,
+    StatisticsRollupBase,
+    StatisticsRollupsRuns,
     StatisticsRuns,
     StatisticsShortTerm,
 )
@@ -125,6 +129,34 @@ QUERY_STATISTICS_SUMMARY_SUM = (
     .label("rownum"),
 )
 
+QUERY_STATISTICS_ROLLUP_MEAN = (
+    Statistics.metadata_id,
+    func.avg(Statistics.mean),
+    # https://github.com/sqlalchemy/sqlalchemy/issues/9189
+    # pylint: disable-next=not-callable
+    func.count(Statistics.mean),
+    # https://github.com/sqlalchemy/sqlalchemy/issues/9189
+    # pylint: disable-next=not-callable
+    func.min(Statistics.min),
+    # https://github.com/sqlalchemy/sqlalchemy/issues/9189
+    # pylint: disable-next=not-callable
+    func.max(Statistics.max),
+)
+
+QUERY_STATISTICS_ROLLUP_SUM = (
+    Statistics.metadata_id,
+    Statistics.start_ts,
+    Statistics.last_reset_ts,
+    Statistics.state,
+    Statistics.sum,
+    func.row_number()
+    .over(  # type: ignore[no-untyped-call]
+        partition_by=Statistics.metadata_id,
+        order_by=Statistics.start_ts.desc(),
+    )
+    .label("rownum"),
+)
+
 
 STATISTIC_UNIT_TO_UNIT_CONVERTER: dict[str | None, type[BaseUnitConverter]] = {
     **{unit: DataRateConverter for unit in DataRateConverter.VALID_UNITS},
@@ -414,6 +446,279 @@ def _compile_hourly_statistics(session: Session, start: datetime) -> None:
         for metadata_id, summary_item in summary.items()
     )
 
+    if summary:
+        # Fold the new hour into its day and month
+        _fold_statistics_rollups(session, start_time_ts, summary)
+
+
+def _compile_statistics_rollup_mean_stmt(
+    start_time_ts: float, end_time_ts: float, metadata_ids: list[int] | None
+) -> StatementLambdaElement:
+    """Generate the summary mean statement for statistics rollups."""
+    stmt = lambda_stmt(
+        lambda: select(*QUERY_STATISTICS_ROLLUP_MEAN)
+        .filter(Statistics.start_ts >= start_time_ts)
+        .filter(Statistics.start_ts < end_time_ts)
+    )
+    if metadata_ids:
+        stmt += lambda q: q.filter(
+            # https://github.com/python/mypy/issues/2608
+            Statistics.metadata_id.in_(metadata_ids)  # type:ignore[arg-type]
+        )
+    stmt += lambda q: q.group_by(Statistics.metadata_id).order_by(
+        Statistics.metadata_id
+    )
+    return stmt
+
+
+def _compile_statistics_rollup_last_sum_stmt(
+    start_time_ts: float, end_time_ts: float, metadata_ids: list[int] | None
+) -> StatementLambdaElement:
+    """Generate the last sum statement for statistics rollups."""
+    if metadata_ids:
+        # https://github.com/python/mypy/issues/2608
+        filter_metadata_ids = metadata_ids
+        return lambda_stmt(
+            lambda: select(
+                subquery := (
+                    select(*QUERY_STATISTICS_ROLLUP_SUM)
+                    .filter(Statistics.start_ts >= start_time_ts)
+                    .filter(Statistics.start_ts < end_time_ts)
+                    .filter(Statistics.metadata_id.in_(filter_metadata_ids))
+                    .subquery()
+                )
+            )
+            .filter(subquery.c.rownum == 1)
+            .order_by(subquery.c.metadata_id)
+        )
+    return lambda_stmt(
+        lambda: select(
+            subquery := (
+                select(*QUERY_STATISTICS_ROLLUP_SUM)
+                .filter(Statistics.start_ts >= start_time_ts)
+                .filter(Statistics.start_ts < end_time_ts)
+                .subquery()
+            )
+        )
+        .filter(subquery.c.rownum == 1)
+        .order_by(subquery.c.metadata_id)
+    )
+
+
+def _compile_statistics_rollup(
+    session: Session,
+    table: type[StatisticsRollupBase],
+    start_time_ts: float,
+    end_time_ts: float,
+    metadata_ids: list[int] | None,
+) -> None:
+    """Roll up the hourly statistics of one day or month.
+
+    The rollup is computed like the hourly statistics are computed
+    from the 5-minute statistics:
+    - average, min max is computed by a database query
+    - sum is taken from the last hourly entry during the period
+    """
+    delete_stmt = (
+        delete(table)
+        .where(table.start_ts >= start_time_ts)
+        .where(table.start_ts < end_time_ts)
+    )
+    if metadata_ids:
+        delete_stmt = delete_stmt.where(table.metadata_id.in_(metadata_ids))
+    session.execute(delete_stmt)
+
+    summary: dict[int, StatisticDataTimestamp] = {}
+    mean_counts: dict[int, int] = {}
+    stmt = _compile_statistics_rollup_mean_stmt(
+        start_time_ts, end_time_ts, metadata_ids
+    )
+    for metadata_id, _mean, _mean_count, _min, _max in execute_stmt_lambda_element(
+        session, stmt
+    ):
+        summary[metadata_id] = {
+            "start_ts": start_time_ts,
+            "mean": _mean,
+            "min": _min,
+            "max": _max,
+        }
+        mean_counts[metadata_id] = _mean_count
+
+    stmt = _compile_statistics_rollup_last_sum_stmt(
+        start_time_ts, end_time_ts, metadata_ids
+    )
+    for metadata_id, _, last_reset_ts, state, _sum, _ in execute_stmt_lambda_element(
+        session, stmt
+    ):
+        summary[metadata_id].update(
+            {
+                "last_reset_ts": last_reset_ts,
+                "state": state,
+                "sum": _sum,
+            }
+        )
+
+    for metadata_id, summary_item in summary.items():
+        rollup = table.from_stats_ts(metadata_id, summary_item)
+        rollup.mean_count = mean_counts[metadata_id]
+        session.add(rollup)
+
+
+def _fold_statistics_rollups(
+    session: Session, start_time_ts: float, summary: dict[int, StatisticDataTimestamp]
+) -> None:
+    """Fold a newly compiled hour into the day and month it is in.
+
+    The sum of a day or month is the sum of its last hour, the hour
+    is only folded in when no later hour of the period has been
+    imported, otherwise the period is rolled up again.
+    """
+    for table, period_start_end in _statistics_rollup_periods():
+        period_start_ts, period_end_ts = period_start_end(start_time_ts)
+        later_metadata_ids = cast(
+            list[int],
+            session.scalars(
+                select(Statistics.metadata_id)
+                .filter(Statistics.start_ts > start_time_ts)
+                .filter(Statistics.start_ts < period_end_ts)
+                .filter(Statistics.metadata_id.in_(summary))
+                .distinct()
+            ).all(),
+        )
+        if later_metadata_ids:
+            _compile_statistics_rollup(
+                session, table, period_start_ts, period_end_ts, later_metadata_ids
+            )
+        rollups: dict[int | None, StatisticsRollupBase] = {
+            rollup.metadata_id: rollup
+            for rollup in session.scalars(
+                select(table)
+                .filter(table.start_ts == period_start_ts)
+                .filter(table.metadata_id.in_(summary))
+            )
+        }
+        for metadata_id, stat in summary.items():
+            if metadata_id in later_metadata_ids:
+                continue
+            _mean = stat.get("mean")
+            if (rollup := rollups.get(metadata_id)) is None:
+                rollup = table.from_stats_ts(metadata_id, stat)
+                rollup.start_ts = period_start_ts
+                rollup.mean_count = 0 if _mean is None else 1
+                session.add(rollup)
+                continue
+            if _mean is not None:
+                mean_count = rollup.mean_count or 0
+                rollup.mean = (
+                    _mean
+                    if rollup.mean is None or not mean_count
+                    else (rollup.mean * mean_count + _mean) / (mean_count + 1)
+                )
+                rollup.mean_count = mean_count + 1
+            if (_min := stat.get("min")) is not None:
+                rollup.min = _min if rollup.min is None else min(rollup.min, _min)
+            if (_max := stat.get("max")) is not None:
+                rollup.max = _max if rollup.max is None else max(rollup.max, _max)
+            rollup.last_reset_ts = stat.get("last_reset_ts")
+            rollup.state = stat.get("state")
+            rollup.sum = stat.get("sum")
+
+
+def get_statistics_rollups_time_zone() -> str:
+    """Return the time zone the days and months of the rollups are in."""
+    return str(dt_util.DEFAULT_TIME_ZONE)
+
+
+def _statistics_rollup_periods() -> (
+    tuple[
+        tuple[type[StatisticsRollupBase], Callable[[float], tuple[float, float]]], ...
+    ]
+):
+    """Return the rollup tables and functions to find the start and end of their periods."""
+    return (
+        (StatisticsDay, reduce_day_ts_factory()[1]),
+        (StatisticsMonth, reduce_month_ts_factory()[1]),
+    )
+
+
+def _update_statistics_rollups(
+    session: Session,
+    start_time_ts: float,
+    end_time_ts: float,
+    metadata_ids: list[int] | None,
+) -> None:
+    """Roll up the days and months overlapping start_time_ts - end_time_ts again."""
+    for table, period_start_end in _statistics_rollup_periods():
+        period_start_ts = period_start_end(start_time_ts)[0]
+        while period_start_ts < end_time_ts:
+            period_end_ts = period_start_end(period_start_ts)[1]
+            _compile_statistics_rollup(
+                session, table, period_start_ts, period_end_ts, metadata_ids
+            )
+            period_start_ts = period_end_ts
+
+
+def _get_next_statistic_start_stmt(start_time_ts: float) -> StatementLambdaElement:
+    """Return a statement that returns the start of the first hourly statistic."""
+    return lambda_stmt(
+        lambda: select(Statistics.start_ts)
+        .filter(Statistics.start_ts >= start_time_ts)
+        .order_by(Statistics.start_ts)
+        .limit(1)
+    )
+
+
+def get_statistics_rollups_run_time_zone(instance: Recorder) -> str | None:
+    """Return the time zone of the last finished rebuild of the rollups.
+
+    Returns None if the rollups in the database have not been rebuilt.
+    """
+    with session_scope(session=instance.get_session(), read_only=True) as session:
+        return cast(
+            str | None,
+            session.scalar(
+                select(StatisticsRollupsRuns.time_zone)
+                .order_by(StatisticsRollupsRuns.run_id.desc())
+                .limit(1)
+            ),
+        )
+
+
+def rebuild_statistics_rollups(
+    instance: Recorder, time_zone: str, start_time_ts: float | None
+) -> float | None:
+    """Rebuild the day and month statistics rollups one month at a time.
+
+    The rollups are removed before the first month is rebuilt, the
+    time zone is recorded in the database once the last month is.
+
+    Returns the start of the next month to rebuild, or None when done.
+    """
+    with session_scope(session=instance.get_session()) as session:
+        if start_time_ts is None:
+            session.execute(delete(StatisticsRollupsRuns))
+            session.execute(delete(StatisticsDay))
+            session.execute(delete(StatisticsMonth))
+            start_time_ts = 0
+        if not (
+            rows := cast(
+                Sequence[Row],
+                execute_stmt_lambda_element(
+                    session, _get_next_statistic_start_stmt(start_time_ts)
+                ),
+            )
+        ):
+            session.add(StatisticsRollupsRuns(time_zone=time_zone))
+            return None
+        _, month_start_end = reduce_month_ts_factory()
+        month_start_ts, month_end_ts = month_start_end(rows[0][0])
+        _LOGGER.debug(
+            "Rebuilding statistics rollups for %s",
+            dt_util.utc_from_timestamp(month_start_ts),
+        )
+        _update_statistics_rollups(session, month_start_ts, month_end_ts, None)
+    return month_end_ts
+
 
 @retryable_database_job("compile missing statistics")
 def compile_missing_statistics(instance: Recorder) -> bool:
@@ -461,6 +766,7 @@ def compile_statistics(instance: Recorder, start: datetime, fire_events: bool) -
     The actual calculation is delegated to the platforms.
     """
     # Return if we already have 5-minute statistics for the requested period
+    modified_statistic_ids: set[str] = set()
     with session_scope(
         session=instance.get_session(),
         exception_filter=_filter_unique_constraint_integrity_error(instance),
@@ -1550,6 +1856,28 @@ def _statistics_during_period_with_session(
     if statistic_ids is not None:
         metadata_ids = [metadata_id for metadata_id, _ in metadata.values()]
 
+    if (
+        period in ("day", "month")
+        and get_instance(hass).statistics_rollups_time_zone
+        == get_statistics_rollups_time_zone()
+        and (
+            rollup_result := _statistics_during_period_from_rollups(
+                hass,
+                session,
+                start_time,
+                end_time,
+                statistic_ids,
+                metadata,
+                metadata_ids,
+                cast(Literal["day", "month"], period),
+                units,
+                types,
+            )
+        )
+        is not None
+    ):
+        return rollup_result
+
     table: type[Statistics | StatisticsShortTerm] = (
         Statistics if period != "5minute" else StatisticsShortTerm
     )
@@ -1597,6 +1925,145 @@ def _statistics_during_period_with_session(
     return _reduce_statistics_per_month(result, types)
 
 
+def _statistics_at_start_time_stmt(
+    metadata_ids: list[int], start_time_ts: float
+) -> StatementLambdaElement:
+    """Return a statement that returns the metadata_ids with a statistic at start."""
+    return lambda_stmt(
+        lambda: select(Statistics.metadata_id)
+        .filter(Statistics.start_ts == start_time_ts)
+        .filter(Statistics.metadata_id.in_(metadata_ids))
+    )
+
+
+def _statistics_during_period_from_rollups(
+    hass: HomeAssistant,
+    session: Session,
+    start_time: datetime,
+    end_time: datetime | None,
+    statistic_ids: set[str] | None,
+    metadata: dict[str, tuple[int, StatisticMetaData]],
+    metadata_ids: list[int] | None,
+    period: Literal["day", "month"],
+    units: dict[str, str] | None,
+    types: set[Literal["last_reset", "max", "mean", "min", "state", "sum"]],
+) -> dict[str, list[StatisticsRow]] | None:
+    """Return daily or monthly statistics read from the rollups.
+
+    The complete periods are read from the rollups. The hours before the
+    first and after the last complete period are read from the hourly
+    statistics and reduced the same way as without rollups.
+
+    Returns None if start_time - end_time does not span a complete period.
+    """
+    if period == "day":
+        table: type[StatisticsDay | StatisticsMonth] = StatisticsDay
+        _, period_start_end = reduce_day_ts_factory()
+        reduce_hourly = _reduce_statistics_per_day
+    else:
+        table = StatisticsMonth
+        _, period_start_end = reduce_month_ts_factory()
+        reduce_hourly = _reduce_statistics_per_month
+
+    start_time_ts = start_time.timestamp()
+    first_start_ts, first_end_ts = period_start_end(start_time_ts)
+    rollup_start_ts = (
+        first_start_ts if first_start_ts == start_time_ts else first_end_ts
+    )
+    rollup_end_ts: float | None = None
+    if end_time is not None:
+        rollup_end_ts = period_start_end(end_time.timestamp())[0]
+        if rollup_end_ts <= rollup_start_ts:
+            return None
+    rollup_start = dt_util.utc_from_timestamp(rollup_start_ts)
+    rollup_end = (
+        dt_util.utc_from_timestamp(rollup_end_ts) if rollup_end_ts is not None else None
+    )
+
+    rollup_stats = cast(
+        Sequence[Row],
+        execute_stmt_lambda_element(
+            session,
+            _generate_statistics_during_period_stmt(
+                rollup_start, rollup_end, metadata_ids, table, types
+            ),
+        ),
+    )
+    hourly_stats: list[Row] = []
+    hourly_ranges: list[tuple[datetime, datetime | None]] = []
+    if rollup_start_ts > start_time_ts:
+        hourly_ranges.append((start_time, rollup_start))
+    if rollup_end is not None and end_time is not None and end_time > rollup_end:
+        hourly_ranges.append((rollup_end, end_time))
+    for range_start, range_end in hourly_ranges:
+        hourly_stats.extend(
+            execute_stmt_lambda_element(
+                session,
+                _generate_statistics_during_period_stmt(
+                    range_start, range_end, metadata_ids, Statistics, types
+                ),
+            )
+        )
+
+    # Without rollups the last hourly statistic before start_time is added
+    # for the statistics without a statistic at start_time, which can be
+    # told from the rows at start_time as statistics are hourly
+    if seen_metadata_ids := {
+        row[0] for row in chain(rollup_stats, hourly_stats)
+    }.difference(
+        row[0]
+        for row in execute_stmt_lambda_element(
+            session,
+            _statistics_at_start_time_stmt(
+                list({row[0] for row in chain(rollup_stats, hourly_stats)}),
+                start_time_ts,
+            ),
+        )
+    ):
+        if stats_at_start_time := _statistics_at_time(
+            session, seen_metadata_ids, Statistics, start_time, types
+        ):
+            hourly_stats.extend(stats_at_start_time)
+
+    result: dict[str, list[StatisticsRow]] = defaultdict(list)
+    if hourly_stats:
+        hourly_stats.sort(key=itemgetter(0, 1))
+        for statistic_id, rows in reduce_hourly(
+            _sorted_statistics_to_dict(
+                hass,
+                session,
+                hourly_stats,
+                statistic_ids,
+                metadata,
+                True,
+                Statistics,
+                None,
+                units,
+                types,
+            ),
+            types,
+        ).items():
+            result[statistic_id].extend(rows)
+    if rollup_stats:
+        for statistic_id, rows in _sorted_statistics_to_dict(
+            hass,
+            session,
+            rollup_stats,
+            statistic_ids,
+            metadata,
+            True,
+            table,
+            None,
+            units,
+            types,
+        ).items():
+            for row in rows:
+                row["end"] = period_start_end(row["start"])[1]
+            result[statistic_id].extend(rows)
+            result[statistic_id].sort(key=itemgetter("start"))
+    return dict(result)
+
+
 def statistics_during_period(
     hass: HomeAssistant,
     start_time: datetime,
@@ -2120,13 +2587,33 @@ def import_statistics(
 ) -> bool:
     """Process an import_statistics job."""
 
+    imported = False
     with session_scope(
         session=instance.get_session(),
         exception_filter=_filter_unique_constraint_integrity_error(instance),
     ) as session:
-        return _import_statistics_with_session(
+        imported = _import_statistics_with_session(
             instance, session, metadata, statistics, table
         )
+    if not imported:
+        return False
+
+    if table == Statistics and (
+        starts := [stat["start"].timestamp() for stat in statistics]
+    ):
+        # Roll up the imported hours once they are committed
+        with session_scope(session=instance.get_session()) as session:
+            if statistic := instance.statistics_meta_manager.get(
+                session, metadata["statistic_id"]
+            ):
+                _update_statistics_rollups(
+                    session,
+                    min(starts),
+                    max(starts) + Statistics.duration.total_seconds(),
+                    [statistic[0]],
+                )
+
+    return True
 
 
 @retryable_database_job("adjust_statistics")
@@ -2168,6 +2655,19 @@ def adjust_statistics(
             sum_adjustment,
         )
 
+        # The sum of a rollup is the sum of its last hour, which is adjusted
+        # if any hour of the period is
+        for table, period_start_end in _statistics_rollup_periods():
+            _adjust_sum_statistics(
+                session,
+                table,
+                metadata[statistic_id][0],
+                dt_util.utc_from_timestamp(
+                    period_start_end(start_time.replace(minute=0).timestamp())[0]
+                ),
+                sum_adjustment,
+            )
+
     return True
 
 
@@ -2221,6 +2721,8 @@ def change_statistics_unit(
         tables: tuple[type[StatisticsBase], ...] = (
             Statistics,
             StatisticsShortTerm,
+            StatisticsDay,
+            StatisticsMonth,
         )
         for table in tables:
             _change_statistics_unit_for_table(session, table, metadata_id, convert)
@@ -54,6 +54,18 @@ def _async_get_db_engine_info(instance: Recorder) -> dict[str, Any]:
     return db_engine_info
 
 
+@callback
+def _async_get_queue_info(instance: Recorder) -> dict[str, Any]:
+    """Get recorder queue info."""
+    queue_info: dict[str, Any] = {
+        "backlog": instance.backlog,
+        "spill_size": f"{instance.spill_size/1024/1024:.2f} MiB",
+    }
+    if (replay_rate := instance.replay_rate) is not None:
+        queue_info["replay_rate"] = f"{replay_rate:.0f} events/s"
+    return queue_info
+
+
 async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     """Get info for the info page."""
     instance = get_instance(hass)
@@ -61,6 +73,7 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
     recorder_runs_manager = instance.recorder_runs_manager
     database_name = urlparse(instance.db_url).path.lstrip("/")
     db_engine_info = _async_get_db_engine_info(instance)
+    queue_info = _async_get_queue_info(instance)
     db_stats: dict[str, Any] = {}
 
     if instance.async_db_ready.done():
@@ -71,4 +84,4 @@ async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
             "oldest_recorder_run": recorder_runs_manager.first.start,
             "current_recorder_run": recorder_runs_manager.current.start,
         }
-    return db_runs | db_stats | db_engine_info
+    return db_runs | db_stats | db_engine_info | queue_info
@@ -0,0 +1,170 @@
+"""Support managing ContextOrigins."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any, cast
+
+from lru import LRU  # pylint: disable=no-name-in-module
+from sqlalchemy import Table, insert
+from sqlalchemy.engine.row import Row
+from sqlalchemy.orm.session import Session
+
+from ..const import SQLITE_MAX_BIND_VARS
+from ..db_schema import ContextOrigins
+from ..queries import find_first_event_ids_by_context_ids
+from ..util import chunked, execute_stmt_lambda_element
+
+CACHE_SIZE = 16384
+
+
+class ContextOriginsManager:
+    """Manage the ContextOrigins table.
+
+    The first events or states row of each context is recorded as the
+    origin of the context. Contexts seen recently are kept in an LRU,
+    a context that was evicted or recorded before a restart gets
+    another row, the oldest one is the origin.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the context origins manager."""
+        self.active = False
+        # The time the origins are recorded since, every row
+        # recorded after this time has its context indexed
+        self.since_ts: float | None = None
+        self._seen: LRU = LRU(CACHE_SIZE)
+        self._pending_events: dict[bytes, dict[str, Any]] = {}
+        self._pending_states: list[tuple[dict[str, Any], dict[str, Any]]] = []
+
+    def start(self, since_ts: float) -> None:
+        """Start recording the context origins.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self.since_ts = since_ts
+        self.active = True
+
+    @property
+    def has_pending_events(self) -> bool:
+        """Return if events rows in the pending commit are origins."""
+        return bool(self._pending_events)
+
+    def _is_new_context(self, context_id_bin: bytes) -> bool:
+        """Return if the context was not seen before and mark it as seen."""
+        if not self.active or context_id_bin in self._seen:
+            return False
+        self._seen[context_id_bin] = True
+        return True
+
+    def add_pending_event(self, dbevent: dict[str, Any]) -> None:
+        """Record the events row as origin if its context is new.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        # Rows without a binary context id are never origins
+        if (
+            context_id_bin := dbevent.get("context_id_bin")
+        ) is not None and self._is_new_context(context_id_bin):
+            self._pending_events[context_id_bin] = {
+                "context_id_bin": context_id_bin,
+                "time_fired_ts": dbevent["time_fired_ts"],
+                "event_id": None,
+                "state_id": None,
+            }
+
+    def add_pending_state(self, dbstate: dict[str, Any]) -> None:
+        """Record the states row as origin if its context is new.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if (
+            context_id_bin := dbstate.get("context_id_bin")
+        ) is not None and self._is_new_context(context_id_bin):
+            origin = {
+                "context_id_bin": context_id_bin,
+                "time_fired_ts": dbstate["last_updated_ts"],
+                "event_id": None,
+                "state_id": None,
+            }
+            self._pending_states.append((origin, dbstate))
+
+    def set_event_ids(self, inserted: Iterable[Row]) -> None:
+        """Set the event_ids from the (event_id, context_id_bin) of inserted rows.
+
+        Events rows after the origin may share its context, the
+        origin is the one inserted first.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        pending_events = self._pending_events
+        for event_id, context_id_bin in inserted:
+            if context_id_bin is None or (
+                (origin := pending_events.get(context_id_bin)) is None
+            ):
+                continue
+            if origin["event_id"] is None or event_id < origin["event_id"]:
+                origin["event_id"] = event_id
+
+    def insert_pending(self, session: Session) -> None:
+        """Insert the origins of the rows inserted in the pending commit.
+
+        Must be called after the events and states rows were inserted.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        pending_events = self._pending_events
+        if missing := [
+            context_id_bin
+            for context_id_bin, origin in pending_events.items()
+            if origin["event_id"] is None
+        ]:
+            # The dialect could not return the ids of the inserted rows
+            for missing_chunk in chunked(missing, SQLITE_MAX_BIND_VARS):
+                for context_id_bin, event_id in execute_stmt_lambda_element(
+                    session, find_first_event_ids_by_context_ids(missing_chunk)
+                ):
+                    pending_events[context_id_bin]["event_id"] = event_id
+        rows = [origin for origin in pending_events.values() if origin["event_id"]]
+        for origin, dbstate in self._pending_states:
+            origin["state_id"] = dbstate["state_id"]
+            rows.append(origin)
+        if rows:
+            session.execute(insert(cast(Table, ContextOrigins.__table__)), rows)
+
+    def post_commit_pending(self) -> None:
+        """Forget the origins written by the commit.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending_events.clear()
+        self._pending_states.clear()
+
+    def rollback_pending(self) -> None:
+        """Forget the ids of the rows the failed commit inserted.
+
+        The origins stay pending, they are written again with the ids
+        of the rows when the commit is retried.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        for origin in self._pending_events.values():
+            origin["event_id"] = None
+        for origin, _ in self._pending_states:
+            origin["state_id"] = None
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._seen.clear()
+        self._pending_events.clear()
+        self._pending_states.clear()
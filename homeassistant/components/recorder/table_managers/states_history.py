@@ -0,0 +1,321 @@
+"""Keep recent states in memory to answer history queries without SQL."""
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import Iterable
+import math
+import threading
+import time
+from typing import Any, NamedTuple
+
+from ..const import (
+    STATES_HISTORY_CACHE_MAX_ROWS,
+    STATES_HISTORY_CACHE_TRIM_INTERVAL,
+    STATES_HISTORY_CACHE_WINDOW,
+)
+
+_NAN = math.nan
+
+
+class CachedStateRow(NamedTuple):
+    """A states row answered from memory.
+
+    The fields match the columns selected by history queries
+    that do not include attributes.
+    """
+
+    metadata_id: int
+    state: str | None
+    last_changed_ts: float | None
+    last_updated_ts: float
+
+
+class CachedStates(NamedTuple):
+    """The result of a history query answered from memory."""
+
+    rows: list[CachedStateRow]
+    start_time_rows: list[CachedStateRow]
+    missing_start_time_states: list[int]
+
+
+class _StatesSeries:
+    """The states of a single entity stored as columns.
+
+    The series holds every committed row of the entity
+    with a last_updated_ts at or after start_ts.
+    """
+
+    __slots__ = ("start_ts", "last_updated_ts", "last_changed_ts", "states")
+
+    def __init__(self, start_ts: float) -> None:
+        """Initialize an empty series."""
+        self.start_ts = start_ts
+        self.last_updated_ts = array("d")
+        # NaN stands in for a last_changed_ts of None
+        self.last_changed_ts = array("d")
+        self.states: list[str | None] = []
+
+    def __len__(self) -> int:
+        """Return the number of rows in the series."""
+        return len(self.states)
+
+    def append(
+        self, state: str | None, last_changed_ts: float | None, last_updated_ts: float
+    ) -> None:
+        """Add a row, keeping the series sorted by last_updated_ts."""
+        changed_ts = _NAN if last_changed_ts is None else last_changed_ts
+        updated = self.last_updated_ts
+        if not updated or last_updated_ts >= updated[-1]:
+            updated.append(last_updated_ts)
+            self.last_changed_ts.append(changed_ts)
+            self.states.append(state)
+            return
+        idx = bisect_right(updated, last_updated_ts)
+        updated.insert(idx, last_updated_ts)
+        self.last_changed_ts.insert(idx, changed_ts)
+        self.states.insert(idx, state)
+
+    def _remove_before(self, idx: int) -> None:
+        """Remove the rows before idx."""
+        del self.last_updated_ts[:idx]
+        del self.last_changed_ts[:idx]
+        del self.states[:idx]
+
+    def trim(self, cutoff_ts: float) -> int:
+        """Remove rows older than cutoff_ts but keep the newest of them.
+
+        The newest row before the cutoff is the state at the start of
+        the window so it is kept to answer queries starting in the window.
+        """
+        if (idx := bisect_left(self.last_updated_ts, cutoff_ts) - 1) <= 0:
+            return 0
+        self._remove_before(idx)
+        self.start_ts = max(self.start_ts, self.last_updated_ts[0])
+        return idx
+
+    def evict_before(self, purge_before_ts: float) -> int:
+        """Remove every row older than purge_before_ts."""
+        idx = bisect_left(self.last_updated_ts, purge_before_ts)
+        self._remove_before(idx)
+        self.start_ts = max(self.start_ts, purge_before_ts)
+        return idx
+
+    def row(
+        self, metadata_id: int, idx: int, include_last_changed: bool
+    ) -> CachedStateRow:
+        """Return the row at idx."""
+        last_changed_ts: float | None = None
+        if include_last_changed and not math.isnan(
+            changed_ts := self.last_changed_ts[idx]
+        ):
+            last_changed_ts = changed_ts
+        return CachedStateRow(
+            metadata_id, self.states[idx], last_changed_ts, self.last_updated_ts[idx]
+        )
+
+
+class StatesHistoryManager:
+    """Keep the recent states of each entity in memory.
+
+    Rows are fed from the write path once they are committed and
+    kept for STATES_HISTORY_CACHE_WINDOW seconds. When more than
+    max_rows are held the least recently used series are dropped.
+
+    Queries that reach before the cached part of a series
+    return None so the caller falls back to the database.
+    """
+
+    def __init__(
+        self,
+        window: float = STATES_HISTORY_CACHE_WINDOW,
+        max_rows: int = STATES_HISTORY_CACHE_MAX_ROWS,
+    ) -> None:
+        """Initialize the states history manager."""
+        self.active = False
+        self.window = window
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._series: OrderedDict[int, _StatesSeries] = OrderedDict()
+        self._evicted: dict[int, float] = {}
+        self._pending: list[tuple[int, str | None, float | None, float]] = []
+        self._start_ts = 0.0
+        self._rows = 0
+        self._next_trim_ts = 0.0
+
+    @property
+    def rows(self) -> int:
+        """Return the number of rows held in memory."""
+        return self._rows
+
+    def start(self, start_ts: float) -> None:
+        """Start caching the states committed after start_ts.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        with self._lock:
+            self._clear(start_ts)
+            self.active = True
+
+    def _clear(self, start_ts: float) -> None:
+        """Drop every series and only trust rows after start_ts."""
+        self._series.clear()
+        self._evicted.clear()
+        self._pending.clear()
+        self._start_ts = start_ts
+        self._rows = 0
+
+    def add_pending(self, dbstate: dict[str, Any]) -> None:
+        """Add a states row that is about to be committed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if self.active and (metadata_id := dbstate.get("metadata_id")) is not None:
+            self._pending.append(
+                (
+                    metadata_id,
+                    dbstate["state"],
+                    dbstate["last_changed_ts"],
+                    dbstate["last_updated_ts"],
+                )
+            )
+
+    def discard_pending(self) -> None:
+        """Discard the rows added by a commit attempt that failed.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        self._pending.clear()
+
+    def post_commit_pending(self) -> None:
+        """Call after commit to move the committed rows into the cache.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        if not self._pending:
+            return
+        now = time.time()
+        with self._lock:
+            series = self._series
+            for metadata_id, state, last_changed_ts, last_updated_ts in self._pending:
+                if (entity_series := series.get(metadata_id)) is None:
+                    entity_series = series[metadata_id] = _StatesSeries(
+                        self._evicted.pop(metadata_id, self._start_ts)
+                    )
+                entity_series.append(state, last_changed_ts, last_updated_ts)
+            self._rows += len(self._pending)
+            self._pending.clear()
+            if now >= self._next_trim_ts:
+                self._next_trim_ts = now + STATES_HISTORY_CACHE_TRIM_INTERVAL
+                cutoff_ts = now - self.window
+                self._rows -= sum(
+                    entity_series.trim(cutoff_ts) for entity_series in series.values()
+                )
+            while self._rows > self.max_rows and series:
+                metadata_id, entity_series = series.popitem(last=False)
+                self._rows -= len(entity_series)
+                self._evicted[metadata_id] = now
+
+    def reset(self) -> None:
+        """Reset after the database has been reset or changed.
+
+        Rows that were not committed are lost so only states
+        committed from now on are trusted.
+
+        This call is not thread-safe and must be called from the
+        recorder thread.
+        """
+        with self._lock:
+            self._clear(time.time())
+
+    def evict_purged_before(self, purge_before_ts: float) -> None:
+        """Evict the rows removed by a purge of states before purge_before_ts."""
+        with self._lock:
+            self._start_ts = max(self._start_ts, purge_before_ts)
+            for entity_series in self._series.values():
+                self._rows -= entity_series.evict_before(purge_before_ts)
+
+    def evict_purged_metadata_ids(self, metadata_ids: Iterable[int]) -> None:
+        """Evict the series of entities whose states were purged."""
+        now = time.time()
+        with self._lock:
+            for metadata_id in metadata_ids:
+                if (entity_series := self._series.pop(metadata_id, None)) is not None:
+                    self._rows -= len(entity_series)
+                self._evicted[metadata_id] = now
+
+    def get_significant_states(
+        self,
+        metadata_ids: list[int],
+        metadata_ids_in_significant_domains: list[int],
+        start_ts: float,
+        end_ts: float | None,
+        significant_changes_only: bool,
+        include_start_time_state: bool,
+    ) -> CachedStates | None:
+        """Return the states of the metadata_ids between start_ts and end_ts.
+
+        The rows match the rows the database returns for the same query
+        without attributes, sorted by metadata_id and last_updated_ts.
+        The metadata_ids without a start time state in memory are listed
+        so the caller can look them up in the database.
+
+        Returns None if the range is not fully held in memory.
+        """
+        if not self.active:
+            return None
+        significant_domain_ids = set(metadata_ids_in_significant_domains)
+        rows: list[CachedStateRow] = []
+        start_time_rows: list[CachedStateRow] = []
+        missing_start_time_states: list[int] = []
+        with self._lock:
+            series = self._series
+            for metadata_id in sorted(metadata_ids):
+                if (entity_series := series.get(metadata_id)) is None:
+                    if start_ts < self._evicted.get(metadata_id, self._start_ts):
+                        return None
+                    if include_start_time_state:
+                        missing_start_time_states.append(metadata_id)
+                    continue
+                if start_ts < entity_series.start_ts:
+                    return None
+                series.move_to_end(metadata_id)
+                updated = entity_series.last_updated_ts
+                lo = bisect_right(updated, start_ts)
+                hi = len(updated) if end_ts is None else bisect_left(updated, end_ts)
+                if include_start_time_state:
+                    if (idx := bisect_left(updated, start_ts) - 1) >= 0 and updated[
+                        idx
+                    ] >= entity_series.start_ts:
+                        start_time_rows.append(
+                            entity_series.row(metadata_id, idx, True)
+                        )
+                    else:
+                        missing_start_time_states.append(metadata_id)
+                if not significant_changes_only:
+                    rows.extend(
+                        entity_series.row(metadata_id, idx, True)
+                        for idx in range(lo, hi)
+                    )
+                    continue
+                if metadata_id in significant_domain_ids:
+                    rows.extend(
+                        entity_series.row(metadata_id, idx, False)
+                        for idx in range(lo, hi)
+                    )
+                    continue
+                # Only rows where the state changed are significant,
+                # last_changed_ts is not returned for them
+                changed = entity_series.last_changed_ts
+                rows.extend(
+                    entity_series.row(metadata_id, idx, False)
+                    for idx in range(lo, hi)
+                    if math.isnan(changed_ts := changed[idx])
+                    or changed_ts == updated[idx]
+                )
+        return CachedStates(rows, start_time_rows, missing_start_time_states)
@@ -8,6 +8,7 @@ from dataclasses import dataclass
 from datetime import datetime
 import logging
 import threading
+import time
 from typing import TYPE_CHECKING, Any
 
 from homeassistant.core import Event
@@ -24,6 +25,7 @@ _LOGGER = logging.getLogger(__name__)
 
 if TYPE_CHECKING:
     from .core import Recorder
+    from .spill import SpillSegment
 
 
 @dataclass(slots=True)
@@ -110,9 +112,30 @@ class PurgeTask(RecorderTask):
 
     def run(self, instance: Recorder) -> None:
         """Purge the database."""
+        progress = instance.purge_progress
+        if progress is None:
+            progress = instance.purge_progress = purge.PurgeProgress(
+                self.purge_before, self.repack, self.apply_filter
+            )
+        elif progress.purge_before != self.purge_before:
+            # Start over but keep the batch sizes adapted to the database
+            progress = instance.purge_progress = progress.restart(
+                self.purge_before, self.repack, self.apply_filter
+            )
+        start = time.monotonic()
         if purge.purge_old_data(
-            instance, self.purge_before, self.repack, self.apply_filter
+            instance,
+            self.purge_before,
+            self.repack,
+            self.apply_filter,
+            progress.events_batch_size,
+            progress.states_batch_size,
+            progress,
         ):
+            instance.purge_progress = None
+            if progress.slices:
+                # Forget the progress persisted by the previous slices
+                instance.save_purge_progress()
             with instance.get_session() as session:
                 instance.recorder_runs_manager.load_from_db(session)
             # We always need to do the db cleanups after a purge
@@ -120,7 +143,10 @@ class PurgeTask(RecorderTask):
             # tasks happen after a vacuum.
             periodic_db_cleanups(instance)
             return
-        # Schedule a new purge task if this one didn't finish
+        progress.adapt_batch_sizes(time.monotonic() - start)
+        instance.save_purge_progress()
+        # Schedule a new purge task if this one didn't finish, behind the
+        # events that were queued while this slice was running
         instance.queue_task(
             PurgeTask(self.purge_before, self.repack, self.apply_filter)
         )
@@ -281,6 +307,19 @@ class EventTask(RecorderTask):
         instance._process_one_event(self.event)
 
 
+@dataclass(slots=True)
+class ReplaySpilledEventsTask(RecorderTask):
+    """Events that were spilled to disk when the queue was full."""
+
+    segment: SpillSegment
+    commit_before = False
+
+    def run(self, instance: Recorder) -> None:
+        """Handle the task."""
+        # pylint: disable-next=[protected-access]
+        instance._replay_spilled_events(self.segment)
+
+
 @dataclass(slots=True)
 class KeepAliveTask(RecorderTask):
     """A keep alive to be sent."""
@@ -361,6 +400,31 @@ class StatisticsTimestampMigrationCleanupTask(RecorderTask):
             instance.queue_task(StatisticsTimestampMigrationCleanupTask())
 
 
+@dataclass(slots=True)
+class RebuildStatisticsRollupsTask(RecorderTask):
+    """An object to insert into the recorder queue to rebuild the statistics rollups."""
+
+    time_zone: str
+    start_time_ts: float | None = None
+
+    def run(self, instance: Recorder) -> None:
+        """Rebuild the statistics rollups of the next month."""
+        if statistics.get_statistics_rollups_time_zone() != self.time_zone:
+            # The time zone changed again, a rebuild for the new
+            # time zone has been queued
+            return
+        if (
+            next_start_time_ts := statistics.rebuild_statistics_rollups(
+                instance, self.time_zone, self.start_time_ts
+            )
+        ) is None:
+            instance.statistics_rollups_rebuilt(self.time_zone)
+            return
+        instance.queue_task(
+            RebuildStatisticsRollupsTask(self.time_zone, next_start_time_ts)
+        )
+
+
 @dataclass(slots=True)
 class AdjustLRUSizeTask(RecorderTask):
     """An object to insert into the recorder queue to adjust the LRU size."""
@@ -438,6 +502,7 @@ class EntityIDMigrationTask(RecorderTask):
             # at this point we can also start using the StatesMeta table
             # so we set active to True
             instance.states_meta_manager.active = True
+            instance.states_history_manager.start(time.time())
             instance.queue_task(EntityIDPostMigrationTask())
 
 
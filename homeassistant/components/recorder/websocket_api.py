@@ -86,6 +86,7 @@ def async_setup(hass: HomeAssistant) -> None:
     websocket_api.async_register_command(hass, ws_list_statistic_ids)
     websocket_api.async_register_command(hass, ws_import_statistics)
     websocket_api.async_register_command(hass, ws_info)
+    websocket_api.async_register_command(hass, ws_purge_progress)
     websocket_api.async_register_command(hass, ws_update_statistics_metadata)
     websocket_api.async_register_command(hass, ws_validate_statistics)
 
@@ -513,6 +514,21 @@ def ws_info(
     connection.send_result(msg["id"], recorder_info)
 
 
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): "recorder/purge_progress",
+    }
+)
+@callback
+def ws_purge_progress(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Return the progress of the running purge."""
+    instance = get_instance(hass)
+    progress = instance.purge_progress if instance else None
+    connection.send_result(msg["id"], progress.as_dict() if progress else None)
+
+
 @websocket_api.ws_require_user(only_supervisor=True)
 @websocket_api.websocket_command({vol.Required("type"): "backup/start"})
 @websocket_api.async_response
@@ -173,6 +173,16 @@ class SensorEntity(Entity):
     _sensor_option_display_precision: int | None = None
     _sensor_option_unit_of_measurement: str | None | UndefinedType = UNDEFINED
 
+    # Sensors that set _cache_static_attributes must invalidate them when one
+    # of these changes, the sensor options of the registry entry are handled
+    _static_attributes_properties = Entity._static_attributes_properties | {
+        "native_unit_of_measurement",
+        "options",
+        "state_class",
+        "suggested_unit_of_measurement",
+        "unique_id",
+    }
+
     @callback
     def add_to_platform_start(
         self,
@@ -205,6 +215,7 @@ class SensorEntity(Entity):
             # Prime _sensor_option_unit_of_measurement to ensure the correct unit
             # is stored in the entity registry.
             self._sensor_option_unit_of_measurement = self._get_initial_suggested_unit()
+            self.async_invalidate_static_attributes()
             return
 
         registry_entry = registry.async_get(entity_id)
@@ -781,6 +792,7 @@ class SensorEntity(Entity):
             self._sensor_option_unit_of_measurement = self._custom_unit_or_undef(
                 f"{DOMAIN}.private", "suggested_unit_of_measurement"
             )
+        self.async_invalidate_static_attributes()
 
 
 @dataclass
@@ -44,6 +44,14 @@ from .const import (
     SensorStateClass,
 )
 
+try:
+    # NumPy is optional, statistics are compiled in plain Python without it
+    import numpy as np
+
+    NUMPY_IMPORTED = True
+except ImportError:
+    NUMPY_IMPORTED = False
+
 _LOGGER = logging.getLogger(__name__)
 
 DEFAULT_STATISTICS = {
@@ -71,6 +79,13 @@ WARN_UNSTABLE_UNIT = "sensor_warn_unstable_unit"
 # Link to dev statistics where issues around LTS can be fixed
 LINK_DEV_STATISTICS = "https://my.home-assistant.io/redirect/developer_statistics"
 
+# Entities with fewer valid states during the period are compiled without
+# NumPy, if it is installed, since creating the arrays costs more than it saves
+VECTORIZE_MIN_STATES = 16
+
+_ONE_MICROSECOND = datetime.timedelta(microseconds=1)
+_EPOCH = dt_util.utc_from_timestamp(0)
+
 
 def _get_sensor_states(hass: HomeAssistant) -> list[State]:
     """Get the current state of all sensors for which to compile statistics."""
@@ -131,6 +146,44 @@ def _time_weighted_average(
     return accumulated / period_seconds
 
 
+def _time_weighted_average_vectorized(
+    values: np.ndarray,
+    fstates: list[tuple[float, State]],
+    start: datetime.datetime,
+    end: datetime.datetime,
+) -> float:
+    """Calculate a time weighted average of an array of states.
+
+    The result is identical to _time_weighted_average: the durations are
+    kept in whole microseconds like timedeltas are and the weighted
+    states are accumulated in the same order.
+    """
+    timestamps = np.fromiter(
+        (state.last_updated_timestamp for _, state in fstates),
+        dtype=np.float64,
+        count=len(fstates),
+    )
+    # Split the timestamps and round the fractions half to even like
+    # datetime.fromtimestamp does to get the exact microseconds
+    fractions, seconds = np.modf(timestamps)
+    microseconds = seconds.astype(np.int64) * 1_000_000 + np.rint(
+        fractions * 1e6
+    ).astype(np.int64)
+    # The recorder will give us the last known state, which may be well
+    # before the requested start time for the statistics
+    offsets = np.maximum(microseconds - (start - _EPOCH) // _ONE_MICROSECOND, 0)
+    end_offset = (end - start) // _ONE_MICROSECOND
+    # Adjust start time, if there was no last known state
+    period_microseconds = end_offset - int(offsets[0])
+    if period_microseconds == 0:
+        # See _time_weighted_average
+        return 0.0
+    durations = np.diff(offsets, append=end_offset) / 1e6
+    # cumsum adds in order, starting from 0.0 like _time_weighted_average
+    accumulated = np.cumsum(np.concatenate(((0.0,), values * durations)))[-1]
+    return float(accumulated) / (period_microseconds / 10**6)
+
+
 def _get_units(fstates: list[tuple[float, State]]) -> set[str | None]:
     """Return a set of all units."""
     return {item[1].attributes.get(ATTR_UNIT_OF_MEASUREMENT) for item in fstates}
@@ -386,6 +439,260 @@ def _timestamp_to_isoformat_or_none(timestamp: float | None) -> str | None:
     return dt_util.utc_from_timestamp(timestamp).isoformat()
 
 
+def _compile_sum(
+    hass: HomeAssistant,
+    entity_id: str,
+    state_class: str,
+    valid_float_states: list[tuple[float, State]],
+    last_stat: statistics.StatisticsRow | None,
+) -> tuple[str | None, float, float] | None:
+    """Compile the sum of a sensor with state class total or total_increasing.
+
+    Returns last_reset, sum and state or None if there are no valid updates.
+    """
+    last_reset = old_last_reset = None
+    new_state = old_state = None
+    _sum = 0.0
+    if last_stat is not None:
+        # We have compiled history for this sensor before,
+        # use that as a starting point.
+        last_reset = _timestamp_to_isoformat_or_none(last_stat["last_reset"])
+        old_last_reset = last_reset
+        new_state = old_state = last_stat["state"]
+        _sum = last_stat["sum"] or 0.0
+
+    for fstate, state in valid_float_states:
+        reset = False
+        if (
+            state_class != SensorStateClass.TOTAL_INCREASING
+            and (
+                last_reset := _last_reset_as_utc_isoformat(
+                    state.attributes.get("last_reset"), entity_id
+                )
+            )
+            != old_last_reset
+            and last_reset is not None
+        ):
+            if old_state is None:
+                _LOGGER.info(
+                    (
+                        "Compiling initial sum statistics for %s, zero point"
+                        " set to %s"
+                    ),
+                    entity_id,
+                    fstate,
+                )
+            else:
+                _LOGGER.info(
+                    (
+                        "Detected new cycle for %s, last_reset set to %s (old"
+                        " last_reset %s)"
+                    ),
+                    entity_id,
+                    last_reset,
+                    old_last_reset,
+                )
+            reset = True
+        elif old_state is None and last_reset is None:
+            reset = True
+            _LOGGER.info(
+                "Compiling initial sum statistics for %s, zero point set to %s",
+                entity_id,
+                fstate,
+            )
+        elif state_class == SensorStateClass.TOTAL_INCREASING:
+            try:
+                if old_state is None or reset_detected(
+                    hass, entity_id, fstate, new_state, state
+                ):
+                    reset = True
+                    _LOGGER.info(
+                        (
+                            "Detected new cycle for %s, value dropped from %s"
+                            " to %s, triggered by state with last_updated set"
+                            " to %s"
+                        ),
+                        entity_id,
+                        new_state,
+                        fstate,
+                        state.last_updated.isoformat(),
+                    )
+            except HomeAssistantError:
+                continue
+
+        if reset:
+            # The sensor has been reset, update the sum
+            if old_state is not None and new_state is not None:
+                _sum += new_state - old_state
+            # ..and update the starting point
+            new_state = fstate
+            old_last_reset = last_reset
+            # Force a new cycle for an existing sensor to start at 0
+            if old_state is not None:
+                old_state = 0.0
+            else:
+                old_state = new_state
+        else:
+            new_state = fstate
+
+    if new_state is None or old_state is None:
+        # No valid updates
+        return None
+
+    # Update the sum with the last state
+    _sum += new_state - old_state
+    return last_reset, _sum, new_state
+
+
+def _compile_sum_vectorized(
+    hass: HomeAssistant,
+    entity_id: str,
+    state_class: str,
+    valid_float_states: list[tuple[float, State]],
+    values: np.ndarray,
+    last_stat: statistics.StatisticsRow | None,
+) -> tuple[str | None, float, float] | None:
+    """Compile the sum of a sensor from an array of its states.
+
+    Only the states where the sensor was reset are walked to update the
+    sum, in the same order as _compile_sum does, so the result is identical.
+
+    Returns last_reset, sum and state or None if there are no valid updates.
+    """
+    last_reset = old_last_reset = None
+    new_state = old_state = None
+    _sum = 0.0
+    if last_stat is not None:
+        # We have compiled history for this sensor before,
+        # use that as a starting point.
+        last_reset = _timestamp_to_isoformat_or_none(last_stat["last_reset"])
+        old_last_reset = last_reset
+        new_state = old_state = last_stat["state"]
+        _sum = last_stat["sum"] or 0.0
+
+    if state_class == SensorStateClass.TOTAL_INCREASING:
+        indices = np.arange(len(values))
+        # Without a previous state the first state starts a new cycle,
+        # the other states are checked like reset_detected does
+        checked = indices >= (0 if old_state is not None else 1)
+        negative = checked & (values < 0)
+        # Negative states are skipped, so the previous state of a state
+        # is the last state before it which is not negative
+        last_valid = np.maximum.accumulate(np.where(negative, -1, indices))
+        previous_idx = np.concatenate((np.array([-1]), last_valid[:-1]))
+        previous = np.where(
+            previous_idx >= 0,
+            values[previous_idx],
+            math.nan if new_state is None else new_state,
+        )
+        threshold = 0.9 * previous
+        dip = checked & (threshold <= values) & (values < previous)
+        for idx in np.flatnonzero(dip | negative):
+            state = valid_float_states[idx][1]
+            if dip[idx]:
+                warn_dip(hass, entity_id, state, float(previous[idx]))
+            if negative[idx]:
+                warn_negative(hass, entity_id, state)
+        reset = ~negative & (values < threshold)
+        if old_state is None:
+            reset[0] = True
+
+        for idx in np.flatnonzero(reset):
+            fstate, state = valid_float_states[idx]
+            previous_state = (
+                float(previous[idx]) if previous_idx[idx] >= 0 else new_state
+            )
+            if old_state is None and last_reset is None:
+                _LOGGER.info(
+                    "Compiling initial sum statistics for %s, zero point set to %s",
+                    entity_id,
+                    fstate,
+                )
+            else:
+                _LOGGER.info(
+                    (
+                        "Detected new cycle for %s, value dropped from %s"
+                        " to %s, triggered by state with last_updated set"
+                        " to %s"
+                    ),
+                    entity_id,
+                    previous_state,
+                    fstate,
+                    state.last_updated.isoformat(),
+                )
+            # The sensor has been reset, update the sum
+            if old_state is not None and previous_state is not None:
+                _sum += previous_state - old_state
+            # Force a new cycle for an existing sensor to start at 0
+            old_state = 0.0 if old_state is not None else fstate
+
+        if (last_idx := last_valid[-1]) >= 0:
+            new_state = valid_float_states[last_idx][0]
+    else:
+        # The sensor can only be reset where last_reset changes,
+        # so each distinct last_reset is parsed once
+        parsed_last_resets: dict[str, str | None] = {}
+        previous_last_reset_s: Any = None
+        for idx, (fstate, state) in enumerate(valid_float_states):
+            last_reset_s = state.attributes.get("last_reset")
+            if idx and last_reset_s == previous_last_reset_s:
+                continue
+            previous_last_reset_s = last_reset_s
+            if isinstance(last_reset_s, str) and last_reset_s in parsed_last_resets:
+                last_reset = parsed_last_resets[last_reset_s]
+            else:
+                last_reset = _last_reset_as_utc_isoformat(last_reset_s, entity_id)
+                if isinstance(last_reset_s, str):
+                    parsed_last_resets[last_reset_s] = last_reset
+
+            if last_reset != old_last_reset and last_reset is not None:
+                if old_state is None:
+                    _LOGGER.info(
+                        (
+                            "Compiling initial sum statistics for %s, zero point"
+                            " set to %s"
+                        ),
+                        entity_id,
+                        fstate,
+                    )
+                else:
+                    _LOGGER.info(
+                        (
+                            "Detected new cycle for %s, last_reset set to %s (old"
+                            " last_reset %s)"
+                        ),
+                        entity_id,
+                        last_reset,
+                        old_last_reset,
+                    )
+            elif old_state is None and last_reset is None:
+                _LOGGER.info(
+                    "Compiling initial sum statistics for %s, zero point set to %s",
+                    entity_id,
+                    fstate,
+                )
+            else:
+                continue
+
+            previous_state = valid_float_states[idx - 1][0] if idx else new_state
+            # The sensor has been reset, update the sum
+            if old_state is not None and previous_state is not None:
+                _sum += previous_state - old_state
+            old_last_reset = last_reset
+            # Force a new cycle for an existing sensor to start at 0
+            old_state = 0.0 if old_state is not None else fstate
+
+        new_state = valid_float_states[-1][0]
+
+    if new_state is None or old_state is None:
+        # No valid updates
+        return None
+
+    # Update the sum with the last state
+    _sum += new_state - old_state
+    return last_reset, _sum, new_state
+
+
 def compile_statistics(
     hass: HomeAssistant, start: datetime.datetime, end: datetime.datetime
 ) -> statistics.PlatformCompiledStatistics:
@@ -529,117 +836,57 @@ def _compile_statistics(  # noqa: C901
 
         # Make calculations
         stat: StatisticData = {"start": start}
+        values: np.ndarray | None = None
+        if NUMPY_IMPORTED and len(valid_float_states) >= VECTORIZE_MIN_STATES:
+            values = np.fromiter(
+                (fstate for fstate, _ in valid_float_states),
+                dtype=np.float64,
+                count=len(valid_float_states),
+            )
         if "max" in wanted_statistics[entity_id]:
-            stat["max"] = max(
-                *itertools.islice(
-                    zip(*valid_float_states),  # type: ignore[typeddict-item]
-                    1,
+            if values is not None:
+                # argmax returns the first maximum like max does
+                stat["max"] = float(values[values.argmax()])
+            else:
+                stat["max"] = max(
+                    *itertools.islice(
+                        zip(*valid_float_states),  # type: ignore[typeddict-item]
+                        1,
+                    )
                 )
-            )
         if "min" in wanted_statistics[entity_id]:
-            stat["min"] = min(
-                *itertools.islice(
-                    zip(*valid_float_states),  # type: ignore[typeddict-item]
-                    1,
+            if values is not None:
+                stat["min"] = float(values[values.argmin()])
+            else:
+                stat["min"] = min(
+                    *itertools.islice(
+                        zip(*valid_float_states),  # type: ignore[typeddict-item]
+                        1,
+                    )
                 )
-            )
 
         if "mean" in wanted_statistics[entity_id]:
-            stat["mean"] = _time_weighted_average(valid_float_states, start, end)
+            if values is not None:
+                stat["mean"] = _time_weighted_average_vectorized(
+                    values, valid_float_states, start, end
+                )
+            else:
+                stat["mean"] = _time_weighted_average(valid_float_states, start, end)
 
         if "sum" in wanted_statistics[entity_id]:
-            last_reset = old_last_reset = None
-            new_state = old_state = None
-            _sum = 0.0
-            if entity_id in last_stats:
-                # We have compiled history for this sensor before,
-                # use that as a starting point.
-                last_stat = last_stats[entity_id][0]
-                last_reset = _timestamp_to_isoformat_or_none(last_stat["last_reset"])
-                old_last_reset = last_reset
-                new_state = old_state = last_stat["state"]
-                _sum = last_stat["sum"] or 0.0
-
-            for fstate, state in valid_float_states:
-                reset = False
-                if (
-                    state_class != SensorStateClass.TOTAL_INCREASING
-                    and (
-                        last_reset := _last_reset_as_utc_isoformat(
-                            state.attributes.get("last_reset"), entity_id
-                        )
-                    )
-                    != old_last_reset
-                    and last_reset is not None
-                ):
-                    if old_state is None:
-                        _LOGGER.info(
-                            (
-                                "Compiling initial sum statistics for %s, zero point"
-                                " set to %s"
-                            ),
-                            entity_id,
-                            fstate,
-                        )
-                    else:
-                        _LOGGER.info(
-                            (
-                                "Detected new cycle for %s, last_reset set to %s (old"
-                                " last_reset %s)"
-                            ),
-                            entity_id,
-                            last_reset,
-                            old_last_reset,
-                        )
-                    reset = True
-                elif old_state is None and last_reset is None:
-                    reset = True
-                    _LOGGER.info(
-                        "Compiling initial sum statistics for %s, zero point set to %s",
-                        entity_id,
-                        fstate,
-                    )
-                elif state_class == SensorStateClass.TOTAL_INCREASING:
-                    try:
-                        if old_state is None or reset_detected(
-                            hass, entity_id, fstate, new_state, state
-                        ):
-                            reset = True
-                            _LOGGER.info(
-                                (
-                                    "Detected new cycle for %s, value dropped from %s"
-                                    " to %s, triggered by state with last_updated set"
-                                    " to %s"
-                                ),
-                                entity_id,
-                                new_state,
-                                fstate,
-                                state.last_updated.isoformat(),
-                            )
-                    except HomeAssistantError:
-                        continue
-
-                if reset:
-                    # The sensor has been reset, update the sum
-                    if old_state is not None and new_state is not None:
-                        _sum += new_state - old_state
-                    # ..and update the starting point
-                    new_state = fstate
-                    old_last_reset = last_reset
-                    # Force a new cycle for an existing sensor to start at 0
-                    if old_state is not None:
-                        old_state = 0.0
-                    else:
-                        old_state = new_state
-                else:
-                    new_state = fstate
-
-            if new_state is None or old_state is None:
+            last_stat = last_stats[entity_id][0] if entity_id in last_stats else None
+            if values is None:
+                compiled_sum = _compile_sum(
+                    hass, entity_id, state_class, valid_float_states, last_stat
+                )
+            else:
+                compiled_sum = _compile_sum_vectorized(
+                    hass, entity_id, state_class, valid_float_states, values, last_stat
+                )
+            if compiled_sum is None:
                 # No valid updates
                 continue
-
-            # Update the sum with the last state
-            _sum += new_state - old_state
+            last_reset, _sum, new_state = compiled_sum
             if last_reset is not None:
                 stat["last_reset"] = dt_util.parse_datetime(last_reset)
             stat["sum"] = _sum
@@ -0,0 +1,306 @@
+"""Aggregates of the samples of a statistics sensor kept up to date incrementally.
+
+Samples are only ever added as the newest and removed as the oldest of the
+buffer, so each aggregate is updated in O(1) or O(log n) per sample instead
+of recomputing the characteristic over the whole buffer.
+"""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+import heapq
+import math
+
+
+class SampleAggregate(ABC):
+    """An aggregate over the samples in the buffer of a statistics sensor.
+
+    The buffer is passed to every call: add is called after a sample was
+    appended and remove is called before the oldest sample is removed.
+    """
+
+    @abstractmethod
+    def add(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Add the newest sample of the buffer."""
+
+    @abstractmethod
+    def remove(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Remove the oldest sample of the buffer."""
+
+
+class RunningSum:
+    """A sum that values are added to and subtracted from.
+
+    Floats are summed with Neumaier's compensation so the error does not
+    grow with the number of samples that went through the buffer. Ints and
+    bools are summed exactly.
+    """
+
+    __slots__ = ("_total", "_compensation")
+
+    def __init__(self) -> None:
+        """Initialize the sum."""
+        self._total: float = 0
+        self._compensation: float = 0
+
+    @property
+    def value(self) -> float:
+        """Return the sum."""
+        return self._total + self._compensation
+
+    def add(self, value: float) -> None:
+        """Add a value to the sum."""
+        total = self._total + value
+        if abs(self._total) >= abs(value):
+            self._compensation += (self._total - total) + value
+        else:
+            self._compensation += (value - total) + self._total
+        self._total = total
+
+    def subtract(self, value: float) -> None:
+        """Subtract a value from the sum."""
+        self.add(-value)
+
+
+class SampleSum(SampleAggregate):
+    """The sum of the samples."""
+
+    def __init__(self) -> None:
+        """Initialize the sum."""
+        self.sum = RunningSum()
+
+    def add(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Add the newest sample of the buffer."""
+        self.sum.add(states[-1])
+
+    def remove(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Remove the oldest sample of the buffer."""
+        self.sum.subtract(states[0])
+
+
+class SampleMoments(SampleAggregate):
+    """The mean and variance of the samples, using Welford's algorithm."""
+
+    def __init__(self) -> None:
+        """Initialize the moments."""
+        self._count = 0
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    @property
+    def variance(self) -> float:
+        """Return the sample variance, there must be at least two samples."""
+        # Rounding errors of removed samples may leave a tiny negative M2
+        return max(self._m2, 0.0) / (self._count - 1)
+
+    @property
+    def standard_deviation(self) -> float:
+        """Return the sample standard deviation."""
+        return math.sqrt(self.variance)
+
+    def add(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Add the newest sample of the buffer."""
+        value = states[-1]
+        self._count += 1
+        delta = value - self._mean
+        self._mean += delta / self._count
+        self._m2 += delta * (value - self._mean)
+
+    def remove(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Remove the oldest sample of the buffer."""
+        value = states[0]
+        self._count -= 1
+        if self._count == 0:
+            self._mean = self._m2 = 0.0
+            return
+        delta = value - self._mean
+        self._mean -= delta / self._count
+        self._m2 -= delta * (value - self._mean)
+
+
+class PairwiseSum(SampleAggregate):
+    """The sum of a term over every pair of consecutive samples."""
+
+    def __init__(
+        self,
+        term: Callable[[float | bool, datetime, float | bool, datetime], float],
+    ) -> None:
+        """Initialize the sum."""
+        self._term = term
+        self.sum = RunningSum()
+
+    def add(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Add the newest sample of the buffer."""
+        if len(states) >= 2:
+            self.sum.add(self._term(states[-2], ages[-2], states[-1], ages[-1]))
+
+    def remove(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Remove the oldest sample of the buffer."""
+        if len(states) >= 2:
+            self.sum.subtract(self._term(states[0], ages[0], states[1], ages[1]))
+
+
+class SampleExtreme(SampleAggregate):
+    """The maximum or minimum of the samples, using a monotonic deque.
+
+    The deque holds the samples that can still become the extreme once
+    the older samples are removed. Of equal samples the oldest is kept
+    at the front, so the extreme is the first one in the buffer.
+    """
+
+    def __init__(self, maximum: bool) -> None:
+        """Initialize the extreme."""
+        self._maximum = maximum
+        self._candidates: deque[tuple[int, float | bool, datetime]] = deque()
+        self._added = 0
+        self._removed = 0
+
+    @property
+    def value(self) -> float | bool:
+        """Return the extreme, there must be at least one sample."""
+        return self._candidates[0][1]
+
+    @property
+    def age(self) -> datetime:
+        """Return the age of the extreme, there must be at least one sample."""
+        return self._candidates[0][2]
+
+    def add(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Add the newest sample of the buffer."""
+        value = states[-1]
+        candidates = self._candidates
+        if self._maximum:
+            while candidates and candidates[-1][1] < value:
+                candidates.pop()
+        else:
+            while candidates and candidates[-1][1] > value:
+                candidates.pop()
+        candidates.append((self._added, value, ages[-1]))
+        self._added += 1
+
+    def remove(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Remove the oldest sample of the buffer."""
+        if self._candidates[0][0] == self._removed:
+            self._candidates.popleft()
+        self._removed += 1
+
+
+class SampleOrderStatistics(SampleAggregate):
+    """The sorted order of the samples, using two heaps.
+
+    The low heap holds the smallest samples and the high heap the others,
+    which makes the two samples around any rank available after moving
+    samples between the heaps. Removed samples are deleted lazily once
+    they reach the top of their heap.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the order statistics."""
+        # The low heap is a max heap of negated samples
+        self._low: list[float] = []
+        self._high: list[float] = []
+        self._low_size = 0
+        self._high_size = 0
+        self._low_deleted: dict[float, int] = {}
+        self._high_deleted: dict[float, int] = {}
+
+    def _prune(self) -> None:
+        """Pop the deleted samples from the top of the heaps."""
+        low, low_deleted = self._low, self._low_deleted
+        while low and (count := low_deleted.get(-low[0])):
+            if count == 1:
+                del low_deleted[-low[0]]
+            else:
+                low_deleted[-low[0]] = count - 1
+            heapq.heappop(low)
+        high, high_deleted = self._high, self._high_deleted
+        while high and (count := high_deleted.get(high[0])):
+            if count == 1:
+                del high_deleted[high[0]]
+            else:
+                high_deleted[high[0]] = count - 1
+            heapq.heappop(high)
+
+    def _compact(self) -> None:
+        """Drop the deleted samples once they take up most of the heaps."""
+        if len(self._low) + len(self._high) <= 2 * (
+            self._low_size + self._high_size + 16
+        ):
+            return
+        for heap, deleted, sign in (
+            (self._low, self._low_deleted, -1),
+            (self._high, self._high_deleted, 1),
+        ):
+            kept = []
+            for item in heap:
+                if count := deleted.get(sign * item):
+                    deleted[sign * item] = count - 1
+                else:
+                    kept.append(item)
+            heapq.heapify(kept)
+            heap[:] = kept
+            deleted.clear()
+
+    def add(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Add the newest sample of the buffer."""
+        value = float(states[-1])
+        self._prune()
+        if self._low and value <= -self._low[0]:
+            heapq.heappush(self._low, -value)
+            self._low_size += 1
+        else:
+            heapq.heappush(self._high, value)
+            self._high_size += 1
+
+    def remove(self, states: deque[float | bool], ages: deque[datetime]) -> None:
+        """Remove the oldest sample of the buffer."""
+        value = float(states[0])
+        self._prune()
+        # An equal sample on top of the low heap may be removed instead
+        if self._low and value <= -self._low[0]:
+            self._low_deleted[value] = self._low_deleted.get(value, 0) + 1
+            self._low_size -= 1
+        else:
+            self._high_deleted[value] = self._high_deleted.get(value, 0) + 1
+            self._high_size -= 1
+        self._compact()
+
+    def _split(self, rank: int) -> None:
+        """Move samples between the heaps until the low heap holds rank samples."""
+        low, high = self._low, self._high
+        self._prune()
+        while self._low_size > rank:
+            heapq.heappush(high, -heapq.heappop(low))
+            self._low_size -= 1
+            self._high_size += 1
+            self._prune()
+        while self._low_size < rank:
+            heapq.heappush(low, -heapq.heappop(high))
+            self._low_size += 1
+            self._high_size -= 1
+            self._prune()
+
+    def median(self) -> float:
+        """Return the median like statistics.median does.
+
+        There must be at least one sample.
+        """
+        count = self._low_size + self._high_size
+        self._split(count // 2)
+        if count % 2:
+            return self._high[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+    def quantile(self, index: int, parts: int) -> float:
+        """Return cut point index of statistics.quantiles(n=parts).
+
+        The exclusive method is used, there must be at least two samples.
+        """
+        count = self._low_size + self._high_size
+        scaled = index * (count + 1)
+        rank = min(max(scaled // parts, 1), count - 1)
+        delta = scaled - rank * parts
+        self._split(rank)
+        return (-self._low[0] * (parts - delta) + self._high[0] * delta) / parts
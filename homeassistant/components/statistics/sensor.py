@@ -6,7 +6,6 @@ from collections.abc import Callable
 import contextlib
 from datetime import datetime, timedelta
 import logging
-import statistics
 from typing import Any, cast
 
 import voluptuous as vol
@@ -51,6 +50,14 @@ from homeassistant.util import dt as dt_util
 from homeassistant.util.enum import try_parse_enum
 
 from . import DOMAIN, PLATFORMS
+from .aggregates import (
+    PairwiseSum,
+    SampleAggregate,
+    SampleExtreme,
+    SampleMoments,
+    SampleOrderStatistics,
+    SampleSum,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -174,6 +181,72 @@ STATS_BINARY_PERCENTAGE = {
     STAT_MEAN,
 }
 
+
+def _area_linear(
+    previous: float | bool, previous_age: datetime, value: float | bool, age: datetime
+) -> float:
+    """Return the area under the line between two samples."""
+    return 0.5 * (value + previous) * (age - previous_age).total_seconds()
+
+
+def _area_step(
+    previous: float | bool, previous_age: datetime, value: float | bool, age: datetime
+) -> float:
+    """Return the area under a sample until the next sample."""
+    return previous * (age - previous_age).total_seconds()
+
+
+def _difference_absolute(
+    previous: float | bool, previous_age: datetime, value: float | bool, age: datetime
+) -> float:
+    """Return the absolute difference of two samples."""
+    return abs(value - previous)
+
+
+def _difference_nonnegative(
+    previous: float | bool, previous_age: datetime, value: float | bool, age: datetime
+) -> float:
+    """Return the difference of two samples, or the sample after a decrease."""
+    return value - previous if value >= previous else value - 0
+
+
+def _seconds_on(
+    previous: float | bool, previous_age: datetime, value: float | bool, age: datetime
+) -> float:
+    """Return the seconds a binary sample was on until the next sample."""
+    if previous is True:
+        return (age - previous_age).total_seconds()
+    return 0
+
+
+# Characteristics computed from the aggregates of the samples
+STATS_FROM_SUM = {
+    STAT_AVERAGE_TIMELESS,
+    STAT_COUNT_BINARY_OFF,
+    STAT_COUNT_BINARY_ON,
+    STAT_MEAN,
+    STAT_SUM,
+    STAT_TOTAL,
+}
+STATS_FROM_MOMENTS = {
+    STAT_DISTANCE_95P,
+    STAT_DISTANCE_99P,
+    STAT_STANDARD_DEVIATION,
+    STAT_VARIANCE,
+}
+STATS_FROM_ORDER_STATISTICS = {STAT_MEDIAN, STAT_PERCENTILE}
+STATS_FROM_MAX = {STAT_DATETIME_VALUE_MAX, STAT_DISTANCE_ABSOLUTE, STAT_VALUE_MAX}
+STATS_FROM_MIN = {STAT_DATETIME_VALUE_MIN, STAT_DISTANCE_ABSOLUTE, STAT_VALUE_MIN}
+# Terms summed over consecutive samples by characteristic
+PAIRWISE_TERMS = {
+    STAT_AVERAGE_LINEAR: _area_linear,
+    STAT_AVERAGE_STEP: _area_step,
+    STAT_NOISINESS: _difference_absolute,
+    STAT_SUM_DIFFERENCES: _difference_absolute,
+    STAT_SUM_DIFFERENCES_NONNEGATIVE: _difference_nonnegative,
+}
+BINARY_PAIRWISE_TERMS = {STAT_AVERAGE_STEP: _seconds_on}
+
 CONF_STATE_CHARACTERISTIC = "state_characteristic"
 CONF_SAMPLES_MAX_BUFFER_SIZE = "sampling_size"
 CONF_MAX_AGE = "max_age"
@@ -298,6 +371,29 @@ class StatisticsSensor(SensorEntity):
         self.ages: deque[datetime] = deque(maxlen=self._samples_max_buffer_size)
         self.attributes: dict[str, StateType] = {}
 
+        # Only the aggregates the characteristic is computed from are updated
+        self._sum = SampleSum()
+        self._moments = SampleMoments()
+        self._order_statistics = SampleOrderStatistics()
+        self._max = SampleExtreme(maximum=True)
+        self._min = SampleExtreme(maximum=False)
+        pairwise_terms = BINARY_PAIRWISE_TERMS if self.is_binary else PAIRWISE_TERMS
+        self._pairwise_sum = PairwiseSum(
+            pairwise_terms.get(self._state_characteristic, _area_step)
+        )
+        self._aggregates: list[SampleAggregate] = [
+            aggregate
+            for aggregate, characteristics in (
+                (self._sum, STATS_FROM_SUM),
+                (self._moments, STATS_FROM_MOMENTS),
+                (self._order_statistics, STATS_FROM_ORDER_STATISTICS),
+                (self._max, STATS_FROM_MAX),
+                (self._min, STATS_FROM_MIN),
+                (self._pairwise_sum, pairwise_terms),
+            )
+            if self._state_characteristic in characteristics
+        ]
+
         self._state_characteristic_fn: Callable[
             [], StateType | datetime
         ] = self._callable_characteristic_fn(self._state_characteristic)
@@ -345,10 +441,9 @@ class StatisticsSensor(SensorEntity):
         try:
             if self.is_binary:
                 assert new_state.state in ("on", "off")
-                self.states.append(new_state.state == "on")
+                self._add_sample(new_state.state == "on", new_state.last_updated)
             else:
-                self.states.append(float(new_state.state))
-            self.ages.append(new_state.last_updated)
+                self._add_sample(float(new_state.state), new_state.last_updated)
             self.attributes[STAT_SOURCE_VALUE_VALID] = True
         except ValueError:
             self.attributes[STAT_SOURCE_VALUE_VALID] = False
@@ -361,6 +456,22 @@ class StatisticsSensor(SensorEntity):
 
         self._unit_of_measurement = self._derive_unit_of_measurement(new_state)
 
+    def _add_sample(self, value: float | bool, age: datetime) -> None:
+        """Add a sample, removing the oldest sample if the buffer is full."""
+        if len(self.states) == self._samples_max_buffer_size:
+            self._remove_oldest_sample()
+        self.states.append(value)
+        self.ages.append(age)
+        for aggregate in self._aggregates:
+            aggregate.add(self.states, self.ages)
+
+    def _remove_oldest_sample(self) -> None:
+        """Remove the oldest sample."""
+        for aggregate in self._aggregates:
+            aggregate.remove(self.states, self.ages)
+        self.ages.popleft()
+        self.states.popleft()
+
     def _derive_unit_of_measurement(self, new_state: State) -> str | None:
         base_unit: str | None = new_state.attributes.get(ATTR_UNIT_OF_MEASUREMENT)
         unit: str | None
@@ -456,8 +567,7 @@ class StatisticsSensor(SensorEntity):
                 dt_util.as_local(self.ages[0]),
                 (now - self.ages[0]),
             )
-            self.ages.popleft()
-            self.states.popleft()
+            self._remove_oldest_sample()
 
     def _next_to_purge_timestamp(self) -> datetime | None:
         """Find the timestamp when the next purge would occur."""
@@ -588,27 +698,14 @@ class StatisticsSensor(SensorEntity):
 
     def _stat_average_linear(self) -> StateType:
         if len(self.states) >= 2:
-            area: float = 0
-            for i in range(1, len(self.states)):
-                area += (
-                    0.5
-                    * (self.states[i] + self.states[i - 1])
-                    * (self.ages[i] - self.ages[i - 1]).total_seconds()
-                )
             age_range_seconds = (self.ages[-1] - self.ages[0]).total_seconds()
-            return area / age_range_seconds
+            return self._pairwise_sum.sum.value / age_range_seconds
         return None
 
     def _stat_average_step(self) -> StateType:
         if len(self.states) >= 2:
-            area: float = 0
-            for i in range(1, len(self.states)):
-                area += (
-                    self.states[i - 1]
-                    * (self.ages[i] - self.ages[i - 1]).total_seconds()
-                )
             age_range_seconds = (self.ages[-1] - self.ages[0]).total_seconds()
-            return area / age_range_seconds
+            return self._pairwise_sum.sum.value / age_range_seconds
         return None
 
     def _stat_average_timeless(self) -> StateType:
@@ -646,12 +743,12 @@ class StatisticsSensor(SensorEntity):
 
     def _stat_datetime_value_max(self) -> datetime | None:
         if len(self.states) > 0:
-            return self.ages[self.states.index(max(self.states))]
+            return self._max.age
         return None
 
     def _stat_datetime_value_min(self) -> datetime | None:
         if len(self.states) > 0:
-            return self.ages[self.states.index(min(self.states))]
+            return self._min.age
         return None
 
     def _stat_distance_95_percent_of_values(self) -> StateType:
@@ -666,17 +763,17 @@ class StatisticsSensor(SensorEntity):
 
     def _stat_distance_absolute(self) -> StateType:
         if len(self.states) > 0:
-            return max(self.states) - min(self.states)
+            return self._max.value - self._min.value
         return None
 
     def _stat_mean(self) -> StateType:
         if len(self.states) > 0:
-            return statistics.mean(self.states)
+            return self._sum.sum.value / len(self.states)
         return None
 
     def _stat_median(self) -> StateType:
         if len(self.states) > 0:
-            return statistics.median(self.states)
+            return self._order_statistics.median()
         return None
 
     def _stat_noisiness(self) -> StateType:
@@ -686,35 +783,27 @@ class StatisticsSensor(SensorEntity):
 
     def _stat_percentile(self) -> StateType:
         if len(self.states) >= 2:
-            percentiles = statistics.quantiles(self.states, n=100, method="exclusive")
-            return percentiles[self._percentile - 1]
+            return self._order_statistics.quantile(self._percentile, 100)
         return None
 
     def _stat_standard_deviation(self) -> StateType:
         if len(self.states) >= 2:
-            return statistics.stdev(self.states)
+            return self._moments.standard_deviation
         return None
 
     def _stat_sum(self) -> StateType:
         if len(self.states) > 0:
-            return sum(self.states)
+            return self._sum.sum.value
         return None
 
     def _stat_sum_differences(self) -> StateType:
         if len(self.states) >= 2:
-            diff_sum = sum(
-                abs(j - i) for i, j in zip(list(self.states), list(self.states)[1:])
-            )
-            return diff_sum
+            return self._pairwise_sum.sum.value
         return None
 
     def _stat_sum_differences_nonnegative(self) -> StateType:
         if len(self.states) >= 2:
-            diff_sum_nn = sum(
-                (j - i if j >= i else j - 0)
-                for i, j in zip(list(self.states), list(self.states)[1:])
-            )
-            return diff_sum_nn
+            return self._pairwise_sum.sum.value
         return None
 
     def _stat_total(self) -> StateType:
@@ -722,27 +811,24 @@ class StatisticsSensor(SensorEntity):
 
     def _stat_value_max(self) -> StateType:
         if len(self.states) > 0:
-            return max(self.states)
+            return self._max.value
         return None
 
     def _stat_value_min(self) -> StateType:
         if len(self.states) > 0:
-            return min(self.states)
+            return self._min.value
         return None
 
     def _stat_variance(self) -> StateType:
         if len(self.states) >= 2:
-            return statistics.variance(self.states)
+            return self._moments.variance
         return None
 
     # Statistics for binary sensor
 
     def _stat_binary_average_step(self) -> StateType:
         if len(self.states) >= 2:
-            on_seconds: float = 0
-            for i in range(1, len(self.states)):
-                if self.states[i - 1] is True:
-                    on_seconds += (self.ages[i] - self.ages[i - 1]).total_seconds()
+            on_seconds: float = self._pairwise_sum.sum.value
             age_range_seconds = (self.ages[-1] - self.ages[0]).total_seconds()
             return 100 / age_range_seconds * on_seconds
         return None
@@ -754,10 +840,10 @@ class StatisticsSensor(SensorEntity):
         return len(self.states)
 
     def _stat_binary_count_on(self) -> StateType:
-        return self.states.count(True)
+        return self._sum.sum.value
 
     def _stat_binary_count_off(self) -> StateType:
-        return self.states.count(False)
+        return len(self.states) - self._sum.sum.value
 
     def _stat_binary_datetime_newest(self) -> datetime | None:
         return self._stat_datetime_newest()
@@ -767,5 +853,5 @@ class StatisticsSensor(SensorEntity):
 
     def _stat_binary_mean(self) -> StateType:
         if len(self.states) > 0:
-            return 100.0 / len(self.states) * self.states.count(True)
+            return 100.0 / len(self.states) * self._sum.sum.value
         return None
@@ -0,0 +1,25 @@
+"""Provide info to system health."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components import system_health
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.event import async_get_shared_template_renders
+
+
+@callback
+def async_register(
+    hass: HomeAssistant, register: system_health.SystemHealthRegistration
+) -> None:
+    """Register system health callbacks."""
+    register.async_register_info(system_health_info)
+
+
+async def system_health_info(hass: HomeAssistant) -> dict[str, Any]:
+    """Get info for the info page."""
+    shared_renders = async_get_shared_template_renders(hass)
+    return {
+        "state_change_renders": shared_renders.renders,
+        "deduplicated_renders": shared_renders.deduplicated_renders,
+    }
@@ -23,7 +23,12 @@ from homeassistant.exceptions import (
     TemplateError,
     Unauthorized,
 )
-from homeassistant.helpers import config_validation as cv, entity, template
+from homeassistant.helpers import (
+    config_validation as cv,
+    entity,
+    entity_platform,
+    template,
+)
 from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.event import (
     TrackTemplate,
@@ -58,6 +63,8 @@ def async_register_commands(
 ) -> None:
     """Register commands."""
     async_reg(hass, handle_call_service)
+    async_reg(hass, handle_connection_stats)
+    async_reg(hass, handle_entity_platform_poll_durations)
     async_reg(hass, handle_entity_source)
     async_reg(hass, handle_execute_script)
     async_reg(hass, handle_fire_event)
@@ -244,31 +251,29 @@ def handle_get_states(
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
-    # to succeed for the UI to show.
-    response = messages.result_message(msg["id"], states)
-    try:
-        connection.send_message(JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
+    # to succeed for the UI to show. Each state caches its own JSON so
+    # it is only serialized once no matter how many clients ask for it.
+    serialized: list[bytes] = []
+    for state in states:
+        # Unserializable states are left out and logged below
+        with suppress(ValueError, TypeError):
+            serialized.append(state.as_dict_json())
+
+    if len(serialized) != len(states):
         connection.logger.error(
             "Unable to serialize to JSON. Bad data found at %s",
             format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
+                find_paths_unserializable_data(
+                    messages.result_message(msg["id"], states), dump=JSON_DUMP
+                )
             ),
         )
-    del response
-
-    # If we can't serialize, we'll filter out unserializable states
-    serialized = []
-    for state in states:
-        # Error is already logged above
-        with suppress(ValueError, TypeError):
-            serialized.append(JSON_DUMP(state))
 
-    # We now have partially serialized states. Craft some JSON.
-    response2 = JSON_DUMP(messages.result_message(msg["id"], ["TO_REPLACE"]))
-    response2 = response2.replace('"TO_REPLACE"', ", ".join(serialized))
-    connection.send_message(response2)
+    connection.send_message(
+        messages.construct_result_message(
+            msg["id"], f"[{b','.join(serialized).decode()}]"
+        )
+    )
 
 
 @callback
@@ -291,8 +296,6 @@ def handle_subscribe_entities(
             event.data["entity_id"], POLICY_READ
         ):
             return
-        if entity_ids and event.data["entity_id"] not in entity_ids:
-            return
 
         connection.send_message(messages.cached_state_diff_message(msg["id"], event))
 
@@ -300,46 +303,50 @@ def handle_subscribe_entities(
     # state changed events or we will introduce a race condition
     # where some states are missed
     states = _async_get_allowed_states(hass, connection)
-    connection.subscriptions[msg["id"]] = hass.bus.async_listen(
-        EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
-    )
+    if entity_ids:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen_keyed(
+            EVENT_STATE_CHANGED,
+            entity_ids,
+            forward_entity_changes,
+            run_immediately=True,
+        )
+    else:
+        connection.subscriptions[msg["id"]] = hass.bus.async_listen(
+            EVENT_STATE_CHANGED, forward_entity_changes, run_immediately=True
+        )
     connection.send_result(msg["id"])
-    data: dict[str, dict[str, dict]] = {
-        messages.ENTITY_EVENT_ADD: {
-            state.entity_id: state.as_compressed_state()
-            for state in states
-            if not entity_ids or state.entity_id in entity_ids
-        }
-    }
 
     # JSON serialize here so we can recover if it blows up due to the
     # state machine containing unserializable data. This command is required
     # to succeed for the UI to show.
-    response = messages.event_message(msg["id"], data)
-    try:
-        connection.send_message(JSON_DUMP(response))
-        return
-    except (ValueError, TypeError):
+    if entity_ids:
+        states = [state for state in states if state.entity_id in entity_ids]
+    serialized: list[str] = []
+    for state in states:
+        # Unserializable states are left out and logged below
+        with suppress(ValueError, TypeError):
+            serialized.append(messages.entity_state_json_fragment(state))
+
+    if len(serialized) != len(states):
+        data = {
+            messages.ENTITY_EVENT_ADD: {
+                state.entity_id: state.as_compressed_state() for state in states
+            }
+        }
         connection.logger.error(
             "Unable to serialize to JSON. Bad data found at %s",
             format_unserializable_data(
-                find_paths_unserializable_data(response, dump=JSON_DUMP)
+                find_paths_unserializable_data(
+                    messages.event_message(msg["id"], data), dump=JSON_DUMP
+                )
             ),
         )
-    del response
-
-    add_entities = data[messages.ENTITY_EVENT_ADD]
-    cannot_serialize: list[str] = []
-    for entity_id, state_dict in add_entities.items():
-        try:
-            JSON_DUMP(state_dict)
-        except (ValueError, TypeError):
-            cannot_serialize.append(entity_id)
-
-    for entity_id in cannot_serialize:
-        del add_entities[entity_id]
 
-    connection.send_message(JSON_DUMP(messages.event_message(msg["id"], data)))
+    connection.send_message(
+        messages.construct_event_message(
+            msg["id"], f'{{"{messages.ENTITY_EVENT_ADD}":{{{",".join(serialized)}}}}}'
+        )
+    )
 
 
 @decorators.websocket_command({vol.Required("type"): "get_services"})
@@ -416,6 +423,27 @@ def handle_integration_setup_info(
     )
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "entity_platform/poll_durations"})
+@decorators.require_admin
+def handle_entity_platform_poll_durations(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle entity platform poll durations command.
+
+    The entity update durations are counted per platform, in buckets with
+    the upper bounds in seconds of POLL_DURATION_BUCKETS and one more for
+    longer updates.
+    """
+    connection.send_result(
+        msg["id"],
+        {
+            "buckets": list(entity_platform.POLL_DURATION_BUCKETS),
+            "platforms": entity_platform.async_get_polling_scheduler(hass).histograms,
+        },
+    )
+
+
 @callback
 @decorators.websocket_command({vol.Required("type"): "ping"})
 def handle_ping(
@@ -719,6 +747,15 @@ def handle_supported_features(
     connection.send_result(msg["id"])
 
 
+@callback
+@decorators.websocket_command({vol.Required("type"): "connection/stats"})
+def handle_connection_stats(
+    hass: HomeAssistant, connection: ActiveConnection, msg: dict[str, Any]
+) -> None:
+    """Handle getting the stats of the frames written to the connection."""
+    connection.send_result(msg["id"], connection.write_stats.as_dict())
+
+
 @decorators.require_admin
 @decorators.websocket_command({"type": "integration/descriptions"})
 @decorators.async_response
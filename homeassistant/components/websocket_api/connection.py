@@ -4,6 +4,7 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Callable, Hashable
 from contextvars import ContextVar
+import time
 from typing import TYPE_CHECKING, Any
 
 from aiohttp import web
@@ -29,6 +30,40 @@ MessageHandler = Callable[[HomeAssistant, "ActiveConnection", dict[str, Any]], N
 BinaryHandler = Callable[[HomeAssistant, "ActiveConnection", bytes], None]
 
 
+class WriteStats:
+    """Count the frames written to a connection."""
+
+    __slots__ = ("started", "frames", "messages", "size")
+
+    def __init__(self) -> None:
+        """Initialize the stats."""
+        self.started = time.monotonic()
+        self.frames = 0
+        self.messages = 0
+        # The bytes of the uncompressed UTF-8 encoded frames
+        self.size = 0
+
+    def add_frame(self, frame: str, messages: int) -> None:
+        """Count a frame holding a number of messages."""
+        self.frames += 1
+        self.messages += messages
+        # Only encode the frame if its length is not its size in bytes
+        self.size += len(frame) if frame.isascii() else len(frame.encode())
+
+    def as_dict(self) -> dict[str, float]:
+        """Return the totals and rates of the stats."""
+        elapsed = time.monotonic() - self.started
+        return {
+            "seconds": elapsed,
+            "frames": self.frames,
+            "messages": self.messages,
+            "bytes": self.size,
+            "frames_per_second": self.frames / elapsed if elapsed else 0.0,
+            "messages_per_second": self.messages / elapsed if elapsed else 0.0,
+            "bytes_per_second": self.size / elapsed if elapsed else 0.0,
+        }
+
+
 class ActiveConnection:
     """Handle an active websocket client connection."""
 
@@ -49,6 +84,7 @@ class ActiveConnection:
         self.subscriptions: dict[Hashable, Callable[[], Any]] = {}
         self.last_id = 0
         self.supported_features: dict[str, float] = {}
+        self.write_stats = WriteStats()
         self.handlers: dict[str, tuple[MessageHandler, vol.Schema]] = self.hass.data[
             const.DOMAIN
         ]
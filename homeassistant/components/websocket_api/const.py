@@ -53,5 +53,7 @@ SIGNAL_WEBSOCKET_DISCONNECTED: Final = "websocket_disconnected"
 
 # Data used to store the current connection list
 DATA_CONNECTIONS: Final = f"{DOMAIN}.connections"
+# Data used to store the live streams shared between subscriptions
+DATA_SHARED_STREAMS: Final = f"{DOMAIN}.shared_streams"
 
 FEATURE_COALESCE_MESSAGES = "coalesce_messages"
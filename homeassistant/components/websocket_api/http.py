@@ -87,27 +87,46 @@ class WebSocketHandler:
         return describe_request(self.request)
 
     async def _writer(self) -> None:
-        """Write outgoing messages."""
+        """Write outgoing messages.
+
+        If the client supports coalesced messages, the messages queued
+        at once are sent in a single frame. While the messages come in
+        bursts the writer waits for one more loop iteration before
+        sending so the messages queued by it share the frame too.
+        """
         # Exceptions if Socket disconnected or cancelled by connection handler
         to_write = self._to_write
         logger = self._logger
         wsock = self.wsock
+        in_burst = False
         try:
             with suppress(RuntimeError, ConnectionResetError, *CANCELLATION_ERRORS):
                 while not self.wsock.closed:
                     if (process := await to_write.get()) is None:
                         return
                     message = process if isinstance(process, str) else process()
+                    connection = self.connection
                     if (
-                        to_write.empty()
-                        or not self.connection
+                        connection is None
                         or FEATURE_COALESCE_MESSAGES
-                        not in self.connection.supported_features
+                        not in connection.supported_features
                     ):
                         logger.debug("Sending %s", message)
                         await wsock.send_str(message)
+                        if connection is not None:
+                            connection.write_stats.add_frame(message, 1)
+                        continue
+
+                    if in_burst and to_write.empty():
+                        await asyncio.sleep(0)
+                    if to_write.empty():
+                        in_burst = False
+                        logger.debug("Sending %s", message)
+                        await wsock.send_str(message)
+                        connection.write_stats.add_frame(message, 1)
                         continue
 
+                    in_burst = True
                     messages: list[str] = [message]
                     while not to_write.empty():
                         if (process := to_write.get_nowait()) is None:
@@ -119,6 +138,7 @@ class WebSocketHandler:
                     coalesced_messages = "[" + ",".join(messages) + "]"
                     logger.debug("Sending %s", coalesced_messages)
                     await wsock.send_str(coalesced_messages)
+                    connection.write_stats.add_frame(coalesced_messages, len(messages))
         finally:
             # Clean up the peaker checker when we shut down the writer
             self._cancel_peak_checker()
@@ -49,6 +49,11 @@ def result_message(iden: int, result: Any = None) -> dict[str, Any]:
     return {"id": iden, "type": const.TYPE_RESULT, "success": True, "result": result}
 
 
+def construct_result_message(iden: int, payload: str) -> str:
+    """Construct a success result message JSON from a serialized result."""
+    return f'{{"id":{iden},"type":"result","success":true,"result":{payload}}}'
+
+
 def error_message(iden: int | None, code: str, message: str) -> dict[str, Any]:
     """Return an error result message."""
     return {
@@ -64,6 +69,14 @@ def event_message(iden: JSON_TYPE | int, event: Any) -> dict[str, Any]:
     return {"id": iden, "type": "event", "event": event}
 
 
+def construct_event_message(iden: int | str, payload: str) -> str:
+    """Construct an event message JSON from a serialized event.
+
+    A str iden must already be JSON encoded.
+    """
+    return f'{{"id":{iden},"type":"event","event":{payload}}}'
+
+
 def cached_event_message(iden: int, event: Event) -> str:
     """Return an event message.
 
@@ -105,9 +118,26 @@ def _cached_state_diff_message(event: Event) -> str:
     The IDEN_TEMPLATE is used which will be replaced
     with the actual iden in cached_event_message
     """
+    if (event_new_state := event.data["new_state"]) is not None and event.data[
+        "old_state"
+    ] is None:
+        # Added states reuse the JSON fragment cached on the State
+        try:
+            fragment = entity_state_json_fragment(event_new_state)
+        except (ValueError, TypeError):
+            pass
+        else:
+            return construct_event_message(
+                IDEN_JSON_TEMPLATE, f'{{"{ENTITY_EVENT_ADD}":{{{fragment}}}}}'
+            )
     return message_to_json(event_message(IDEN_TEMPLATE, _state_diff_event(event)))
 
 
+def entity_state_json_fragment(state: State) -> str:
+    """Return the compressed state as a JSON object member keyed by entity_id."""
+    return f'"{state.entity_id}":{state.as_compressed_state_json().decode()}'
+
+
 def _state_diff_event(event: Event) -> dict:
     """Convert a state_changed event to the minimal version.
 
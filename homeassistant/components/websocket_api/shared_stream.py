@@ -0,0 +1,151 @@
+"""Live streams shared between identical websocket subscriptions."""
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+import homeassistant.util.dt as dt_util
+
+from .connection import ActiveConnection
+from .const import DATA_SHARED_STREAMS
+from .messages import construct_event_message
+
+
+class SharedStream:
+    """A live stream shared by the subscriptions asking for the same data.
+
+    The producer of the stream runs once for all subscribers, each
+    payload is converted and serialized once and only the message id
+    differs between the messages sent to the subscribers.
+    """
+
+    def __init__(self, streams: dict[Hashable, SharedStream], key: Hashable) -> None:
+        """Initialize the shared stream."""
+        self._streams = streams
+        self._key = key
+        self.subscribers: list[SharedStreamSubscriber] = []
+        # The time the oldest event queued for the next payload was fired
+        self.batch_start: datetime | None = None
+        self.stop_producer: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_event_queued(self, time_fired: datetime) -> None:
+        """Record an event was queued for the next payload of the stream."""
+        if self.batch_start is None:
+            self.batch_start = time_fired
+
+    @callback
+    def async_publish(self, payload: str | None) -> None:
+        """Send the JSON serialized payload of the queued events to the subscribers.
+
+        The payload is None if none of the queued events are sent.
+        """
+        self.batch_start = None
+        if payload is None:
+            return
+        for subscriber in self.subscribers.copy():
+            subscriber.async_deliver(payload)
+
+    @callback
+    def async_end(self) -> None:
+        """End the stream and the subscriptions of its subscribers."""
+        for subscriber in self.subscribers.copy():
+            subscriber.end_subscription()
+
+    @callback
+    def async_remove_subscriber(self, subscriber: SharedStreamSubscriber) -> None:
+        """Remove a subscriber and stop the producer after the last one."""
+        if subscriber not in self.subscribers:
+            return
+        self.subscribers.remove(subscriber)
+        if self.subscribers:
+            return
+        del self._streams[self._key]
+        if self.stop_producer:
+            self.stop_producer()
+            self.stop_producer = None
+
+
+class SharedStreamSubscriber:
+    """A subscription to a shared stream.
+
+    Payloads are held until the subscriber is started so they are sent
+    after the historical data. The subscriber receives every payload
+    published after it joined the stream in full, so its historical data
+    ends at subscribed_time, when the oldest event of the next payload
+    was fired.
+    """
+
+    def __init__(
+        self,
+        stream: SharedStream,
+        connection: ActiveConnection,
+        msg_id: int,
+        max_pending: int,
+        end_subscription: CALLBACK_TYPE,
+    ) -> None:
+        """Initialize the subscriber."""
+        self.stream = stream
+        self.connection = connection
+        self.msg_id = msg_id
+        self.end_subscription = end_subscription
+        self.subscribed_time = stream.batch_start or dt_util.utcnow()
+        self._max_pending = max_pending
+        self._pending: list[str] | None = []
+
+    @callback
+    def async_deliver(self, payload: str) -> None:
+        """Send or hold a payload of the stream."""
+        message = construct_event_message(self.msg_id, payload)
+        if (pending := self._pending) is None:
+            self.connection.send_message(message)
+        elif len(pending) < self._max_pending:
+            pending.append(message)
+        else:
+            self.end_subscription()
+
+    @callback
+    def async_start(self) -> None:
+        """Send the held payloads and any further payloads right away."""
+        if (pending := self._pending) is None:
+            return
+        self._pending = None
+        for message in pending:
+            self.connection.send_message(message)
+
+    @callback
+    def async_remove(self) -> None:
+        """Remove the subscriber from the stream."""
+        self.stream.async_remove_subscriber(self)
+
+
+@callback
+def async_subscribe_shared_stream(
+    hass: HomeAssistant,
+    key: Hashable,
+    start_producer: Callable[[SharedStream], CALLBACK_TYPE],
+    connection: ActiveConnection,
+    msg_id: int,
+    max_pending: int,
+    end_subscription: CALLBACK_TYPE,
+) -> SharedStreamSubscriber:
+    """Subscribe to the live stream for the key.
+
+    Subscriptions with the same key share one stream, start_producer is
+    called with the stream when the first subscriber joins and returns
+    a callback to stop the producer after the last subscriber leaves.
+    The subscription is ended with end_subscription if more than
+    max_pending payloads are held or the stream ends.
+    """
+    streams: dict[Hashable, SharedStream] = hass.data.setdefault(
+        DATA_SHARED_STREAMS, {}
+    )
+    if (stream := streams.get(key)) is None:
+        stream = streams[key] = SharedStream(streams, key)
+        stream.stop_producer = start_producer(stream)
+    subscriber = SharedStreamSubscriber(
+        stream, connection, msg_id, max_pending, end_subscription
+    )
+    stream.subscribers.append(subscriber)
+    return subscriber
@@ -20,11 +20,14 @@ from contextvars import ContextVar
 import datetime
 import enum
 import functools
+import itertools
 import logging
 import os
 import pathlib
 import re
+from sys import intern
 import threading
+import time
 from time import monotonic
 from typing import (
     TYPE_CHECKING,
@@ -47,6 +50,7 @@ from . import block_async_io, loader, util
 from .backports.enum import StrEnum
 from .const import (
     ATTR_DOMAIN,
+    ATTR_ENTITY_ID,
     ATTR_FRIENDLY_NAME,
     ATTR_SERVICE,
     ATTR_SERVICE_DATA,
@@ -847,23 +851,92 @@ class HomeAssistant:
             _LOGGER.warning("Shutdown stage %s: still running: %s", stage, task)
 
 
+# The random part of lazily generated context ids is offset by a sequence
+# number taken when the context is created, the id is then the same
+# whichever thread generates it first
+_LAZY_CONTEXT_ID_RANDOMNESS = int.from_bytes(os.urandom(10), "big")
+_LAZY_CONTEXT_ID_RANDOMNESS_MASK = (1 << 80) - 1
+_LAZY_CONTEXT_ID_SEQUENCE = itertools.count()
+
+
 class Context:
-    """The context that triggered something."""
+    """The context that triggered something.
+
+    When no id is passed, the ULID is only generated when the id is
+    accessed, as most contexts are never looked at. The timestamp the
+    context was created at is kept to generate it.
+    """
 
-    __slots__ = ("user_id", "parent_id", "id", "origin_event")
+    __slots__ = (
+        "user_id",
+        "parent_id",
+        "_id",
+        "_id_bin",
+        "_id_sequence",
+        "_timestamp",
+        "origin_event",
+    )
 
     def __init__(
         self,
         user_id: str | None = None,
         parent_id: str | None = None,
         id: str | None = None,  # pylint: disable=redefined-builtin
+        timestamp: float | None = None,
     ) -> None:
         """Init the context."""
-        self.id = id or ulid_util.ulid()
+        self._id = id or None
+        self._id_bin: bytes | None = None
+        if self._id is None:
+            if timestamp is None:
+                timestamp = time.time()
+            self._id_sequence = next(_LAZY_CONTEXT_ID_SEQUENCE)
+        self._timestamp = timestamp
         self.user_id = user_id
         self.parent_id = parent_id
         self.origin_event: Event | None = None
 
+    @property
+    def id(self) -> str:  # pylint: disable=invalid-name
+        """Return the id of the context, generating it if needed."""
+        if self._id is None:
+            self._id = ulid_util.bytes_to_ulid(self.id_bin)
+        return self._id
+
+    @property
+    def id_bin(self) -> bytes:
+        """Return the binary form of the id.
+
+        When the id has not been generated yet, it is generated from the
+        timestamp in its binary form.
+
+        Raises ValueError if the id is not a ULID.
+        """
+        if self._id_bin is None:
+            if (id_ := self._id) is not None:
+                self._id_bin = ulid_util.ulid_to_bytes(id_)
+            else:
+                self._id_bin = self._generate_id_bin()
+        return self._id_bin
+
+    def _generate_id_bin(self) -> bytes:
+        """Generate the binary form of a lazy id.
+
+        The id can be accessed from the event loop and the recorder thread at
+        the same time. The randomness is derived from the sequence number of
+        the context so both generate the same ULID without locking, the string
+        form is derived from the binary form.
+        """
+        assert self._timestamp is not None
+        randomness = (
+            _LAZY_CONTEXT_ID_RANDOMNESS + self._id_sequence
+        ) & _LAZY_CONTEXT_ID_RANDOMNESS_MASK
+        id_bin = ulid_util.ulid_bytes_at_time(
+            self._timestamp, randomness.to_bytes(10, "big")
+        )
+        self._id_bin = id_bin
+        return id_bin
+
     def __eq__(self, other: Any) -> bool:
         """Compare contexts."""
         return bool(self.__class__ == other.__class__ and self.id == other.id)
@@ -872,6 +945,17 @@ class Context:
         """Return a dictionary representation of the context."""
         return {"id": self.id, "parent_id": self.parent_id, "user_id": self.user_id}
 
+    def _as_expired(self) -> Context:
+        """Return a copy of the context without the origin event."""
+        if self._id is None:
+            # Both copies must end up with the same id
+            context = Context(self.user_id, self.parent_id, None, self._timestamp)
+            # pylint: disable-next=protected-access
+            context._id_sequence = self._id_sequence
+            context._id_bin = self._id_bin  # pylint: disable=protected-access
+            return context
+        return Context(self.user_id, self.parent_id, self._id)
+
 
 class EventOrigin(enum.Enum):
     """Represent the origin of an event."""
@@ -903,7 +987,7 @@ class Event:
         self.origin = origin
         self.time_fired = time_fired or dt_util.utcnow()
         self.context: Context = context or Context(
-            id=ulid_util.ulid_at_time(dt_util.utc_to_timestamp(self.time_fired))
+            timestamp=dt_util.utc_to_timestamp(self.time_fired)
         )
 
     def as_dict(self) -> dict[str, Any]:
@@ -938,12 +1022,28 @@ class _FilterableJob(NamedTuple):
     run_immediately: bool
 
 
+@callback
+def _async_keyed_jobs(
+    keyed_listeners: dict[str, list[_FilterableJob]], entity_id: str
+) -> list[_FilterableJob]:
+    """Return the keyed listener jobs of an entity_id and its domain.
+
+    A job keyed on both the entity_id and its domain is only returned once.
+    """
+    entity_jobs = keyed_listeners.get(entity_id)
+    domain_jobs = keyed_listeners.get(entity_id.partition(".")[0])
+    if entity_jobs and domain_jobs:
+        return list({id(job): job for job in (*entity_jobs, *domain_jobs)}.values())
+    return list(entity_jobs or domain_jobs or ())
+
+
 class EventBus:
     """Allow the firing of and listening for events."""
 
     def __init__(self, hass: HomeAssistant) -> None:
         """Initialize a new event bus."""
         self._listeners: dict[str, list[_FilterableJob]] = {}
+        self._keyed_listeners: dict[str, dict[str, list[_FilterableJob]]] = {}
         self._hass = hass
 
     @callback
@@ -952,7 +1052,24 @@ class EventBus:
 
         This method must be run in the event loop.
         """
-        return {key: len(listeners) for key, listeners in self._listeners.items()}
+        listeners = {key: len(listeners) for key, listeners in self._listeners.items()}
+        for event_type, keyed_listeners in self._keyed_listeners.items():
+            keyed_count = len(
+                {id(job) for jobs in keyed_listeners.values() for job in jobs}
+            )
+            listeners[event_type] = listeners.get(event_type, 0) + keyed_count
+        return listeners
+
+    @callback
+    def async_keyed_listeners(self, event_type: str) -> dict[str, int]:
+        """Return dictionary with keys and the number of keyed listeners.
+
+        This method must be run in the event loop.
+        """
+        return {
+            key: len(listeners)
+            for key, listeners in self._keyed_listeners.get(event_type, {}).items()
+        }
 
     @property
     def listeners(self) -> dict[str, int]:
@@ -996,12 +1113,34 @@ class EventBus:
         if match_all_listeners is not None and event_type != EVENT_HOMEASSISTANT_CLOSE:
             listeners = match_all_listeners + listeners
 
+        keyed_match = False
+        keyed_immediate_jobs: list[_FilterableJob] | None = None
+        if (
+            event_data
+            and (keyed_listeners := self._keyed_listeners.get(event_type)) is not None
+            and type(entity_id := event_data.get(ATTR_ENTITY_ID)) is str
+        ):
+            # Keyed listeners are routed with a dict lookup on the
+            # entity_id and its domain instead of running a filter
+            # for every listener.
+            keyed_jobs = _async_keyed_jobs(keyed_listeners, entity_id)
+            if keyed_jobs:
+                keyed_match = True
+                keyed_immediate_jobs = [
+                    job for job in keyed_jobs if job.run_immediately
+                ]
+
         event = Event(event_type, event_data, origin, time_fired, context)
         if not event.context.origin_event:
             event.context.origin_event = event
 
         _LOGGER.debug("Bus:Handling %s", event)
 
+        if keyed_match:
+            if keyed_immediate_jobs:
+                self._async_run_keyed_jobs(event, keyed_immediate_jobs)
+            self._hass.loop.call_soon(self._async_dispatch_keyed_listeners, event)
+
         if not listeners:
             return
 
@@ -1021,6 +1160,50 @@ class EventBus:
             else:
                 self._hass.async_add_hass_job(job, event)
 
+    @callback
+    def _async_dispatch_keyed_listeners(self, event: Event) -> None:
+        """Dispatch an event to the keyed listeners of its entity_id and domain.
+
+        The listeners are looked up when the event is dispatched so listeners
+        added while the event was queued are run as well. Listeners that run
+        immediately were already run when the event was fired.
+
+        This method must be run in the event loop.
+        """
+        if (keyed_listeners := self._keyed_listeners.get(event.event_type)) is None:
+            return
+        self._async_run_keyed_jobs(
+            event,
+            [
+                job
+                for job in _async_keyed_jobs(
+                    keyed_listeners, event.data[ATTR_ENTITY_ID]
+                )
+                if not job.run_immediately
+            ],
+        )
+
+    @callback
+    def _async_run_keyed_jobs(
+        self, event: Event, keyed_jobs: list[_FilterableJob]
+    ) -> None:
+        """Run the keyed listener jobs of an event.
+
+        This method must be run in the event loop.
+        """
+        for job, event_filter, _ in keyed_jobs:
+            if event_filter is not None:
+                try:
+                    if not event_filter(event):
+                        continue
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception("Error in event filter")
+                    continue
+            try:
+                self._hass.async_run_hass_job(job, event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error running job: %s", job)
+
     def listen(
         self,
         event_type: str,
@@ -1075,6 +1258,96 @@ class EventBus:
             ),
         )
 
+    def listen_keyed(
+        self,
+        event_type: str,
+        keys: str | Iterable[str],
+        listener: Callable[[Event], Coroutine[Any, Any, None] | None],
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type for specific entities or domains."""
+        async_remove_listener = run_callback_threadsafe(
+            self._hass.loop, self.async_listen_keyed, event_type, keys, listener
+        ).result()
+
+        def remove_listener() -> None:
+            """Remove the listener."""
+            run_callback_threadsafe(self._hass.loop, async_remove_listener).result()
+
+        return remove_listener
+
+    @callback
+    def async_listen_keyed(
+        self,
+        event_type: str,
+        keys: str | Iterable[str],
+        listener: Callable[[Event], Coroutine[Any, Any, None] | None],
+        event_filter: Callable[[Event], bool] | None = None,
+        run_immediately: bool = False,
+    ) -> CALLBACK_TYPE:
+        """Listen for events of a specific type for specific entities or domains.
+
+        The listener only runs for events whose ``entity_id`` data matches
+        one of the keys, either as an entity_id or as a domain.
+        Events are routed with a dict lookup so the cost of firing does not
+        grow with the number of keyed listeners.
+
+        An optional event_filter, which must be a callable decorated with
+        @callback that returns a boolean value, determines if the
+        listener callable should run.
+
+        If run_immediately is passed, the callback will be run
+        right away instead of using call_soon. Only use this if
+        the callback results in scheduling another task.
+
+        This method must be run in the event loop.
+        """
+        if event_type == MATCH_ALL:
+            raise HomeAssistantError("Keyed listeners cannot listen to all events")
+        if event_filter is not None and not is_callback(event_filter):
+            raise HomeAssistantError(f"Event filter {event_filter} is not a callback")
+        if run_immediately and not is_callback(listener):
+            raise HomeAssistantError(f"Event listener {listener} is not a callback")
+        if isinstance(keys, str):
+            keys = (keys.lower(),)
+        else:
+            keys = tuple(key.lower() for key in keys)
+        filterable_job = _FilterableJob(
+            HassJob(listener, f"listen {event_type} {keys}"),
+            event_filter,
+            run_immediately,
+        )
+        keyed_listeners = self._keyed_listeners.setdefault(event_type, {})
+        for key in keys:
+            keyed_listeners.setdefault(key, []).append(filterable_job)
+
+        def remove_listener() -> None:
+            """Remove the keyed listener."""
+            self._async_remove_keyed_listener(event_type, keys, filterable_job)
+
+        return remove_listener
+
+    @callback
+    def _async_remove_keyed_listener(
+        self, event_type: str, keys: Iterable[str], filterable_job: _FilterableJob
+    ) -> None:
+        """Remove a keyed listener of a specific event_type.
+
+        This method must be run in the event loop.
+        """
+        try:
+            keyed_listeners = self._keyed_listeners[event_type]
+            for key in keys:
+                keyed_listeners[key].remove(filterable_job)
+                # delete key list if empty
+                if not keyed_listeners[key]:
+                    del keyed_listeners[key]
+            if not keyed_listeners:
+                del self._keyed_listeners[event_type]
+        except (KeyError, ValueError):
+            _LOGGER.exception(
+                "Unable to remove unknown keyed job listener %s", filterable_job
+            )
+
     @callback
     def _async_listen_filterable_job(
         self, event_type: str, filterable_job: _FilterableJob
@@ -1176,6 +1449,9 @@ class EventBus:
             )
 
 
+_EMPTY_ATTRIBUTES: ReadOnlyDict[str, Any] = ReadOnlyDict()
+
+
 class State:
     """Object to represent a state within the state machine.
 
@@ -1199,7 +1475,9 @@ class State:
         "domain",
         "object_id",
         "_as_dict",
+        "_as_dict_json",
         "_as_compressed_state",
+        "_as_compressed_state_json",
     ]
 
     def __init__(
@@ -1229,13 +1507,26 @@ class State:
 
         self.entity_id = entity_id.lower()
         self.state = state
-        self.attributes = ReadOnlyDict(attributes or {})
+        if type(attributes) is ReadOnlyDict:  # pylint: disable=unidiomatic-typecheck
+            # Read only attributes can be shared with the previous state
+            self.attributes = attributes
+        elif attributes:
+            self.attributes = ReadOnlyDict(
+                {
+                    intern(key) if type(key) is str else key: value
+                    for key, value in attributes.items()
+                }
+            )
+        else:
+            self.attributes = _EMPTY_ATTRIBUTES
         self.last_updated = last_updated or dt_util.utcnow()
         self.last_changed = last_changed or self.last_updated
         self.context = context or Context()
         self.domain, self.object_id = split_entity_id(self.entity_id)
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
+        self._as_dict_json: bytes | None = None
         self._as_compressed_state: dict[str, Any] | None = None
+        self._as_compressed_state_json: bytes | None = None
 
     @property
     def name(self) -> str:
@@ -1244,6 +1535,11 @@ class State:
             "_", " "
         )
 
+    @property
+    def last_updated_timestamp(self) -> float:
+        """Timestamp of last_updated."""
+        return self.last_updated.timestamp()
+
     def as_dict(self) -> ReadOnlyDict[str, Collection[Any]]:
         """Return a dict representation of the State.
 
@@ -1270,6 +1566,18 @@ class State:
             )
         return self._as_dict
 
+    def as_dict_json(self) -> bytes:
+        """Return a JSON representation of the State.
+
+        The JSON is cached so all consumers serialize the State only once.
+        """
+        if not self._as_dict_json:
+            # pylint: disable-next=import-outside-toplevel
+            from .helpers.json import json_bytes
+
+            self._as_dict_json = json_bytes(self.as_dict())
+        return self._as_dict_json
+
     def as_compressed_state(self) -> dict[str, Any]:
         """Build a compressed dict of a state for adds.
 
@@ -1297,6 +1605,18 @@ class State:
         self._as_compressed_state = compressed_state
         return compressed_state
 
+    def as_compressed_state_json(self) -> bytes:
+        """Return a JSON representation of the compressed State.
+
+        The JSON is cached so all consumers serialize the State only once.
+        """
+        if not self._as_compressed_state_json:
+            # pylint: disable-next=import-outside-toplevel
+            from .helpers.json import json_bytes
+
+            self._as_compressed_state_json = json_bytes(self.as_compressed_state())
+        return self._as_compressed_state_json
+
     @classmethod
     def from_dict(cls, json_dict: dict[str, Any]) -> Self | None:
         """Initialize a state from a dict.
@@ -1344,9 +1664,7 @@ class State:
         since it can never be garbage collected as each event would
         reference the previous one.
         """
-        self.context = Context(
-            self.context.user_id, self.context.parent_id, self.context.id
-        )
+        self.context = self.context._as_expired()  # pylint: disable=protected-access
 
     def __repr__(self) -> str:
         """Return the representation of the states."""
@@ -1367,6 +1685,11 @@ class StateMachine:
         self._reservations: set[str] = set()
         self._bus = bus
         self._loop = loop
+        self._coalesce_windows: dict[str, float] = {}
+        self._coalesce_last_fired: dict[str, float] = {}
+        self._coalesce_pending: dict[str, tuple[State, asyncio.TimerHandle]] = {}
+        self._coalesced_writes = 0
+        self._delivered_writes = 0
 
     def entity_ids(self, domain_filter: str | None = None) -> list[str]:
         """List of entity ids that are being tracked."""
@@ -1478,6 +1801,10 @@ class StateMachine:
         if old_state is None:
             return False
 
+        self._coalesce_last_fired.pop(entity_id, None)
+        if (pending := self._coalesce_pending.pop(entity_id, None)) is not None:
+            pending[1].cancel()
+
         old_state.expire()
         self._bus.async_fire(
             EVENT_STATE_CHANGED,
@@ -1530,6 +1857,82 @@ class StateMachine:
 
         self._reservations.add(entity_id)
 
+    @callback
+    def async_set_coalesce_window(
+        self, entity_id_or_domain: str, window: datetime.timedelta | None
+    ) -> None:
+        """Coalesce state changes of an entity or a domain within a window.
+
+        When an entity changes state again within the window after the last
+        state_changed event was fired for it, the state machine is updated
+        right away but the event is delayed until the window has passed.
+        Writes received in the meantime are collapsed into a single
+        state_changed event with the latest state.
+
+        Pass None as window to stop coalescing.
+
+        This method must be run in the event loop.
+        """
+        key = entity_id_or_domain.lower()
+        if window is not None:
+            self._coalesce_windows[key] = window.total_seconds()
+            return
+
+        self._coalesce_windows.pop(key, None)
+        for entity_id in [
+            entity_id
+            for entity_id in self._coalesce_pending
+            if entity_id == key or split_entity_id(entity_id)[0] == key
+        ]:
+            self._coalesce_pending[entity_id][1].cancel()
+            self._async_fire_coalesced(entity_id)
+        # Entities which are no longer coalesced do not need their last
+        # fired time
+        for entity_id in [
+            entity_id
+            for entity_id in self._coalesce_last_fired
+            if (entity_id == key or split_entity_id(entity_id)[0] == key)
+            and self._async_coalesce_window(entity_id) is None
+        ]:
+            del self._coalesce_last_fired[entity_id]
+
+    @callback
+    def _async_coalesce_window(self, entity_id: str) -> float | None:
+        """Return the coalesce window of an entity in seconds.
+
+        A window set for the entity takes precedence over one set for its
+        domain, even when it is zero.
+        """
+        if (window := self._coalesce_windows.get(entity_id)) is not None:
+            return window
+        return self._coalesce_windows.get(split_entity_id(entity_id)[0])
+
+    @callback
+    def async_coalesce_stats(self) -> dict[str, int]:
+        """Return the number of coalesced and delivered coalescable writes.
+
+        This method must be run in the event loop.
+        """
+        return {
+            "coalesced": self._coalesced_writes,
+            "delivered": self._delivered_writes,
+        }
+
+    @callback
+    def _async_fire_coalesced(self, entity_id: str) -> None:
+        """Fire the state_changed event for collapsed writes of an entity."""
+        old_state, _ = self._coalesce_pending.pop(entity_id)
+        state = self._states[entity_id]
+        self._coalesce_last_fired[entity_id] = self._loop.time()
+        self._delivered_writes += 1
+        self._bus.async_fire(
+            EVENT_STATE_CHANGED,
+            {"entity_id": entity_id, "old_state": old_state, "new_state": state},
+            EventOrigin.local,
+            state.context,
+            time_fired=state.last_updated,
+        )
+
     @callback
     def async_available(self, entity_id: str) -> bool:
         """Check to see if an entity_id is available to be used."""
@@ -1563,8 +1966,12 @@ class StateMachine:
             last_changed = None
         else:
             same_state = old_state.state == new_state and not force_update
-            same_attr = old_state.attributes == attributes
+            same_attr = (
+                old_state.attributes is attributes or old_state.attributes == attributes
+            )
             last_changed = old_state.last_changed if same_state else None
+            if same_attr:
+                attributes = old_state.attributes
 
         if same_state and same_attr:
             return
@@ -1572,7 +1979,7 @@ class StateMachine:
         now = dt_util.utcnow()
 
         if context is None:
-            context = Context(id=ulid_util.ulid_at_time(dt_util.utc_to_timestamp(now)))
+            context = Context(timestamp=dt_util.utc_to_timestamp(now))
         state = State(
             entity_id,
             new_state,
@@ -1582,6 +1989,31 @@ class StateMachine:
             context,
             old_state is None,
         )
+        if self._coalesce_windows and old_state is not None:
+            if (window := self._async_coalesce_window(entity_id)) is not None:
+                if entity_id in self._coalesce_pending:
+                    # The state that was last fired is kept with the pending
+                    # write so the intermediate states are never delivered.
+                    old_state.expire()
+                    self._states[entity_id] = state
+                    self._coalesced_writes += 1
+                    return
+                loop_time = self._loop.time()
+                last_fired = self._coalesce_last_fired.get(entity_id)
+                if last_fired is not None and loop_time - last_fired < window:
+                    old_state.expire()
+                    self._states[entity_id] = state
+                    self._coalesce_pending[entity_id] = (
+                        old_state,
+                        self._loop.call_at(
+                            last_fired + window, self._async_fire_coalesced, entity_id
+                        ),
+                    )
+                    self._coalesced_writes += 1
+                    return
+                self._coalesce_last_fired[entity_id] = loop_time
+                self._delivered_writes += 1
+
         if old_state is not None:
             old_state.expire()
         self._states[entity_id] = state
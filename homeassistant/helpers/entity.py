@@ -37,10 +37,14 @@ from homeassistant.core import CALLBACK_TYPE, Context, Event, HomeAssistant, cal
 from homeassistant.exceptions import HomeAssistantError, NoEntitySpecifiedError
 from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util, ensure_unique_string, slugify
+from homeassistant.util.read_only_dict import ReadOnlyDict
 
 from . import device_registry as dr, entity_registry as er
 from .device_registry import DeviceEntryType
-from .event import async_track_entity_registry_updated_event
+from .event import (
+    async_track_device_registry_updated_event,
+    async_track_entity_registry_updated_event,
+)
 from .typing import StateType
 
 if TYPE_CHECKING:
@@ -268,6 +272,34 @@ class Entity(ABC):
     # If entity is added to an entity platform
     _platform_state = EntityPlatformState.NOT_ADDED
 
+    # If the attributes that do not change with the state are cached. An
+    # entity that sets this must call async_invalidate_static_attributes
+    # when one of them changes, they are only assembled again by itself
+    # when the registry entry, its device or the unit system changes.
+    _cache_static_attributes = False
+    _cached_static_attributes: tuple[
+        tuple[Any, ...], dict[str, Any], dict[str, Any], ReadOnlyDict[str, Any]
+    ] | None = None
+    _unsub_device_updates: CALLBACK_TYPE | None = None
+    # The properties the static attributes are assembled from. Subclasses
+    # that get one of them from a class not enabling the cache do not cache
+    # the static attributes, unless they set _cache_static_attributes themselves.
+    _static_attributes_properties = frozenset(
+        {
+            "assumed_state",
+            "attribution",
+            "capability_attributes",
+            "device_class",
+            "entity_picture",
+            "has_entity_name",
+            "icon",
+            "name",
+            "supported_features",
+            "translation_key",
+            "unit_of_measurement",
+        }
+    )
+
     # Entity Properties
     _attr_assumed_state: bool = False
     _attr_attribution: str | None = None
@@ -292,6 +324,32 @@ class Entity(ABC):
     _attr_unique_id: str | None = None
     _attr_unit_of_measurement: str | None
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Stop caching the static attributes if their properties are overridden."""
+        super().__init_subclass__(**kwargs)
+        if (
+            not cls._cache_static_attributes
+            or "_cache_static_attributes" in cls.__dict__
+        ):
+            return
+        # Only the classes that enable the cache and their bases are known to
+        # invalidate it, a property from any other class in the method
+        # resolution order can change without it.
+        mro = cls.__mro__
+        caching = {
+            base
+            for klass in mro
+            if klass.__dict__.get("_cache_static_attributes")
+            for base in klass.__mro__
+        }
+        properties = cls._static_attributes_properties
+        if any(
+            not properties.isdisjoint(klass.__dict__)
+            for klass in mro
+            if klass not in caching
+        ):
+            cls._cache_static_attributes = False
+
     @property
     def should_poll(self) -> bool:
         """Return True if entity has to be polled for state.
@@ -567,6 +625,84 @@ class Entity(ABC):
 
         self._async_write_ha_state()
 
+    @callback
+    def async_invalidate_static_attributes(self) -> None:
+        """Assemble the cached attributes that do not change with the state again.
+
+        Entities that cache their static attributes must call this when one
+        of them changes, before writing the state.
+        """
+        self._cached_static_attributes = None
+
+    @callback
+    def _async_static_attributes_key(self) -> tuple[Any, ...]:
+        """Return what the cached static attributes are assembled from.
+
+        Updates of the device invalidate the cached static attributes.
+        """
+        return (self.registry_entry, self.hass.config.units)
+
+    @callback
+    def _async_subscribe_device_updates(self) -> None:
+        """Track updates of the device of the cached static attributes."""
+        self._async_unsubscribe_device_updates()
+        if (
+            not self._cache_static_attributes
+            or (entry := self.registry_entry) is None
+            or (device_id := entry.device_id) is None
+        ):
+            return
+        self._unsub_device_updates = async_track_device_registry_updated_event(
+            self.hass, device_id, self._async_device_registry_updated
+        )
+
+    @callback
+    def _async_unsubscribe_device_updates(self) -> None:
+        """Stop tracking updates of the device."""
+        if self._unsub_device_updates is not None:
+            self._unsub_device_updates()
+            self._unsub_device_updates = None
+
+    @callback
+    def _async_device_registry_updated(self, event: Event) -> None:
+        """Assemble the static attributes again once the device is updated."""
+        self.async_invalidate_static_attributes()
+
+    @callback
+    def _async_add_static_attributes(self, attr: dict[str, Any]) -> dict[str, Any]:
+        """Add the attributes that do not change with the state, but capabilities."""
+        entry = self.registry_entry
+
+        if (unit_of_measurement := self.unit_of_measurement) is not None:
+            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
+
+        if assumed_state := self.assumed_state:
+            attr[ATTR_ASSUMED_STATE] = assumed_state
+
+        if (attribution := self.attribution) is not None:
+            attr[ATTR_ATTRIBUTION] = attribution
+
+        if (
+            device_class := (entry and entry.device_class) or self.device_class
+        ) is not None:
+            attr[ATTR_DEVICE_CLASS] = str(device_class)
+
+        if (entity_picture := self.entity_picture) is not None:
+            attr[ATTR_ENTITY_PICTURE] = entity_picture
+
+        if (icon := (entry and entry.icon) or self.icon) is not None:
+            attr[ATTR_ICON] = icon
+
+        if (
+            name := (entry and entry.name) or self._friendly_name_internal()
+        ) is not None:
+            attr[ATTR_FRIENDLY_NAME] = name
+
+        if (supported_features := self.supported_features) is not None:
+            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+
+        return attr
+
     def _stringify_state(self, available: bool) -> str:
         """Convert state to string."""
         if not available:
@@ -625,42 +761,41 @@ class Entity(ABC):
 
         start = timer()
 
-        attr = self.capability_attributes
-        attr = dict(attr) if attr else {}
-
         available = self.available  # only call self.available once per update cycle
         state = self._stringify_state(available)
-        if available:
-            attr.update(self.state_attributes or {})
-            attr.update(self.extra_state_attributes or {})
-
-        if (unit_of_measurement := self.unit_of_measurement) is not None:
-            attr[ATTR_UNIT_OF_MEASUREMENT] = unit_of_measurement
-
-        if assumed_state := self.assumed_state:
-            attr[ATTR_ASSUMED_STATE] = assumed_state
-
-        if (attribution := self.attribution) is not None:
-            attr[ATTR_ATTRIBUTION] = attribution
 
-        if (
-            device_class := (entry and entry.device_class) or self.device_class
-        ) is not None:
-            attr[ATTR_DEVICE_CLASS] = str(device_class)
-
-        if (entity_picture := self.entity_picture) is not None:
-            attr[ATTR_ENTITY_PICTURE] = entity_picture
-
-        if (icon := (entry and entry.icon) or self.icon) is not None:
-            attr[ATTR_ICON] = icon
-
-        if (
-            name := (entry and entry.name) or self._friendly_name_internal()
-        ) is not None:
-            attr[ATTR_FRIENDLY_NAME] = name
-
-        if (supported_features := self.supported_features) is not None:
-            attr[ATTR_SUPPORTED_FEATURES] = supported_features
+        attr: dict[str, Any]
+        if not self._cache_static_attributes:
+            capabilities = self.capability_attributes
+            attr = dict(capabilities) if capabilities else {}
+            if available:
+                attr.update(self.state_attributes or {})
+                attr.update(self.extra_state_attributes or {})
+            self._async_add_static_attributes(attr)
+        else:
+            key = self._async_static_attributes_key()
+            if (cached := self._cached_static_attributes) is None or cached[0] != key:
+                capability_attr = dict(self.capability_attributes or {})
+                static_attr = self._async_add_static_attributes({})
+                cached = self._cached_static_attributes = (
+                    key,
+                    capability_attr,
+                    static_attr,
+                    ReadOnlyDict({**capability_attr, **static_attr}),
+                )
+            # Without state attributes the attributes of the last write are
+            # passed, so the state machine can tell they did not change by identity
+            _, capability_attr, static_attr, attr = cached
+            if available:
+                state_attr = self.state_attributes
+                extra_attr = self.extra_state_attributes
+                if state_attr or extra_attr:
+                    attr = {
+                        **capability_attr,
+                        **(state_attr or {}),
+                        **(extra_attr or {}),
+                        **static_attr,
+                    }
 
         end = timer()
 
@@ -676,8 +811,10 @@ class Entity(ABC):
             )
 
         # Overwrite properties that have been set in the config file.
-        if customize := hass.data.get(DATA_CUSTOMIZE):
-            attr.update(customize.get(entity_id))
+        if (customize := hass.data.get(DATA_CUSTOMIZE)) and (
+            customized := customize.get(entity_id)
+        ):
+            attr = {**attr, **customized}
 
         if (
             self._context_set is not None
@@ -907,6 +1044,8 @@ class Entity(ABC):
                     self.hass, self.entity_id, self._async_registry_updated
                 )
             )
+            self._async_subscribe_device_updates()
+            self.async_on_remove(self._async_unsubscribe_device_updates)
 
     async def async_internal_will_remove_from_hass(self) -> None:
         """Run when entity will be removed from hass.
@@ -937,6 +1076,9 @@ class Entity(ABC):
             return
 
         assert old is not None
+        if self.registry_entry.device_id != old.device_id:
+            self._async_subscribe_device_updates()
+
         if self.registry_entry.entity_id == old.entity_id:
             self.async_registry_entry_updated()
             self.async_write_ha_state()
@@ -2,12 +2,18 @@
 from __future__ import annotations
 
 import asyncio
+import bisect
 from collections.abc import Awaitable, Callable, Coroutine, Iterable
 from contextvars import ContextVar
 from datetime import datetime, timedelta
+import heapq
+import itertools
 from logging import Logger, getLogger
+import math
+import time
 from typing import TYPE_CHECKING, Any, Protocol
 from urllib.parse import urlparse
+import zlib
 
 import voluptuous as vol
 
@@ -20,6 +26,7 @@ from homeassistant.const import (
 from homeassistant.core import (
     CALLBACK_TYPE,
     CoreState,
+    HassJob,
     HomeAssistant,
     ServiceCall,
     callback,
@@ -32,18 +39,21 @@ from homeassistant.exceptions import (
     RequiredParameterMissing,
 )
 from homeassistant.setup import async_start_setup
+from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
 from . import (
     config_validation as cv,
     device_registry as dev_reg,
     entity_registry as ent_reg,
+    event,
     service,
     translation,
 )
 from .device_registry import DeviceRegistry
 from .entity_registry import EntityRegistry, RegistryEntryDisabler, RegistryEntryHider
-from .event import async_call_later, async_track_time_interval
+from .event import async_call_later, async_track_point_in_utc_time
+from .singleton import singleton
 from .typing import ConfigType, DiscoveryInfoType
 
 if TYPE_CHECKING:
@@ -58,6 +68,11 @@ SLOW_ADD_MIN_TIMEOUT = 500
 PLATFORM_NOT_READY_RETRIES = 10
 DATA_ENTITY_PLATFORM = "entity_platform"
 PLATFORM_NOT_READY_BASE_WAIT_TIME = 30  # seconds
+DATA_POLLING_SCHEDULER = "entity_platform_polling_scheduler"
+MAX_CONCURRENT_POLLS = 64
+# Upper bounds in seconds of the buckets of the poll duration histograms,
+# polls that take longer are counted in one more bucket
+POLL_DURATION_BUCKETS = (0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0)
 
 _LOGGER = getLogger(__name__)
 
@@ -133,7 +148,6 @@ class EntityPlatform:
         self._async_unsub_polling: CALLBACK_TYPE | None = None
         # Method to cancel the retry of setup
         self._async_cancel_retry_setup: CALLBACK_TYPE | None = None
-        self._process_updates: asyncio.Lock | None = None
 
         self.parallel_updates: asyncio.Semaphore | None = None
 
@@ -475,12 +489,9 @@ class EntityPlatform:
         ):
             return
 
-        self._async_unsub_polling = async_track_time_interval(
-            self.hass,
-            self._update_entity_states,
-            self.scan_interval,
-            name=f"EntityPlatform poll {self.domain}.{self.platform_name}",
-        )
+        self._async_unsub_polling = async_get_polling_scheduler(
+            self.hass
+        ).async_add_platform(self)
 
     def _entity_id_already_exists(self, entity_id: str) -> tuple[bool, bool]:
         """Check if an entity_id already exists.
@@ -822,34 +833,168 @@ class EntityPlatform:
             self.platform_name, name, handle_service, schema
         )
 
-    async def _update_entity_states(self, now: datetime) -> None:
-        """Update the states of all the polling entities.
+
+class _ScheduledPoll:
+    """A polling platform polled by the polling scheduler."""
+
+    __slots__ = ("platform", "key", "interval", "offset", "polling")
+
+    def __init__(self, platform: EntityPlatform) -> None:
+        """Initialize the scheduled poll."""
+        self.platform = platform
+        self.key = f"{platform.domain}.{platform.platform_name}"
+        self.interval = platform.scan_interval.total_seconds()
+        slot_key = self.key
+        if platform.config_entry:
+            slot_key = f"{slot_key}.{platform.config_entry.entry_id}"
+        # The offset of the slot in the interval only depends on the
+        # platform so it is the same on every restart
+        self.offset = zlib.crc32(slot_key.encode()) / 2**32 * self.interval
+        self.polling = False
+
+    def next_due(self, now: float) -> float:
+        """Return the start of the first slot after now."""
+        interval = self.interval
+        return self.offset + (math.floor((now - self.offset) / interval) + 1) * interval
+
+
+class PollingScheduler:
+    """Poll the entity platforms from one timer.
+
+    Each polling platform updates all its polling entities together, in its
+    own slot of its scan interval. The offset of the slot is derived from
+    the platform, so platforms sharing a scan interval are spread across it
+    instead of all polling at once. At most MAX_CONCURRENT_POLLS platforms
+    are polled at the same time.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the polling scheduler."""
+        self.hass = hass
+        # Limited per platform poll, the entities of a platform are limited
+        # by its parallel_updates semaphore, so the two can not deadlock
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_POLLS)
+        # Entity update durations per platform, counted in POLL_DURATION_BUCKETS
+        self.histograms: dict[str, list[int]] = {}
+        self._polls: dict[EntityPlatform, _ScheduledPoll] = {}
+        self._queue: list[tuple[float, int, _ScheduledPoll]] = []
+        self._counter = itertools.count()
+        self._job = HassJob(self._async_poll_due, "EntityPlatform polling scheduler")
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_due = math.inf
+
+    @callback
+    def async_add_platform(self, platform: EntityPlatform) -> CALLBACK_TYPE:
+        """Start polling the polling entities of a platform.
+
+        Returns a callback to stop polling the platform.
+        """
+        if platform not in self._polls:
+            poll = self._polls[platform] = _ScheduledPoll(platform)
+            self._async_schedule(poll, event.time_tracker_timestamp())
+            self._async_arm_timer()
+
+        @callback
+        def _async_remove() -> None:
+            """Stop polling the platform."""
+            if self._polls.pop(platform, None) is None:
+                return
+            self._queue = [
+                item for item in self._queue if item[2].platform is not platform
+            ]
+            heapq.heapify(self._queue)
+            self._async_arm_timer()
+
+        return _async_remove
+
+    @callback
+    def _async_schedule(self, poll: _ScheduledPoll, now: float) -> None:
+        """Schedule the next poll of a platform."""
+        heapq.heappush(self._queue, (poll.next_due(now), next(self._counter), poll))
+
+    @callback
+    def _async_arm_timer(self) -> None:
+        """Arm the timer for the first platform that is due."""
+        if not self._queue:
+            if self._unsub_timer is not None:
+                self._unsub_timer()
+                self._unsub_timer = None
+                self._timer_due = math.inf
+            return
+        due = self._queue[0][0]
+        if self._unsub_timer is not None:
+            if self._timer_due <= due:
+                return
+            self._unsub_timer()
+        self._timer_due = due
+        self._unsub_timer = async_track_point_in_utc_time(
+            self.hass, self._job, dt_util.utc_from_timestamp(due)
+        )
+
+    @callback
+    def _async_poll_due(self, _: datetime) -> None:
+        """Poll the platforms that are due."""
+        # The timer does not fire before it is due, only the rounding
+        # of its time to microseconds can make it look early
+        now = max(event.time_tracker_timestamp(), self._timer_due)
+        self._unsub_timer = None
+        self._timer_due = math.inf
+        queue = self._queue
+        while queue and queue[0][0] <= now:
+            poll = heapq.heappop(queue)[2]
+            platform = poll.platform
+            if self._polls.get(platform) is not poll:
+                continue
+            self._async_schedule(poll, now)
+            if poll.polling:
+                platform.logger.warning(
+                    "Updating %s %s took longer than the scheduled update interval %s",
+                    platform.platform_name,
+                    platform.domain,
+                    platform.scan_interval,
+                )
+                continue
+            self.hass.async_create_task(
+                self._async_poll(poll), f"EntityPlatform poll {poll.key}"
+            )
+        self._async_arm_timer()
+
+    async def _async_poll(self, poll: _ScheduledPoll) -> None:
+        """Update the polling entities of a platform.
 
         To protect from flooding the executor, we will update async entities
         in parallel and other entities sequential.
-
-        This method must be run in the event loop.
         """
-        if self._process_updates is None:
-            self._process_updates = asyncio.Lock()
-        if self._process_updates.locked():
-            self.logger.warning(
-                "Updating %s %s took longer than the scheduled update interval %s",
-                self.platform_name,
-                self.domain,
-                self.scan_interval,
+        poll.polling = True
+        try:
+            async with self._semaphore:
+                tasks: list[Coroutine[Any, Any, None]] = [
+                    self._async_update_entity(poll, entity)
+                    for entity in poll.platform.entities.values()
+                    if entity.should_poll
+                ]
+                if tasks:
+                    await asyncio.gather(*tasks)
+        finally:
+            poll.polling = False
+
+    async def _async_update_entity(self, poll: _ScheduledPoll, entity: Entity) -> None:
+        """Update an entity and record how long it took."""
+        start = time.monotonic()
+        await entity.async_update_ha_state(True)
+        duration = time.monotonic() - start
+        if (histogram := self.histograms.get(poll.key)) is None:
+            histogram = self.histograms[poll.key] = [0] * (
+                len(POLL_DURATION_BUCKETS) + 1
             )
-            return
+        histogram[bisect.bisect_left(POLL_DURATION_BUCKETS, duration)] += 1
 
-        async with self._process_updates:
-            tasks: list[Coroutine[Any, Any, None]] = []
-            for entity in self.entities.values():
-                if not entity.should_poll:
-                    continue
-                tasks.append(entity.async_update_ha_state(True))
 
-            if tasks:
-                await asyncio.gather(*tasks)
+@callback
+@singleton(DATA_POLLING_SCHEDULER)
+def async_get_polling_scheduler(hass: HomeAssistant) -> PollingScheduler:
+    """Get the polling scheduler of the entity platforms."""
+    return PollingScheduler(hass)
 
 
 current_platform: ContextVar[EntityPlatform | None] = ContextVar(
@@ -49,6 +49,23 @@ class EntityFilter:
             bool(self._exclude_eg and self._exclude_eg.match(entity_id))
         )
 
+    @property
+    def included_keys(self) -> set[str] | None:
+        """Return the entity_ids and domains of an include only filter.
+
+        An entity passes such a filter if its entity_id or its domain is one
+        of the keys. None is returned for all other filters.
+        """
+        if (
+            self._exclude_e
+            or self._exclude_d
+            or self._exclude_eg
+            or self._include_eg
+            or not (self._include_e or self._include_d)
+        ):
+            return None
+        return self._include_e | self._include_d
+
     def __call__(self, entity_id: str) -> bool:
         """Run the filter."""
         if self._filter is None:
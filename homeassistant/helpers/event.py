@@ -36,15 +36,14 @@ from homeassistant.loader import bind_hass
 from homeassistant.util import dt as dt_util
 from homeassistant.util.async_ import run_callback_threadsafe
 
+from .device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from .entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from .ratelimit import KeyedRateLimit
+from .singleton import singleton
 from .sun import get_astral_event_next
-from .template import RenderInfo, Template, result_as_boolean
+from .template import RenderInfo, Template, result_as_boolean, template_variable_names
 from .typing import TemplateVarsType
 
-TRACK_STATE_CHANGE_CALLBACKS = "track_state_change_callbacks"
-TRACK_STATE_CHANGE_LISTENER = "track_state_change_listener"
-
 TRACK_STATE_ADDED_DOMAIN_CALLBACKS = "track_state_added_domain_callbacks"
 TRACK_STATE_ADDED_DOMAIN_LISTENER = "track_state_added_domain_listener"
 
@@ -54,6 +53,11 @@ TRACK_STATE_REMOVED_DOMAIN_LISTENER = "track_state_removed_domain_listener"
 TRACK_ENTITY_REGISTRY_UPDATED_CALLBACKS = "track_entity_registry_updated_callbacks"
 TRACK_ENTITY_REGISTRY_UPDATED_LISTENER = "track_entity_registry_updated_listener"
 
+TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS = "track_device_registry_updated_callbacks"
+TRACK_DEVICE_REGISTRY_UPDATED_LISTENER = "track_device_registry_updated_listener"
+
+SHARED_TEMPLATE_RENDERS = "shared_template_renders"
+
 _ALL_LISTENER = "all"
 _DOMAINS_LISTENER = "domains"
 _ENTITIES_LISTENER = "entities"
@@ -247,9 +251,9 @@ def async_track_state_change_event(
 
     In order to avoid having to iterate a long list
     of EVENT_STATE_CHANGED and fire and create a job
-    for each one, we keep a dict of entity ids that
-    care about the state change events so we can
-    do a fast dict lookup to route events.
+    for each one, the listener is registered as a keyed
+    listener on the event bus which does a fast dict
+    lookup by entity_id to route events.
     """
     if not (entity_ids := _async_string_to_lower_list(entity_ids)):
         return _remove_empty_listener
@@ -263,56 +267,7 @@ def _async_track_state_change_event(
     action: Callable[[Event], Any],
 ) -> CALLBACK_TYPE:
     """async_track_state_change_event without lowercasing."""
-    entity_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
-        TRACK_STATE_CHANGE_CALLBACKS, {}
-    )
-
-    if TRACK_STATE_CHANGE_LISTENER not in hass.data:
-
-        @callback
-        def _async_state_change_filter(event: Event) -> bool:
-            """Filter state changes by entity_id."""
-            return event.data.get("entity_id") in entity_callbacks
-
-        @callback
-        def _async_state_change_dispatcher(event: Event) -> None:
-            """Dispatch state changes by entity_id."""
-            entity_id = event.data.get("entity_id")
-
-            if entity_id not in entity_callbacks:
-                return
-
-            for job in entity_callbacks[entity_id][:]:
-                try:
-                    hass.async_run_hass_job(job, event)
-                except Exception:  # pylint: disable=broad-except
-                    _LOGGER.exception(
-                        "Error while processing state change for %s", entity_id
-                    )
-
-        hass.data[TRACK_STATE_CHANGE_LISTENER] = hass.bus.async_listen(
-            EVENT_STATE_CHANGED,
-            _async_state_change_dispatcher,
-            event_filter=_async_state_change_filter,
-        )
-
-    job = HassJob(action, f"track state change event {entity_ids}")
-
-    for entity_id in entity_ids:
-        entity_callbacks.setdefault(entity_id, []).append(job)
-
-    @callback
-    def remove_listener() -> None:
-        """Remove state change listener."""
-        _async_remove_indexed_listeners(
-            hass,
-            TRACK_STATE_CHANGE_CALLBACKS,
-            TRACK_STATE_CHANGE_LISTENER,
-            entity_ids,
-            job,
-        )
-
-    return remove_listener
+    return hass.bus.async_listen_keyed(EVENT_STATE_CHANGED, entity_ids, action)
 
 
 @callback
@@ -412,6 +367,74 @@ def async_track_entity_registry_updated_event(
     return remove_listener
 
 
+@bind_hass
+def async_track_device_registry_updated_event(
+    hass: HomeAssistant,
+    device_ids: str | Iterable[str],
+    action: Callable[[Event], Any],
+) -> CALLBACK_TYPE:
+    """Track specific device registry updated events indexed by device_id.
+
+    Similar to async_track_entity_registry_updated_event.
+    """
+    if not device_ids:
+        return _remove_empty_listener
+    if isinstance(device_ids, str):
+        device_ids = [device_ids]
+
+    device_callbacks: dict[str, list[HassJob[[Event], Any]]] = hass.data.setdefault(
+        TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS, {}
+    )
+
+    if TRACK_DEVICE_REGISTRY_UPDATED_LISTENER not in hass.data:
+
+        @callback
+        def _async_device_registry_updated_filter(event: Event) -> bool:
+            """Filter device registry updates by device_id."""
+            return event.data["device_id"] in device_callbacks
+
+        @callback
+        def _async_device_registry_updated_dispatcher(event: Event) -> None:
+            """Dispatch device registry updates by device_id."""
+            device_id = event.data["device_id"]
+
+            if device_id not in device_callbacks:
+                return
+
+            for job in device_callbacks[device_id][:]:
+                try:
+                    hass.async_run_hass_job(job, event)
+                except Exception:  # pylint: disable=broad-except
+                    _LOGGER.exception(
+                        "Error while processing device registry update for %s",
+                        device_id,
+                    )
+
+        hass.data[TRACK_DEVICE_REGISTRY_UPDATED_LISTENER] = hass.bus.async_listen(
+            EVENT_DEVICE_REGISTRY_UPDATED,
+            _async_device_registry_updated_dispatcher,
+            event_filter=_async_device_registry_updated_filter,
+        )
+
+    job = HassJob(action, f"track device registry updated event {device_ids}")
+
+    for device_id in device_ids:
+        device_callbacks.setdefault(device_id, []).append(job)
+
+    @callback
+    def remove_listener() -> None:
+        """Remove device registry update listener."""
+        _async_remove_indexed_listeners(
+            hass,
+            TRACK_DEVICE_REGISTRY_UPDATED_CALLBACKS,
+            TRACK_DEVICE_REGISTRY_UPDATED_LISTENER,
+            device_ids,
+            job,
+        )
+
+    return remove_listener
+
+
 @callback
 def _async_domain_has_listeners(
     domain: str, callbacks: dict[str, list[HassJob[[Event], Any]]]
@@ -812,6 +835,70 @@ def async_track_template(
 track_template = threaded_listener_factory(async_track_template)
 
 
+class SharedTemplateRenders:
+    """Share the renders of identical templates for a state change.
+
+    Identical templates with equal variables, tracked by different
+    listeners, are rendered once for a state_changed event and the
+    render is reused by the other listeners. Only the variables the
+    template reads are compared, so templates of different entities
+    that do not read `this` are shared.
+    """
+
+    __slots__ = ("_event", "_now", "_renders", "renders", "deduplicated_renders")
+
+    def __init__(self) -> None:
+        """Initialize the shared renders."""
+        self._event: Event | None = None
+        self._now: datetime | None = None
+        self._renders: dict[Template, list[tuple[TemplateVarsType, RenderInfo]]] = {}
+        self.renders = 0
+        self.deduplicated_renders = 0
+
+    @callback
+    def async_render_to_info(
+        self,
+        template: Template,
+        variables: TemplateVarsType,
+        event: Event,
+        now: datetime,
+    ) -> RenderInfo:
+        """Render the template for the event, or reuse an identical render."""
+        if event is not self._event or now != self._now:
+            # Renders of a previous event or a replayed event are outdated
+            self._event = event
+            self._now = now
+            self._renders = {}
+
+        shared_key = variables
+        if (
+            variables
+            and (names := template_variable_names(template.template)) is not None
+        ):
+            shared_key = {
+                name: value for name, value in variables.items() if name in names
+            }
+        renders = self._renders.setdefault(template, [])
+        for shared_variables, shared_info in renders:
+            if shared_variables == shared_key:
+                self.deduplicated_renders += 1
+                info = copy.copy(shared_info)
+                info.template = template
+                return info
+
+        info = template.async_render_to_info(variables)
+        self.renders += 1
+        renders.append((shared_key, info))
+        return info
+
+
+@callback
+@singleton(SHARED_TEMPLATE_RENDERS)
+def async_get_shared_template_renders(hass: HomeAssistant) -> SharedTemplateRenders:
+    """Return the shared template renders."""
+    return SharedTemplateRenders()
+
+
 class TrackTemplateResultInfo:
     """Handle removal / refresh of tracker."""
 
@@ -834,6 +921,7 @@ class TrackTemplateResultInfo:
         self._last_result: dict[Template, bool | str | TemplateError] = {}
 
         self._rate_limit = KeyedRateLimit(hass)
+        self._shared_renders = async_get_shared_template_renders(hass)
         self._info: dict[Template, RenderInfo] = {}
         self._track_state_changes: _TrackStateChangeFiltered | None = None
         self._time_listeners: dict[Template, Callable[[], None]] = {}
@@ -996,9 +1084,13 @@ class TrackTemplateResultInfo:
             )
 
         self._rate_limit.async_triggered(template, now)
-        self._info[template] = info = template.async_render_to_info(
-            track_template_.variables
-        )
+        if event:
+            info = self._shared_renders.async_render_to_info(
+                template, track_template_.variables, event, now
+            )
+        else:
+            info = template.async_render_to_info(track_template_.variables)
+        self._info[template] = info
 
         try:
             result: str | TemplateError = info.result()
@@ -1677,13 +1769,15 @@ def _event_triggers_rerender(event: Event, info: RenderInfo) -> bool:
     """Determine if a template should be re-rendered from an event."""
     entity_id = cast(str, event.data.get(ATTR_ENTITY_ID))
 
+    new_state = event.data.get("new_state")
+    old_state = event.data.get("old_state")
+
     if info.filter(entity_id):
-        return True
+        if new_state is None or old_state is None:
+            return True
+        return info.fields_changed(entity_id, old_state, new_state)
 
-    if (
-        event.data.get("new_state") is not None
-        and event.data.get("old_state") is not None
-    ):
+    if new_state is not None and old_state is not None:
         return False
 
     return bool(info.filter_lifecycle(entity_id))
@@ -10,16 +10,19 @@ from contextlib import contextmanager, suppress
 from contextvars import ContextVar
 from datetime import datetime, timedelta
 from functools import cache, lru_cache, partial, wraps
+import hashlib
 import json
 import logging
 import math
 from operator import contains
 import pathlib
+import pickle
 import random
 import re
 import statistics
 from struct import error as StructError, pack, unpack_from
 import sys
+import threading
 from types import CodeType
 from typing import (
     Any,
@@ -38,6 +41,7 @@ import async_timeout
 from awesomeversion import AwesomeVersion
 import jinja2
 from jinja2 import pass_context, pass_environment, pass_eval_context
+from jinja2.meta import find_undeclared_variables
 from jinja2.runtime import AsyncLoopContext, LoopContext
 from jinja2.sandbox import ImmutableSandboxedEnvironment
 from jinja2.utils import Namespace
@@ -46,6 +50,7 @@ import voluptuous as vol
 
 from homeassistant.const import (
     ATTR_ENTITY_ID,
+    ATTR_FRIENDLY_NAME,
     ATTR_LATITUDE,
     ATTR_LONGITUDE,
     ATTR_PERSONS,
@@ -55,6 +60,7 @@ from homeassistant.const import (
     STATE_UNAVAILABLE,
     STATE_UNKNOWN,
     UnitOfLength,
+    __version__ as HA_VERSION,
 )
 from homeassistant.core import (
     Context,
@@ -79,6 +85,8 @@ from homeassistant.util.thread import ThreadWithException
 
 from . import area_registry, device_registry, entity_registry, location as loc_helper
 from .singleton import singleton
+from .start import async_at_started
+from .storage import Store
 from .typing import TemplateVarsType
 
 # mypy: allow-untyped-defs, no-check-untyped-defs
@@ -92,6 +100,7 @@ _ENVIRONMENT = "template.environment"
 _ENVIRONMENT_LIMITED = "template.environment_limited"
 _ENVIRONMENT_STRICT = "template.environment_strict"
 _HASS_LOADER = "template.hass_loader"
+_CODE_CACHE = "template.code_cache"
 
 _RE_JINJA_DELIMITERS = re.compile(r"\{%|\{\{|\{#")
 # Match "simple" ints and floats. -1.0, 1, +5, 5.0
@@ -102,15 +111,22 @@ _RESERVED_NAMES = {"contextfunction", "evalcontextfunction", "environmentfunctio
 _GROUP_DOMAIN_PREFIX = "group."
 _ZONE_DOMAIN_PREFIX = "zone."
 
-_COLLECTABLE_STATE_ATTRIBUTES = {
-    "state",
-    "attributes",
-    "last_changed",
-    "last_updated",
-    "context",
-    "domain",
-    "object_id",
-    "name",
+# A field standing for the whole state
+_ALL_FIELDS = "*"
+_ATTRIBUTE_FIELD_PREFIX = "attributes."
+
+# The state attributes that are collected, with the fields of the
+# state they are read from. The domain and object_id of an entity
+# never change.
+_COLLECTABLE_STATE_ATTRIBUTES: dict[str, tuple[str, ...]] = {
+    "state": ("state",),
+    "attributes": ("attributes",),
+    "last_changed": ("last_changed",),
+    "last_updated": ("last_updated",),
+    "context": ("context",),
+    "domain": (),
+    "object_id": (),
+    "name": (f"{_ATTRIBUTE_FIELD_PREFIX}{ATTR_FRIENDLY_NAME}",),
 }
 
 _T = TypeVar("_T")
@@ -144,6 +160,13 @@ EVAL_CACHE_SIZE = 512
 
 MAX_CUSTOM_TEMPLATE_SIZE = 5 * 1024 * 1024
 
+CODE_CACHE_STORAGE_KEY = "core.template_code_cache"
+CODE_CACHE_STORAGE_VERSION = 1
+CODE_CACHE_SAVE_DELAY = 60
+CODE_CACHE_COMPILED_SAVE_DELAY = 3600
+MAX_CACHED_CODE_SIZE = 4 * 1024 * 1024
+MAX_COMPILED_KEYS = 8192
+
 CACHED_TEMPLATE_LRU: MutableMapping[State, TemplateState] = LRU(CACHED_TEMPLATE_STATES)
 CACHED_TEMPLATE_NO_COLLECT_LRU: MutableMapping[State, TemplateState] = LRU(
     CACHED_TEMPLATE_STATES
@@ -252,6 +275,29 @@ def is_template_string(maybe_template: str) -> bool:
     return _RE_JINJA_DELIMITERS.search(maybe_template) is not None
 
 
+@lru_cache(maxsize=EVAL_CACHE_SIZE)
+def template_variable_names(template: str) -> frozenset[str] | None:
+    """Return the names a template may read from its variables.
+
+    None is returned if the template can not be parsed or includes or
+    imports other templates, which can read any variable.
+    """
+    try:
+        ast = _NO_HASS_ENV.parse(template)
+    except jinja2.TemplateSyntaxError:
+        return None
+    if any(
+        ast.find(node_type)
+        for node_type in (
+            jinja2.nodes.Import,
+            jinja2.nodes.FromImport,
+            jinja2.nodes.Include,
+        )
+    ):
+        return None
+    return frozenset(find_undeclared_variables(ast))
+
+
 class ResultWrapper:
     """Result wrapper class to store render result."""
 
@@ -335,6 +381,10 @@ class RenderInfo:
         self.domains: collections.abc.Set[str] = set()
         self.domains_lifecycle: collections.abc.Set[str] = set()
         self.entities: collections.abc.Set[str] = set()
+        # The fields of the states read, by entity_id. The fields of the
+        # states of iterated domains or all states are collected under None.
+        # A state without collected fields depends on the whole state.
+        self.state_fields: dict[str | None, set[str]] = {}
         self.rate_limit: timedelta | None = None
         self.has_time = False
 
@@ -347,6 +397,7 @@ class RenderInfo:
             f" domains={self.domains}"
             f" domains_lifecycle={self.domains_lifecycle}"
             f" entities={self.entities}"
+            f" state_fields={self.state_fields}"
             f" rate_limit={self.rate_limit}"
             f" has_time={self.has_time}"
             f" exception={self.exception}"
@@ -377,6 +428,51 @@ class RenderInfo:
         """
         return split_entity_id(entity_id)[0] in self.domains_lifecycle
 
+    def collect_state_fields(
+        self, entity_id: str | None, fields: Iterable[str]
+    ) -> None:
+        """Collect the fields read from a state."""
+        if (state_fields := self.state_fields.get(entity_id)) is None:
+            self.state_fields[entity_id] = set(fields)
+        else:
+            state_fields.update(fields)
+
+    def fields_changed(
+        self, entity_id: str, old_state: State, new_state: State
+    ) -> bool:
+        """Return if a state change can change the result of the template.
+
+        Only the fields of the state the template read are compared, so
+        the template is not re-rendered when an unrelated attribute of
+        an entity it tracks changes.
+        """
+        if self.exception is not None:
+            return True
+        fields: set[str] = set()
+        if entity_id in self.entities:
+            if (entity_fields := self.state_fields.get(entity_id)) is None:
+                return True
+            fields.update(entity_fields)
+        if self.all_states or split_entity_id(entity_id)[0] in self.domains:
+            if (iterated_fields := self.state_fields.get(None)) is None:
+                return True
+            fields.update(iterated_fields)
+        elif entity_id not in self.entities:
+            return True
+
+        for field in fields:
+            if field == _ALL_FIELDS:
+                return True
+            if field.startswith(_ATTRIBUTE_FIELD_PREFIX):
+                name = field[len(_ATTRIBUTE_FIELD_PREFIX) :]
+                if old_state.attributes.get(name, _SENTINEL) != (
+                    new_state.attributes.get(name, _SENTINEL)
+                ):
+                    return True
+            elif getattr(old_state, field) != getattr(new_state, field):
+                return True
+        return False
+
     def result(self) -> str:
         """Results of the template computation."""
         if self.exception is not None:
@@ -906,18 +1002,20 @@ class TemplateStateBase(State):
         self._entity_id = entity_id
         self._as_dict: ReadOnlyDict[str, Collection[Any]] | None = None
 
-    def _collect_state(self) -> None:
-        if self._collect and (_render_info := self._hass.data.get(_RENDER_INFO)):
-            _render_info.entities.add(self._entity_id)
+    def _collect_state(self, *fields: str) -> None:
+        if _render_info := self._hass.data.get(_RENDER_INFO):
+            entity_id: str | None = None
+            if self._collect:
+                entity_id = self._entity_id
+                _render_info.entities.add(entity_id)
+            _render_info.collect_state_fields(entity_id, fields)
 
     # Jinja will try __getitem__ first and it avoids the need
     # to call is_safe_attribute
     def __getitem__(self, item: str) -> Any:
         """Return a property as an attribute for jinja."""
-        if item in _COLLECTABLE_STATE_ATTRIBUTES:
-            # _collect_state inlined here for performance
-            if self._collect and (_render_info := self._hass.data.get(_RENDER_INFO)):
-                _render_info.entities.add(self._entity_id)
+        if (fields := _COLLECTABLE_STATE_ATTRIBUTES.get(item)) is not None:
+            self._collect_state(*fields)
             return getattr(self._state, item)
         if item == "entity_id":
             return self._entity_id
@@ -936,31 +1034,31 @@ class TemplateStateBase(State):
     @property
     def state(self) -> str:  # type: ignore[override]
         """Wrap State.state."""
-        self._collect_state()
+        self._collect_state("state")
         return self._state.state
 
     @property
     def attributes(self) -> ReadOnlyDict[str, Any]:  # type: ignore[override]
         """Wrap State.attributes."""
-        self._collect_state()
+        self._collect_state("attributes")
         return self._state.attributes
 
     @property
     def last_changed(self) -> datetime:  # type: ignore[override]
         """Wrap State.last_changed."""
-        self._collect_state()
+        self._collect_state("last_changed")
         return self._state.last_changed
 
     @property
     def last_updated(self) -> datetime:  # type: ignore[override]
         """Wrap State.last_updated."""
-        self._collect_state()
+        self._collect_state("last_updated")
         return self._state.last_updated
 
     @property
     def context(self) -> Context:  # type: ignore[override]
         """Wrap State.context."""
-        self._collect_state()
+        self._collect_state("context")
         return self._state.context
 
     @property
@@ -978,7 +1076,7 @@ class TemplateStateBase(State):
     @property
     def name(self) -> str:
         """Wrap State.name."""
-        self._collect_state()
+        self._collect_state(f"{_ATTRIBUTE_FIELD_PREFIX}{ATTR_FRIENDLY_NAME}")
         return self._state.name
 
     @property
@@ -986,6 +1084,11 @@ class TemplateStateBase(State):
         """Return the state concatenated with the unit if available."""
         return self.format_state(rounded=True, with_unit=True)
 
+    def _attribute(self, name: str) -> Any:
+        """Return a state attribute, only collecting the attribute."""
+        self._collect_state(f"{_ATTRIBUTE_FIELD_PREFIX}{name}")
+        return self._state.attributes.get(name)
+
     def format_state(self, rounded: bool, with_unit: bool) -> str:
         """Return a formatted version of the state."""
         # Import here, not at top-level, to avoid circular import
@@ -995,7 +1098,7 @@ class TemplateStateBase(State):
             async_rounded_state,
         )
 
-        self._collect_state()
+        self._collect_state("state", "attributes")
         if rounded and self._state.domain == SENSOR_DOMAIN:
             state = async_rounded_state(self._hass, self._entity_id, self._state)
         else:
@@ -1006,7 +1109,7 @@ class TemplateStateBase(State):
 
     def __eq__(self, other: Any) -> bool:
         """Ensure we collect on equality check."""
-        self._collect_state()
+        self._collect_state(_ALL_FIELDS)
         return self._state.__eq__(other)
 
 
@@ -1023,6 +1126,12 @@ class TemplateState(TemplateStateBase):
 
     def __repr__(self) -> str:
         """Representation of Template State."""
+        if _render_info := self._hass.data.get(_RENDER_INFO):
+            # The representation includes the whole state, but does
+            # not collect the entity when the state is not tracked
+            _render_info.collect_state_fields(
+                self._entity_id if self._collect else None, (_ALL_FIELDS,)
+            )
         return f"<template TemplateState({self._state!r})>"
 
 
@@ -1053,6 +1162,7 @@ _create_template_state_no_collect = partial(TemplateState, collect=False)
 def _collect_state(hass: HomeAssistant, entity_id: str) -> None:
     if (entity_collect := hass.data.get(_RENDER_INFO)) is not None:
         entity_collect.entities.add(entity_id)
+        entity_collect.collect_state_fields(entity_id, (_ALL_FIELDS,))
 
 
 def _state_generator(
@@ -1554,7 +1664,7 @@ def is_state_attr(hass: HomeAssistant, entity_id: str, name: str, value: Any) ->
 def state_attr(hass: HomeAssistant, entity_id: str, name: str) -> Any:
     """Get a specific attribute from a state."""
     if (state_obj := _get_state(hass, entity_id)) is not None:
-        return state_obj.attributes.get(name)
+        return state_obj._attribute(name)  # pylint: disable=protected-access
     return None
 
 
@@ -2177,6 +2287,123 @@ async def async_load_custom_templates(hass: HomeAssistant) -> None:
     _get_hass_loader(hass).sources = custom_templates
 
 
+async def async_load_code_cache(hass: HomeAssistant) -> None:
+    """Load the code of the templates compiled before the restart."""
+    code_cache = TemplateCodeCache(hass)
+    await code_cache.async_load()
+    hass.data[_CODE_CACHE] = code_cache
+    async_at_started(hass, code_cache.async_started)
+
+
+def _code_cache_build() -> str:
+    """Return the versions the compiled code depends on."""
+    return f"{HA_VERSION}-{jinja2.__version__}-{sys.implementation.cache_tag}"
+
+
+class TemplateCodeCache(jinja2.BytecodeCache):
+    """Keep the bytecode of compiled templates across restarts.
+
+    The buckets are stored by the flavour of the environment and the hash
+    of the template source. Jinja rejects a bucket with another magic
+    header or source checksum. The stored bytecode is dropped when Home
+    Assistant, Jinja or Python is updated.
+
+    The bytecode of the templates compiled while Home Assistant starts is
+    stored once it has started. Templates compiled later, like the ones of
+    the template editor, are only stored once they are compiled again, also
+    after a restart; until then only their key is stored.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the code cache."""
+        self.hass = hass
+        self._store: Store[dict[str, Any]] = Store(
+            hass, CODE_CACHE_STORAGE_VERSION, CODE_CACHE_STORAGE_KEY, private=True
+        )
+        # Templates are compiled in and outside the event loop
+        self._lock = threading.Lock()
+        self._started = False
+        # The bytecode stored before the restart and the bytecode to store
+        self._stored: dict[str, str] = {}
+        self._used: dict[str, str] = {}
+        # The keys of the templates compiled once after starting
+        self._compiled: MutableMapping[str, None] = LRU(MAX_COMPILED_KEYS)
+
+    async def async_load(self) -> None:
+        """Load the stored bytecode."""
+        data = await self._store.async_load()
+        if data is not None and data.get("build") == _code_cache_build():
+            self._stored = data["code"]
+            # The keys are stored with the key compiled last first
+            for key in reversed(data.get("compiled", ())):
+                self._compiled[key] = None
+
+    @callback
+    def async_started(self, hass: HomeAssistant) -> None:
+        """Store the bytecode of the templates compiled while starting."""
+        with self._lock:
+            self._started = True
+        self._async_schedule_save(CODE_CACHE_SAVE_DELAY)
+
+    def load_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Load the bytecode of the bucket if it was cached."""
+        with self._lock:
+            encoded = self._used.get(bucket.key) or self._stored.get(bucket.key)
+        if encoded is None:
+            return
+        try:
+            bucket.bytecode_from_string(base64.b64decode(encoded))
+        except (EOFError, TypeError, ValueError, pickle.UnpicklingError):
+            bucket.reset()
+        with self._lock:
+            if bucket.code is None:
+                self._stored.pop(bucket.key, None)
+            else:
+                self._used[bucket.key] = encoded
+
+    def dump_bytecode(self, bucket: jinja2.bccache.Bucket) -> None:
+        """Cache the bytecode of the bucket.
+
+        Templates may be compiled outside the event loop, the cache is
+        saved from the event loop.
+        """
+        with self._lock:
+            if not self._started:
+                self._used[bucket.key] = base64.b64encode(
+                    bucket.bytecode_to_string()
+                ).decode()
+                return
+            if bucket.key not in self._compiled:
+                self._compiled[bucket.key] = None
+                delay = CODE_CACHE_COMPILED_SAVE_DELAY
+            else:
+                del self._compiled[bucket.key]
+                self._used[bucket.key] = base64.b64encode(
+                    bucket.bytecode_to_string()
+                ).decode()
+                delay = CODE_CACHE_SAVE_DELAY
+        self.hass.loop.call_soon_threadsafe(self._async_schedule_save, delay)
+
+    @callback
+    def _async_schedule_save(self, delay: float) -> None:
+        """Schedule saving the cache."""
+        self._store.async_delay_save(self._data_to_save, delay)
+
+    @callback
+    def _data_to_save(self) -> dict[str, Any]:
+        """Return the bytecode to store, the bytecode used since the restart first."""
+        code: dict[str, str] = {}
+        size = 0
+        with self._lock:
+            for key, encoded in (*self._used.items(), *self._stored.items()):
+                if key in code or size + len(encoded) > MAX_CACHED_CODE_SIZE:
+                    continue
+                code[key] = encoded
+                size += len(encoded)
+            compiled = self._compiled.keys()
+        return {"build": _code_cache_build(), "code": code, "compiled": compiled}
+
+
 def _load_custom_templates(hass: HomeAssistant) -> dict[str, str]:
     result = {}
     jinja_path = hass.config.path("custom_templates")
@@ -2237,6 +2464,12 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             undefined = jinja2.StrictUndefined
         super().__init__(undefined=undefined)
         self.hass = hass
+        if limited:
+            self.flavour = "limited"
+        elif strict:
+            self.flavour = "strict"
+        else:
+            self.flavour = "normal"
         self.template_cache: weakref.WeakValueDictionary[
             str | jinja2.nodes.Template, CodeType | str | None
         ] = weakref.WeakValueDictionary()
@@ -2522,9 +2755,27 @@ class TemplateEnvironment(ImmutableSandboxedEnvironment):
             )
 
         if (cached := self.template_cache.get(source)) is None:
-            cached = self.template_cache[source] = super().compile(source)
+            cached = self.template_cache[source] = self._compile_code(source)
 
         return cached
 
+    def _compile_code(self, source: str | jinja2.nodes.Template) -> CodeType:
+        """Compile the template or return the code compiled before the restart."""
+        code_cache: TemplateCodeCache | None = (
+            None if self.hass is None else self.hass.data.get(_CODE_CACHE)
+        )
+        if code_cache is None or not isinstance(source, str):
+            return super().compile(source)
+        bucket = code_cache.get_bucket(
+            self,
+            f"{self.flavour}-{hashlib.sha256(source.encode()).hexdigest()}",
+            None,
+            source,
+        )
+        if (code := bucket.code) is None:
+            code = bucket.code = super().compile(source)
+            code_cache.set_bucket(bucket)
+        return code
+
 
 _NO_HASS_ENV = TemplateEnvironment(None)  # type: ignore[no-untyped-call]
@@ -6,19 +6,28 @@ import asyncio
 import collections
 from collections.abc import Callable
 from contextlib import suppress
+import gc
 import json
 import logging
+import os
+import tempfile
 from timeit import default_timer as timer
+import tracemalloc
 from typing import TypeVar
 
 from homeassistant import core
-from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_FINAL_WRITE,
+    EVENT_HOMEASSISTANT_STARTED,
+    EVENT_STATE_CHANGED,
+)
 from homeassistant.helpers.entityfilter import convert_include_exclude_filter
 from homeassistant.helpers.event import (
     async_track_state_change,
     async_track_state_change_event,
 )
 from homeassistant.helpers.json import JSON_DUMP, JSONEncoder
+from homeassistant.util.json import json_loads
 
 # mypy: allow-untyped-calls, allow-untyped-defs, no-check-untyped-defs
 # mypy: no-warn-return-any
@@ -314,6 +323,703 @@ async def json_serialize_states(hass):
     return timer() - start
 
 
+@benchmark
+async def state_machine_memory(hass):
+    """Measure memory of 50k entities that update their state 3 times."""
+    entities = 50000
+    attributes_json = JSON_DUMP(
+        {
+            "friendly_name": "Power",
+            "unit_of_measurement": "W",
+            "device_class": "power",
+            "state_class": "measurement",
+            "icon": "mdi:flash",
+        }
+    )
+
+    gc.collect()
+    tracemalloc.start()
+    start = timer()
+
+    for update in range(4):
+        for idx in range(entities):
+            # Attributes decoded from JSON do not share their keys
+            hass.states.async_set(
+                f"sensor.power_{idx}", str(update), json_loads(attributes_json)
+            )
+        await hass.async_block_till_done()
+
+    runtime = timer() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(
+        f"State machine with {entities} entities uses {current / 1024**2:.1f} MiB"
+        f" (peak {peak / 1024**2:.1f} MiB)"
+    )
+    return runtime
+
+
+@benchmark
+async def recorder_write_states(hass):
+    """Record 100k state changes of 1000 entities.
+
+    The database defaults to SQLite in memory, set BENCHMARK_DB_URL to
+    compare against another database such as a local PostgreSQL or MariaDB.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import entity, recorder as recorder_helper
+
+    entities = 1000
+    updates = 100
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        # The recorder spills its queue below the config dir when it is full
+        hass.config.config_dir = config_dir
+        entity.async_setup(hass)
+        recorder_helper.async_initialize_recorder(hass)
+        instance = hass.data[recorder.DATA_INSTANCE] = recorder.Recorder(
+            hass=hass,
+            auto_purge=False,
+            auto_repack=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=os.environ.get("BENCHMARK_DB_URL", "sqlite://"),
+            db_max_retries=10,
+            db_retry_wait=3,
+            entity_filter=lambda entity_id: True,
+            exclude_event_types=set(),
+            exclude_attributes_by_domain={},
+        )
+        instance.async_initialize()
+        instance.async_register()
+        instance.start()
+        await hass.async_start()
+        await instance.async_db_ready
+        await instance.async_block_till_done()
+
+        start = timer()
+        for update in range(updates):
+            for idx in range(entities):
+                hass.states.async_set(
+                    f"sensor.power_{idx}", str(update), {"unit_of_measurement": "W"}
+                )
+            await hass.async_block_till_done()
+        await instance.async_block_till_done()
+        runtime = timer() - start
+
+    print(f"Recorded {entities * updates / runtime:.0f} state changes/sec")
+    return runtime
+
+
+@benchmark
+async def statistics_during_period_rollups(hass):
+    """Query 5 years of hourly statistics of 500 statistic ids per day and month.
+
+    The same queries are run with and without the statistics rollups,
+    only a few statistic ids are queried as reducing the hourly statistics
+    of all of them does not fit in memory.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from datetime import timedelta
+
+    # pylint: disable-next=import-outside-toplevel
+    from sqlalchemy import insert
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder import statistics
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.db_schema import Statistics, StatisticsMeta
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.recorder.util import session_scope
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import entity, recorder as recorder_helper
+
+    # pylint: disable-next=import-outside-toplevel
+    import homeassistant.util.dt as dt_util
+
+    statistic_ids = 500
+    queried_statistic_ids = 10
+    hours = 5 * 365 * 24
+    queries = 10
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        entity.async_setup(hass)
+        recorder_helper.async_initialize_recorder(hass)
+        instance = hass.data[recorder.DATA_INSTANCE] = recorder.Recorder(
+            hass=hass,
+            auto_purge=False,
+            auto_repack=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=os.environ.get("BENCHMARK_DB_URL", "sqlite://"),
+            db_max_retries=10,
+            db_retry_wait=3,
+            entity_filter=lambda entity_id: True,
+            exclude_event_types=set(),
+            exclude_attributes_by_domain={},
+        )
+        instance.async_initialize()
+        instance.async_register()
+        instance.start()
+        await hass.async_start()
+        await instance.async_db_ready
+        await instance.async_block_till_done()
+
+        first_hour = dt_util.utcnow().replace(
+            minute=0, second=0, microsecond=0
+        ) - timedelta(hours=hours)
+        first_hour_ts = first_hour.timestamp()
+
+        def _insert_statistics() -> None:
+            """Insert the hourly statistics."""
+            with session_scope(session=instance.get_session()) as session:
+                metadata = [
+                    StatisticsMeta(
+                        statistic_id=f"test:energy_{idx}",
+                        source="test",
+                        unit_of_measurement="kWh",
+                        has_mean=False,
+                        has_sum=True,
+                        name=None,
+                    )
+                    for idx in range(statistic_ids)
+                ]
+                session.add_all(metadata)
+                session.flush()
+                for hour in range(hours):
+                    start_ts = first_hour_ts + hour * 3600
+                    session.execute(
+                        insert(Statistics),
+                        [
+                            {
+                                "metadata_id": meta.id,
+                                "created_ts": start_ts,
+                                "start_ts": start_ts,
+                                "state": hour % 1000,
+                                "sum": hour,
+                            }
+                            for meta in metadata
+                        ],
+                    )
+
+        await instance.async_add_executor_job(_insert_statistics)
+        instance.async_rebuild_statistics_rollups()
+        while instance.statistics_rollups_time_zone is None:
+            await instance.async_block_till_done()
+            await hass.async_block_till_done()
+
+        async def _query(period: str) -> float:
+            """Query the statistics and return the runtime."""
+            start = timer()
+            for _ in range(queries):
+                await instance.async_add_executor_job(
+                    statistics.statistics_during_period,
+                    hass,
+                    first_hour,
+                    None,
+                    {f"test:energy_{idx}" for idx in range(queried_statistic_ids)},
+                    period,
+                    None,
+                    {"state", "sum"},
+                )
+            return timer() - start
+
+        runtime = 0.0
+        rollups_time_zone = instance.statistics_rollups_time_zone
+        for period in ("day", "month"):
+            instance.statistics_rollups_time_zone = rollups_time_zone
+            with_rollups = await _query(period)
+            instance.statistics_rollups_time_zone = None
+            without_rollups = await _query(period)
+            runtime += with_rollups
+            print(
+                f"{queries} {period} queries took {with_rollups:.3f}s with rollups"
+                f" and {without_rollups:.3f}s without"
+            )
+
+    return runtime
+
+
+@benchmark
+async def sensor_compile_statistics(hass):
+    """Compile 5 minute statistics of 200 sensors updated every second.
+
+    The statistics are compiled with NumPy and again without it, NumPy
+    must be installed.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from datetime import timedelta
+
+    # pylint: disable-next=import-outside-toplevel
+    from unittest.mock import patch
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.sensor import recorder as sensor_recorder
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import entity, recorder as recorder_helper
+
+    # pylint: disable-next=import-outside-toplevel
+    import homeassistant.util.dt as dt_util
+
+    measurements = 150
+    totals = 50
+    updates = 300
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        entity.async_setup(hass)
+        recorder_helper.async_initialize_recorder(hass)
+        instance = hass.data[recorder.DATA_INSTANCE] = recorder.Recorder(
+            hass=hass,
+            auto_purge=False,
+            auto_repack=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=os.environ.get("BENCHMARK_DB_URL", "sqlite://"),
+            db_max_retries=10,
+            db_retry_wait=3,
+            entity_filter=lambda entity_id: True,
+            exclude_event_types=set(),
+            exclude_attributes_by_domain={},
+        )
+        instance.async_initialize()
+        instance.async_register()
+        instance.start()
+        await hass.async_start()
+        await instance.async_db_ready
+
+        start = dt_util.utcnow().replace(second=0, microsecond=0) - timedelta(
+            minutes=10
+        )
+        start -= timedelta(minutes=start.minute % 5)
+        end = start + timedelta(minutes=5)
+        power = {"state_class": "measurement", "unit_of_measurement": "W"}
+        energy = {"state_class": "total_increasing", "unit_of_measurement": "kWh"}
+        for update in range(updates):
+            with patch(
+                "homeassistant.util.dt.utcnow",
+                return_value=start + timedelta(seconds=update),
+            ):
+                for idx in range(measurements):
+                    hass.states.async_set(
+                        f"sensor.power_{idx}", str((idx + update) % 97), power
+                    )
+                for idx in range(totals):
+                    hass.states.async_set(
+                        f"sensor.energy_{idx}", str(idx + update / 10), energy
+                    )
+            await hass.async_block_till_done()
+        await instance.async_block_till_done()
+
+        async def _compile() -> float:
+            """Compile the statistics and return the runtime."""
+            compile_start = timer()
+            await instance.async_add_executor_job(
+                sensor_recorder.compile_statistics, hass, start, end
+            )
+            return timer() - compile_start
+
+        vectorized = await _compile()
+        with patch.object(sensor_recorder, "NUMPY_IMPORTED", False):
+            scalar = await _compile()
+
+    print(
+        f"Compiled statistics of {measurements + totals} sensors in"
+        f" {vectorized:.3f}s with NumPy and {scalar:.3f}s without"
+    )
+    return vectorized
+
+
+@benchmark
+async def logbook_entities_context(hass):
+    """Query the logbook of 10 lights each turned on and off 500 times by services.
+
+    Every state change has the context of the service call that caused it.
+    The same queries are run with and without the context origins.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from datetime import timedelta
+
+    # pylint: disable-next=import-outside-toplevel
+    from unittest.mock import patch
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components import recorder
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.logbook import DOMAIN as LOGBOOK_DOMAIN
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.logbook.models import LogbookConfig
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.logbook.processor import EventProcessor
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.const import EVENT_CALL_SERVICE, EVENT_LOGBOOK_ENTRY
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import (
+        entity,
+        entity_registry as er,
+        recorder as recorder_helper,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    import homeassistant.util.dt as dt_util
+
+    lights = 200
+    queried_lights = 10
+    updates = 500
+    queries = 10
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        entity.async_setup(hass)
+        await er.async_load(hass)
+        recorder_helper.async_initialize_recorder(hass)
+        instance = hass.data[recorder.DATA_INSTANCE] = recorder.Recorder(
+            hass=hass,
+            auto_purge=False,
+            auto_repack=False,
+            keep_days=10,
+            commit_interval=1,
+            uri=os.environ.get("BENCHMARK_DB_URL", "sqlite://"),
+            db_max_retries=10,
+            db_retry_wait=3,
+            entity_filter=lambda entity_id: True,
+            exclude_event_types=set(),
+            exclude_attributes_by_domain={},
+        )
+        instance.async_initialize()
+        instance.async_register()
+        instance.start()
+        await hass.async_start()
+        await instance.async_db_ready
+        hass.data[LOGBOOK_DOMAIN] = LogbookConfig({})
+
+        start = dt_util.utcnow() - timedelta(minutes=1)
+        for update in range(updates):
+            for idx in range(lights):
+                context = core.Context()
+                service = "turn_on" if update % 2 else "turn_off"
+                hass.bus.async_fire(
+                    EVENT_CALL_SERVICE,
+                    {
+                        "domain": "light",
+                        "service": service,
+                        "service_data": {"entity_id": f"light.light_{idx}"},
+                    },
+                    context=context,
+                )
+                hass.states.async_set(
+                    f"light.light_{idx}", "on" if update % 2 else "off", context=context
+                )
+            await hass.async_block_till_done()
+        await instance.async_block_till_done()
+        end = dt_util.utcnow() + timedelta(minutes=1)
+
+        def _get_events() -> int:
+            """Get the logbook of the lights and return the number of entries."""
+            return sum(
+                len(
+                    EventProcessor(
+                        hass,
+                        (EVENT_CALL_SERVICE, EVENT_LOGBOOK_ENTRY),
+                        [f"light.light_{idx}"],
+                    ).get_events(start, end)
+                )
+                for idx in range(queried_lights)
+            )
+
+        async def _query() -> float:
+            """Query the logbook and return the runtime."""
+            query_start = timer()
+            for _ in range(queries):
+                await instance.async_add_executor_job(_get_events)
+            return timer() - query_start
+
+        with_origins = await _query()
+        with patch.object(instance.context_origins_manager, "since_ts", None):
+            without_origins = await _query()
+
+    print(
+        f"{queries * queried_lights} logbook queries took {with_origins:.3f}s"
+        f" with context origins and {without_origins:.3f}s without"
+    )
+    return with_origins
+
+
+@benchmark
+async def mqtt_match_subscriptions(hass):
+    """Match 10k MQTT messages against 5k subscriptions.
+
+    The subscriptions are like the ones of zigbee2mqtt and Tasmota
+    devices. The messages are matched with the matches of recently
+    received topics cached and again without the cache.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.mqtt.client import Subscription, SubscriptionTrie
+
+    devices = 1000
+    messages = 10000
+
+    job = core.HassJob(lambda msg: None)
+    topic_filters = ["zigbee2mqtt/bridge/#", "homeassistant/+/+/+/config"]
+    topics = []
+    for idx in range(devices // 2):
+        topic_filters.append(f"zigbee2mqtt/device_{idx}")
+        topic_filters.append(f"zigbee2mqtt/device_{idx}/availability")
+        topics.append(f"zigbee2mqtt/device_{idx}")
+        topics.append(f"zigbee2mqtt/device_{idx}/availability")
+    for idx in range(devices // 2):
+        topic_filters.append(f"tele/tasmota_{idx}/+")
+        topic_filters.append(f"stat/tasmota_{idx}/RESULT")
+        topic_filters.append(f"stat/tasmota_{idx}/POWER")
+        topics.append(f"tele/tasmota_{idx}/STATE")
+        topics.append(f"tele/tasmota_{idx}/SENSOR")
+        topics.append(f"stat/tasmota_{idx}/RESULT")
+    topic_filters.extend(
+        f"zigbee2mqtt/device_{idx}/+/set" for idx in range(5000 - len(topic_filters))
+    )
+
+    def _match(cache_size: int) -> float:
+        """Match the messages and return the runtime."""
+        trie = SubscriptionTrie(cache_size)
+        for topic_filter in topic_filters:
+            trie.add(Subscription(topic_filter, job))
+        match_start = timer()
+        for idx in range(messages):
+            trie.match(topics[idx % len(topics)])
+        return timer() - match_start
+
+    cached = _match(len(topics))
+    uncached = _match(1)
+
+    print(
+        f"Matched {messages} messages against {len(topic_filters)} subscriptions:"
+        f" {messages / cached:.0f} msgs/s with the cache and"
+        f" {messages / uncached:.0f} msgs/s without"
+    )
+    return cached
+
+
+@benchmark
+async def mqtt_discovery(hass):
+    """Discover 1500 MQTT sensors of 300 zigbee2mqtt devices.
+
+    The time until all sensors are available is measured when they
+    are first discovered and again after the MQTT entry is reloaded.
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from unittest.mock import MagicMock, patch
+
+    # pylint: disable-next=import-outside-toplevel
+    from paho.mqtt.client import MQTTMessage
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant import config_entries
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.mqtt import DOMAIN as MQTT_DOMAIN
+    from homeassistant.components.mqtt.util import (  # pylint: disable=import-outside-toplevel
+        get_mqtt_data,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import (
+        area_registry as ar,
+        device_registry as dr,
+        entity,
+        entity_registry as er,
+    )
+
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.setup import async_setup_component
+
+    devices = 300
+    sensors_per_device = 5
+
+    messages = []
+    for device in range(devices):
+        ieee = f"0x{device:016x}"
+        for sensor in range(sensors_per_device):
+            msg = MQTTMessage(
+                topic=f"homeassistant/sensor/{ieee}/sensor_{sensor}/config".encode()
+            )
+            msg.payload = JSON_DUMP(
+                {
+                    "availability": [
+                        {
+                            "topic": "zigbee2mqtt/bridge/state",
+                            "value_template": "{{ value_json.state }}",
+                        }
+                    ],
+                    "device": {
+                        "identifiers": [f"zigbee2mqtt_{ieee}"],
+                        "manufacturer": "IKEA",
+                        "model": "E1743",
+                        "name": f"Device {device}",
+                    },
+                    "device_class": "temperature",
+                    "json_attributes_topic": f"zigbee2mqtt/{ieee}",
+                    "name": f"Sensor {sensor}",
+                    "state_class": "measurement",
+                    "state_topic": f"zigbee2mqtt/{ieee}",
+                    "unique_id": f"{ieee}_sensor_{sensor}_zigbee2mqtt",
+                    "unit_of_measurement": "°C",
+                    "value_template": f"{{{{ value_json.sensor_{sensor} }}}}",
+                }
+            ).encode()
+            messages.append(msg)
+
+    async def _discover() -> float:
+        """Discover the sensors and return the time until all are available."""
+        client = get_mqtt_data(hass).client
+        discovery_start = timer()
+        for msg in messages:
+            client._mqtt_handle_message(msg)  # pylint: disable=protected-access
+        await hass.async_block_till_done()
+        assert len(hass.states.async_entity_ids("sensor")) == len(messages)
+        return timer() - discovery_start
+
+    with tempfile.TemporaryDirectory() as config_dir, patch(
+        "paho.mqtt.client.Client"
+    ) as mock_client:
+        mock_client.return_value.connect.return_value = 0
+        mock_client.return_value.subscribe.return_value = (0, 0)
+        mock_client.return_value.unsubscribe.return_value = (0, 0)
+        hass.config.config_dir = config_dir
+        # The uploaded certificates and the views are not used
+        hass.config.components.update(("file_upload", "http"))
+        hass.http = MagicMock()
+        with open(os.path.join(config_dir, "configuration.yaml"), "w") as config:
+            config.write("mqtt:\n")
+        entity.async_setup(hass)
+        await ar.async_load(hass)
+        await dr.async_load(hass)
+        await er.async_load(hass)
+        hass.config_entries = config_entries.ConfigEntries(hass, {})
+        await hass.config_entries.async_initialize()
+        entry = config_entries.ConfigEntry(
+            1, MQTT_DOMAIN, "MQTT", {"broker": "mock-broker"}, "user"
+        )
+        await hass.config_entries.async_add(entry)
+        await async_setup_component(hass, MQTT_DOMAIN, {})
+        await hass.async_block_till_done()
+
+        discovered = await _discover()
+        await hass.config_entries.async_reload(entry.entry_id)
+        await hass.async_block_till_done()
+        rediscovered = await _discover()
+        await hass.config_entries.async_unload(entry.entry_id)
+
+    print(
+        f"{len(messages)} discovered MQTT sensors were available after"
+        f" {discovered:.3f}s and after {rediscovered:.3f}s once reloaded"
+    )
+    return discovered
+
+
+@benchmark
+async def template_compile_cache(hass):
+    """Compile 3000 templates without and with the code cache of a restart."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.helpers import template
+
+    templates = 3000
+
+    sources = [
+        f"{{% if is_state('binary_sensor.door_{idx}', 'on') %}}"
+        f"{{{{ states('sensor.temperature_{idx}') | float(0) * {idx} }}}}"
+        f"{{% else %}}{{{{ state_attr('climate.room_{idx}', 'current') }}}}"
+        "{% endif %}"
+        for idx in range(templates)
+    ]
+
+    async def _compile() -> float:
+        """Load the code cache, compile the templates and return the runtime."""
+        hass.data.pop("template.environment", None)
+        compile_start = timer()
+        await template.async_load_code_cache(hass)
+        for source in sources:
+            template.Template(source, hass).ensure_valid()
+        return timer() - compile_start
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass.config.config_dir = config_dir
+        cold = await _compile()
+        # The templates are compiled while starting, they are stored once
+        # started. Save the cache as when Home Assistant stops.
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+        await hass.async_block_till_done()
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_FINAL_WRITE)
+        await hass.async_block_till_done()
+        warm = await _compile()
+
+    print(
+        f"Compiled {templates} templates in {cold:.3f}s cold and"
+        f" {warm:.3f}s with the code cached before the restart"
+    )
+    return warm
+
+
+@benchmark
+async def sensor_write_states(hass):
+    """Write the state of a sensor 100k times with only its value changing."""
+    # pylint: disable-next=import-outside-toplevel
+    from homeassistant.components.sensor import (
+        SensorDeviceClass,
+        SensorEntity,
+        SensorStateClass,
+    )
+
+    writes = 100000
+
+    def _write(entity_id: str, cache_static_attributes: bool) -> float:
+        """Write the states of a sensor and return the runtime."""
+        sensor = SensorEntity()
+        sensor.hass = hass
+        sensor.entity_id = entity_id
+        sensor._cache_static_attributes = cache_static_attributes
+        sensor._attr_name = "Power"
+        sensor._attr_icon = "mdi:flash"
+        sensor._attr_device_class = SensorDeviceClass.POWER
+        sensor._attr_state_class = SensorStateClass.MEASUREMENT
+        sensor._attr_native_unit_of_measurement = "W"
+
+        write_start = timer()
+        for value in range(writes):
+            sensor._attr_native_value = value
+            sensor.async_write_ha_state()
+        elapsed = timer() - write_start
+        assert hass.states.get(entity_id).state == str(writes - 1)
+        return elapsed
+
+    uncached = _write("sensor.power", False)
+    cached = _write("sensor.power_cached", True)
+    print(
+        f"Wrote {writes} sensor states in {uncached:.3f}s and in {cached:.3f}s"
+        " with the static attributes cached"
+    )
+    return cached
+
+
 def _create_state_changed_event_from_old_new(
     entity_id, event_time_fired, old_state, new_state
 ):
@@ -1,11 +1,19 @@
 """Helpers to generate ulids."""
 from __future__ import annotations
 
+import os
 import time
 
 from ulid_transform import bytes_to_ulid, ulid_at_time, ulid_hex, ulid_to_bytes
 
-__all__ = ["ulid", "ulid_hex", "ulid_at_time", "ulid_to_bytes", "bytes_to_ulid"]
+__all__ = [
+    "ulid",
+    "ulid_hex",
+    "ulid_at_time",
+    "ulid_bytes_at_time",
+    "ulid_to_bytes",
+    "bytes_to_ulid",
+]
 
 
 def ulid(timestamp: float | None = None) -> str:
@@ -26,3 +34,12 @@ def ulid(timestamp: float | None = None) -> str:
     ulid.parse(ulid_util.ulid())
     """
     return ulid_at_time(timestamp or time.time())
+
+
+def ulid_bytes_at_time(timestamp: float, randomness: bytes | None = None) -> bytes:
+    """Generate the binary form of a ULID at a given timestamp.
+
+    The 48 bits of the timestamp in milliseconds are followed by 80 bits
+    of randomness, which are read from os.urandom unless they are passed.
+    """
+    return int(timestamp * 1000).to_bytes(6, "big") + (randomness or os.urandom(10))
@@ -13,6 +13,7 @@ from homeassistant.const import (
     ATTR_FRIENDLY_NAME,
     ATTR_ICON,
     EVENT_HOMEASSISTANT_START,
+    EVENT_STATE_CHANGED,
     SERVICE_RELOAD,
     STATE_HOME,
     STATE_NOT_HOME,
@@ -22,7 +23,6 @@ from homeassistant.const import (
 )
 from homeassistant.core import CoreState, HomeAssistant
 from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.event import TRACK_STATE_CHANGE_CALLBACKS
 from homeassistant.setup import async_setup_component
 
 from . import common
@@ -457,11 +457,11 @@ async def test_reloading_groups(hass: HomeAssistant) -> None:
         "group.second_group",
         "group.test_group",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["hello.world"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    assert hass.bus.async_listeners()["state_changed"] == 3
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["hello.world"] == 1
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["light.bowl"] == 1
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["test.one"] == 1
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["test.two"] == 1
 
     with patch(
         "homeassistant.config.load_yaml_config_file",
@@ -476,10 +476,10 @@ async def test_reloading_groups(hass: HomeAssistant) -> None:
         "group.all_tests",
         "group.hello",
     ]
-    assert hass.bus.async_listeners()["state_changed"] == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["light.bowl"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.one"]) == 1
-    assert len(hass.data[TRACK_STATE_CHANGE_CALLBACKS]["test.two"]) == 1
+    assert hass.bus.async_listeners()["state_changed"] == 2
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["light.bowl"] == 1
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["test.one"] == 1
+    assert hass.bus.async_keyed_listeners(EVENT_STATE_CHANGED)["test.two"] == 1
 
 
 async def test_modify_group(hass: HomeAssistant) -> None:
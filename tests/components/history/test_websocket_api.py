@@ -10,6 +10,7 @@ import pytest
 from homeassistant.components import history
 from homeassistant.components.history import websocket_api
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.websocket_api.const import DATA_SHARED_STREAMS
 from homeassistant.const import (
     CONF_DOMAINS,
     CONF_ENTITIES,
@@ -531,6 +532,67 @@ async def test_history_stream_historical_only(
     }
 
 
+async def test_history_stream_historical_only_in_chunks(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test history stream sends the historical states in chunks.
+
+    States changed at the same time are never split across chunks.
+    """
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "0")
+    start = dt_util.utcnow()
+    for offset, entity_id, state in (
+        (1, "sensor.one", "1"),
+        (2, "sensor.one", "2"),
+        (3, "sensor.one", "3"),
+        (3, "sensor.two", "3"),
+        (4, "sensor.one", "4"),
+    ):
+        with freeze_time(start + timedelta(seconds=offset)):
+            hass.states.async_set(entity_id, state)
+    await async_wait_recording_done(hass)
+
+    client = await hass_ws_client()
+    with freeze_time(start + timedelta(seconds=10)):
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "entity_ids": ["sensor.one", "sensor.two"],
+                "start_time": start.isoformat(),
+                "end_time": (start + timedelta(seconds=5)).isoformat(),
+                "include_start_time_state": True,
+                "significant_changes_only": False,
+                "no_attributes": True,
+                "chunk_size": 2,
+            }
+        )
+        response = await client.receive_json()
+    assert response["success"]
+    assert response["id"] == 1
+    assert response["type"] == "result"
+
+    chunk_start_time = start
+    for chunk_end_offset, chunk in (
+        (2, {"sensor.one": ["0", "1", "2"]}),
+        (3, {"sensor.one": ["3"], "sensor.two": ["3"]}),
+        (4, {"sensor.one": ["4"]}),
+    ):
+        response = await client.receive_json()
+        assert response["id"] == 1
+        assert response["type"] == "event"
+        assert response["event"]["start_time"] == chunk_start_time.timestamp()
+        chunk_start_time = start + timedelta(seconds=chunk_end_offset)
+        assert response["event"]["end_time"] == chunk_start_time.timestamp()
+        assert {
+            entity_id: [state["s"] for state in states]
+            for entity_id, states in response["event"]["states"].items()
+        } == chunk
+
+
 async def test_history_stream_significant_domain_historical_only(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -1173,6 +1235,66 @@ async def test_history_stream_live_no_attributes(
     }
 
 
+async def test_history_stream_live_shared(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test identical history streams share the live stream."""
+    now = dt_util.utcnow()
+    await async_setup_component(hass, "history", {})
+    await async_setup_component(hass, "sensor", {})
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "on")
+    await async_wait_recording_done(hass)
+
+    clients = []
+    for entity_ids in (["sensor.one", "sensor.two"], ["sensor.two", "sensor.one"]):
+        client = await hass_ws_client()
+        await client.send_json(
+            {
+                "id": 1,
+                "type": "history/stream",
+                "start_time": now.isoformat(),
+                "entity_ids": entity_ids,
+                "no_attributes": True,
+            }
+        )
+        response = await client.receive_json()
+        assert response["success"]
+        response = await client.receive_json()
+        assert response["event"]["states"]["sensor.one"][0]["s"] == "on"
+        clients.append(client)
+
+    streams = hass.data[DATA_SHARED_STREAMS]
+    assert len(streams) == 1
+    assert len(next(iter(streams.values())).subscribers) == 2
+
+    await async_recorder_block_till_done(hass)
+    hass.states.async_set("sensor.one", "off")
+    await async_recorder_block_till_done(hass)
+    sensor_one_last_updated = hass.states.get("sensor.one").last_updated
+    for client in clients:
+        response = await client.receive_json()
+        assert response == {
+            "event": {
+                "states": {
+                    "sensor.one": [
+                        {"lu": sensor_one_last_updated.timestamp(), "s": "off"}
+                    ],
+                },
+            },
+            "id": 1,
+            "type": "event",
+        }
+
+    for client in clients:
+        await client.send_json(
+            {"id": 2, "type": "unsubscribe_events", "subscription": 1}
+        )
+        response = await client.receive_json()
+        assert response["success"]
+    assert not streams
+
+
 async def test_history_stream_live_no_attributes_minimal_response_specific_entities(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -40,6 +40,7 @@ class FilterTest:
 def mock_batch_timeout(hass, monkeypatch):
     """Mock the event bus listener and the batch timeout for tests."""
     hass.bus.listen = MagicMock()
+    hass.bus.listen_keyed = MagicMock()
     monkeypatch.setattr(
         f"{INFLUX_PATH}.InfluxThread.batch_timeout",
         Mock(return_value=0),
@@ -347,6 +348,8 @@ async def _setup(hass, mock_influx_client, config_ext, get_write_api):
     # A call is made to the write API during setup to test the connection.
     # Therefore we reset the write API mock here before the test begins.
     get_write_api(mock_influx_client).reset_mock()
+    if hass.bus.listen_keyed.called:
+        return hass.bus.listen_keyed.call_args_list[0][0][2]
     return hass.bus.listen.call_args_list[0][0][1]
 
 
@@ -751,6 +754,11 @@ async def test_event_listener_allowlist(
     config.update(config_ext)
     handler_method = await _setup(hass, mock_client, config, get_write_api)
     write_api = get_write_api(mock_client)
+    assert not hass.bus.listen.called
+    assert hass.bus.listen_keyed.call_args_list[0][0][:2] == (
+        EVENT_STATE_CHANGED,
+        {"fake.included"},
+    )
 
     tests = [
         FilterTest("fake.included", True),
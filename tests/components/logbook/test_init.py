@@ -8,16 +8,19 @@ from http import HTTPStatus
 import json
 from unittest.mock import Mock, patch
 
+from freezegun import freeze_time
 import pytest
 import voluptuous as vol
 
 from homeassistant.components import logbook, recorder
 from homeassistant.components.alexa.smart_home import EVENT_ALEXA_SMART_HOME
 from homeassistant.components.automation import EVENT_AUTOMATION_TRIGGERED
+from homeassistant.components.logbook.helpers import async_determine_event_types
 from homeassistant.components.logbook.models import LazyEventPartialState
 from homeassistant.components.logbook.processor import EventProcessor
 from homeassistant.components.logbook.queries.common import PSEUDO_EVENT_STATE_CHANGED
 from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.util import get_instance
 from homeassistant.components.script import EVENT_SCRIPT_STARTED
 from homeassistant.components.sensor import SensorStateClass
 from homeassistant.const import (
@@ -2748,10 +2751,17 @@ async def test_get_events_with_device_ids(
     assert isinstance(results[3]["when"], float)
 
 
+@pytest.mark.parametrize("context_origins", [True, False])
 async def test_logbook_select_entities_context_id(
-    recorder_mock: Recorder, hass: HomeAssistant, hass_client: ClientSessionGenerator
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_client: ClientSessionGenerator,
+    context_origins: bool,
 ) -> None:
-    """Test the logbook view with end_time and entity with automations and scripts."""
+    """Test the logbook view with end_time and entity with automations and scripts.
+
+    The context is augmented the same with and without the context origins.
+    """
     await asyncio.gather(
         *[
             async_setup_component(hass, comp, {})
@@ -2851,9 +2861,15 @@ async def test_logbook_select_entities_context_id(
 
     # Test today entries with filter by end_time
     end_time = start + timedelta(hours=24)
-    response = await client.get(
-        f"/api/logbook/{start_date.isoformat()}?end_time={end_time}&entity={entity_id_test},{entity_id_second},{entity_id_third},light.switch"
-    )
+    # The origins are looked up for a few rows at a time
+    with patch.object(
+        recorder_mock.context_origins_manager,
+        "since_ts",
+        0.0 if context_origins else None,
+    ), patch("homeassistant.components.logbook.processor.SQLITE_MAX_BIND_VARS", 2):
+        response = await client.get(
+            f"/api/logbook/{start_date.isoformat()}?end_time={end_time}&entity={entity_id_test},{entity_id_second},{entity_id_third},light.switch"
+        )
     assert response.status == HTTPStatus.OK
     json_dict = await response.json()
 
@@ -2986,3 +3002,62 @@ async def test_logbook_with_non_iterable_entity_filter(
         },
     )
     await hass.async_block_till_done()
+
+
+@pytest.mark.parametrize("context_origins_since", [0.0, None])
+async def test_get_events_chunk_context_lookup(
+    recorder_mock: Recorder, hass: HomeAssistant, context_origins_since: float | None
+) -> None:
+    """Test the chunks only keep the contexts of their rows.
+
+    A context that returns after it was forgotten is looked up again.
+    """
+    await async_setup_component(hass, "logbook", {})
+    now = dt_util.utcnow() - timedelta(seconds=10)
+    service_context = ha.Context()
+    with freeze_time(now - timedelta(seconds=1)):
+        hass.states.async_set("light.kitchen", "0")
+    with freeze_time(now):
+        hass.bus.async_fire(
+            EVENT_CALL_SERVICE,
+            {ATTR_DOMAIN: "light", "service": "turn_on"},
+            context=service_context,
+        )
+    for offset, context in (
+        (1, service_context),
+        (2, ha.Context()),
+        (3, ha.Context()),
+        (4, ha.Context()),
+        (5, service_context),
+    ):
+        with freeze_time(now + timedelta(seconds=offset)):
+            hass.states.async_set(
+                "light.kitchen", str(offset), context=context, force_update=True
+            )
+    await async_wait_recording_done(hass)
+
+    get_instance(hass).context_origins_manager.since_ts = context_origins_since
+    event_processor = EventProcessor(
+        hass,
+        async_determine_event_types(hass, ["light.kitchen"], None),
+        ["light.kitchen"],
+        timestamp=True,
+    )
+    context_lookup = event_processor.logbook_run.context_lookup
+    events = []
+    start_ts: float | None = now.timestamp() - 1
+    while start_ts is not None:
+        chunk, start_ts = await get_instance(hass).async_add_executor_job(
+            event_processor.get_events_chunk,
+            start_ts,
+            (now + timedelta(seconds=6)).timestamp(),
+            1,
+        )
+        events.extend(chunk)
+        # The lookup holds None and the context of the chunk
+        assert len(context_lookup._lookup) <= 2
+
+    assert [event["state"] for event in events] == ["1", "2", "3", "4", "5"]
+    assert events[0]["context_service"] == "turn_on"
+    assert events[4]["context_service"] == "turn_on"
+    assert "context_service" not in events[1]
@@ -1698,6 +1698,80 @@ async def test_subscribe_unsubscribe_logbook_stream_entities_past_only(
     ) == listeners_without_writes(init_listeners)
 
 
+@pytest.mark.parametrize("context_origins_since", [0.0, None])
+async def test_logbook_stream_entities_in_chunks(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    hass_ws_client: WebSocketGenerator,
+    context_origins_since: float | None,
+) -> None:
+    """Test the historical events are streamed in chunks.
+
+    Rows fired at the same time are never split across chunks. Without
+    the context origins the context union is selected for each chunk.
+    """
+    expected_chunks = [[0, 1], [2, 3, 4], [5]]
+    now = dt_util.utcnow() - timedelta(seconds=10)
+    await asyncio.gather(
+        *[
+            async_setup_component(hass, comp, {})
+            for comp in ("homeassistant", "logbook")
+        ]
+    )
+    await hass.async_block_till_done()
+
+    with freeze_time(now):
+        hass.states.async_set("binary_sensor.is_light", STATE_OFF)
+    states: list[State] = []
+    for offset, state in (
+        (1, STATE_ON),
+        (2, STATE_OFF),
+        (3, STATE_ON),
+        (3, STATE_OFF),
+        (3, STATE_ON),
+        (4, STATE_OFF),
+    ):
+        with freeze_time(now + timedelta(seconds=offset)):
+            hass.states.async_set("binary_sensor.is_light", state, force_update=True)
+            states.append(hass.states.get("binary_sensor.is_light"))
+    await async_wait_recording_done(hass)
+
+    get_instance(hass).context_origins_manager.since_ts = context_origins_since
+    websocket_client = await hass_ws_client()
+    await websocket_client.send_json(
+        {
+            "id": 7,
+            "type": "logbook/event_stream",
+            "start_time": now.isoformat(),
+            "end_time": (now + timedelta(seconds=5)).isoformat(),
+            "entity_ids": ["binary_sensor.is_light"],
+            "chunk_size": 2,
+        }
+    )
+
+    msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+    assert msg["id"] == 7
+    assert msg["type"] == TYPE_RESULT
+    assert msg["success"]
+
+    for index, chunk in enumerate(expected_chunks):
+        msg = await asyncio.wait_for(websocket_client.receive_json(), 2)
+        assert msg["id"] == 7
+        assert msg["type"] == "event"
+        assert msg["event"]["events"] == [
+            {
+                "entity_id": "binary_sensor.is_light",
+                "state": states[state_index].state,
+                "when": states[state_index].last_updated.timestamp(),
+            }
+            for state_index in chunk
+        ]
+        if index < len(expected_chunks) - 1:
+            assert msg["event"]["partial"] is True
+        else:
+            assert "partial" not in msg["event"]
+
+
 @patch("homeassistant.components.logbook.websocket_api.EVENT_COALESCE_TIME", 0)
 async def test_subscribe_unsubscribe_logbook_stream_big_query(
     recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
@@ -680,6 +680,63 @@ async def test_keepalive_validation(
     assert not result["errors"]
 
 
+@pytest.mark.parametrize(
+    ("input_value", "error"),
+    [
+        ("", True),
+        ("-1", True),
+        ("11", True),
+        ("0", False),
+        ("0.05", False),
+        ("10", False),
+    ],
+)
+async def test_max_batch_latency_validation(
+    hass: HomeAssistant,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    mock_try_connection: MagicMock,
+    mock_reload_after_entry_update: MagicMock,
+    input_value: str,
+    error: bool,
+) -> None:
+    """Test validation of the max batch latency option."""
+
+    test_input = {
+        mqtt.CONF_BROKER: "another-broker",
+        mqtt.CONF_PORT: 2345,
+        mqtt.CONF_MAX_BATCH_LATENCY: input_value,
+    }
+
+    mqtt_mock = await mqtt_mock_entry_no_yaml_config()
+    mock_try_connection.return_value = True
+    config_entry = hass.config_entries.async_entries(mqtt.DOMAIN)[0]
+    # Add at least one advanced option to get the full form
+    config_entry.data = {
+        mqtt.CONF_BROKER: "test-broker",
+        mqtt.CONF_PORT: 1234,
+        mqtt.CONF_CLIENT_ID: "custom1234",
+    }
+
+    mqtt_mock.async_connect.reset_mock()
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "broker"
+
+    if error:
+        with pytest.raises(vol.MultipleInvalid):
+            result = await hass.config_entries.options.async_configure(
+                result["flow_id"],
+                user_input=test_input,
+            )
+        return
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input=test_input,
+    )
+    assert not result["errors"]
+
+
 async def test_disable_birth_will(
     hass: HomeAssistant,
     mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
@@ -22,6 +22,7 @@ default_config = {
     "discovery": True,
     "discovery_prefix": "homeassistant",
     "keepalive": 60,
+    "max_batch_latency": 0.0,
     "port": 1883,
     "protocol": "3.1.1",
     "transport": "tcp",
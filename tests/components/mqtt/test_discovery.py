@@ -25,6 +25,7 @@ from homeassistant.const import (
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers import device_registry as dr, entity_registry as er
+from homeassistant.helpers.entity_platform import EntityPlatform
 from homeassistant.helpers.service_info.mqtt import MqttServiceInfo
 from homeassistant.setup import async_setup_component
 
@@ -509,6 +510,73 @@ async def test_rediscover(
     assert state is not None
 
 
+@patch("homeassistant.components.mqtt.PLATFORMS", [Platform.BINARY_SENSOR])
+async def test_rediscover_reuses_validated_config(
+    hass: HomeAssistant,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+) -> None:
+    """Test rediscovering an unchanged payload after a reload skips validation."""
+    await mqtt_mock_entry_no_yaml_config()
+    mqtt_data = hass.data["mqtt"]
+    entry = hass.config_entries.async_entries(mqtt.DOMAIN)[0]
+    discovery_hash = ("binary_sensor", "bla")
+    payload = '{ "name": "Beer", "state_topic": "test-topic" }'
+    async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", payload)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.beer") is not None
+    _, config = mqtt_data.discovery_config_cache[discovery_hash]
+
+    assert await hass.config_entries.async_reload(entry.entry_id)
+    await hass.async_block_till_done()
+    async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", payload)
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.beer") is not None
+    assert mqtt_data.discovery_config_cache[discovery_hash][1] is config
+
+    # The item is removed
+    async_fire_mqtt_message(hass, "homeassistant/binary_sensor/bla/config", "")
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.beer") is None
+    assert discovery_hash not in mqtt_data.discovery_config_cache
+
+    # A changed payload is validated again
+    async_fire_mqtt_message(
+        hass,
+        "homeassistant/binary_sensor/bla/config",
+        '{ "name": "Milk", "state_topic": "test-topic" }',
+    )
+    await hass.async_block_till_done()
+    assert hass.states.get("binary_sensor.milk") is not None
+    assert mqtt_data.discovery_config_cache[discovery_hash][1] is not config
+
+
+@patch("homeassistant.components.mqtt.PLATFORMS", [Platform.SENSOR])
+async def test_discovered_entities_added_together(
+    hass: HomeAssistant,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+) -> None:
+    """Test the entities discovered in one loop iteration are added together."""
+    await mqtt_mock_entry_no_yaml_config()
+    with patch.object(
+        EntityPlatform,
+        "async_add_entities",
+        autospec=True,
+        side_effect=EntityPlatform.async_add_entities,
+    ) as async_add_entities:
+        for idx in range(3):
+            async_fire_mqtt_message(
+                hass,
+                f"homeassistant/sensor/bla_{idx}/config",
+                f'{{ "name": "Beer {idx}", "state_topic": "test-topic" }}',
+            )
+        await hass.async_block_till_done()
+
+    assert len(async_add_entities.mock_calls) == 1
+    assert len(async_add_entities.mock_calls[0].args[1]) == 3
+    for idx in range(3):
+        assert hass.states.get(f"sensor.beer_{idx}") is not None
+
+
 @patch("homeassistant.components.mqtt.PLATFORMS", [Platform.BINARY_SENSOR])
 async def test_rapid_rediscover(
     hass: HomeAssistant,
@@ -1265,6 +1333,7 @@ ABBREVIATIONS_WHITE_LIST = [
     "CONF_DISCOVERY_PREFIX",
     "CONF_EMBEDDED",
     "CONF_KEEPALIVE",
+    "CONF_MAX_BATCH_LATENCY",
     "CONF_TLS_INSECURE",
     "CONF_TRANSPORT",
     "CONF_WILL_MESSAGE",
@@ -5,16 +5,23 @@ import copy
 from datetime import datetime, timedelta
 from functools import partial
 import json
+import random
 import ssl
 from typing import Any, TypedDict
 from unittest.mock import ANY, MagicMock, call, mock_open, patch
 
+from paho.mqtt.client import MQTTMessage
+from paho.mqtt.matcher import MQTTMatcher
 import pytest
 import voluptuous as vol
 
 from homeassistant.components import mqtt
 from homeassistant.components.mqtt import debug_info
-from homeassistant.components.mqtt.client import EnsureJobAfterCooldown
+from homeassistant.components.mqtt.client import (
+    EnsureJobAfterCooldown,
+    Subscription,
+    SubscriptionTrie,
+)
 from homeassistant.components.mqtt.mixins import MQTT_ENTITY_DEVICE_INFO_SCHEMA
 from homeassistant.components.mqtt.models import MessageCallbackType, ReceiveMessage
 from homeassistant.config_entries import ConfigEntryDisabler, ConfigEntryState
@@ -27,7 +34,7 @@ from homeassistant.const import (
     UnitOfTemperature,
 )
 import homeassistant.core as ha
-from homeassistant.core import CoreState, HomeAssistant, callback
+from homeassistant.core import CoreState, HassJob, HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import device_registry as dr, entity_registry as er, template
 from homeassistant.helpers.entity import Entity
@@ -935,6 +942,122 @@ async def test_subscribe_topic_non_async(
     assert len(calls) == 1
 
 
+def _received_message(topic: str, payload: bytes) -> MQTTMessage:
+    """Return a message received from the broker."""
+    msg = MQTTMessage(topic=topic.encode("utf-8"))
+    msg.payload = payload
+    return msg
+
+
+async def test_received_messages_handled_in_batches(
+    hass: HomeAssistant,
+    mqtt_client_mock: MqttMockPahoClient,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+) -> None:
+    """Test the messages received by the paho thread are handled in batches."""
+    await mqtt_mock_entry_no_yaml_config()
+    mqtt_client = mqtt_client_mock.on_message.__self__
+    await mqtt.async_subscribe(hass, "test-topic/+", record_calls)
+
+    def _wakeups() -> int:
+        """Return the times the paho thread woke up the loop to handle messages."""
+        return sum(
+            mock_call.args[0] == mqtt_client._async_schedule_received_messages
+            for mock_call in call_soon_threadsafe.call_args_list
+        )
+
+    def _receive_messages(first: int, last: int) -> None:
+        for idx in range(first, last):
+            mqtt_client_mock.on_message(
+                None, None, _received_message(f"test-topic/{idx}", b"payload")
+            )
+
+    with patch.object(
+        hass.loop, "call_soon_threadsafe", wraps=hass.loop.call_soon_threadsafe
+    ) as call_soon_threadsafe:
+        await hass.async_add_executor_job(_receive_messages, 0, 100)
+        assert _wakeups() == 1
+        await hass.async_block_till_done()
+        assert [msg.topic for msg in calls] == [
+            f"test-topic/{idx}" for idx in range(100)
+        ]
+
+        # A new batch wakes up the loop again
+        await hass.async_add_executor_job(_receive_messages, 100, 101)
+        assert _wakeups() == 2
+        await hass.async_block_till_done()
+        assert len(calls) == 101
+
+
+@pytest.mark.parametrize(
+    "mqtt_config_entry_data",
+    [{mqtt.CONF_BROKER: "mock-broker", mqtt.CONF_MAX_BATCH_LATENCY: 0.5}],
+)
+async def test_received_messages_held_for_max_batch_latency(
+    hass: HomeAssistant,
+    mqtt_client_mock: MqttMockPahoClient,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+) -> None:
+    """Test a batch of received messages is held for the max batch latency."""
+    await mqtt_mock_entry_no_yaml_config()
+    await mqtt.async_subscribe(hass, "test-topic/+", record_calls)
+
+    def _receive_messages(first: int, last: int) -> None:
+        for idx in range(first, last):
+            mqtt_client_mock.on_message(
+                None, None, _received_message(f"test-topic/{idx}", b"payload")
+            )
+
+    now = utcnow()
+    await hass.async_add_executor_job(_receive_messages, 0, 5)
+    await hass.async_block_till_done()
+    assert not calls
+
+    # Messages received while the batch is held join the batch
+    await hass.async_add_executor_job(_receive_messages, 5, 10)
+    async_fire_time_changed(hass, now + timedelta(seconds=0.25))
+    await hass.async_block_till_done()
+    assert not calls
+
+    async_fire_time_changed(hass, now + timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert [msg.topic for msg in calls] == [f"test-topic/{idx}" for idx in range(10)]
+
+
+async def test_received_messages_batch_continues_after_error(
+    hass: HomeAssistant,
+    mqtt_client_mock: MqttMockPahoClient,
+    mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
+    calls: list[ReceiveMessage],
+    record_calls: MessageCallbackType,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a failing message callback does not drop the rest of the batch."""
+    await mqtt_mock_entry_no_yaml_config()
+
+    @callback
+    def _fail(msg: ReceiveMessage) -> None:
+        raise ValueError("Boom")
+
+    await mqtt.async_subscribe(hass, "test-topic/fail", _fail)
+    await mqtt.async_subscribe(hass, "test-topic/ok/+", record_calls)
+
+    def _receive_messages() -> None:
+        for topic in ("test-topic/ok/0", "test-topic/fail", "test-topic/ok/1"):
+            mqtt_client_mock.on_message(
+                None, None, _received_message(topic, b"payload")
+            )
+
+    await hass.async_add_executor_job(_receive_messages)
+    await hass.async_block_till_done()
+    assert [msg.topic for msg in calls] == ["test-topic/ok/0", "test-topic/ok/1"]
+    assert "Error handling message on test-topic/fail" in caplog.text
+
+
 async def test_subscribe_bad_topic(
     hass: HomeAssistant,
     mqtt_mock_entry_no_yaml_config: MqttMockHAClientGenerator,
@@ -1246,6 +1369,67 @@ async def test_subscribe_special_characters(
     assert calls[0].payload == payload
 
 
+@pytest.mark.parametrize("seed", range(5))
+def test_subscription_trie_matches_paho(seed: int) -> None:
+    """Test the subscription trie matches the topics like paho."""
+    rng = random.Random(seed)
+    levels = ["a", "b", "$c", ""]
+    filters = [
+        "/".join(rng.choice([*levels, "+"]) for _ in range(rng.randint(1, 3)))
+        + rng.choice(["", "/#"])
+        for _ in range(30)
+    ] + ["#", "+"]
+    trie = SubscriptionTrie()
+    subscriptions = [
+        Subscription(topic_filter, HassJob(lambda msg: None))
+        for topic_filter in filters
+    ]
+    for subscription in subscriptions:
+        trie.add(subscription)
+    # Removing prunes the levels only the removed subscription used
+    for subscription in subscriptions[::3]:
+        trie.remove(subscription)
+    with pytest.raises(ValueError):
+        trie.remove(subscriptions[0])
+    subscriptions = [
+        subscription for subscription in subscriptions if subscription in trie
+    ]
+    assert len(subscriptions) == len(filters) - len(filters[::3])
+
+    for _ in range(200):
+        topic = "/".join(rng.choice(levels) for _ in range(rng.randint(1, 4)))
+        expected = []
+        for subscription in subscriptions:
+            matcher = MQTTMatcher()
+            matcher[subscription.topic] = True
+            if next(matcher.iter_match(topic), False):
+                expected.append(subscription)
+        assert sorted(trie.match(topic), key=id) == sorted(expected, key=id)
+        assert trie.has_topic(topic) == any(
+            subscription.topic == topic for subscription in subscriptions
+        )
+
+
+def test_subscription_trie_cache() -> None:
+    """Test the cached matches are invalidated when subscribing."""
+    trie = SubscriptionTrie(cache_size=2)
+    job = HassJob(lambda msg: None)
+    simple = Subscription("a/b", job)
+    wildcard = Subscription("a/+", job)
+    trie.add(simple)
+    assert trie.match("a/b") == [simple]
+    assert trie.match("a/c") == []
+    trie.add(wildcard)
+    assert trie.match("a/b") == [simple, wildcard]
+    assert trie.match("a/c") == [wildcard]
+    trie.remove(simple)
+    assert trie.match("a/b") == [wildcard]
+    assert trie.match("a/c") == [wildcard]
+    trie.remove(wildcard)
+    assert trie.match("a/b") == []
+    assert list(trie) == []
+
+
 @patch("homeassistant.components.mqtt.client.INITIAL_SUBSCRIBE_COOLDOWN", 0.0)
 @patch("homeassistant.components.mqtt.client.DISCOVERY_COOLDOWN", 0.0)
 @patch("homeassistant.components.mqtt.client.SUBSCRIBE_COOLDOWN", 0.0)
@@ -1,8 +1,10 @@
 """Test the Profiler config flow."""
+import asyncio
 from datetime import timedelta
 from functools import lru_cache
 import os
 import sys
+import time
 from unittest.mock import patch
 
 from lru import LRU  # pylint: disable=no-name-in-module
@@ -15,22 +17,27 @@ from homeassistant.components.profiler import (
     CONF_SECONDS,
     SERVICE_DUMP_LOG_OBJECTS,
     SERVICE_LOG_EVENT_LOOP_SCHEDULED,
+    SERVICE_LOG_STALLS,
     SERVICE_LOG_THREAD_FRAMES,
     SERVICE_LRU_STATS,
     SERVICE_MEMORY,
     SERVICE_START,
     SERVICE_START_LOG_OBJECT_SOURCES,
     SERVICE_START_LOG_OBJECTS,
+    SERVICE_START_STALL_DETECTOR,
     SERVICE_STOP_LOG_OBJECT_SOURCES,
     SERVICE_STOP_LOG_OBJECTS,
+    SERVICE_STOP_STALL_DETECTOR,
 )
 from homeassistant.components.profiler.const import DOMAIN
+from homeassistant.components.profiler.stall_detector import StallDetector
 from homeassistant.const import CONF_SCAN_INTERVAL, CONF_TYPE
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.util.dt as dt_util
 
 from tests.common import MockConfigEntry, async_fire_time_changed
+from tests.typing import WebSocketGenerator
 
 
 async def test_basic_usage(hass: HomeAssistant, tmpdir: py.path.local) -> None:
@@ -255,6 +262,143 @@ async def test_log_scheduled(
     await hass.async_block_till_done()
 
 
+async def test_stall_detector(
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+    hass_ws_client: WebSocketGenerator,
+) -> None:
+    """Test the stall detector records slow callbacks."""
+    original_run = asyncio.Handle._run
+
+    entry = MockConfigEntry(domain=DOMAIN)
+    entry.add_to_hass(hass)
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The stall detector only runs once it is started
+    assert asyncio.Handle._run is original_run
+    client = await hass_ws_client(hass)
+    await client.send_json({"id": 1, "type": "profiler/stalls"})
+    response = await client.receive_json()
+    assert not response["success"]
+    assert response["error"]["code"] == "not_found"
+
+    with pytest.raises(HomeAssistantError, match="Stall detector not running"):
+        await hass.services.async_call(DOMAIN, SERVICE_LOG_STALLS, {}, blocking=True)
+
+    await hass.services.async_call(
+        DOMAIN,
+        SERVICE_START_STALL_DETECTOR,
+        {"threshold": 0.01},
+        blocking=True,
+    )
+    assert asyncio.Handle._run is not original_run
+    with pytest.raises(HomeAssistantError, match="Stall detector already started"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_START_STALL_DETECTOR, {}, blocking=True
+        )
+
+    @callback
+    def _blocking_callback() -> None:
+        time.sleep(0.02)
+
+    hass.loop.call_soon(_blocking_callback)
+    await hass.async_block_till_done()
+
+    await client.send_json({"id": 2, "type": "profiler/stalls"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"]["threshold"] == 0.01
+    stalls = [
+        stall
+        for stall in response["result"]["stalls"]
+        if stall["callback"].endswith("_blocking_callback")
+    ]
+    assert len(stalls) == 1
+    assert stalls[0]["duration"] >= 0.02
+    assert stalls[0]["file"] == __file__
+
+    await hass.services.async_call(DOMAIN, SERVICE_LOG_STALLS, {}, blocking=True)
+    assert "Event loop stalled for" in caplog.text
+    assert "_blocking_callback" in caplog.text
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_STOP_STALL_DETECTOR, {}, blocking=True
+    )
+    with pytest.raises(HomeAssistantError, match="Stall detector not running"):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_STOP_STALL_DETECTOR, {}, blocking=True
+        )
+
+    await hass.services.async_call(
+        DOMAIN, SERVICE_START_STALL_DETECTOR, {}, blocking=True
+    )
+    assert asyncio.Handle._run is not original_run
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    await hass.async_block_till_done()
+    assert asyncio.Handle._run is original_run
+
+
+async def test_stall_detector_other_loops(hass: HomeAssistant) -> None:
+    """Test the stall detector ignores other event loops and later wrappers."""
+    original_run = asyncio.Handle._run
+    stall_detector = StallDetector(hass, 0.01, 2)
+    stall_detector.async_start()
+
+    def _run_blocking_callback() -> None:
+        loop = asyncio.new_event_loop()
+        try:
+            loop.call_soon(_blocking_callback)
+            loop.call_soon(loop.stop)
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    await hass.async_add_executor_job(_run_blocking_callback)
+    assert stall_detector.total_stalls == 0
+
+    timed_run = asyncio.Handle._run
+    calls = []
+
+    def _wrapped_run(handle: asyncio.Handle) -> None:
+        calls.append(handle)
+        timed_run(handle)
+
+    asyncio.Handle._run = _wrapped_run
+    try:
+        stall_detector.async_stop()
+        assert asyncio.Handle._run is _wrapped_run
+        hass.loop.call_soon(_blocking_callback)
+        await hass.async_block_till_done()
+        assert calls
+        assert stall_detector.total_stalls == 0
+    finally:
+        asyncio.Handle._run = original_run
+
+
+async def test_stall_detector_keeps_slowest(hass: HomeAssistant) -> None:
+    """Test the stall detector keeps the slowest stalls."""
+    stall_detector = StallDetector(hass, 0.01, 2)
+
+    for duration in (0.3, 0.1, 0.5, 0.2, 0.4):
+        stall_detector._record(
+            asyncio.Handle(_blocking_callback, (), hass.loop), duration
+        )
+
+    assert stall_detector.total_stalls == 5
+    assert [stall["duration"] for stall in stall_detector.async_stalls()] == [
+        0.5,
+        0.4,
+    ]
+    assert stall_detector.async_stalls()[0]["callback"] == "_blocking_callback"
+
+
+def _blocking_callback() -> None:
+    """Mock a slow callback."""
+    time.sleep(0.02)
+
+
 async def test_lru_stats(hass: HomeAssistant, caplog: pytest.LogCaptureFixture) -> None:
     """Test logging lru stats."""
 
@@ -1574,6 +1574,7 @@ def mock_client_fixture():
 def mock_bus(hass):
     """Mock the event bus listener."""
     hass.bus.listen = mock.MagicMock()
+    hass.bus.listen_keyed = mock.MagicMock()
 
 
 @pytest.mark.usefixtures("mock_bus")
@@ -1631,6 +1632,8 @@ async def _setup(hass, filter_config):
     config = {prometheus.DOMAIN: {"filter": filter_config}}
     assert await async_setup_component(hass, prometheus.DOMAIN, config)
     await hass.async_block_till_done()
+    if hass.bus.listen_keyed.called:
+        return hass.bus.listen_keyed.call_args_list[0][0][2]
     return hass.bus.listen.call_args_list[0][0][1]
 
 
@@ -1664,6 +1667,29 @@ async def test_allowlist(hass: HomeAssistant, mock_client) -> None:
         mock_client.labels.reset_mock()
 
 
+@pytest.mark.usefixtures("mock_bus")
+async def test_allowlist_keyed(hass: HomeAssistant, mock_client) -> None:
+    """Test an allowlist of entities and domains listens keyed."""
+    handler_method = await _setup(
+        hass,
+        {
+            "include_domains": ["fake"],
+            "include_entities": ["not_real.included"],
+        },
+    )
+
+    assert EVENT_STATE_CHANGED not in [
+        call[0][0] for call in hass.bus.listen.call_args_list
+    ]
+    assert hass.bus.listen_keyed.call_args_list[0][0][:2] == (
+        EVENT_STATE_CHANGED,
+        {"fake", "not_real.included"},
+    )
+
+    handler_method(make_event("fake.included"))
+    assert mock_client.labels.call_count == 1
+
+
 @pytest.mark.usefixtures("mock_bus")
 async def test_denylist(hass: HomeAssistant, mock_client) -> None:
     """Test a denylist only config."""
@@ -0,0 +1,9 @@
+"""Fixtures for recorder tests."""
+from typing import Any
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def mock_recorder_storage(hass_storage: dict[str, Any]) -> None:
+    """Keep recorders set up without the hass fixture out of the testing config."""
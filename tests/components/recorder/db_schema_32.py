@@ -260,6 +260,20 @@ class Events(Base):  # type: ignore[misc,valid-type]
             context_parent_id=event.context.parent_id,
         )
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of an events row from a native event.
+
+        *** Not originally in v32, only added for recorder to startup ok
+        """
+        dbevent = Events.from_event(event)
+        row = {
+            column.key: getattr(dbevent, column.key)
+            for column in Events.__table__.columns
+            if column.key in dbevent.__dict__
+        }
+        return row | {"data_id": None, "event_type_id": None}
+
     def to_native(self, validate_entity_id: bool = True) -> Event | None:
         """Convert to a native HA Event."""
         context = Context(
@@ -439,6 +453,20 @@ class States(Base):  # type: ignore[misc,valid-type]
 
         return dbstate
 
+    @staticmethod
+    def row_from_event(event: Event) -> dict[str, Any]:
+        """Create the column values of a states row from a state_changed event.
+
+        *** Not originally in v32, only added for recorder to startup ok
+        """
+        dbstate = States.from_event(event)
+        row = {
+            column.key: getattr(dbstate, column.key)
+            for column in States.__table__.columns
+            if column.key in dbstate.__dict__
+        }
+        return row | {"old_state_id": None, "attributes_id": None, "metadata_id": None}
+
     def to_native(self, validate_entity_id: bool = True) -> State | None:
         """Convert to an HA state object."""
         context = Context(
@@ -0,0 +1,133 @@
+"""Test the context origins table manager."""
+from unittest.mock import patch
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from homeassistant.components.recorder.db_schema import (
+    ContextOrigins,
+    EventData,
+    Events,
+    States,
+)
+from homeassistant.components.recorder.models import ulid_to_bytes_or_none
+from homeassistant.components.recorder.util import session_scope
+from homeassistant.core import Context, HomeAssistant
+
+from ..common import async_wait_recording_done
+
+from tests.typing import RecorderInstanceGenerator
+
+
+@pytest.mark.parametrize("executemany_returning", [True, False])
+async def test_context_origins_recorded(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    executemany_returning: bool,
+) -> None:
+    """Test the first row of each context is recorded as its origin."""
+    instance = await async_setup_recorder_instance(hass)
+    assert instance.context_origins_manager.active
+    assert instance.context_origins_manager.since_ts == 0.0
+    event_context = Context()
+    state_context = Context()
+
+    with patch.object(
+        instance.engine.dialect, "use_insertmanyvalues", executemany_returning
+    ):
+        hass.bus.async_fire("test_event", {"first": True}, context=event_context)
+        hass.states.async_set("light.kitchen", "on", context=event_context)
+        hass.bus.async_fire("test_event", {"first": False}, context=event_context)
+        hass.states.async_set("light.kitchen", "off", context=state_context)
+        hass.bus.async_fire("test_event", context=state_context)
+        await async_wait_recording_done(hass)
+
+        # After a restart contexts are recorded again
+        instance.context_origins_manager.reset()
+        hass.bus.async_fire("test_event", {"first": None}, context=event_context)
+        await async_wait_recording_done(hass)
+
+    event_context_bin = ulid_to_bytes_or_none(event_context.id)
+    state_context_bin = ulid_to_bytes_or_none(state_context.id)
+    with session_scope(hass=hass) as session:
+        origins = (
+            session.query(ContextOrigins)
+            .filter(
+                ContextOrigins.context_id_bin.in_(
+                    [event_context_bin, state_context_bin]
+                )
+            )
+            .order_by(ContextOrigins.origin_id)
+            .all()
+        )
+        assert [origin.context_id_bin for origin in origins] == [
+            event_context_bin,
+            state_context_bin,
+            event_context_bin,
+        ]
+        first_event = session.get(Events, origins[0].event_id)
+        assert session.get(EventData, first_event.data_id).shared_data == (
+            '{"first":true}'
+        )
+        assert first_event.time_fired_ts == origins[0].time_fired_ts
+        assert origins[0].state_id is None
+        state = session.get(States, origins[1].state_id)
+        assert state.state == "off"
+        assert state.last_updated_ts == origins[1].time_fired_ts
+        assert origins[1].event_id is None
+        assert origins[2].event_id is not None
+
+
+async def test_context_origins_commit_retry(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+) -> None:
+    """Test the origins are written again when the commit is retried."""
+    instance = await async_setup_recorder_instance(hass)
+    hass.bus.async_fire("test_event", {"first": True})
+    await async_wait_recording_done(hass)
+    event_context = Context()
+    state_context = Context()
+    session = instance.event_session
+    commit = session.commit
+    failures = []
+
+    def _fail_first_commit():
+        if not failures and instance._pending_events:
+            failures.append(len(instance._pending_events))
+            session.rollback()
+            raise OperationalError("commit", "fake params", "forced to fail")
+        commit()
+
+    with patch("time.sleep"), patch.object(
+        session, "commit", side_effect=_fail_first_commit
+    ):
+        hass.bus.async_fire("test_event", {"first": True}, context=event_context)
+        hass.states.async_set("light.kitchen", "on", context=state_context)
+        await async_wait_recording_done(hass)
+    assert failures == [1]
+
+    # The contexts are still known after the retry
+    hass.bus.async_fire("test_event", {"first": False}, context=event_context)
+    await async_wait_recording_done(hass)
+
+    event_context_bin = ulid_to_bytes_or_none(event_context.id)
+    state_context_bin = ulid_to_bytes_or_none(state_context.id)
+    with session_scope(hass=hass) as session:
+        origins = {
+            origin.context_id_bin: origin
+            for origin in session.query(ContextOrigins).filter(
+                ContextOrigins.context_id_bin.in_(
+                    [event_context_bin, state_context_bin]
+                )
+            )
+        }
+        assert len(origins) == 2
+        first_event = session.get(Events, origins[event_context_bin].event_id)
+        assert first_event.context_id_bin == event_context_bin
+        assert session.get(EventData, first_event.data_id).shared_data == (
+            '{"first":true}'
+        )
+        state = session.get(States, origins[state_context_bin].state_id)
+        assert state.state == "on"
+        assert state.context_id_bin == state_context_bin
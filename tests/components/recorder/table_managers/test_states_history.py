@@ -0,0 +1,150 @@
+"""Test the states history table manager."""
+import math
+from unittest.mock import patch
+
+from homeassistant.components.recorder.table_managers.states_history import (
+    CachedStateRow,
+    StatesHistoryManager,
+)
+
+
+def _add(
+    manager: StatesHistoryManager,
+    metadata_id: int,
+    state: str,
+    last_updated_ts: float,
+    last_changed_ts: float | None = None,
+) -> None:
+    """Add a committed row to the manager."""
+    manager.add_pending(
+        {
+            "metadata_id": metadata_id,
+            "state": state,
+            "last_changed_ts": last_changed_ts,
+            "last_updated_ts": last_updated_ts,
+        }
+    )
+
+
+def test_states_history_manager_queries() -> None:
+    """Test queries are answered from memory once rows are committed."""
+    manager = StatesHistoryManager(window=math.inf)
+    assert manager.get_significant_states([1], [], 100, None, False, True) is None
+
+    manager.start(100)
+    _add(manager, 1, "on", 110)
+    _add(manager, 1, "on", 130, 110)
+    _add(manager, 2, "idle", 115)
+    # Rows are only served once they are committed
+    assert manager.get_significant_states([1, 2], [], 105, None, False, False) == (
+        [],
+        [],
+        [],
+    )
+    _add(manager, 1, "off", 120)  # out of order
+    manager.post_commit_pending()
+    assert manager.rows == 4
+
+    cached = manager.get_significant_states([2, 1], [], 105, None, False, False)
+    assert cached.rows == [
+        CachedStateRow(1, "on", None, 110),
+        CachedStateRow(1, "off", None, 120),
+        CachedStateRow(1, "on", 110, 130),
+        CachedStateRow(2, "idle", None, 115),
+    ]
+
+    # Only rows where the state changed are significant
+    cached = manager.get_significant_states([1, 2], [], 110, 130, True, True)
+    assert cached.rows == [
+        CachedStateRow(1, "off", None, 120),
+        CachedStateRow(2, "idle", None, 115),
+    ]
+    assert cached.start_time_rows == []
+    assert cached.missing_start_time_states == [1, 2]
+
+    # Unless the entity is in a significant domain
+    cached = manager.get_significant_states([1], [1], 115, None, True, True)
+    assert cached.rows == [
+        CachedStateRow(1, "off", None, 120),
+        CachedStateRow(1, "on", None, 130),
+    ]
+    assert cached.start_time_rows == [CachedStateRow(1, "on", None, 110)]
+    assert cached.missing_start_time_states == []
+
+    # Entities without rows have no state changes
+    cached = manager.get_significant_states([3], [], 105, None, False, True)
+    assert cached.rows == []
+    assert cached.missing_start_time_states == [3]
+
+    # Queries reaching before the cached rows fall back to the database
+    assert manager.get_significant_states([1], [], 99, None, False, False) is None
+
+
+def test_states_history_manager_trim_and_evict() -> None:
+    """Test rows are trimmed to the window and series are evicted."""
+    manager = StatesHistoryManager(window=100, max_rows=5)
+    manager.start(0)
+    with patch(
+        "homeassistant.components.recorder.table_managers.states_history.time.time",
+        return_value=1000,
+    ):
+        for ts in (10, 20, 950, 960):
+            _add(manager, 1, str(ts), ts)
+        manager.post_commit_pending()
+    # The newest row before the window is kept as the start state
+    assert manager.rows == 3
+    assert manager.get_significant_states([1], [], 15, None, False, True) is None
+    cached = manager.get_significant_states([1], [], 900, None, False, True)
+    assert cached.start_time_rows == [CachedStateRow(1, "20", None, 20)]
+    assert [row.state for row in cached.rows] == ["950", "960"]
+
+    with patch(
+        "homeassistant.components.recorder.table_managers.states_history.time.time",
+        return_value=1010,
+    ):
+        for ts in (1001, 1002, 1003):
+            _add(manager, 2, str(ts), ts)
+        manager.post_commit_pending()
+    # Series 1 is the least recently used and is evicted
+    assert manager.rows == 3
+    assert manager.get_significant_states([1], [], 1000, None, False, False) is None
+    assert manager.get_significant_states([1], [], 1010, None, False, False) == (
+        [],
+        [],
+        [],
+    )
+
+    # A recreated series only holds the rows after the eviction
+    with patch(
+        "homeassistant.components.recorder.table_managers.states_history.time.time",
+        return_value=1020,
+    ):
+        _add(manager, 1, "1015", 1015)
+        manager.post_commit_pending()
+    assert manager.get_significant_states([1], [], 1005, None, False, False) is None
+    cached = manager.get_significant_states([1], [], 1010, None, False, True)
+    assert cached.rows == [CachedStateRow(1, "1015", None, 1015)]
+
+
+def test_states_history_manager_purge_and_reset() -> None:
+    """Test purged rows are evicted and reset drops every row."""
+    manager = StatesHistoryManager(window=math.inf)
+    manager.start(0)
+    for ts in (10, 20, 30):
+        _add(manager, 1, str(ts), ts)
+        _add(manager, 2, str(ts), ts)
+    manager.post_commit_pending()
+
+    manager.evict_purged_before(20)
+    assert manager.rows == 4
+    assert manager.get_significant_states([1, 2], [], 15, None, False, True) is None
+    cached = manager.get_significant_states([1, 2], [], 25, None, False, True)
+    assert [row.state for row in cached.start_time_rows] == ["20", "20"]
+
+    manager.evict_purged_metadata_ids([2])
+    assert manager.rows == 2
+    assert manager.get_significant_states([2], [], 25, None, False, True) is None
+
+    manager.reset()
+    assert manager.rows == 0
+    assert manager.get_significant_states([1], [], 25, None, False, True) is None
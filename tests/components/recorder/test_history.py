@@ -7,8 +7,10 @@ from collections.abc import Callable
 from copy import copy
 from datetime import datetime, timedelta
 import json
+from typing import Any
 from unittest.mock import patch, sentinel
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 from sqlalchemy import text
 
@@ -756,6 +758,89 @@ async def test_get_significant_states_only_minimal_response(
     assert len(hist["sensor.test"]) == 3
 
 
+@pytest.mark.parametrize("significant_changes_only", [True, False])
+@pytest.mark.parametrize("minimal_response", [True, False])
+@pytest.mark.parametrize("compressed_state_format", [True, False])
+async def test_get_significant_states_from_memory(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    significant_changes_only: bool,
+    minimal_response: bool,
+    compressed_state_format: bool,
+) -> None:
+    """Test recent states are answered from memory like from the database."""
+    instance = recorder.get_instance(hass)
+    entity_ids = ["sensor.test", "climate.test", "light.test"]
+    start = dt_util.utcnow()
+    for idx in range(6):
+        freezer.tick(timedelta(minutes=1))
+        hass.states.async_set("sensor.test", str(idx // 2), {"idx": idx})
+        hass.states.async_set("climate.test", "heat", {"current_temperature": idx})
+        if idx == 3:
+            hass.states.async_set("light.test", "on")
+        await async_recorder_block_till_done(hass)
+    await async_wait_recording_done(hass)
+
+    def _get_states(start_time: datetime) -> dict[str, list[Any]]:
+        hist = history.get_significant_states(
+            hass,
+            start_time,
+            start_time + timedelta(minutes=4),
+            entity_ids=entity_ids,
+            significant_changes_only=significant_changes_only,
+            minimal_response=minimal_response,
+            no_attributes=True,
+            compressed_state_format=compressed_state_format,
+        )
+        return {
+            entity_id: [
+                state.as_dict() if isinstance(state, State) else state
+                for state in states
+            ]
+            for entity_id, states in hist.items()
+        }
+
+    def _get_states_from_db(start_time: datetime) -> dict[str, list[Any]]:
+        with patch.object(instance.states_history_manager, "active", False):
+            return _get_states(start_time)
+
+    for start_time in (
+        start,
+        start + timedelta(seconds=90),
+        start + timedelta(minutes=3),
+    ):
+        with patch.object(
+            history.modern,
+            "_significant_states_stmt",
+            wraps=history.modern._significant_states_stmt,
+        ) as significant_states_stmt:
+            from_memory = await instance.async_add_executor_job(_get_states, start_time)
+        assert significant_states_stmt.call_count == 0
+        from_db = await instance.async_add_executor_job(_get_states_from_db, start_time)
+        assert from_memory == from_db
+        assert from_memory["sensor.test"]
+
+    # Start time states held in memory are only used during a recorder run
+    with patch.object(instance.recorder_runs_manager, "get", return_value=None):
+        from_memory = await instance.async_add_executor_job(
+            _get_states, start + timedelta(minutes=3)
+        )
+        from_db = await instance.async_add_executor_job(
+            _get_states_from_db, start + timedelta(minutes=3)
+        )
+    assert from_memory == from_db
+
+    # Ranges before the states held in memory are read from the database
+    with patch.object(
+        history.modern,
+        "_significant_states_stmt",
+        wraps=history.modern._significant_states_stmt,
+    ) as significant_states_stmt:
+        await instance.async_add_executor_job(_get_states, start - timedelta(days=2))
+    assert significant_states_stmt.call_count == 1
+
+
 def record_states(hass) -> tuple[datetime, datetime, dict[str, list[State]]]:
     """Record some test states.
 
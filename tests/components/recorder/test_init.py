@@ -4,6 +4,7 @@ from __future__ import annotations
 import asyncio
 from collections.abc import Callable
 from datetime import datetime, timedelta
+import os
 from pathlib import Path
 import sqlite3
 import threading
@@ -35,6 +36,7 @@ from homeassistant.components.recorder.const import (
     EVENT_RECORDER_5MIN_STATISTICS_GENERATED,
     EVENT_RECORDER_HOURLY_STATISTICS_GENERATED,
     KEEPALIVE_TIME,
+    SPILL_DIR,
     SupportedDialect,
 )
 from homeassistant.components.recorder.db_schema import (
@@ -56,18 +58,22 @@ from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
     SERVICE_PURGE_ENTITIES,
 )
+from homeassistant.components.recorder.spill import SpillingQueue
+from homeassistant.components.recorder.tasks import ReplaySpilledEventsTask
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.const import (
     EVENT_COMPONENT_LOADED,
     EVENT_HOMEASSISTANT_FINAL_WRITE,
     EVENT_HOMEASSISTANT_STARTED,
     EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED,
     MATCH_ALL,
     STATE_LOCKED,
     STATE_UNLOCKED,
 )
 from homeassistant.core import Context, CoreState, Event, HomeAssistant, callback
 from homeassistant.helpers import entity_registry as er, recorder as recorder_helper
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.setup import async_setup_component, setup_component
 from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
@@ -364,11 +370,8 @@ def test_saving_state_with_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise OperationalError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        if get_instance(hass)._pending_states:
+            raise OperationalError("insert the state", "fake params", "forced to fail")
 
     with patch("time.sleep"), patch.object(
         get_instance(hass).event_session,
@@ -393,6 +396,76 @@ def test_saving_state_with_exception(
     assert "Error saving events" not in caplog.text
 
 
+def test_saving_state_with_commit_retry(
+    hass_recorder: Callable[..., HomeAssistant],
+    hass: HomeAssistant,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the pending rows are written again when the commit is retried."""
+    hass = hass_recorder()
+    instance = get_instance(hass)
+    hass.states.set("test.recorder", "first", {"test_attr": 5})
+    wait_recording_done(hass)
+
+    session = instance.event_session
+    commit = session.commit
+    failures = []
+
+    def _fail_first_commit():
+        if not failures and instance._pending_states:
+            failures.append(len(instance._pending_states))
+            session.rollback()
+            raise OperationalError("commit", "fake params", "forced to fail")
+        commit()
+
+    with patch("time.sleep"), patch.object(
+        session, "commit", side_effect=_fail_first_commit
+    ):
+        hass.states.set("test.recorder", "retried", {"test_attr": 5})
+        wait_recording_done(hass)
+
+    assert failures == [1]
+    assert "Error executing query" in caplog.text
+    assert not instance._pending_states
+    with session_scope(hass=hass) as session:
+        db_states = list(session.query(States))
+        assert [db_state.state for db_state in db_states] == ["first", "retried"]
+        assert db_states[1].old_state_id == db_states[0].state_id
+
+
+def test_states_history_cache_with_commit_retry(
+    hass_recorder: Callable[..., HomeAssistant],
+    hass: HomeAssistant,
+) -> None:
+    """Test a retried commit adds its rows to the states history cache once."""
+    hass = hass_recorder()
+    instance = get_instance(hass)
+    hass.states.set("test.recorder", "first", {"test_attr": 5})
+    wait_recording_done(hass)
+    assert instance.states_history_manager.active
+    rows = instance.states_history_manager.rows
+
+    session = instance.event_session
+    commit = session.commit
+    failures = []
+
+    def _fail_first_commit():
+        if not failures and instance._pending_states:
+            failures.append(len(instance._pending_states))
+            session.rollback()
+            raise OperationalError("commit", "fake params", "forced to fail")
+        commit()
+
+    with patch("time.sleep"), patch.object(
+        session, "commit", side_effect=_fail_first_commit
+    ):
+        hass.states.set("test.recorder", "retried", {"test_attr": 5})
+        wait_recording_done(hass)
+
+    assert failures == [1]
+    assert instance.states_history_manager.rows == rows + 1
+
+
 def test_saving_state_with_sqlalchemy_exception(
     hass_recorder: Callable[..., HomeAssistant],
     hass: HomeAssistant,
@@ -406,11 +479,8 @@ def test_saving_state_with_sqlalchemy_exception(
     attributes = {"test_attr": 5, "test_attr_10": "nice"}
 
     def _throw_if_state_in_session(*args, **kwargs):
-        for obj in get_instance(hass).event_session:
-            if isinstance(obj, States):
-                raise SQLAlchemyError(
-                    "insert the state", "fake params", "forced to fail"
-                )
+        if get_instance(hass)._pending_states:
+            raise SQLAlchemyError("insert the state", "fake params", "forced to fail")
 
     with patch("time.sleep"), patch.object(
         get_instance(hass).event_session,
@@ -1375,6 +1445,68 @@ def test_saving_sets_old_state(hass_recorder: Callable[..., HomeAssistant]) -> N
         assert states_by_state["s4"].old_state_id == states_by_state["s2"].state_id
 
 
+@pytest.mark.parametrize("executemany_returning", [True, False])
+def test_saving_sets_old_state_in_same_commit(
+    hass_recorder: Callable[..., HomeAssistant], executemany_returning: bool
+) -> None:
+    """Test saving sets old state when the old state is in the same commit.
+
+    Without executemany RETURNING, as on MySQL, the state_ids are selected
+    after the insert.
+    """
+    hass = hass_recorder({"commit_interval": 30})
+    dialect = get_instance(hass).engine.dialect
+
+    with patch.object(dialect, "insert_executemany_returning", executemany_returning):
+        hass.states.set("test.one", "s1", {"any": 1})
+        hass.states.set("test.two", "s2", {})
+        hass.states.set("test.one", "s3", {"any": 2})
+        hass.states.set("test.one", "s4", {"any": 1})
+        hass.states.set("test.two", "s5", {})
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        states = list(
+            session.query(
+                StatesMeta.entity_id,
+                States.state_id,
+                States.old_state_id,
+                States.state,
+                States.attributes_id,
+            ).outerjoin(StatesMeta, States.metadata_id == StatesMeta.metadata_id)
+        )
+        assert len(states) == 5
+        states_by_state = {state.state: state for state in states}
+
+        assert states_by_state["s1"].entity_id == "test.one"
+        assert states_by_state["s3"].entity_id == "test.one"
+        assert states_by_state["s4"].entity_id == "test.one"
+        assert states_by_state["s2"].entity_id == "test.two"
+        assert states_by_state["s5"].entity_id == "test.two"
+
+        assert states_by_state["s1"].old_state_id is None
+        assert states_by_state["s3"].old_state_id == states_by_state["s1"].state_id
+        assert states_by_state["s4"].old_state_id == states_by_state["s3"].state_id
+        assert states_by_state["s2"].old_state_id is None
+        assert states_by_state["s5"].old_state_id == states_by_state["s2"].state_id
+
+        assert states_by_state["s1"].attributes_id is not None
+        assert (
+            states_by_state["s1"].attributes_id == states_by_state["s4"].attributes_id
+        )
+        assert (
+            states_by_state["s1"].attributes_id != states_by_state["s3"].attributes_id
+        )
+
+    with patch.object(dialect, "insert_executemany_returning", executemany_returning):
+        hass.states.set("test.one", "s6", {})
+        wait_recording_done(hass)
+
+    with session_scope(hass=hass) as session:
+        s6 = session.query(States).filter(States.state == "s6").one()
+        assert s6.old_state_id == states_by_state["s4"].state_id
+
+
 def test_saving_state_with_serializable_data(
     hass_recorder: Callable[..., HomeAssistant], caplog: pytest.LogCaptureFixture
 ) -> None:
@@ -1996,6 +2128,185 @@ async def test_async_block_till_done(
     await hass.async_block_till_done()
 
 
+async def test_events_spill_to_disk_when_queue_is_full(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Test events are spilled to disk and replayed when the queue is full."""
+    # Spilled events left behind would be replayed by recorders of other tests
+    hass.config.config_dir = str(tmp_path)
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+    instance._queue.max_in_memory = 1
+
+    started = asyncio.Event()
+
+    class BlockQueue(recorder.tasks.RecorderTask):
+        event: threading.Event = threading.Event()
+
+        def run(self, instance: Recorder) -> None:
+            hass.loop.call_soon_threadsafe(started.set)
+            self.event.wait()
+
+    block_task = BlockQueue()
+    instance.queue_task(block_task)
+    await started.wait()
+    entity_id = "test.recorder"
+    for idx in range(10):
+        hass.states.async_set(entity_id, str(idx), {"idx": idx})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance._queue.flush)
+
+    # The first event stays in memory, the rest is spilled behind a replay task
+    assert instance._queue.spilled_events == 9
+    assert instance.backlog == 11
+    assert instance.spill_size > 0
+    spill_dir = hass.config.path(STORAGE_DIR, SPILL_DIR)
+    assert len(os.listdir(spill_dir)) == 1
+
+    def _fetch_states():
+        with session_scope(hass=hass) as session:
+            return [
+                (state.state, state.old_state_id is not None)
+                for state in session.query(States).order_by(States.state_id)
+            ]
+
+    block_task.event.set()
+    await async_wait_recording_done(hass)
+    states = await instance.async_add_executor_job(_fetch_states)
+    assert states == [(str(idx), idx > 0) for idx in range(10)]
+    assert instance.backlog == 0
+    assert instance.spill_size == 0
+    assert instance.replay_rate is not None
+    assert os.listdir(spill_dir) == []
+
+
+async def test_spilled_events_resume_after_failed_replay(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    tmp_path: Path,
+) -> None:
+    """Test a replay that fails keeps the events that were not committed."""
+    # Spilled events left behind would be replayed by recorders of other tests
+    hass.config.config_dir = str(tmp_path)
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+    instance._queue.max_in_memory = 1
+
+    started = asyncio.Event()
+
+    class BlockQueue(recorder.tasks.RecorderTask):
+        event: threading.Event = threading.Event()
+
+        def run(self, instance: Recorder) -> None:
+            hass.loop.call_soon_threadsafe(started.set)
+            self.event.wait()
+
+    block_task = BlockQueue()
+    instance.queue_task(block_task)
+    await started.wait()
+    entity_id = "test.recorder"
+    for idx in range(10):
+        hass.states.async_set(entity_id, str(idx), {"idx": idx})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance._queue.flush)
+
+    process_one_event = instance._process_one_event
+
+    def _process_one_event_or_fail(event: Event) -> None:
+        if (
+            event.event_type == EVENT_STATE_CHANGED
+            and event.data["new_state"].state == "5"
+        ):
+            raise RuntimeError("replay failed")
+        process_one_event(event)
+
+    def _fetch_states():
+        with session_scope(hass=hass) as session:
+            query = session.query(States).order_by(States.state_id)
+            return [state.state for state in query]
+
+    with patch.object(instance, "_process_one_event", _process_one_event_or_fail):
+        block_task.event.set()
+        await async_wait_recording_done(hass)
+
+    # The events committed before the failure are recorded, the segment is kept
+    states = await instance.async_add_executor_job(_fetch_states)
+    assert states == [str(idx) for idx in range(5)]
+    spill_dir = hass.config.path(STORAGE_DIR, SPILL_DIR)
+    assert len(os.listdir(spill_dir)) == 2
+
+    # The next start resumes after the committed events
+    segments = await instance.async_add_executor_job(
+        SpillingQueue(spill_dir, 0).leftover_segments
+    )
+    assert len(segments) == 1
+    assert segments[0].offset == 4
+    instance.queue_task(ReplaySpilledEventsTask(segments[0]))
+    await async_wait_recording_done(hass)
+    states = await instance.async_add_executor_job(_fetch_states)
+    assert states == [str(idx) for idx in range(10)]
+    assert os.listdir(spill_dir) == []
+
+
+async def test_recorder_stops_when_spill_is_full(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    tmp_path: Path,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the recorder stops recording once the spilled events are too large."""
+    # Spilled events left behind would be replayed by recorders of other tests
+    hass.config.config_dir = str(tmp_path)
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_recording_done(hass)
+    instance._queue.max_in_memory = 1
+
+    started = asyncio.Event()
+
+    class BlockQueue(recorder.tasks.RecorderTask):
+        event: threading.Event = threading.Event()
+
+        def run(self, instance: Recorder) -> None:
+            hass.loop.call_soon_threadsafe(started.set)
+            self.event.wait()
+
+    block_task = BlockQueue()
+    instance.queue_task(block_task)
+    await started.wait()
+    entity_id = "test.recorder"
+    for idx in range(10):
+        hass.states.async_set(entity_id, str(idx), {"idx": idx})
+    await hass.async_block_till_done()
+    await hass.async_add_executor_job(instance._queue.flush)
+    spill_size = instance.spill_size
+
+    with patch.object(recorder.core, "MAX_SPILL_SIZE", spill_size):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=10))
+        await hass.async_block_till_done()
+        assert instance._event_listener is not None
+
+    with patch.object(recorder.core, "MAX_SPILL_SIZE", spill_size - 1):
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(minutes=20))
+        await hass.async_block_till_done()
+    assert instance._event_listener is None
+    assert "9 spilled to disk" in caplog.text
+
+    # The events spilled before the recorder stopped are still recorded
+    hass.states.async_set(entity_id, "not recorded")
+    await hass.async_block_till_done()
+    block_task.event.set()
+    await async_wait_recording_done(hass)
+
+    def _fetch_states():
+        with session_scope(hass=hass) as session:
+            return [state.state for state in session.query(States)]
+
+    states = await instance.async_add_executor_job(_fetch_states)
+    assert states == [str(idx) for idx in range(10)]
+
+
 @pytest.mark.parametrize(
     ("db_url", "echo"),
     (
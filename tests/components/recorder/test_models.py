@@ -306,6 +306,7 @@ async def test_lazy_state_handles_different_last_updated_and_last_changed(
         "state": "off",
     }
     assert lstate.last_updated.timestamp() == row.last_updated_ts
+    assert lstate.last_updated_timestamp == row.last_updated_ts
     assert lstate.last_changed.timestamp() == row.last_changed_ts
     assert lstate.as_dict() == {
         "attributes": {"shared": True},
@@ -2,6 +2,7 @@
 from datetime import datetime, timedelta
 import json
 import sqlite3
+from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
@@ -12,10 +13,12 @@ from sqlalchemy.orm.session import Session
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, migration
 from homeassistant.components.recorder.const import (
+    PURGE_PROGRESS_STORAGE_KEY,
     SQLITE_MAX_BIND_VARS,
     SupportedDialect,
 )
 from homeassistant.components.recorder.db_schema import (
+    ContextOrigins,
     EventData,
     Events,
     EventTypes,
@@ -27,7 +30,11 @@ from homeassistant.components.recorder.db_schema import (
     StatisticsShortTerm,
 )
 from homeassistant.components.recorder.history import get_significant_states
-from homeassistant.components.recorder.purge import purge_old_data
+from homeassistant.components.recorder.purge import (
+    PURGE_TIME_BUDGET,
+    PurgeProgress,
+    purge_old_data,
+)
 from homeassistant.components.recorder.queries import select_event_type_ids
 from homeassistant.components.recorder.services import (
     SERVICE_PURGE,
@@ -47,6 +54,7 @@ from .common import (
     async_wait_recording_done,
 )
 
+from tests.common import async_fire_time_changed
 from tests.typing import RecorderInstanceGenerator
 
 
@@ -281,6 +289,39 @@ async def test_purge_old_events(
         assert events.count() == 2
 
 
+async def test_purge_old_context_origins(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test deleting the origins of old contexts."""
+    instance = await async_setup_recorder_instance(hass)
+    now = dt_util.utcnow()
+    for days in (10, 5, 1, 0):
+        with freeze_time(now - timedelta(days=days)):
+            hass.bus.async_fire("EVENT_TEST_PURGE")
+            hass.states.async_set("sensor.purge", str(days))
+        await async_wait_recording_done(hass)
+
+    purge_before = now - timedelta(days=4)
+    with session_scope(hass=hass) as session:
+        context_origins = session.query(ContextOrigins)
+        old_context_origins = context_origins.filter(
+            ContextOrigins.time_fired_ts < purge_before.timestamp()
+        )
+        assert old_context_origins.count() == 4
+        recent_count = context_origins.count() - 4
+
+        finished = purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            events_batch_size=1,
+            states_batch_size=1,
+        )
+        assert not finished
+        assert old_context_origins.count() == 0
+        assert context_origins.count() == recent_count
+
+
 async def test_purge_old_recorder_runs(
     async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
 ) -> None:
@@ -1721,6 +1762,131 @@ async def test_purge_many_old_events(
         assert events.count() == 0
 
 
+async def test_purge_old_data_tracks_progress(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test the oldest remaining state is tracked as watermark of a purge."""
+    instance = await async_setup_recorder_instance(hass)
+
+    await _add_test_states(hass)
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = PurgeProgress(purge_before, False, False)
+
+    with session_scope(hass=hass) as session:
+        states = session.query(States)
+        oldest_ts = min(state.last_updated_ts for state in states)
+
+        finished = purge_old_data(
+            instance,
+            purge_before,
+            repack=False,
+            states_batch_size=1,
+            events_batch_size=1,
+            progress=progress,
+        )
+        assert not finished
+        assert states.count() == 2
+        assert progress.oldest_ts == oldest_ts
+        assert progress.watermark_ts == min(state.last_updated_ts for state in states)
+        assert progress.watermark_ts > dt_util.utc_to_timestamp(purge_before)
+        assert progress.fraction_done == 1.0
+
+
+def test_purge_progress_adapts_batch_sizes() -> None:
+    """Test the batches of a purge slice are scaled to the time budget."""
+    progress = PurgeProgress(dt_util.utcnow(), False, False)
+    assert progress.fraction_done == 0.0
+    assert progress.estimated_completion() is None
+
+    progress.adapt_batch_sizes(PURGE_TIME_BUDGET * 2)
+    assert (progress.states_batch_size, progress.events_batch_size) == (10, 8)
+    progress.adapt_batch_sizes(PURGE_TIME_BUDGET / 10)
+    assert (progress.states_batch_size, progress.events_batch_size) == (20, 16)
+    progress.adapt_batch_sizes(PURGE_TIME_BUDGET * 100)
+    assert (progress.states_batch_size, progress.events_batch_size) == (2, 2)
+    progress.adapt_batch_sizes(PURGE_TIME_BUDGET * 100)
+    assert (progress.states_batch_size, progress.events_batch_size) == (1, 1)
+    for _ in range(10):
+        progress.adapt_batch_sizes(0)
+    assert (progress.states_batch_size, progress.events_batch_size) == (200, 150)
+    assert progress.slices == 14
+
+    assert PurgeProgress.from_storage(progress.as_storage()) == progress
+
+
+async def test_purge_task_keeps_batch_sizes(
+    async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
+) -> None:
+    """Test a purge of other data starts over with the adapted batch sizes."""
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_purge_done(hass)
+    old_purge_before = dt_util.utcnow() - timedelta(days=5)
+    instance.purge_progress = PurgeProgress(
+        old_purge_before,
+        False,
+        False,
+        oldest_ts=1.0,
+        watermark_ts=2.0,
+        slices=3,
+        states_batch_size=50,
+        events_batch_size=40,
+    )
+
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    with patch(
+        "homeassistant.components.recorder.purge.purge_old_data",
+        side_effect=[False, True],
+    ) as purge_old_data_mock:
+        instance.queue_task(PurgeTask(purge_before, repack=False, apply_filter=False))
+        await async_wait_purge_done(hass)
+
+    assert len(purge_old_data_mock.mock_calls) == 2
+    first_slice = purge_old_data_mock.mock_calls[0].args
+    assert first_slice[1] == purge_before
+    assert first_slice[4:6] == (40, 50)
+    progress: PurgeProgress = first_slice[6]
+    assert progress.purge_before == purge_before
+    assert progress.oldest_ts is None
+    assert progress.watermark_ts is None
+    assert progress.slices == 1
+    assert instance.purge_progress is None
+
+
+async def test_purge_resumes_after_restart(
+    async_setup_recorder_instance: RecorderInstanceGenerator,
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a purge that did not finish is persisted and resumed on start."""
+    purge_before = dt_util.utcnow() - timedelta(days=4)
+    progress = PurgeProgress(purge_before, False, False, slices=1)
+    hass_storage[PURGE_PROGRESS_STORAGE_KEY] = {
+        "version": 1,
+        "data": progress.as_storage(),
+    }
+
+    instance = await async_setup_recorder_instance(hass)
+    await async_wait_purge_done(hass)
+    assert "Resuming purge of data before" in caplog.text
+    assert instance.purge_progress is None
+    await hass.async_block_till_done()
+    assert PURGE_PROGRESS_STORAGE_KEY not in hass_storage
+
+    instance.purge_progress = progress
+    await instance.async_add_executor_job(instance.save_purge_progress)
+    await hass.async_block_till_done()
+    assert PURGE_PROGRESS_STORAGE_KEY not in hass_storage
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=31))
+    await hass.async_block_till_done()
+    assert hass_storage[PURGE_PROGRESS_STORAGE_KEY]["data"] == progress.as_storage()
+
+    instance.purge_progress = None
+    await instance.async_add_executor_job(instance.save_purge_progress)
+    await hass.async_block_till_done()
+    assert PURGE_PROGRESS_STORAGE_KEY not in hass_storage
+
+
 async def test_purge_can_mix_legacy_and_new_format(
     async_setup_recorder_instance: RecorderInstanceGenerator, hass: HomeAssistant
 ) -> None:
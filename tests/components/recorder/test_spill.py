@@ -0,0 +1,228 @@
+"""Test spilling the recorder queue to disk."""
+from datetime import datetime
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from homeassistant.components.recorder.spill import (
+    SpillingQueue,
+    event_to_json,
+    json_to_event,
+)
+from homeassistant.components.recorder.tasks import (
+    CommitTask,
+    EventTask,
+    ReplaySpilledEventsTask,
+)
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import Context, Event, EventOrigin, State
+import homeassistant.util.dt as dt_util
+
+
+def _state_changed_event(entity_id: str, state: str) -> Event:
+    """Create a state changed event."""
+    time_fired = datetime(2023, 4, 1, 12, 0, 0, 123456, tzinfo=dt_util.UTC)
+    context = Context(user_id="abc", parent_id="01GX0D3QXR5ZJ0XM8Y5PJ0DFNQ")
+    old_state = State(entity_id, "off", {"any": 1}, time_fired, time_fired, context)
+    new_state = State(entity_id, state, {"any": 2}, time_fired, time_fired, context)
+    return Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": entity_id, "old_state": old_state, "new_state": new_state},
+        EventOrigin.local,
+        time_fired,
+        context,
+    )
+
+
+def test_event_json_round_trip() -> None:
+    """Test events survive being spilled to disk."""
+    event = _state_changed_event("sensor.one", "on")
+    restored = json_to_event(event_to_json(event))
+    assert restored.event_type == EVENT_STATE_CHANGED
+    assert restored.time_fired == event.time_fired
+    assert restored.origin == event.origin
+    assert restored.context == event.context
+    assert restored.context.parent_id == event.context.parent_id
+    assert restored.data["entity_id"] == "sensor.one"
+    assert restored.data["old_state"].as_dict() == event.data["old_state"].as_dict()
+    assert restored.data["new_state"].as_dict() == event.data["new_state"].as_dict()
+    assert restored.data["new_state"].context.id == event.context.id
+
+    removed = Event(
+        EVENT_STATE_CHANGED,
+        {"entity_id": "sensor.one", "old_state": event.data["new_state"]},
+    )
+    restored = json_to_event(event_to_json(removed))
+    assert restored.data["new_state"] is None
+    assert restored.data["old_state"].as_dict() == event.data["new_state"].as_dict()
+
+    other = Event("test_event", {"test_attr": 5}, EventOrigin.remote)
+    restored = json_to_event(event_to_json(other))
+    assert restored.event_type == "test_event"
+    assert restored.data == {"test_attr": 5}
+    assert restored.origin == EventOrigin.remote
+    assert restored.context == other.context
+
+
+def test_spilling_queue_keeps_order(tmp_path: Path) -> None:
+    """Test events are spilled once the queue is full and tasks stay in order."""
+    spill_dir = str(tmp_path / "spill")
+    spill_queue = SpillingQueue(spill_dir, 2)
+    events = [_state_changed_event("sensor.one", str(idx)) for idx in range(6)]
+
+    spill_queue.put(EventTask(events[0]))
+    spill_queue.put(EventTask(events[1]))
+    spill_queue.put(EventTask(events[2]))
+    spill_queue.put(EventTask(events[3]))
+    commit_task = CommitTask()
+    spill_queue.put(commit_task)
+    spill_queue.put(EventTask(events[4]))
+    spill_queue.put(EventTask(events[5]))
+    spill_queue.flush()
+
+    assert spill_queue.qsize() == 5
+    assert spill_queue.spilled_events == 4
+    assert spill_queue.spill_size == sum(
+        len(event_to_json(event)) + 1 for event in events[2:]
+    )
+    assert len(os.listdir(spill_dir)) == 2
+
+    tasks = [spill_queue.get_nowait() for _ in range(5)]
+    assert spill_queue.empty()
+    assert [task.event for task in tasks[:2]] == events[:2]
+    assert isinstance(tasks[2], ReplaySpilledEventsTask)
+    assert tasks[3] is commit_task
+    assert isinstance(tasks[4], ReplaySpilledEventsTask)
+
+    first_segment = tasks[2].segment
+    spill_queue.close_segment(first_segment)
+    assert [event.data["new_state"].state for event in first_segment.read()] == [
+        "2",
+        "3",
+    ]
+    spill_queue.finish_replay(first_segment, 2, 0.5)
+    assert spill_queue.spilled_events == 2
+    assert spill_queue.replay_rate == 4
+    assert not os.path.exists(first_segment.path)
+
+    # The last segment is still open for appending until it is replayed
+    spill_queue.put(EventTask(_state_changed_event("sensor.one", "6")))
+    last_segment = tasks[4].segment
+    spill_queue.close_segment(last_segment)
+    assert [event.data["new_state"].state for event in last_segment.read()] == [
+        "4",
+        "5",
+        "6",
+    ]
+    assert spill_queue.qsize() == 0
+
+    # Once the queue drains events are kept in memory again
+    spill_queue.finish_replay(last_segment, 3, 1)
+    spill_queue.put(EventTask(events[0]))
+    assert spill_queue.get_nowait().event is events[0]
+    assert spill_queue.spilled_events == 0
+    assert spill_queue.spill_size == 0
+    spill_queue.shutdown()
+
+
+def test_leftover_segments(tmp_path: Path) -> None:
+    """Test segments left behind by a shutdown are found on the next start."""
+    spill_dir = str(tmp_path / "spill")
+    spill_queue = SpillingQueue(spill_dir, 0)
+    spill_queue.put(EventTask(_state_changed_event("sensor.one", "on")))
+    spill_queue.put(EventTask(_state_changed_event("sensor.one", "off")))
+    spill_queue.shutdown()
+
+    # Segments of the running queue are not leftovers
+    assert spill_queue.leftover_segments() == []
+
+    next_queue = SpillingQueue(spill_dir, 0)
+    segments = next_queue.leftover_segments()
+    assert len(segments) == 1
+    assert next_queue.spill_size == spill_queue.spill_size
+    assert [event.data["new_state"].state for event in segments[0].read()] == [
+        "on",
+        "off",
+    ]
+    assert next_queue.leftover_segments() == []
+
+    assert SpillingQueue(str(tmp_path / "missing"), 0).leftover_segments() == []
+
+
+def test_leftover_segment_resumes_after_committed_events(tmp_path: Path) -> None:
+    """Test a segment replayed in part is read back after the committed events."""
+    spill_dir = str(tmp_path / "spill")
+    spill_queue = SpillingQueue(spill_dir, 0)
+    for state in ("one", "two", "three"):
+        spill_queue.put(EventTask(_state_changed_event("sensor.one", state)))
+    spill_queue.shutdown()
+
+    segment = SpillingQueue(spill_dir, 0).leftover_segments()[0]
+    assert segment.offset == 0
+    events = segment.read()
+    next(events)
+    assert segment.read_lines == 1
+    segment.save_offset(segment.read_lines)
+
+    segment = SpillingQueue(spill_dir, 0).leftover_segments()[0]
+    assert segment.offset == 1
+    assert [event.data["new_state"].state for event in segment.read()] == [
+        "two",
+        "three",
+    ]
+    assert segment.read_lines == 3
+
+    segment.remove()
+    assert os.listdir(spill_dir) == []
+
+
+def test_spill_does_no_io_in_put(tmp_path: Path) -> None:
+    """Test put only queues events and the spill writer writes them."""
+    spill_dir = str(tmp_path / "spill")
+    spill_queue = SpillingQueue(spill_dir, 0)
+
+    with patch(
+        "homeassistant.components.recorder.spill.ThreadPoolExecutor"
+    ) as mock_executor:
+        spill_queue.put(EventTask(_state_changed_event("sensor.one", "on")))
+        spill_queue.put(EventTask(_state_changed_event("sensor.one", "off")))
+
+    assert not os.path.exists(spill_dir)
+    assert spill_queue.spilled_events == 2
+    assert spill_queue.spill_size == 0
+    # The writer is only scheduled once until it drained the segments
+    assert mock_executor.return_value.submit.call_count == 1
+    mock_executor.return_value.submit.call_args[0][0]()
+
+    segment = spill_queue.get_nowait().segment
+    assert spill_queue.spill_size == segment.size > 0
+    spill_queue.close()
+    mock_executor.return_value.submit.call_args[0][0]()
+    spill_queue.close_segment(segment)
+    assert [event.data["new_state"].state for event in segment.read()] == [
+        "on",
+        "off",
+    ]
+
+
+def test_spill_keeps_unwritable_events_in_memory(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test events that cannot be written are kept in memory in order."""
+    spill_queue = SpillingQueue(str(tmp_path / "spill"), 0)
+    unserializable = Event("test_event", {"bad": object()})
+
+    spill_queue.put(EventTask(_state_changed_event("sensor.one", "on")))
+    spill_queue.put(EventTask(unserializable))
+    spill_queue.put(EventTask(_state_changed_event("sensor.one", "off")))
+    segment = spill_queue.get_nowait().segment
+    spill_queue.close_segment(segment)
+
+    assert "Unable to spill event" in caplog.text
+    events = list(segment.read())
+    assert events[0].data["new_state"].state == "on"
+    assert events[1] is unserializable
+    assert events[2].data["new_state"].state == "off"
+    spill_queue.shutdown()
@@ -6,11 +6,15 @@ from datetime import timedelta
 from unittest.mock import patch
 
 import pytest
-from sqlalchemy import select
+from sqlalchemy import delete, select
 
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder, history, statistics
-from homeassistant.components.recorder.db_schema import StatisticsShortTerm
+from homeassistant.components.recorder.db_schema import (
+    Statistics,
+    StatisticsRollupsRuns,
+    StatisticsShortTerm,
+)
 from homeassistant.components.recorder.models import (
     datetime_to_timestamp_or_none,
     process_timestamp,
@@ -33,6 +37,7 @@ from homeassistant.components.recorder.table_managers.statistics_meta import (
 )
 from homeassistant.components.recorder.util import session_scope
 from homeassistant.components.sensor import UNIT_CONVERTERS
+from homeassistant.const import EVENT_CORE_CONFIG_UPDATE
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.setup import setup_component
@@ -1324,3 +1329,314 @@ def test_cache_key_for_generate_statistics_at_time_stmt() -> None:
     )
     cache_key_3 = stmt3._generate_cache_key()
     assert cache_key_1 != cache_key_3
+
+
+def _assert_statistics_match(
+    stats: dict[str, list[dict]], expected: dict[str, list[dict]]
+) -> None:
+    """Assert statistics match, allowing rounding differences of the mean."""
+    assert stats.keys() == expected.keys()
+    for statistic_id, rows in stats.items():
+        assert len(rows) == len(expected[statistic_id])
+        for row, expected_row in zip(rows, expected[statistic_id]):
+            assert row == {
+                **expected_row,
+                "mean": pytest.approx(expected_row["mean"])
+                if expected_row["mean"] is not None
+                else None,
+            }
+
+
+@pytest.mark.freeze_time("2022-12-01 00:00:00+00:00")
+def test_statistics_rollups(hass_recorder: Callable[..., HomeAssistant]) -> None:
+    """Test day and month statistics are read from the rollups."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    wait_recording_done(hass)
+    wait_recording_done(hass)
+    assert instance.statistics_rollups_time_zone == hass.config.time_zone
+
+    hour = timedelta(hours=1)
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2022-08-20 05:00:00"))
+    hours = [first_hour + idx * hour for idx in range(24 * 70)]
+    mean_metadata = {
+        "has_mean": True,
+        "has_sum": False,
+        "name": "Outdoor temperature",
+        "source": "test",
+        "statistic_id": "test:temperature",
+        "unit_of_measurement": "°C",
+    }
+    sum_metadata = {
+        "has_mean": False,
+        "has_sum": True,
+        "name": "Total imported energy",
+        "source": "test",
+        "statistic_id": "test:total_energy_import",
+        "unit_of_measurement": "kWh",
+    }
+    async_add_external_statistics(
+        hass,
+        mean_metadata,
+        [
+            {
+                "start": start,
+                "mean": idx % 17 + 0.1,
+                "min": idx % 17 - 1.3,
+                "max": idx % 17 + 2.7,
+            }
+            for idx, start in enumerate(hours)
+        ],
+    )
+    async_add_external_statistics(
+        hass,
+        sum_metadata,
+        [
+            {"start": start, "last_reset": None, "state": idx % 5, "sum": idx * 0.5}
+            for idx, start in enumerate(hours)
+        ],
+    )
+    wait_recording_done(hass)
+
+    def _assert_rollups_match_hourly() -> None:
+        """Assert reading from the rollups matches reducing hourly statistics."""
+        ranges = (
+            (first_hour - timedelta(days=30), None),
+            (first_hour + timedelta(days=3, hours=7), hours[-1] - timedelta(days=2)),
+            (
+                dt_util.as_utc(dt_util.parse_datetime("2022-09-01 00:00:00")),
+                dt_util.as_utc(dt_util.parse_datetime("2022-10-01 00:00:00")),
+            ),
+            (first_hour + timedelta(days=45, hours=2), None),
+        )
+        for period in ("day", "month"):
+            for start_time, end_time in ranges:
+                rollups_time_zone = instance.statistics_rollups_time_zone
+                stats = statistics_during_period(
+                    hass, start_time, end_time, None, period
+                )
+                instance.statistics_rollups_time_zone = None
+                expected = statistics_during_period(
+                    hass, start_time, end_time, None, period
+                )
+                instance.statistics_rollups_time_zone = rollups_time_zone
+                assert expected
+                _assert_statistics_match(stats, expected)
+
+    _assert_rollups_match_hourly()
+
+    # Adjusting the sum is applied to the rollups
+    recorder.get_instance(hass).async_adjust_statistics(
+        "test:total_energy_import", hours[500], 100, "kWh"
+    )
+    wait_recording_done(hass)
+    _assert_rollups_match_hourly()
+
+    # Updating imported statistics updates the rollups
+    async_add_external_statistics(
+        hass,
+        mean_metadata,
+        [{"start": hours[700], "mean": 100, "min": -100, "max": 200}],
+    )
+    wait_recording_done(hass)
+    _assert_rollups_match_hourly()
+
+    # The rollups are rebuilt when the time zone changes
+    hass.config.set_time_zone("Asia/Kolkata")
+    hass.bus.fire(EVENT_CORE_CONFIG_UPDATE)
+    hass.block_till_done()
+    assert instance.statistics_rollups_time_zone is None
+    # The rollups are rebuilt one month per task
+    for _ in range(6):
+        wait_recording_done(hass)
+    assert instance.statistics_rollups_time_zone == "Asia/Kolkata"
+    assert statistics.get_statistics_rollups_run_time_zone(instance) == "Asia/Kolkata"
+    _assert_rollups_match_hourly()
+
+    dt_util.set_default_time_zone(ORIG_TZ)
+
+
+def test_statistics_rollups_runs(hass_recorder: Callable[..., HomeAssistant]) -> None:
+    """Test the time zone of the rollups is stored in the database."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    wait_recording_done(hass)
+    wait_recording_done(hass)
+    assert instance.statistics_rollups_time_zone == hass.config.time_zone
+    assert (
+        statistics.get_statistics_rollups_run_time_zone(instance)
+        == hass.config.time_zone
+    )
+
+    # The rollups of a database with a finished rebuild are used
+    with patch.object(
+        statistics,
+        "rebuild_statistics_rollups",
+        wraps=statistics.rebuild_statistics_rollups,
+    ) as rebuild_statistics_rollups:
+        hass.add_job(instance._async_load_statistics_rollups)
+        hass.block_till_done()
+        wait_recording_done(hass)
+    assert rebuild_statistics_rollups.call_count == 0
+    assert instance.statistics_rollups_time_zone == hass.config.time_zone
+
+    # The rollups of a database without a finished rebuild, like one
+    # restored from a backup made during a rebuild, are rebuilt
+    with session_scope(hass=hass) as session:
+        session.execute(delete(StatisticsRollupsRuns))
+    with patch.object(
+        statistics,
+        "rebuild_statistics_rollups",
+        wraps=statistics.rebuild_statistics_rollups,
+    ) as rebuild_statistics_rollups:
+        hass.add_job(instance._async_load_statistics_rollups)
+        hass.block_till_done()
+        wait_recording_done(hass)
+        wait_recording_done(hass)
+    assert rebuild_statistics_rollups.call_count == 1
+    assert instance.statistics_rollups_time_zone == hass.config.time_zone
+    assert (
+        statistics.get_statistics_rollups_run_time_zone(instance)
+        == hass.config.time_zone
+    )
+
+
+@pytest.mark.freeze_time("2022-12-02 00:00:00+00:00")
+def test_statistics_rollups_fold_compiled_hours(
+    hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test compiled hours are folded into the rollups."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    wait_recording_done(hass)
+    wait_recording_done(hass)
+    assert instance.statistics_rollups_time_zone == hass.config.time_zone
+
+    # The hours cross the end of a day and a month
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2022-11-30 02:00:00"))
+    hours = [first_hour + timedelta(hours=idx) for idx in range(40)]
+    metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Test",
+        "source": "recorder",
+        "statistic_id": "sensor.test",
+        "unit_of_measurement": "kWh",
+    }
+    # The 5-minute statistics of the last 5 minutes of each hour are
+    # left out so the statistics task compiles the hour
+    instance.async_import_statistics(
+        metadata,
+        [
+            {
+                "start": hour + timedelta(minutes=minute),
+                "mean": (idx * 3 + minute) % 13 + 0.5,
+                "min": (idx * 3 + minute) % 13 - idx % 4 - 0.5,
+                "max": (idx * 3 + minute) % 13 + idx % 6 + 1.5,
+                "last_reset": None,
+                "state": idx % 5,
+                "sum": idx * 2.0 + minute,
+            }
+            for idx, hour in enumerate(hours)
+            for minute in range(0, 55, 5)
+        ],
+        StatisticsShortTerm,
+    )
+    wait_recording_done(hass)
+
+    with patch.object(
+        statistics,
+        "_compile_statistics_rollup",
+        wraps=statistics._compile_statistics_rollup,
+    ) as compile_statistics_rollup:
+        for hour in hours:
+            do_adhoc_statistics(hass, start=hour + timedelta(minutes=55))
+        wait_recording_done(hass)
+    # Only the compiled hours are folded into the rollups
+    assert compile_statistics_rollup.call_count == 0
+
+    start_time = first_hour - timedelta(days=1)
+    for period in ("day", "month"):
+        stats = statistics_during_period(hass, start_time, None, None, period)
+        instance.statistics_rollups_time_zone = None
+        expected = statistics_during_period(hass, start_time, None, None, period)
+        instance.statistics_rollups_time_zone = hass.config.time_zone
+        assert len(expected["sensor.test"]) > 1
+        _assert_statistics_match(stats, expected)
+
+
+@pytest.mark.freeze_time("2022-12-02 00:00:00+00:00")
+def test_statistics_rollups_fold_before_imported_hours(
+    hass_recorder: Callable[..., HomeAssistant]
+) -> None:
+    """Test compiled hours before imported hours of their day are rolled up."""
+    hass = hass_recorder()
+    instance = recorder.get_instance(hass)
+    wait_recording_done(hass)
+    wait_recording_done(hass)
+    assert instance.statistics_rollups_time_zone == hass.config.time_zone
+
+    first_hour = dt_util.as_utc(dt_util.parse_datetime("2022-11-30 02:00:00"))
+    hours = [first_hour + timedelta(hours=idx) for idx in range(4)]
+    metadata = {
+        "has_mean": True,
+        "has_sum": True,
+        "name": "Test",
+        "source": "recorder",
+        "statistic_id": "sensor.test",
+        "unit_of_measurement": "kWh",
+    }
+    instance.async_import_statistics(
+        metadata,
+        [
+            {
+                "start": hour + timedelta(minutes=minute),
+                "mean": idx + minute,
+                "min": idx + minute - 1,
+                "max": idx + minute + 1,
+                "last_reset": None,
+                "state": idx,
+                "sum": idx * 2.0 + minute,
+            }
+            for idx, hour in enumerate(hours)
+            for minute in range(0, 55, 5)
+        ],
+        StatisticsShortTerm,
+    )
+    # A later hour of the same day is imported before the hours are compiled
+    instance.async_import_statistics(
+        metadata,
+        [
+            {
+                "start": first_hour + timedelta(hours=4),
+                "mean": 100,
+                "min": 90,
+                "max": 110,
+                "last_reset": None,
+                "state": 100,
+                "sum": 1000,
+            }
+        ],
+        Statistics,
+    )
+    wait_recording_done(hass)
+
+    with patch.object(
+        statistics,
+        "_compile_statistics_rollup",
+        wraps=statistics._compile_statistics_rollup,
+    ) as compile_statistics_rollup:
+        for hour in hours:
+            do_adhoc_statistics(hass, start=hour + timedelta(minutes=55))
+        wait_recording_done(hass)
+    # The day and month are rolled up again for each compiled hour
+    assert compile_statistics_rollup.call_count == 8
+
+    start_time = first_hour - timedelta(days=1)
+    for period in ("day", "month"):
+        stats = statistics_during_period(hass, start_time, None, None, period)
+        instance.statistics_rollups_time_zone = None
+        expected = statistics_during_period(hass, start_time, None, None, period)
+        instance.statistics_rollups_time_zone = hass.config.time_zone
+        assert expected["sensor.test"][-1]["sum"] == 1000
+        _assert_statistics_match(stats, expected)
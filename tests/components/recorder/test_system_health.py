@@ -32,6 +32,8 @@ async def test_recorder_system_health(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "backlog": 0,
+        "spill_size": "0.00 MiB",
     }
 
 
@@ -58,6 +60,8 @@ async def test_recorder_system_health_alternate_dbms(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "backlog": 0,
+        "spill_size": "0.00 MiB",
     }
 
 
@@ -89,6 +93,8 @@ async def test_recorder_system_health_db_url_missing_host(
         "estimated_db_size": "1.00 MiB",
         "database_engine": dialect_name.value,
         "database_version": ANY,
+        "backlog": 0,
+        "spill_size": "0.00 MiB",
     }
 
 
@@ -115,4 +121,6 @@ async def test_recorder_system_health_crashed_recorder_runs_table(
         "estimated_db_size": ANY,
         "database_engine": SupportedDialect.SQLITE.value,
         "database_version": ANY,
+        "backlog": 0,
+        "spill_size": "0.00 MiB",
     }
@@ -12,6 +12,7 @@ import pytest
 from homeassistant.components import recorder
 from homeassistant.components.recorder import Recorder
 from homeassistant.components.recorder.db_schema import Statistics, StatisticsShortTerm
+from homeassistant.components.recorder.purge import PurgeProgress
 from homeassistant.components.recorder.statistics import (
     async_add_external_statistics,
     get_last_statistics,
@@ -2143,6 +2144,44 @@ async def test_recorder_info(
     }
 
 
+async def test_recorder_purge_progress(
+    recorder_mock: Recorder, hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test getting the progress of a purge."""
+    client = await hass_ws_client()
+    await async_wait_recording_done(hass)
+
+    await client.send_json({"id": 1, "type": "recorder/purge_progress"})
+    response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] is None
+
+    purge_before = dt_util.parse_datetime("2023-04-10 00:00:00+00:00")
+    recorder_mock.purge_progress = PurgeProgress(
+        purge_before,
+        False,
+        False,
+        started=dt_util.parse_datetime("2023-04-20 12:00:00+00:00").timestamp(),
+        oldest_ts=dt_util.parse_datetime("2023-04-01 00:00:00+00:00").timestamp(),
+        watermark_ts=dt_util.parse_datetime("2023-04-04 00:00:00+00:00").timestamp(),
+        slices=3,
+    )
+    with freeze_time("2023-04-20 12:10:00+00:00"):
+        await client.send_json({"id": 2, "type": "recorder/purge_progress"})
+        response = await client.receive_json()
+    assert response["success"]
+    assert response["result"] == {
+        "purge_before": "2023-04-10T00:00:00+00:00",
+        "started": "2023-04-20T12:00:00+00:00",
+        "watermark": "2023-04-04T00:00:00+00:00",
+        "progress": 0.3333,
+        "estimated_completion": "2023-04-20T12:30:00+00:00",
+        "slices": 3,
+        "states_batch_size": 20,
+        "events_batch_size": 15,
+    }
+
+
 async def test_recorder_info_no_recorder(
     hass: HomeAssistant, hass_ws_client: WebSocketGenerator
 ) -> None:
@@ -12,6 +12,7 @@ from homeassistant.components.sensor import (
     DEVICE_CLASS_STATE_CLASSES,
     DEVICE_CLASS_UNITS,
     SensorDeviceClass,
+    SensorEntity,
     SensorStateClass,
     async_update_suggested_units,
 )
@@ -30,6 +31,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, State
 from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.restore_state import STORAGE_KEY as RESTORE_STATE_KEY
 from homeassistant.setup import async_setup_component
 from homeassistant.util import dt as dt_util
@@ -2256,3 +2258,181 @@ async def test_unit_conversion_update(
     state = hass.states.get(entity3.entity_id)
     assert state.state == suggested_state
     assert state.attributes[ATTR_UNIT_OF_MEASUREMENT] == suggested_unit
+
+
+async def test_cached_static_attributes(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test sensors that opt in cache their static attributes until invalidated."""
+
+    class StaticSensor(SensorEntity):
+        """Sensor assembling its static attributes from _attr_ values."""
+
+        _attr_name = "Power"
+        _attr_icon = "mdi:flash"
+        _attr_native_unit_of_measurement = "W"
+        _attr_should_poll = False
+        _cache_static_attributes = True
+
+    class DynamicIconSensor(StaticSensor):
+        """Sensor with an icon depending on its value."""
+
+        @property
+        def icon(self) -> str:
+            """Return the icon."""
+            return "mdi:flash" if self.native_value else "mdi:flash-off"
+
+    assert not SensorEntity._cache_static_attributes
+    assert StaticSensor._cache_static_attributes
+    assert not DynamicIconSensor._cache_static_attributes
+
+    platform = getattr(hass.components, "test.sensor")
+    platform.init(empty=True)
+    platform.ENTITIES["0"] = static_sensor = StaticSensor()
+    platform.ENTITIES["1"] = dynamic_sensor = DynamicIconSensor()
+    static_sensor.entity_id = "sensor.static"
+    dynamic_sensor.entity_id = "sensor.dynamic"
+    assert await async_setup_component(hass, "sensor", {"sensor": {"platform": "test"}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.static")
+    assert state.attributes == {
+        "unit_of_measurement": "W",
+        "icon": "mdi:flash",
+        "friendly_name": "Power",
+    }
+
+    # A value update passes the attributes of the last write again
+    static_sensor._attr_native_value = 5
+    static_sensor.async_write_ha_state()
+    new_state = hass.states.get("sensor.static")
+    assert new_state.state == "5"
+    assert new_state.attributes is state.attributes
+
+    # A static attribute is only assembled again once it is invalidated
+    static_sensor._attr_icon = "mdi:flash-off"
+    static_sensor._attr_native_unit_of_measurement = "kW"
+    static_sensor.async_write_ha_state()
+    assert hass.states.get("sensor.static").attributes is state.attributes
+    static_sensor.async_invalidate_static_attributes()
+    static_sensor.async_write_ha_state()
+    assert hass.states.get("sensor.static").attributes == {
+        "unit_of_measurement": "kW",
+        "icon": "mdi:flash-off",
+        "friendly_name": "Power",
+    }
+
+    assert hass.states.get("sensor.dynamic").attributes["icon"] == "mdi:flash-off"
+    dynamic_sensor._attr_native_value = 5
+    dynamic_sensor.async_write_ha_state()
+    assert hass.states.get("sensor.dynamic").attributes["icon"] == "mdi:flash"
+
+
+async def test_static_attributes_changed_in_place(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test static attributes changed in place are written."""
+
+    class EnumSensor(SensorEntity):
+        """Sensor with options that change in place."""
+
+        _attr_device_class = SensorDeviceClass.ENUM
+        _attr_should_poll = False
+
+        def __init__(self) -> None:
+            """Initialize the sensor."""
+            self._attr_options = ["low", "high"]
+
+    class CachedEnumSensor(EnumSensor):
+        """Sensor caching its static attributes."""
+
+        _cache_static_attributes = True
+
+    platform = getattr(hass.components, "test.sensor")
+    platform.init(empty=True)
+    platform.ENTITIES["0"] = sensor = EnumSensor()
+    platform.ENTITIES["1"] = cached_sensor = CachedEnumSensor()
+    sensor.entity_id = "sensor.enum"
+    cached_sensor.entity_id = "sensor.cached_enum"
+    assert await async_setup_component(hass, "sensor", {"sensor": {"platform": "test"}})
+    await hass.async_block_till_done()
+
+    # Sensors do not cache their static attributes unless they opt in
+    sensor._attr_options.append("medium")
+    sensor.async_write_ha_state()
+    assert hass.states.get("sensor.enum").attributes["options"] == [
+        "low",
+        "high",
+        "medium",
+    ]
+
+    cached_sensor._attr_options.append("medium")
+    cached_sensor.async_invalidate_static_attributes()
+    cached_sensor.async_write_ha_state()
+    assert hass.states.get("sensor.cached_enum").attributes["options"] == [
+        "low",
+        "high",
+        "medium",
+    ]
+
+
+async def test_cached_static_attributes_base_after_sensor_entity(
+    hass: HomeAssistant, enable_custom_integrations: None
+) -> None:
+    """Test a base class following a caching sensor can turn off the cache."""
+
+    class DynamicIconBase(Entity):
+        """Entity with an icon depending on its value."""
+
+        _attr_assumed_state = True
+        value = False
+
+        @property
+        def icon(self) -> str:
+            """Return the icon."""
+            return "mdi:flash" if self.value else "mdi:flash-off"
+
+    class DefaultIconBase(Entity):
+        """Entity with a default icon."""
+
+        _attr_icon = "mdi:flash"
+
+    class CachedSensor(SensorEntity):
+        """Sensor caching its static attributes."""
+
+        _cache_static_attributes = True
+
+    class DynamicIconSensor(CachedSensor, DynamicIconBase):
+        """Sensor with the icon of a base class following the caching sensor."""
+
+        _attr_should_poll = False
+
+    class DefaultIconSensor(CachedSensor, DefaultIconBase):
+        """Sensor with the default icon of a base class following it."""
+
+        _attr_should_poll = False
+
+    assert not DynamicIconSensor._cache_static_attributes
+    assert DefaultIconSensor._cache_static_attributes
+
+    platform = getattr(hass.components, "test.sensor")
+    platform.init(empty=True)
+    platform.ENTITIES["0"] = dynamic_sensor = DynamicIconSensor()
+    platform.ENTITIES["1"] = default_sensor = DefaultIconSensor()
+    dynamic_sensor.entity_id = "sensor.dynamic"
+    default_sensor.entity_id = "sensor.default"
+    assert await async_setup_component(hass, "sensor", {"sensor": {"platform": "test"}})
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.dynamic")
+    assert state.attributes["icon"] == "mdi:flash-off"
+    assert state.attributes["assumed_state"] is True
+    dynamic_sensor.value = True
+    dynamic_sensor.async_write_ha_state()
+    assert hass.states.get("sensor.dynamic").attributes["icon"] == "mdi:flash"
+
+    assert hass.states.get("sensor.default").attributes["icon"] == "mdi:flash"
+    default_sensor._attr_icon = "mdi:flash-off"
+    default_sensor.async_invalidate_static_attributes()
+    default_sensor.async_write_ha_state()
+    assert hass.states.get("sensor.default").attributes["icon"] == "mdi:flash-off"
@@ -4,9 +4,11 @@ from collections.abc import Callable
 # pylint: disable=invalid-name
 from datetime import datetime, timedelta
 import math
+import random
 from statistics import mean
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from homeassistant import loader
@@ -32,7 +34,11 @@ from homeassistant.components.recorder.statistics import (
     list_statistic_ids,
 )
 from homeassistant.components.recorder.util import get_instance, session_scope
-from homeassistant.components.sensor import ATTR_OPTIONS, SensorDeviceClass
+from homeassistant.components.sensor import (
+    ATTR_OPTIONS,
+    SensorDeviceClass,
+    recorder as sensor_recorder,
+)
 from homeassistant.const import ATTR_FRIENDLY_NAME, STATE_UNAVAILABLE
 from homeassistant.core import HomeAssistant, State
 from homeassistant.setup import async_setup_component, setup_component
@@ -5163,3 +5169,151 @@ async def test_exclude_attributes(
     assert len(states) == 1
     assert ATTR_OPTIONS not in states[0].attributes
     assert ATTR_FRIENDLY_NAME in states[0].attributes
+
+
+def _random_sensor_states(
+    seed: int, count: int, state_class: str, start: datetime
+) -> list[tuple[float, State]]:
+    """Return random float states of a sensor, the first before start."""
+    rng = random.Random(seed)
+    value = rng.uniform(-10, 100)
+    last_reset = (start - timedelta(days=1)).isoformat()
+    last_updated = start - timedelta(seconds=rng.uniform(0, 60))
+    fstates: list[tuple[float, State]] = []
+    for _ in range(count):
+        if state_class == "measurement":
+            value = round(rng.uniform(-10, 100), 3)
+        elif (kind := rng.random()) < 0.1:
+            # Reset
+            value = round(rng.uniform(0, 1), 3)
+            last_reset = last_updated.isoformat()
+        elif kind < 0.2:
+            # Small dip
+            value = round(value * 0.95, 3)
+        elif kind < 0.25 and state_class == "total_increasing":
+            value = round(-rng.uniform(0, 10), 3)
+        else:
+            value = round(abs(value) + rng.uniform(0, 10), 3)
+        attributes = {"state_class": state_class}
+        if state_class == "total" and rng.random() < 0.9:
+            attributes["last_reset"] = last_reset
+        fstates.append(
+            (
+                value,
+                State(
+                    "sensor.test",
+                    str(value),
+                    attributes,
+                    last_updated=last_updated,
+                ),
+            )
+        )
+        last_updated += timedelta(microseconds=rng.randint(1, 300_000_000 // count))
+    return fstates
+
+
+@pytest.mark.parametrize(
+    "count",
+    [
+        1,
+        2,
+        sensor_recorder.VECTORIZE_MIN_STATES - 1,
+        sensor_recorder.VECTORIZE_MIN_STATES,
+        sensor_recorder.VECTORIZE_MIN_STATES + 1,
+        500,
+    ],
+)
+@pytest.mark.parametrize("seed", range(5))
+async def test_vectorized_statistics_identical(
+    hass: HomeAssistant, count: int, seed: int
+) -> None:
+    """Test statistics compiled with NumPy are identical to the plain ones."""
+    start = datetime(2023, 1, 1, 0, 5, tzinfo=dt_util.UTC)
+    end = start + timedelta(minutes=5)
+    warn_keys = (
+        sensor_recorder.SEEN_DIP,
+        sensor_recorder.WARN_DIP,
+        sensor_recorder.WARN_NEGATIVE,
+    )
+
+    fstates = _random_sensor_states(seed, count, "measurement", start)
+    values = np.array([fstate for fstate, _ in fstates])
+    assert sensor_recorder._time_weighted_average_vectorized(
+        values, fstates, start, end
+    ) == sensor_recorder._time_weighted_average(fstates, start, end)
+
+    for state_class in ("total", "total_increasing"):
+        fstates = _random_sensor_states(seed, count, state_class, start)
+        values = np.array([fstate for fstate, _ in fstates])
+        last_stats = [
+            None,
+            {
+                "last_reset": (start - timedelta(days=2)).timestamp(),
+                "state": 50.0,
+                "sum": 100.0,
+            },
+        ]
+        for last_stat in last_stats:
+            for key in warn_keys:
+                hass.data.pop(key, None)
+            expected = sensor_recorder._compile_sum(
+                hass, "sensor.test", state_class, fstates, last_stat
+            )
+            expected_warnings = [hass.data.pop(key, None) for key in warn_keys]
+            assert (
+                sensor_recorder._compile_sum_vectorized(
+                    hass, "sensor.test", state_class, fstates, values, last_stat
+                )
+                == expected
+            )
+            assert [hass.data.pop(key, None) for key in warn_keys] == expected_warnings
+
+
+def test_vectorized_statistics_boundary(
+    hass_recorder: Callable[..., HomeAssistant],
+) -> None:
+    """Test sensors are compiled with NumPy from VECTORIZE_MIN_STATES states."""
+    zero = dt_util.utcnow()
+    hass = hass_recorder()
+    setup_component(hass, "sensor", {})
+    wait_recording_done(hass)  # Wait for the sensor recorder platform to be added
+    counts = {
+        "below": sensor_recorder.VECTORIZE_MIN_STATES - 1,
+        "boundary": sensor_recorder.VECTORIZE_MIN_STATES,
+    }
+    for name, count in counts.items():
+        for state_class in ("measurement", "total_increasing"):
+            for idx in range(count):
+                with patch(
+                    "homeassistant.components.recorder.core.dt_util.utcnow",
+                    return_value=zero + timedelta(seconds=idx + 1),
+                ):
+                    hass.states.set(
+                        f"sensor.{state_class}_{name}",
+                        str((idx * 7) % 11 + idx / 3),
+                        {"state_class": state_class, "unit_of_measurement": "kWh"},
+                    )
+    wait_recording_done(hass)
+    end = zero + timedelta(minutes=5)
+
+    with patch.object(sensor_recorder, "NUMPY_IMPORTED", False):
+        expected = sensor_recorder.compile_statistics(hass, zero, end)
+    with patch.object(
+        sensor_recorder,
+        "_time_weighted_average_vectorized",
+        wraps=sensor_recorder._time_weighted_average_vectorized,
+    ) as average_mock, patch.object(
+        sensor_recorder,
+        "_compile_sum_vectorized",
+        wraps=sensor_recorder._compile_sum_vectorized,
+    ) as sum_mock:
+        compiled = sensor_recorder.compile_statistics(hass, zero, end)
+
+    assert compiled.platform_stats == expected.platform_stats
+    assert len(compiled.platform_stats) == 4
+    assert [call.args[1][0][1].entity_id for call in average_mock.mock_calls] == [
+        "sensor.measurement_boundary"
+    ]
+    assert [call.args[1] for call in sum_mock.mock_calls] == [
+        "sensor.total_increasing_boundary"
+    ]
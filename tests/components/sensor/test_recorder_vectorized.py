@@ -0,0 +1,279 @@
+"""Test the vectorized statistics compilation of the sensor recorder platform.
+
+The vectorized compilation must give results identical to the bit
+to the compilation without NumPy, which is used as the reference.
+"""
+from datetime import timedelta
+import random
+from typing import Any
+from unittest.mock import Mock, patch
+
+import numpy as np
+import pytest
+
+from homeassistant.components.recorder import Recorder
+from homeassistant.components.recorder.models import LazyState
+from homeassistant.components.recorder.statistics import StatisticsRow
+from homeassistant.components.sensor import (
+    SensorStateClass,
+    recorder as sensor_recorder,
+)
+from homeassistant.components.sensor.recorder import (
+    SEEN_DIP,
+    WARN_DIP,
+    WARN_NEGATIVE,
+    _compile_sum,
+    _compile_sum_vectorized,
+    _time_weighted_average,
+    _time_weighted_average_vectorized,
+)
+from homeassistant.core import HomeAssistant, State
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from tests.components.recorder.common import async_wait_recording_done
+
+START = dt_util.parse_datetime("2023-04-01 12:00:00+00:00")
+END = START + timedelta(minutes=5)
+
+
+def _float_states(
+    values: list[float], rng: random.Random, attributes: list[dict[str, Any]] | None
+) -> list[tuple[float, State]]:
+    """Return float states updated at random times in or before the period."""
+    offsets = sorted(
+        rng.choice((0, rng.randint(-100_000_000, 300_000_000)))
+        for _ in range(len(values))
+    )
+    return [
+        (
+            value,
+            State(
+                "sensor.test",
+                str(value),
+                attributes[idx] if attributes else None,
+                last_updated=START + timedelta(microseconds=offset),
+            ),
+        )
+        for idx, (value, offset) in enumerate(zip(values, offsets))
+    ]
+
+
+def _values(fstates: list[tuple[float, State]]) -> np.ndarray:
+    """Return the states as an array."""
+    return np.array([fstate for fstate, _ in fstates], dtype=np.float64)
+
+
+def _assert_identical(result: Any, expected: Any) -> None:
+    """Assert results are identical, comparing floats to the bit."""
+    if isinstance(expected, tuple):
+        assert len(result) == len(expected)
+        for item, expected_item in zip(result, expected):
+            _assert_identical(item, expected_item)
+    elif isinstance(expected, float):
+        assert type(result) is float
+        assert result.hex() == expected.hex()
+    else:
+        assert result == expected
+
+
+@pytest.mark.parametrize("seed", range(25))
+def test_time_weighted_average(seed: int) -> None:
+    """Test the vectorized time weighted average is identical."""
+    rng = random.Random(seed)
+    values = [
+        rng.choice(
+            (
+                rng.uniform(-1e6, 1e6),
+                rng.uniform(-1, 1),
+                rng.randint(0, 100) / 10,
+                0.0,
+                -0.0,
+                5e-324,
+            )
+        )
+        for _ in range(rng.randint(1, 300))
+    ]
+    fstates = _float_states(values, rng, None)
+    _assert_identical(
+        _time_weighted_average_vectorized(_values(fstates), fstates, START, END),
+        _time_weighted_average(fstates, START, END),
+    )
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_time_weighted_average_lazy_states(seed: int) -> None:
+    """Test the vectorized time weighted average of states read from the database.
+
+    The timestamps of the rows are not rounded to whole microseconds.
+    """
+    rng = random.Random(seed)
+    timestamps = sorted(
+        START.timestamp() + rng.choice((0, 0.0000005, 0.0000015, rng.uniform(-1, 300)))
+        for _ in range(rng.randint(1, 300))
+    )
+    fstates = [
+        (
+            rng.uniform(-100, 100),
+            LazyState(
+                Mock(
+                    entity_id="sensor.test",
+                    state="1",
+                    last_updated_ts=timestamp,
+                    last_changed_ts=None,
+                ),
+                {},
+                None,
+            ),
+        )
+        for timestamp in timestamps
+    ]
+    _assert_identical(
+        _time_weighted_average_vectorized(_values(fstates), fstates, START, END),
+        _time_weighted_average(fstates, START, END),
+    )
+
+
+@pytest.mark.parametrize(
+    "last_updated",
+    [START - timedelta(hours=1), START, END - timedelta(microseconds=1), END],
+)
+def test_time_weighted_average_single_state(last_updated) -> None:
+    """Test the vectorized time weighted average of a single state."""
+    fstates = [(-0.0, State("sensor.test", "-0.0", last_updated=last_updated))]
+    _assert_identical(
+        _time_weighted_average_vectorized(_values(fstates), fstates, START, END),
+        _time_weighted_average(fstates, START, END),
+    )
+
+
+def _total_increasing_values(rng: random.Random) -> list[float]:
+    """Return increasing values with resets, dips and negative values."""
+    values = []
+    value = rng.uniform(-5, 1000)
+    for _ in range(rng.randint(1, 200)):
+        value = rng.choice(
+            (
+                value + rng.uniform(0, 10),
+                value + rng.uniform(0, 10),
+                value + rng.uniform(0, 10),
+                value,
+                value * rng.uniform(0.9, 1),
+                rng.uniform(0, 5),
+                -rng.uniform(0, 5),
+            )
+        )
+        values.append(value)
+    return values
+
+
+def _last_reset_attributes(rng: random.Random, count: int) -> list[dict[str, Any]]:
+    """Return attributes where last_reset changes now and then."""
+    last_resets = [
+        None,
+        "2023-04-01T00:00:00+00:00",
+        "2023-04-01T02:00:00+02:00",
+        "2023-04-02T00:00:00+00:00",
+        "not a timestamp",
+        42,
+    ]
+    last_reset = rng.choice(last_resets)
+    attributes = []
+    for _ in range(count):
+        if rng.random() < 0.05:
+            last_reset = rng.choice(last_resets)
+        attributes.append({"last_reset": last_reset} if last_reset != 42 else {})
+    return attributes
+
+
+@pytest.mark.parametrize(
+    "state_class", [SensorStateClass.TOTAL, SensorStateClass.TOTAL_INCREASING]
+)
+@pytest.mark.parametrize("seed", range(25))
+async def test_compile_sum(
+    hass: HomeAssistant, state_class: SensorStateClass, seed: int
+) -> None:
+    """Test the vectorized sum is identical."""
+    rng = random.Random(seed)
+    values = _total_increasing_values(rng)
+    fstates = _float_states(values, rng, _last_reset_attributes(rng, len(values)))
+    last_stat: StatisticsRow | None = rng.choice(
+        (
+            None,
+            {"start": 0, "last_reset": None, "state": values[0] * 1.5, "sum": 10.5},
+            {"start": 0, "last_reset": 1680307200.0, "state": 3.3, "sum": None},
+            {"start": 0, "last_reset": 1680307200.0, "state": None, "sum": None},
+        )
+    )
+
+    def _warnings() -> dict[str, set[str]]:
+        """Return and forget the warnings given so far."""
+        return {
+            key: hass.data.pop(key, set())
+            for key in (SEEN_DIP, WARN_DIP, WARN_NEGATIVE)
+        }
+
+    expected = _compile_sum(hass, "sensor.test", state_class, fstates, last_stat)
+    expected_warnings = _warnings()
+    result = _compile_sum_vectorized(
+        hass, "sensor.test", state_class, fstates, _values(fstates), last_stat
+    )
+    _assert_identical(result, expected)
+    assert _warnings() == expected_warnings
+
+
+@pytest.mark.parametrize(
+    ("state_class", "unit", "vectorized_stats"),
+    [
+        ("measurement", "°C", {"mean", "min", "max"}),
+        ("total", "kWh", {"sum", "state", "last_reset"}),
+        ("total_increasing", "kWh", {"sum", "state"}),
+    ],
+)
+async def test_compile_statistics(
+    recorder_mock: Recorder,
+    hass: HomeAssistant,
+    state_class: str,
+    unit: str,
+    vectorized_stats: set[str],
+) -> None:
+    """Test statistics compiled with and without NumPy are identical."""
+    await async_setup_component(hass, "sensor", {})
+    rng = random.Random(state_class)
+    attributes = {"state_class": state_class, "unit_of_measurement": unit}
+    values = _total_increasing_values(rng)
+    last_resets = _last_reset_attributes(rng, len(values))
+
+    def _compile() -> dict[str, Any]:
+        """Compile the statistics of the recorded states."""
+        return sensor_recorder.compile_statistics(hass, START, END).platform_stats
+
+    with patch("homeassistant.util.dt.utcnow", return_value=START):
+        hass.states.async_set("sensor.test", "0", attributes)
+    await async_wait_recording_done(hass)
+    for (value, state), last_reset in zip(
+        _float_states(values, rng, None), last_resets
+    ):
+        with patch(
+            "homeassistant.util.dt.utcnow",
+            return_value=max(state.last_updated, START),
+        ):
+            hass.states.async_set(
+                "sensor.test", str(value), {**attributes, **last_reset}
+            )
+    await async_wait_recording_done(hass)
+
+    with patch.object(sensor_recorder, "VECTORIZE_MIN_STATES", 1):
+        vectorized = await recorder_mock.async_add_executor_job(_compile)
+    # Without NumPy installed the statistics are compiled in plain Python
+    with patch.object(sensor_recorder, "VECTORIZE_MIN_STATES", 1), patch.object(
+        sensor_recorder, "NUMPY_IMPORTED", False
+    ):
+        expected = await recorder_mock.async_add_executor_job(_compile)
+
+    assert len(expected) == 1
+    assert vectorized_stats & expected[0]["stat"].keys()
+    assert vectorized[0]["meta"] == expected[0]["meta"]
+    assert vectorized[0]["stat"].keys() == expected[0]["stat"].keys()
+    for key, value in expected[0]["stat"].items():
+        _assert_identical(vectorized[0]["stat"][key], value)
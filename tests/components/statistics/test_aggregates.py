@@ -0,0 +1,90 @@
+"""Test the incrementally updated aggregates of the statistics sensor."""
+from collections import deque
+from datetime import datetime, timedelta
+import random
+import statistics
+
+import pytest
+
+from homeassistant.components.statistics.aggregates import (
+    PairwiseSum,
+    SampleExtreme,
+    SampleMoments,
+    SampleOrderStatistics,
+    SampleSum,
+)
+import homeassistant.util.dt as dt_util
+
+
+def _difference(
+    previous: float, previous_age: datetime, value: float, age: datetime
+) -> float:
+    """Return the difference of two samples."""
+    return value - previous
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_sliding_aggregates(seed: int) -> None:
+    """Test the aggregates match a recomputation over a sliding buffer."""
+    rng = random.Random(seed)
+    choices = [rng.uniform(-100, 100) for _ in range(10)]
+    states: deque[float] = deque()
+    ages: deque[datetime] = deque()
+    now = dt_util.utcnow()
+    sample_sum = SampleSum()
+    moments = SampleMoments()
+    order_statistics = SampleOrderStatistics()
+    maximum = SampleExtreme(maximum=True)
+    minimum = SampleExtreme(maximum=False)
+    differences = PairwiseSum(_difference)
+    aggregates = (sample_sum, moments, order_statistics, maximum, minimum, differences)
+
+    for _ in range(1000):
+        # Add more samples than are removed until the buffer holds 50
+        if states and (len(states) > 50 or rng.random() < 0.3):
+            for aggregate in aggregates:
+                aggregate.remove(states, ages)
+            states.popleft()
+            ages.popleft()
+        else:
+            # Repeated samples test that equal samples are handled
+            states.append(rng.choice(choices + [rng.uniform(-1e3, 1e3)]))
+            now += timedelta(seconds=rng.randint(1, 60))
+            ages.append(now)
+            for aggregate in aggregates:
+                aggregate.add(states, ages)
+        if not states:
+            continue
+
+        assert sample_sum.sum.value == pytest.approx(sum(states))
+        assert maximum.value == max(states)
+        assert maximum.age == ages[states.index(max(states))]
+        assert minimum.value == min(states)
+        assert minimum.age == ages[states.index(min(states))]
+        assert order_statistics.median() == statistics.median(states)
+        assert differences.sum.value == pytest.approx(states[-1] - states[0], abs=1e-9)
+        if len(states) < 2:
+            continue
+        assert moments.variance == pytest.approx(statistics.variance(states))
+        assert moments.standard_deviation == pytest.approx(statistics.stdev(states))
+        quantiles = statistics.quantiles(states, n=100, method="exclusive")
+        for percentile in (1, 25, rng.randint(1, 99), 99):
+            assert order_statistics.quantile(percentile, 100) == pytest.approx(
+                quantiles[percentile - 1]
+            )
+
+
+def test_sum_of_booleans_is_exact() -> None:
+    """Test booleans are counted as integers."""
+    states: deque[bool] = deque()
+    ages: deque[datetime] = deque()
+    sample_sum = SampleSum()
+    for state in (True, False, True, True):
+        states.append(state)
+        ages.append(dt_util.utcnow())
+        sample_sum.add(states, ages)
+    sample_sum.remove(states, ages)
+    states.popleft()
+    ages.popleft()
+    assert sample_sum.sum.value == 2
+    assert isinstance(sample_sum.sum.value, int)
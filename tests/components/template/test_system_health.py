@@ -0,0 +1,28 @@
+"""Test template system health."""
+from homeassistant.components.template.const import DOMAIN
+from homeassistant.core import HomeAssistant
+from homeassistant.setup import async_setup_component
+
+from tests.common import get_system_health_info
+
+
+async def test_system_health(hass: HomeAssistant) -> None:
+    """Test identical templates of the entities are rendered once."""
+    template_sensor = {
+        "platform": "template",
+        "sensors": {
+            name: {"value_template": "{{ states('sensor.source') | int(0) * 2 }}"}
+            for name in ("first", "second", "third")
+        },
+    }
+    assert await async_setup_component(hass, "sensor", {"sensor": [template_sensor]})
+    assert await async_setup_component(hass, "system_health", {})
+    await hass.async_block_till_done()
+
+    hass.states.async_set("sensor.source", "2")
+    await hass.async_block_till_done()
+    for name in ("first", "second", "third"):
+        assert hass.states.get(f"sensor.{name}").state == "4"
+
+    info = await get_system_health_info(hass, DOMAIN)
+    assert info == {"state_change_renders": 1, "deduplicated_renders": 2}
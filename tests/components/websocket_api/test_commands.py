@@ -21,9 +21,16 @@ from homeassistant.helpers import entity
 from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.loader import async_get_integration
 from homeassistant.setup import DATA_SETUP_TIME, async_setup_component
+from homeassistant.util import dt as dt_util
 from homeassistant.util.json import json_loads
 
-from tests.common import MockEntity, MockEntityPlatform, MockUser, async_mock_service
+from tests.common import (
+    MockEntity,
+    MockEntityPlatform,
+    MockUser,
+    async_fire_time_changed,
+    async_mock_service,
+)
 from tests.typing import ClientSessionGenerator, WebSocketGenerator
 
 STATE_KEY_SHORT_NAMES = {
@@ -1768,6 +1775,43 @@ async def test_integration_setup_info(
     ]
 
 
+async def test_entity_platform_poll_durations(
+    hass: HomeAssistant, websocket_client, hass_admin_user: MockUser
+) -> None:
+    """Test getting the poll durations of the entity platforms."""
+    platform = MockEntityPlatform(hass, platform_name="demo")
+    await platform.async_add_entities([MockEntity(should_poll=True)])
+    for seconds in (15, 30, 45):
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + datetime.timedelta(seconds=seconds)
+        )
+        await hass.async_block_till_done()
+
+    await websocket_client.send_json(
+        {"id": 7, "type": "entity_platform/poll_durations"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 7
+    assert msg["type"] == const.TYPE_RESULT
+    assert msg["success"]
+    assert msg["result"] == {
+        "buckets": [0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0],
+        "platforms": {"test_domain.demo": [3, 0, 0, 0, 0, 0, 0, 0]},
+    }
+
+    hass_admin_user.groups = []
+    await websocket_client.send_json(
+        {"id": 8, "type": "entity_platform/poll_durations"}
+    )
+
+    msg = await websocket_client.receive_json()
+    assert msg["id"] == 8
+    assert msg["type"] == const.TYPE_RESULT
+    assert not msg["success"]
+    assert msg["error"]["code"] == const.ERR_UNAUTHORIZED
+
+
 @pytest.mark.parametrize(
     ("key", "config"),
     (
@@ -1900,6 +1944,44 @@ async def test_message_coalescing(
     await hass.async_block_till_done()
 
 
+async def test_connection_stats(
+    hass: HomeAssistant, websocket_client, hass_admin_user: MockUser
+) -> None:
+    """Test getting the stats of the frames written to the connection."""
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+
+    await websocket_client.send_json({"id": 2, "type": "connection/stats"})
+    data = await websocket_client.receive_str()
+    first_stats = json_loads(data)["result"]
+
+    await websocket_client.send_json(
+        [{"id": 3, "type": "ping"}, {"id": 4, "type": "ping"}]
+    )
+    pongs = await websocket_client.receive_str()
+    assert [msg["id"] for msg in json_loads(pongs)] == [3, 4]
+
+    await websocket_client.send_json({"id": 5, "type": "connection/stats"})
+    msg = await websocket_client.receive_json()
+    assert msg["success"]
+    stats = msg["result"]
+    assert stats["frames"] - first_stats["frames"] == 2
+    assert stats["messages"] - first_stats["messages"] == 3
+    assert stats["bytes"] - first_stats["bytes"] == len(data) + len(pongs)
+    assert stats["seconds"] > first_stats["seconds"]
+    assert stats["frames_per_second"] == pytest.approx(
+        stats["frames"] / stats["seconds"]
+    )
+    assert stats["bytes_per_second"] == pytest.approx(stats["bytes"] / stats["seconds"])
+
+
 async def test_message_coalescing_not_supported_by_websocket_client(
     hass: HomeAssistant, websocket_client, hass_admin_user: MockUser
 ) -> None:
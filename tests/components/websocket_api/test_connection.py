@@ -10,6 +10,7 @@ import voluptuous as vol
 
 from homeassistant import exceptions
 from homeassistant.components import websocket_api
+from homeassistant.components.websocket_api.connection import WriteStats
 from homeassistant.components.websocket_api.const import DOMAIN
 from homeassistant.core import HomeAssistant
 
@@ -125,3 +126,14 @@ async def test_binary_handler_registration() -> None:
     # Verify we reuse an unsubscribed prefix
     prefix, unsub = connection.async_register_binary_handler(None)
     assert prefix == 15
+
+
+def test_write_stats_count_bytes() -> None:
+    """Test the write stats count the UTF-8 encoded bytes of the frames."""
+    stats = WriteStats()
+    stats.add_frame('{"id":1}', 1)
+    stats.add_frame('[{"s":"café"},{"s":"☃"}]', 2)
+    result = stats.as_dict()
+    assert result["frames"] == 2
+    assert result["messages"] == 3
+    assert result["bytes"] == 8 + 27
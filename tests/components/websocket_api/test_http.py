@@ -236,3 +236,48 @@ async def test_binary_message(
     assert "Received binary message for non-existing handler 0" in caplog.text
     assert "Received binary message for non-existing handler 3" in caplog.text
     assert "Received binary message for non-existing handler 10" in caplog.text
+
+
+async def test_coalescing_waits_during_bursts(
+    hass: HomeAssistant, hass_ws_client: WebSocketGenerator
+) -> None:
+    """Test messages queued in consecutive loop iterations of a burst share a frame."""
+    orig_handler = http.WebSocketHandler
+    instance: http.WebSocketHandler | None = None
+
+    def instantiate_handler(*args):
+        nonlocal instance
+        instance = orig_handler(*args)
+        return instance
+
+    with patch(
+        "homeassistant.components.websocket_api.http.WebSocketHandler",
+        instantiate_handler,
+    ):
+        websocket_client = await hass_ws_client()
+
+    assert instance is not None
+    await websocket_client.send_json(
+        {
+            "id": 1,
+            "type": "supported_features",
+            "features": {const.FEATURE_COALESCE_MESSAGES: 1},
+        }
+    )
+    assert (await websocket_client.receive_json())["success"]
+
+    # Not in a burst, the message is sent right away
+    instance._send_message({"id": 2})
+    hass.loop.call_soon(instance._send_message, {"id": 3})
+    assert await websocket_client.receive_str() == '{"id":2}'
+    assert await websocket_client.receive_str() == '{"id":3}'
+
+    # Messages queued at once start a burst
+    instance._send_message({"id": 4})
+    instance._send_message({"id": 5})
+    assert await websocket_client.receive_str() == '[{"id":4},{"id":5}]'
+
+    # During the burst the writer waits for the next loop iteration
+    instance._send_message({"id": 6})
+    hass.loop.call_soon(instance._send_message, {"id": 7})
+    assert await websocket_client.receive_str() == '[{"id":6},{"id":7}]'
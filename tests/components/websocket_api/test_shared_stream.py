@@ -0,0 +1,114 @@
+"""Test Websocket API shared stream module."""
+from datetime import timedelta
+import json
+from unittest.mock import Mock
+
+from homeassistant.components.websocket_api.shared_stream import (
+    SharedStream,
+    async_subscribe_shared_stream,
+)
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+
+async def test_shared_stream(hass: HomeAssistant) -> None:
+    """Test identical subscriptions share one stream."""
+    streams: list[SharedStream] = []
+    stop_producer = Mock()
+
+    def _start_producer(stream: SharedStream) -> Mock:
+        streams.append(stream)
+        return stop_producer
+
+    connection = Mock()
+    end_first, end_second, end_other = Mock(), Mock(), Mock()
+    first = async_subscribe_shared_stream(
+        hass, "key", _start_producer, connection, 1, 10, end_first
+    )
+    stream = streams[0]
+    batch_start = dt_util.utcnow()
+    stream.async_event_queued(batch_start)
+    stream.async_event_queued(batch_start + timedelta(seconds=1))
+    second = async_subscribe_shared_stream(
+        hass, "key", _start_producer, connection, 2, 10, end_second
+    )
+    other = async_subscribe_shared_stream(
+        hass, "other", _start_producer, connection, 3, 10, end_other
+    )
+    assert len(streams) == 2
+    assert first.stream is second.stream is stream
+    assert other.stream is streams[1]
+    # A subscriber joining while events are queued gets all of them live
+    # and its historical data ends before the oldest of them
+    assert second.subscribed_time == batch_start
+    assert other.subscribed_time > batch_start
+
+    stream.async_publish('{"new":true}')
+    # Payloads are held until the subscriber is started
+    connection.send_message.assert_not_called()
+
+    first.async_start()
+    assert [
+        json.loads(call.args[0]) for call in connection.send_message.call_args_list
+    ] == [{"id": 1, "type": "event", "event": {"new": True}}]
+    connection.send_message.reset_mock()
+
+    # Queued events that are not sent do not end up in a payload
+    stream.async_event_queued(dt_util.utcnow())
+    stream.async_publish(None)
+    assert stream.batch_start is None
+
+    stream.async_event_queued(dt_util.utcnow())
+    stream.async_publish('{"live":true}')
+    second.async_start()
+    assert [
+        json.loads(call.args[0]) for call in connection.send_message.call_args_list
+    ] == [
+        {"id": 1, "type": "event", "event": {"live": True}},
+        {"id": 2, "type": "event", "event": {"new": True}},
+        {"id": 2, "type": "event", "event": {"live": True}},
+    ]
+
+    first.async_remove()
+    first.async_remove()
+    stop_producer.assert_not_called()
+    second.async_remove()
+    stop_producer.assert_called_once()
+
+    # A new subscription starts a new stream
+    async_subscribe_shared_stream(
+        hass, "key", _start_producer, connection, 4, 10, Mock()
+    )
+    assert len(streams) == 3
+    end_first.assert_not_called()
+    end_second.assert_not_called()
+    end_other.assert_not_called()
+
+
+async def test_shared_stream_end(hass: HomeAssistant) -> None:
+    """Test ending the stream or holding too many payloads ends subscriptions."""
+    streams: list[SharedStream] = []
+
+    def _start_producer(stream: SharedStream) -> Mock:
+        streams.append(stream)
+        return Mock()
+
+    connection = Mock()
+    end_first, end_second = Mock(), Mock()
+    async_subscribe_shared_stream(
+        hass, "key", _start_producer, connection, 1, 2, end_first
+    )
+    second = async_subscribe_shared_stream(
+        hass, "key", _start_producer, connection, 2, 2, end_second
+    )
+    second.async_start()
+    stream = streams[0]
+    for _ in range(3):
+        stream.async_publish("{}")
+    end_first.assert_called_once()
+    end_second.assert_not_called()
+    assert connection.send_message.call_count == 3
+
+    stream.async_end()
+    assert end_first.call_count == 2
+    end_second.assert_called_once()
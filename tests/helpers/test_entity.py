@@ -986,3 +986,103 @@ async def test_repr_using_stringify_state() -> None:
 
     entity = MyEntity(entity_id="test.test", available=False)
     assert str(entity) == "<entity test.test=unavailable>"
+
+
+async def test_cached_static_attributes(
+    hass: HomeAssistant,
+    device_registry: dr.DeviceRegistry,
+    entity_registry: er.EntityRegistry,
+) -> None:
+    """Test the static attributes are cached until they are invalidated."""
+
+    class CachedEntity(MockEntity):
+        """Mock entity caching its static attributes."""
+
+        _cache_static_attributes = True
+
+    ent = CachedEntity(
+        unique_id="qwer",
+        device_info={"identifiers": {("hue", "1234")}, "name": "Device Bla"},
+        has_entity_name=True,
+        name="Power",
+        icon="mdi:flash",
+        capability_attributes={"max": 10},
+        state="1",
+    )
+
+    async def async_setup_entry(hass, config_entry, async_add_entities):
+        """Mock setup entry method."""
+        async_add_entities([ent])
+        return True
+
+    platform = MockPlatform(async_setup_entry=async_setup_entry)
+    config_entry = MockConfigEntry(entry_id="super-mock-id")
+    entity_platform = MockEntityPlatform(
+        hass, platform_name=config_entry.domain, platform=platform
+    )
+    assert await entity_platform.async_setup_entry(config_entry)
+    await hass.async_block_till_done()
+
+    state = hass.states.get(ent.entity_id)
+    assert state.attributes == {
+        "max": 10,
+        "icon": "mdi:flash",
+        "friendly_name": "Device Bla Power",
+    }
+
+    # The attributes of a value update are the attributes of the last write
+    ent._values["state"] = "2"
+    ent._values["icon"] = "mdi:flash-off"
+    ent.async_write_ha_state()
+    new_state = hass.states.get(ent.entity_id)
+    assert new_state.state == "2"
+    assert new_state.attributes is state.attributes
+
+    ent._values["extra_state_attributes"] = {"extra": True}
+    ent.async_write_ha_state()
+    assert hass.states.get(ent.entity_id).attributes == {
+        "max": 10,
+        "extra": True,
+        "icon": "mdi:flash",
+        "friendly_name": "Device Bla Power",
+    }
+
+    ent.async_invalidate_static_attributes()
+    ent.async_write_ha_state()
+    assert hass.states.get(ent.entity_id).attributes["icon"] == "mdi:flash-off"
+
+    # Registry and device updates assemble the static attributes again
+    entity_registry.async_update_entity(ent.entity_id, icon="mdi:bolt")
+    await hass.async_block_till_done()
+    assert hass.states.get(ent.entity_id).attributes["icon"] == "mdi:bolt"
+
+    # Writing the state does not look up the device
+    with patch.object(
+        device_registry, "async_get", wraps=device_registry.async_get
+    ) as device_registry_get:
+        ent.async_write_ha_state()
+    assert device_registry_get.call_count == 0
+
+    device_registry.async_update_device(
+        ent.registry_entry.device_id, name_by_user="Meter"
+    )
+    await hass.async_block_till_done()
+    ent.async_write_ha_state()
+    assert hass.states.get(ent.entity_id).attributes["friendly_name"] == "Meter Power"
+
+    # Updates of a device the entity is moved to are tracked
+    device = device_registry.async_get_or_create(
+        config_entry_id=config_entry.entry_id,
+        identifiers={("hue", "5678")},
+        name="Other device",
+    )
+    entity_registry.async_update_entity(ent.entity_id, device_id=device.id)
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get(ent.entity_id).attributes["friendly_name"]
+        == "Other device Power"
+    )
+    device_registry.async_update_device(device.id, name_by_user="Heater")
+    await hass.async_block_till_done()
+    ent.async_write_ha_state()
+    assert hass.states.get(ent.entity_id).attributes["friendly_name"] == "Heater Power"
@@ -1,9 +1,12 @@
 """Tests for the EntityPlatform helper."""
 import asyncio
 from datetime import timedelta
+from functools import partial
 import logging
 from unittest.mock import ANY, Mock, patch
+import zlib
 
+from freezegun.api import FrozenDateTimeFactory
 import pytest
 
 from homeassistant.const import EVENT_HOMEASSISTANT_STARTED, PERCENTAGE
@@ -32,6 +35,7 @@ from tests.common import (
     MockEntityPlatform,
     MockPlatform,
     async_fire_time_changed,
+    async_fire_time_changed_exact,
     mock_entity_platform,
     mock_registry,
 )
@@ -114,6 +118,197 @@ async def test_polling_updates_entities_with_exception(hass: HomeAssistant) -> N
     assert len(update_err) == 1
 
 
+async def test_polling_spread_across_scan_interval(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test platforms are polled in their own slot of the scan interval."""
+    start = dt_util.parse_datetime("2023-01-01 00:00:00+00:00")
+    freezer.move_to(start)
+    platform_entities: dict[str, list[MockEntity]] = {}
+    slots = {}
+    for platform_name, entity_ids in (
+        ("kitchen", ("test_domain.oven", "test_domain.fridge")),
+        ("garage", ("test_domain.door",)),
+    ):
+        platform = MockEntityPlatform(
+            hass, platform_name=platform_name, scan_interval=timedelta(seconds=30)
+        )
+        entities = platform_entities[platform_name] = []
+        for entity_id in entity_ids:
+            ent = MockEntity(should_poll=True)
+            ent.entity_id = entity_id
+            ent.async_update = Mock()
+            entities.append(ent)
+        slots[platform_name] = start + timedelta(
+            seconds=zlib.crc32(f"test_domain.{platform_name}".encode()) / 2**32 * 30
+        )
+        await platform.async_add_entities(entities)
+
+    order = sorted(platform_entities, key=slots.__getitem__)
+    assert slots[order[1]] - slots[order[0]] > timedelta(seconds=1)
+
+    def _call_counts() -> list[list[int]]:
+        return [
+            [ent.async_update.call_count for ent in platform_entities[platform_name]]
+            for platform_name in order
+        ]
+
+    async_fire_time_changed_exact(hass, slots[order[0]] - timedelta(seconds=1))
+    await hass.async_block_till_done()
+    assert _call_counts() == [[0] * len(platform_entities[name]) for name in order]
+
+    # All entities of a platform are polled together
+    for idx, platform_name in enumerate(order):
+        async_fire_time_changed_exact(hass, slots[platform_name])
+        await hass.async_block_till_done()
+        assert _call_counts() == [
+            [1 if polled_idx <= idx else 0] * len(platform_entities[name])
+            for polled_idx, name in enumerate(order)
+        ]
+
+    # The platforms are due again one interval later
+    for idx, platform_name in enumerate(order):
+        async_fire_time_changed_exact(
+            hass, slots[platform_name] + timedelta(seconds=30)
+        )
+        await hass.async_block_till_done()
+        assert _call_counts() == [
+            [2 if polled_idx <= idx else 1] * len(platform_entities[name])
+            for polled_idx, name in enumerate(order)
+        ]
+
+
+async def test_polling_scheduler_slow_platform(
+    hass: HomeAssistant, caplog: pytest.LogCaptureFixture
+) -> None:
+    """Test a slow platform is not polled again, and the polls are timed."""
+    release = asyncio.Event()
+    started = []
+
+    async def _async_update(entity_id: str) -> None:
+        started.append(entity_id)
+        await release.wait()
+
+    platform = MockEntityPlatform(hass, platform_name="slow")
+    entities = [MockEntity(should_poll=True), MockEntity(should_poll=True)]
+    await platform.async_add_entities(entities)
+    platform.async_unsub_polling()
+    for ent in entities:
+        ent.async_update = partial(_async_update, ent.entity_id)
+    other_platform = MockEntityPlatform(hass, platform_name="fast")
+    other_entity = MockEntity(should_poll=True)
+    await other_platform.async_add_entities([other_entity])
+    other_platform.async_unsub_polling()
+    other_entity.async_update = Mock()
+
+    scheduler = entity_platform.PollingScheduler(hass)
+    unsubs = [
+        scheduler.async_add_platform(platform),
+        scheduler.async_add_platform(other_platform),
+    ]
+
+    with patch.object(entity_platform, "time") as mock_time:
+        mock_time.monotonic.return_value = 0
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(started) == 2
+        assert other_entity.async_update.call_count == 1
+
+        # The platform that is still being updated is not polled again,
+        # other platforms are
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+        for _ in range(5):
+            await asyncio.sleep(0)
+        assert len(started) == 2
+        assert other_entity.async_update.call_count == 2
+        assert caplog.text.count("took longer than the scheduled update interval") == 1
+        assert "Updating slow test_domain took longer" in caplog.text
+
+        release.set()
+        await hass.async_block_till_done()
+    assert scheduler.histograms == {
+        "test_domain.slow": [2, 0, 0, 0, 0, 0, 0, 0],
+        "test_domain.fast": [2, 0, 0, 0, 0, 0, 0, 0],
+    }
+
+    for unsub in unsubs:
+        unsub()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=45))
+    await hass.async_block_till_done()
+    assert len(started) == 2
+    assert other_entity.async_update.call_count == 2
+
+
+async def test_polling_scheduler_limits_concurrent_polls(
+    hass: HomeAssistant,
+) -> None:
+    """Test no more than MAX_CONCURRENT_POLLS platforms are polled at once."""
+    release = asyncio.Event()
+    running = 0
+    max_running = 0
+    polled = 0
+
+    async def _async_update() -> None:
+        nonlocal running, max_running, polled
+        running += 1
+        max_running = max(max_running, running)
+        await release.wait()
+        running -= 1
+        polled += 1
+
+    platforms = []
+    for idx in range(5):
+        platform = MockEntityPlatform(hass, platform_name=f"platform_{idx}")
+        entity = MockEntity(should_poll=True)
+        await platform.async_add_entities([entity])
+        platform.async_unsub_polling()
+        entity.async_update = _async_update
+        platforms.append(platform)
+
+    with patch.object(entity_platform, "MAX_CONCURRENT_POLLS", 2):
+        scheduler = entity_platform.PollingScheduler(hass)
+    unsubs = [scheduler.async_add_platform(platform) for platform in platforms]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+    for _ in range(5):
+        await asyncio.sleep(0)
+    assert running == 2
+
+    release.set()
+    await hass.async_block_till_done()
+    assert polled == 5
+    assert max_running == 2
+
+    for unsub in unsubs:
+        unsub()
+
+
+async def test_polling_scheduler_added_and_removed_entities(
+    hass: HomeAssistant,
+) -> None:
+    """Test entities added to and removed from a polling platform."""
+    platform = MockEntityPlatform(hass)
+    first = MockEntity(should_poll=True)
+    first.async_update = Mock()
+    await platform.async_add_entities([first])
+    second = MockEntity(should_poll=True)
+    second.async_update = Mock()
+    await platform.async_add_entities([second])
+    first.async_update.reset_mock()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+    await hass.async_block_till_done()
+    assert first.async_update.call_count == 1
+    assert second.async_update.call_count == 1
+
+    await platform.async_remove_entity(first.entity_id)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=30))
+    await hass.async_block_till_done()
+    assert first.async_update.call_count == 1
+    assert second.async_update.call_count == 2
+
+
 async def test_update_state_adds_entities(hass: HomeAssistant) -> None:
     """Test if updating poll entities cause an entity to be added works."""
     component = EntityComponent(_LOGGER, DOMAIN, hass)
@@ -166,7 +361,7 @@ async def test_update_state_adds_entities_with_update_before_add_false(
     assert not ent.update.called
 
 
-@patch("homeassistant.helpers.entity_platform.async_track_time_interval")
+@patch("homeassistant.helpers.entity_platform.PollingScheduler.async_add_platform")
 async def test_set_scan_interval_via_platform(
     mock_track: Mock, hass: HomeAssistant
 ) -> None:
@@ -192,7 +387,7 @@ async def test_set_scan_interval_via_platform(
 
     await hass.async_block_till_done()
     assert mock_track.called
-    assert timedelta(seconds=30) == mock_track.call_args[0][2]
+    assert timedelta(seconds=30) == mock_track.call_args[0][0].scan_interval
 
 
 async def test_adding_entities_with_generator_and_thread_callback(
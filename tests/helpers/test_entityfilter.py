@@ -328,6 +328,28 @@ def test_filter_schema() -> None:
     assert not filt.empty_filter
 
 
+def test_filter_included_keys() -> None:
+    """Test the keys of include only filters."""
+    filt = FILTER_SCHEMA(
+        {"include_domains": ["light"], "include_entities": ["switch.kitchen"]}
+    )
+    assert filt.included_keys == {"light", "switch.kitchen"}
+
+    assert FILTER_SCHEMA({}).included_keys is None
+    assert (
+        FILTER_SCHEMA(
+            {"include_domains": ["light"], "include_entity_globs": ["sensor.*"]}
+        ).included_keys
+        is None
+    )
+    assert (
+        FILTER_SCHEMA(
+            {"include_domains": ["light"], "exclude_entities": ["light.kitchen"]}
+        ).included_keys
+        is None
+    )
+
+
 def test_filter_schema_with_globs() -> None:
     """Test filter schema with glob options."""
     conf = {
@@ -18,12 +18,15 @@ from homeassistant.const import MATCH_ALL
 import homeassistant.core as ha
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import TemplateError
+from homeassistant.helpers.device_registry import EVENT_DEVICE_REGISTRY_UPDATED
 from homeassistant.helpers.entity_registry import EVENT_ENTITY_REGISTRY_UPDATED
 from homeassistant.helpers.event import (
     TrackStates,
     TrackTemplate,
     TrackTemplateResult,
     async_call_later,
+    async_get_shared_template_renders,
+    async_track_device_registry_updated_event,
     async_track_entity_registry_updated_event,
     async_track_point_in_time,
     async_track_point_in_utc_time,
@@ -1036,6 +1039,104 @@ async def test_track_template_result(hass: HomeAssistant) -> None:
     assert len(wildercard_runs) == 4
 
 
+async def test_track_template_result_skips_unread_fields(
+    hass: HomeAssistant,
+) -> None:
+    """Test templates are not re-rendered when fields they did not read change."""
+    hass.states.async_set("sensor.one", "1", {"power": 1})
+    hass.states.async_set("sensor.two", "2")
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10})
+    domain_template = Template(
+        "{{ states.sensor | map(attribute='state') | join(',') }}", hass
+    )
+    attribute_template = Template(
+        "{{ state_attr('light.kitchen', 'brightness') }}", hass
+    )
+    last_changed_template = Template(
+        "{{ states.light.kitchen.last_changed.isoformat() }}", hass
+    )
+    results = []
+
+    @ha.callback
+    def _run_callback(event, updates):
+        results.extend((update.template, update.result) for update in updates)
+
+    templates = (domain_template, attribute_template, last_changed_template)
+    for template in templates:
+        async_track_template_result(
+            hass, [TrackTemplate(template, None, timedelta(0))], _run_callback
+        )
+    await hass.async_block_till_done()
+    renders = [template._renders for template in templates]
+
+    hass.states.async_set("sensor.one", "1", {"power": 2})
+    await hass.async_block_till_done()
+    assert [template._renders for template in templates] == renders
+
+    hass.states.async_set("sensor.one", "3", {"power": 2})
+    await hass.async_block_till_done()
+    assert results == [(domain_template, (3, 2))]
+    results.clear()
+
+    # An added entity is rendered even without read fields
+    hass.states.async_set("sensor.three", "4")
+    await hass.async_block_till_done()
+    assert results == [(domain_template, (3, 2, 4))]
+    results.clear()
+
+    renders = [template._renders for template in templates]
+    hass.states.async_set("light.kitchen", "on", {"brightness": 10, "color": "red"})
+    await hass.async_block_till_done()
+    assert [template._renders for template in templates] == renders
+
+    hass.states.async_set("light.kitchen", "on", {"brightness": 20, "color": "red"})
+    await hass.async_block_till_done()
+    assert results == [(attribute_template, 20)]
+    assert last_changed_template._renders == renders[2]
+    results.clear()
+
+    hass.states.async_set("light.kitchen", "off", {"brightness": 20, "color": "red"})
+    await hass.async_block_till_done()
+    assert results == [
+        (
+            last_changed_template,
+            hass.states.get("light.kitchen").last_changed.isoformat(),
+        )
+    ]
+    assert domain_template._renders == renders[0]
+
+
+async def test_track_template_result_shared_renders(hass: HomeAssistant) -> None:
+    """Test identical templates are rendered once for a state change."""
+    shared_renders = async_get_shared_template_renders(hass)
+    results = []
+
+    @ha.callback
+    def _run_callback(event, updates):
+        results.extend((update.template, update.result) for update in updates)
+
+    templates = []
+    for variables in ({"unused": 1}, {"unused": 2}, {"offset": 1}, {"offset": 1}):
+        template = Template("{{ states('sensor.test') | int(0) + offset }}", hass)
+        templates.append(template)
+        async_track_template_result(
+            hass, [TrackTemplate(template, {"offset": 0, **variables})], _run_callback
+        )
+    await hass.async_block_till_done()
+    assert shared_renders.renders == 0
+
+    hass.states.async_set("sensor.test", "5")
+    await hass.async_block_till_done()
+    assert results == [
+        (templates[0], 5),
+        (templates[1], 5),
+        (templates[2], 6),
+        (templates[3], 6),
+    ]
+    assert shared_renders.renders == 2
+    assert shared_renders.deduplicated_renders == 2
+
+
 async def test_track_template_result_none(hass: HomeAssistant) -> None:
     """Test tracking template."""
     specific_runs = []
@@ -4540,6 +4641,47 @@ async def test_async_track_entity_registry_updated_event_with_a_callback_that_th
     assert event_data[0] == {"action": "create", "entity_id": "switch.puppy_feeder"}
 
 
+async def test_async_track_device_registry_updated_event(hass: HomeAssistant) -> None:
+    """Test tracking device registry updates for a device_id."""
+    event_data = []
+
+    @ha.callback
+    def run_callback(event):
+        event_data.append(event.data)
+
+    @ha.callback
+    def failing_callback(event):
+        raise ValueError
+
+    unsub1 = async_track_device_registry_updated_event(
+        hass, "device_1", failing_callback
+    )
+    unsub2 = async_track_device_registry_updated_event(
+        hass, ["device_1", "device_2"], run_callback
+    )
+    for device_id in ("device_1", "device_2", "device_3"):
+        hass.bus.async_fire(
+            EVENT_DEVICE_REGISTRY_UPDATED, {"action": "update", "device_id": device_id}
+        )
+    await hass.async_block_till_done()
+
+    unsub1()
+    unsub2()
+    hass.bus.async_fire(
+        EVENT_DEVICE_REGISTRY_UPDATED, {"action": "remove", "device_id": "device_1"}
+    )
+    await hass.async_block_till_done()
+
+    assert event_data == [
+        {"action": "update", "device_id": "device_1"},
+        {"action": "update", "device_id": "device_2"},
+    ]
+    unsub_empty = async_track_device_registry_updated_event(
+        hass, [], ha.callback(lambda event: None)
+    )
+    unsub_empty()
+
+
 async def test_async_track_entity_registry_updated_event_with_empty_list(
     hass: HomeAssistant,
 ) -> None:
@@ -10,6 +10,7 @@ from typing import Any
 from unittest.mock import patch
 
 from freezegun import freeze_time
+import jinja2
 import pytest
 import voluptuous as vol
 
@@ -17,6 +18,7 @@ from homeassistant.components import group
 from homeassistant.config import async_process_ha_core_config
 from homeassistant.const import (
     ATTR_UNIT_OF_MEASUREMENT,
+    EVENT_HOMEASSISTANT_STARTED,
     LENGTH_METERS,
     LENGTH_MILLIMETERS,
     MASS_GRAMS,
@@ -27,7 +29,7 @@ from homeassistant.const import (
     UnitOfPressure,
     UnitOfSpeed,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CoreState, HomeAssistant
 from homeassistant.exceptions import TemplateError
 from homeassistant.helpers import (
     area_registry as ar,
@@ -305,6 +307,163 @@ async def test_import_change(hass: HomeAssistant) -> None:
     assert to_test.async_render() == "macro2 variable2"
 
 
+async def _async_restart_code_cache(hass: HomeAssistant) -> None:
+    """Load the code cache again as after a restart."""
+    hass.data.pop(template._ENVIRONMENT)
+    await template.async_load_code_cache(hass)
+
+
+async def _async_fire_code_cache_save(hass: HomeAssistant, delay: float) -> None:
+    """Fire the delayed save of the code cache."""
+    await hass.async_block_till_done()
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=delay))
+    await hass.async_block_till_done()
+
+
+async def test_code_cache(hass: HomeAssistant, hass_storage: dict[str, Any]) -> None:
+    """Test the code of templates compiled while starting is reused after a restart."""
+    hass.state = CoreState.starting
+    await template.async_load_code_cache(hass)
+    assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    await _async_fire_code_cache_save(hass, template.CODE_CACHE_SAVE_DELAY)
+    assert template.CODE_CACHE_STORAGE_KEY not in hass_storage
+
+    hass.state = CoreState.running
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await _async_fire_code_cache_save(hass, template.CODE_CACHE_SAVE_DELAY)
+    stored = hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]
+    assert len(stored["code"]) == 2
+    code = dict(stored["code"])
+    first, second = code
+
+    # Restart
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+        assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    assert len(compile_mock.mock_calls) == 0
+
+    # Restart with the bytecode of the templates swapped
+    stored["code"] = {first: code[second], second: code[first]}
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+        assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    assert len(compile_mock.mock_calls) == 2
+
+    # Restart with a corrupted entry
+    stored["code"] = {first: code[first], second: "invalid"}
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+        assert template.Template("{{ 2 + 2 }}", hass).async_render() == 4
+    assert len(compile_mock.mock_calls) == 1
+
+    # Code stored by another version is not used
+    stored["code"] = code
+    stored["build"] = "other"
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        assert template.Template("{{ 1 + 1 }}", hass).async_render() == 2
+    assert len(compile_mock.mock_calls) == 1
+
+
+async def test_code_cache_compiled_after_start(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test templates compiled after starting are only stored once compiled again."""
+    await template.async_load_code_cache(hass)
+    await _async_fire_code_cache_save(hass, template.CODE_CACHE_SAVE_DELAY)
+    assert template.Template("{{ 3 }}", hass).async_render() == 3
+    await _async_fire_code_cache_save(hass, template.CODE_CACHE_COMPILED_SAVE_DELAY)
+    stored = hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]
+    assert stored["code"] == {}
+    assert len(stored["compiled"]) == 1
+
+    # The template is compiled again after the restart and stored
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        assert template.Template("{{ 3 }}", hass).async_render() == 3
+    assert len(compile_mock.mock_calls) == 1
+    await _async_fire_code_cache_save(hass, template.CODE_CACHE_SAVE_DELAY)
+    stored = hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]
+    assert len(stored["code"]) == 1
+    assert stored["compiled"] == []
+
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        assert template.Template("{{ 3 }}", hass).async_render() == 3
+    assert len(compile_mock.mock_calls) == 0
+
+
+async def test_code_cache_limit(
+    hass: HomeAssistant, hass_storage: dict[str, Any]
+) -> None:
+    """Test the code cache only keeps the bytecode used last within its size."""
+    hass.state = CoreState.starting
+    await template.async_load_code_cache(hass)
+    for value in range(3):
+        assert template.Template(f"{{{{ {value} }}}}", hass).async_render() == value
+    hass.state = CoreState.running
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STARTED)
+    await _async_fire_code_cache_save(hass, template.CODE_CACHE_SAVE_DELAY)
+    stored = hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]
+    sizes = [len(encoded) for encoded in stored["code"].values()]
+    assert len(sizes) == 3
+
+    # Only the bytecode used since the restart fits
+    with patch.object(template, "MAX_CACHED_CODE_SIZE", sizes[1] + sizes[2]):
+        await _async_restart_code_cache(hass)
+        for value in (2, 1):
+            assert template.Template(f"{{{{ {value} }}}}", hass).async_render() == value
+        await _async_fire_code_cache_save(hass, template.CODE_CACHE_SAVE_DELAY)
+    stored = hass_storage[template.CODE_CACHE_STORAGE_KEY]["data"]
+    assert len(stored["code"]) == 2
+
+    # The templates used last are not compiled again after a restart
+    await _async_restart_code_cache(hass)
+    with patch.object(
+        jinja2.Environment,
+        "compile",
+        autospec=True,
+        side_effect=jinja2.Environment.compile,
+    ) as compile_mock:
+        for value in range(3):
+            assert template.Template(f"{{{{ {value} }}}}", hass).async_render() == value
+    assert [call.args[1] for call in compile_mock.mock_calls] == ["{{ 0 }}"]
+
+
 def test_loop_controls(hass: HomeAssistant) -> None:
     """Test that loop controls are enabled."""
     assert (
@@ -3495,6 +3654,37 @@ def test_nested_async_render_to_info_case(hass: HomeAssistant) -> None:
     assert info.rate_limit is None
 
 
+def test_async_render_to_info_state_fields(hass: HomeAssistant) -> None:
+    """Test the fields read from the states are collected."""
+    hass.states.async_set("light.a", "on", {"brightness": 10})
+    hass.states.async_set("sensor.a", "1")
+
+    info = render_to_info(
+        hass,
+        "{{ states.light.a.state }} {{ states.light.a.name }}"
+        " {{ state_attr('light.a', 'brightness') }} {{ states.sensor.a.domain }}",
+    )
+    assert info.state_fields == {
+        "light.a": {"state", "attributes.friendly_name", "attributes.brightness"},
+        "sensor.a": set(),
+    }
+
+    info = render_to_info(
+        hass, "{{ states.sensor | map(attribute='last_changed') | list | count }}"
+    )
+    assert info.state_fields == {None: {"last_changed"}}
+
+    info = render_to_info(hass, "{{ states('sensor.missing') }} {{ states.light.a }}")
+    assert info.state_fields == {"sensor.missing": {"*"}, "light.a": {"*"}}
+
+    old_state = hass.states.get("light.a")
+    info = render_to_info(hass, "{{ state_attr('light.a', 'brightness') }}")
+    hass.states.async_set("light.a", "off", {"brightness": 10})
+    assert not info.fields_changed("light.a", old_state, hass.states.get("light.a"))
+    hass.states.async_set("light.a", "off", {"brightness": 20})
+    assert info.fields_changed("light.a", old_state, hass.states.get("light.a"))
+
+
 def test_result_as_boolean(hass: HomeAssistant) -> None:
     """Test converting a template result to a boolean."""
 
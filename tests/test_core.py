@@ -8,7 +8,9 @@ import functools
 import gc
 import logging
 import os
+import sys
 from tempfile import TemporaryDirectory
+import threading
 import time
 from typing import Any
 from unittest.mock import MagicMock, Mock, PropertyMock, patch
@@ -35,16 +37,20 @@ from homeassistant.const import (
 import homeassistant.core as ha
 from homeassistant.core import HassJob, HomeAssistant, State
 from homeassistant.exceptions import (
+    HomeAssistantError,
     InvalidEntityFormatError,
     InvalidStateError,
     MaxLengthExceeded,
     ServiceNotFound,
 )
+from homeassistant.helpers.json import JSON_DUMP
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import json_loads
 from homeassistant.util.read_only_dict import ReadOnlyDict
+import homeassistant.util.ulid as ulid_util
 from homeassistant.util.unit_system import METRIC_SYSTEM
 
-from .common import async_capture_events, async_mock_service
+from .common import async_capture_events, async_fire_time_changed, async_mock_service
 
 PST = dt_util.get_time_zone("America/Los_Angeles")
 
@@ -491,6 +497,43 @@ def test_state_as_compressed_state() -> None:
     assert state.as_compressed_state() is as_compressed_state
 
 
+def test_state_as_dict_json() -> None:
+    """Test a State as JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    as_dict_json = state.as_dict_json()
+    assert json_loads(as_dict_json) == json_loads(JSON_DUMP(state.as_dict()))
+    # 2nd time to verify cache
+    assert state.as_dict_json() is as_dict_json
+
+
+def test_state_as_compressed_state_json() -> None:
+    """Test a State as compressed state JSON."""
+    last_time = datetime(1984, 12, 8, 12, 0, 0, tzinfo=dt_util.UTC)
+    state = ha.State(
+        "happy.happy",
+        "on",
+        {"pig": "dog"},
+        last_updated=last_time,
+        last_changed=last_time,
+    )
+    as_compressed_state_json = state.as_compressed_state_json()
+    assert json_loads(as_compressed_state_json) == {
+        "a": {"pig": "dog"},
+        "c": state.context.id,
+        "lc": last_time.timestamp(),
+        "s": "on",
+    }
+    # 2nd time to verify cache
+    assert state.as_compressed_state_json() is as_compressed_state_json
+
+
 def test_state_as_compressed_state_unique_last_updated() -> None:
     """Test a State as compressed state where last_changed is not last_updated."""
     last_changed = datetime(1984, 12, 8, 11, 0, 0, tzinfo=dt_util.UTC)
@@ -584,6 +627,146 @@ async def test_eventbus_run_immediately(hass: HomeAssistant) -> None:
     unsub()
 
 
+async def test_eventbus_keyed_listener(hass: HomeAssistant) -> None:
+    """Test keyed listeners are routed by entity_id and domain."""
+    entity_calls = []
+    domain_calls = []
+
+    @ha.callback
+    def entity_listener(event):
+        """Mock entity listener."""
+        entity_calls.append(event)
+
+    @ha.callback
+    def domain_listener(event):
+        """Mock domain listener."""
+        domain_calls.append(event)
+
+    unsub_entity = hass.bus.async_listen_keyed(
+        "test", ["Light.Kitchen", "switch.porch"], entity_listener
+    )
+    unsub_domain = hass.bus.async_listen_keyed("test", "light", domain_listener)
+
+    assert hass.bus.async_listeners()["test"] == 2
+    assert hass.bus.async_keyed_listeners("test") == {
+        "light.kitchen": 1,
+        "switch.porch": 1,
+        "light": 1,
+    }
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    hass.bus.async_fire("test", {"entity_id": "light.living_room"})
+    hass.bus.async_fire("test", {"entity_id": "switch.porch"})
+    hass.bus.async_fire("test", {"entity_id": "switch.other"})
+    hass.bus.async_fire("test", {"other": "light.kitchen"})
+    hass.bus.async_fire("other", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert [event.data["entity_id"] for event in entity_calls] == [
+        "light.kitchen",
+        "switch.porch",
+    ]
+    assert [event.data["entity_id"] for event in domain_calls] == [
+        "light.kitchen",
+        "light.living_room",
+    ]
+
+    unsub_entity()
+    assert hass.bus.async_keyed_listeners("test") == {"light": 1}
+    unsub_domain()
+    assert hass.bus.async_keyed_listeners("test") == {}
+    assert "test" not in hass.bus.async_listeners()
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(entity_calls) == 2
+    assert len(domain_calls) == 2
+
+
+async def test_eventbus_keyed_listener_entity_and_domain(
+    hass: HomeAssistant,
+) -> None:
+    """Test a listener keyed on an entity_id and its domain runs once."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed("test", ["light.kitchen", "light"], listener)
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+
+    unsub()
+
+
+async def test_eventbus_keyed_listener_run_immediately(
+    hass: HomeAssistant,
+) -> None:
+    """Test keyed listeners can run immediately."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    unsub = hass.bus.async_listen_keyed(
+        "test", ["light.kitchen", "light"], listener, run_immediately=True
+    )
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen"})
+    assert len(calls) == 1
+
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+    unsub()
+
+    async def coro_listener(event):
+        """Mock coroutine listener."""
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(
+            "test", "light.kitchen", coro_listener, run_immediately=True
+        )
+
+
+async def test_eventbus_keyed_listener_filter(hass: HomeAssistant) -> None:
+    """Test keyed listeners can be filtered and cannot listen to all events."""
+    calls = []
+
+    @ha.callback
+    def listener(event):
+        """Mock listener."""
+        calls.append(event)
+
+    @ha.callback
+    def filter(event):
+        """Mock filter."""
+        return not event.data["filtered"]
+
+    unsub = hass.bus.async_listen_keyed(
+        "test", "light.kitchen", listener, event_filter=filter
+    )
+
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": True})
+    hass.bus.async_fire("test", {"entity_id": "light.kitchen", "filtered": False})
+    await hass.async_block_till_done()
+
+    assert len(calls) == 1
+
+    unsub()
+
+    with pytest.raises(HomeAssistantError):
+        hass.bus.async_listen_keyed(MATCH_ALL, "light.kitchen", listener)
+
+
 async def test_eventbus_unsubscribe_listener(hass: HomeAssistant) -> None:
     """Test unsubscribe listener from returned function."""
     calls = []
@@ -749,6 +932,13 @@ def test_state_name_if_friendly_name_attr() -> None:
     assert state.name == name
 
 
+def test_state_last_updated_timestamp() -> None:
+    """Test the timestamp of last updated."""
+    last_updated = datetime(2021, 6, 12, 3, 4, 1, 323, tzinfo=dt_util.UTC)
+    state = ha.State("domain.hello", "world", last_updated=last_updated)
+    assert state.last_updated_timestamp == last_updated.timestamp()
+
+
 def test_state_dict_conversion() -> None:
     """Test conversion of dict."""
     state = ha.State("domain.hello", "world", {"some": "attr"})
@@ -868,6 +1058,31 @@ async def test_statemachine_last_changed_not_updated_on_same_state(
     assert state.last_changed == state2.last_changed
 
 
+async def test_statemachine_shares_same_attributes(hass: HomeAssistant) -> None:
+    """Test unchanged attributes are shared with the previous state."""
+    hass.states.async_set("light.bowl", "on", json_loads('{"brightness": 100}'))
+    state = hass.states.get("light.bowl")
+    assert isinstance(state.attributes, ReadOnlyDict)
+    key = next(iter(state.attributes))
+    assert key is sys.intern("brightness")
+
+    hass.states.async_set("light.bowl", "off", {"brightness": 100})
+    state2 = hass.states.get("light.bowl")
+    assert state2.attributes is state.attributes
+
+    hass.states.async_set("light.bowl", "on", {"brightness": 50})
+    state3 = hass.states.get("light.bowl")
+    assert state3.attributes is not state.attributes
+    assert state3.attributes == {"brightness": 50}
+
+    hass.states.async_set("light.other", "on")
+    hass.states.async_set("light.another", "on", {})
+    assert (
+        hass.states.get("light.other").attributes
+        is hass.states.get("light.another").attributes
+    )
+
+
 async def test_statemachine_force_update(hass: HomeAssistant) -> None:
     """Test force update option."""
     hass.states.async_set("light.bowl", "on", {})
@@ -882,6 +1097,98 @@ async def test_statemachine_force_update(hass: HomeAssistant) -> None:
     assert len(events) == 1
 
 
+async def test_statemachine_coalesce(hass: HomeAssistant) -> None:
+    """Test state changes within the coalesce window are collapsed."""
+    hass.states.async_set_coalesce_window("sensor", timedelta(seconds=5))
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("light.bowl", "on")
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("sensor.power", "2")
+    hass.states.async_set("sensor.power", "3")
+    hass.states.async_set("sensor.power", "4", {"unit": "W"})
+    hass.states.async_set("light.bowl", "off")
+    hass.states.async_set("light.bowl", "on")
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.power").state == "4"
+    assert [
+        (event.data["entity_id"], event.data["new_state"].state) for event in events
+    ] == [("sensor.power", "2"), ("light.bowl", "off"), ("light.bowl", "on")]
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=6))
+    await hass.async_block_till_done()
+
+    assert len(events) == 4
+    assert events[3].data["old_state"].state == "2"
+    assert events[3].data["new_state"].state == "4"
+    assert events[3].data["new_state"].attributes == {"unit": "W"}
+    assert hass.states.async_coalesce_stats() == {"coalesced": 2, "delivered": 2}
+
+    hass.states.async_set("sensor.power", "5")
+    assert hass.states.async_remove("sensor.power")
+    await hass.async_block_till_done()
+
+    assert len(events) == 5
+    assert events[4].data["old_state"].state == "5"
+    assert events[4].data["new_state"] is None
+
+
+async def test_statemachine_coalesce_disable(hass: HomeAssistant) -> None:
+    """Test pending writes are fired when coalescing is disabled."""
+    hass.states.async_set_coalesce_window("sensor.power", timedelta(seconds=5))
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("sensor.power", "2")
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("sensor.power", "3")
+    await hass.async_block_till_done()
+    assert len(events) == 0
+
+    hass.states.async_set_coalesce_window("sensor.power", None)
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert events[0].data["old_state"].state == "2"
+    assert events[0].data["new_state"].state == "3"
+
+    hass.states.async_set("sensor.power", "4")
+    await hass.async_block_till_done()
+    assert len(events) == 2
+    assert hass.states.async_coalesce_stats() == {"coalesced": 1, "delivered": 2}
+
+
+async def test_statemachine_coalesce_entity_window(hass: HomeAssistant) -> None:
+    """Test entity windows override domain windows and intermediates expire."""
+    hass.states.async_set_coalesce_window("sensor", timedelta(seconds=5))
+    hass.states.async_set_coalesce_window("sensor.energy", timedelta(0))
+    hass.states.async_set("sensor.power", "1")
+    hass.states.async_set("sensor.energy", "1")
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    hass.states.async_set("sensor.energy", "2")
+    hass.states.async_set("sensor.energy", "3")
+    hass.states.async_set("sensor.power", "2")
+    hass.states.async_set("sensor.power", "3")
+    intermediate = hass.states.get("sensor.power")
+    context = intermediate.context
+    hass.states.async_set("sensor.power", "4")
+    await hass.async_block_till_done()
+
+    assert [
+        (event.data["entity_id"], event.data["new_state"].state) for event in events
+    ] == [("sensor.energy", "2"), ("sensor.energy", "3"), ("sensor.power", "2")]
+    assert intermediate.context is not context
+    assert intermediate.context.id == context.id
+
+    hass.states.async_set_coalesce_window("sensor", None)
+    await hass.async_block_till_done()
+    assert len(events) == 4
+    assert hass.states._coalesce_last_fired.keys() == {"sensor.energy"}
+
+    hass.states.async_set_coalesce_window("sensor.energy", None)
+    assert not hass.states._coalesce_last_fired
+
+
 def test_service_call_repr() -> None:
     """Test ServiceCall repr."""
     call = ha.ServiceCall("homeassistant", "start")
@@ -1292,6 +1599,75 @@ def test_context() -> None:
     assert c.id is not None
 
 
+def test_context_lazy_id() -> None:
+    """Test the context id is generated lazily from the timestamp."""
+    timestamp = dt_util.utc_to_timestamp(datetime(2023, 4, 1, tzinfo=dt_util.UTC))
+    c = ha.Context(timestamp=timestamp)
+    assert c.id[:10] == ulid_util.ulid_at_time(timestamp)[:10]
+    assert c.id is c.id
+    assert c.id_bin == ulid_util.ulid_to_bytes(c.id)
+
+    c = ha.Context(timestamp=timestamp)
+    id_bin = c.id_bin
+    assert id_bin[:6] == ulid_util.ulid_to_bytes(ulid_util.ulid_at_time(timestamp))[:6]
+    assert c.id == ulid_util.bytes_to_ulid(id_bin)
+    assert c.id_bin is id_bin
+
+    c = ha.Context(id="01GX2CRYZ1G4RZ6JBYJ0R2VQZK")
+    assert c.id_bin == ulid_util.ulid_to_bytes("01GX2CRYZ1G4RZ6JBYJ0R2VQZK")
+
+    c = ha.Context(id="not_a_ulid")
+    with pytest.raises(ValueError):
+        c.id_bin
+
+
+def test_context_lazy_id_threads() -> None:
+    """Test the lazy id is the same when generated from two threads."""
+    c = ha.Context(timestamp=time.time())
+    ids = []
+    ulid_bytes_at_time = ulid_util.ulid_bytes_at_time
+
+    def _generate(timestamp: float, randomness: bytes) -> bytes:
+        # Another thread generates the id while it is being generated
+        if not threads:
+            thread = threading.Thread(target=lambda: ids.append(c.id))
+            threads.append(thread)
+            thread.start()
+            thread.join()
+        return ulid_bytes_at_time(timestamp, randomness)
+
+    threads: list[threading.Thread] = []
+    with patch(
+        "homeassistant.util.ulid.ulid_bytes_at_time", side_effect=_generate
+    ) as mock_generate:
+        id_bin = c.id_bin
+
+    assert mock_generate.call_count == 2
+    assert ids == [ulid_util.bytes_to_ulid(id_bin)]
+    assert c.id == ids[0]
+
+
+def test_context_lazy_id_unique() -> None:
+    """Test lazy ids of contexts created at the same time are unique."""
+    timestamp = time.time()
+    contexts = [ha.Context(timestamp=timestamp) for _ in range(1000)]
+    assert len({context.id for context in contexts}) == 1000
+    assert len({context.id[:10] for context in contexts}) == 1
+
+
+async def test_state_expire_keeps_lazy_context(hass: HomeAssistant) -> None:
+    """Test expiring a state keeps the same context id."""
+    hass.states.async_set("light.bowl", "on")
+    state = hass.states.get("light.bowl")
+    context = state.context
+    hass.states.async_set("light.bowl", "off")
+
+    assert state.context is not context
+    assert state.context.origin_event is None
+    assert state.context.id == context.id
+    assert state.context == context
+
+
 async def test_async_functions_with_callback(hass: HomeAssistant) -> None:
     """Test we deal with async functions accidentally marked as callback."""
     runs = []
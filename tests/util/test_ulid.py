@@ -14,3 +14,21 @@ async def test_ulid_util_uuid_hex() -> None:
 async def test_ulid_util_uuid() -> None:
     """Verify we can generate a ulid."""
     assert len(ulid_util.ulid()) == 26
+
+
+async def test_ulid_util_bytes_at_time() -> None:
+    """Verify we can generate a binary ulid at a timestamp."""
+    timestamp = 1680000000.123
+    ulid_bytes = ulid_util.ulid_bytes_at_time(timestamp)
+    assert len(ulid_bytes) == 16
+    assert (
+        ulid_util.bytes_to_ulid(ulid_bytes)[:10]
+        == ulid_util.ulid_at_time(timestamp)[:10]
+    )
+
+
+async def test_ulid_util_bytes_at_time_randomness() -> None:
+    """Verify the randomness of a binary ulid can be passed."""
+    ulid_bytes = ulid_util.ulid_bytes_at_time(1680000000.123, bytes(range(10)))
+    assert ulid_bytes == (1680000000123).to_bytes(6, "big") + bytes(range(10))
+    assert ulid_util.ulid_bytes_at_time(1680000000.123) != ulid_bytes